@@ -102,12 +102,45 @@ CREATE TABLE IF NOT EXISTS trade_history (
 
     -- 🔥 빠른 조회를 위한 인덱스 강화
     INDEX idx_symbol_time (symbol, trade_time),
+    INDEX idx_time_id (trade_time, id),  -- 거래내역 키셋 페이지네이션 (trade_time, id)
     INDEX idx_trade_type (trade_type),
     INDEX idx_order_id (order_id),
     INDEX idx_side (side),
     INDEX idx_created_at (created_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='실제 체결된 모든 거래 내역 저장';
 
+-- 기존 DB에는 키셋 페이지네이션 인덱스를 한 번만 추가
+-- ALTER TABLE trade_history ADD INDEX idx_time_id (trade_time, id);
+
+
+-- 6. 일별/심볼별/방향별 거래 집계 (save_trade에서 증분 갱신, 통계 조회용)
+CREATE TABLE IF NOT EXISTS trade_daily_stats (
+    trade_date DATE NOT NULL COMMENT '체결 일자',
+    symbol VARCHAR(20) NOT NULL COMMENT '심볼',
+    side ENUM('LONG', 'SHORT') NOT NULL COMMENT '포지션 방향',
+    trade_count INT NOT NULL DEFAULT 0 COMMENT '거래 수',
+    entry_count INT NOT NULL DEFAULT 0 COMMENT '진입 수',
+    exit_count INT NOT NULL DEFAULT 0 COMMENT '종료 수',
+    total_volume DECIMAL(30, 8) NOT NULL DEFAULT 0 COMMENT 'SUM(quantity * price)',
+    total_commission DECIMAL(20, 8) NOT NULL DEFAULT 0 COMMENT 'SUM(commission)',
+    total_pnl DECIMAL(20, 8) NOT NULL DEFAULT 0 COMMENT 'SUM(realized_pnl)',
+    max_pnl DECIMAL(20, 8) DEFAULT NULL COMMENT 'MAX(realized_pnl)',
+    min_pnl DECIMAL(20, 8) DEFAULT NULL COMMENT 'MIN(realized_pnl)',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (trade_date, symbol, side)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='거래 내역 일별 사전 집계';
+
+-- 기존 거래 내역 백필 (DatabaseManager.rebuild_daily_stats()와 동일)
+-- INSERT INTO trade_daily_stats
+-- (trade_date, symbol, side, trade_count, entry_count, exit_count,
+--  total_volume, total_commission, total_pnl, max_pnl, min_pnl)
+-- SELECT DATE(trade_time), symbol, side, COUNT(*),
+--        SUM(trade_type = 'ENTRY'), SUM(trade_type = 'EXIT'),
+--        SUM(quantity * price), SUM(commission), SUM(realized_pnl),
+--        MAX(realized_pnl), MIN(realized_pnl)
+-- FROM trade_history
+-- GROUP BY DATE(trade_time), symbol, side;
+
 
 -- 초기 데이터 삽입
 
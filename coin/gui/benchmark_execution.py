@@ -0,0 +1,252 @@
+# benchmark_execution.py - 주문 실행 경로 지연/처리량 측정
+"""
+exchange_simulator.py 위에서 자동매매 진입 흐름(심볼 정보 → 레버리지 → 현재가 → 주문 → 체결 확인)을
+반복 실행해 시그널→체결 지연과 처리량을 측정
+
+- sequential: 시그널을 하나씩 처리 (단건 지연 분포)
+- batch: OrderBatchExecutor + OrderBatcher로 여러 심볼 동시 처리 (execute_signal_batch와 같은 방식)
+- --ccxt: CCXTBinanceClient로 sequential 측정 (ccxt 설치 필요, 체결은 주문 응답 기준)
+
+실행 예:
+    python benchmark_execution.py --signals 40 --latency 0.03 --jitter 0.02 --fill-delay 0.05
+    python benchmark_execution.py --url http://127.0.0.1:8765   # 따로 띄운 시뮬레이터 사용
+"""
+
+import argparse
+import asyncio
+import math
+import statistics
+import time
+
+from binance_client import BinanceClient
+from exchange_simulator import SimulatedExchange, MatchingModel, SimulatorConfig
+from order_executor import OrderBatchExecutor, OrderBatcher
+
+
+def summarize(label, samples, elapsed=None):
+    """지연 분포 출력 (ms)"""
+    if not samples:
+        print(f"   {label}: 성공한 시그널 없음")
+        return {}
+
+    ordered = sorted(samples)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(math.ceil(p / 100 * len(ordered))) - 1)] * 1000
+
+    result = {
+        'count': len(samples),
+        'mean_ms': statistics.mean(samples) * 1000,
+        'p50_ms': pct(50),
+        'p95_ms': pct(95),
+        'p99_ms': pct(99),
+        'max_ms': ordered[-1] * 1000,
+    }
+    line = (f"   {label}: {result['count']}건 | 평균 {result['mean_ms']:.1f}ms | p50 {result['p50_ms']:.1f}ms"
+            f" | p95 {result['p95_ms']:.1f}ms | p99 {result['p99_ms']:.1f}ms | 최대 {result['max_ms']:.1f}ms")
+    if elapsed:
+        result['throughput'] = len(samples) / elapsed
+        line += f" | {result['throughput']:.1f}건/초"
+    print(line)
+    return result
+
+
+async def execute_signal(client, symbol, side, margin, leverage, submit, fill_timeout=5.0):
+    """
+    시그널 1건 진입 (StrategyWidget.open_position과 같은 요청 순서)
+
+    Returns:
+        dict | None: {'symbol', 'ack', 'fill'} (시그널 수신 기준 경과 시간, 초)
+    """
+    started = time.perf_counter()
+
+    symbol_info = await client.get_symbol_info(symbol)
+    if not symbol_info:
+        return None
+
+    if not await client.set_leverage(symbol, leverage):
+        return None
+
+    # BinanceClient: get_ticker()['last'] / CCXTBinanceClient: get_ticker_price()['price']
+    if hasattr(client, 'get_ticker'):
+        ticker = await client.get_ticker(symbol)
+        price = ticker.get('last') if ticker else None
+    else:
+        ticker = await client.get_ticker_price(symbol)
+        price = ticker.get('price') if ticker else None
+    if not price:
+        return None
+    price = float(price)
+
+    step = symbol_info.get('stepSize', 0.001)
+    quantity = math.floor(margin * leverage / price / step) * step
+    quantity = round(max(quantity, step), int(symbol_info.get('quantityPrecision', 3)))
+
+    order = await submit(symbol, side, 'MARKET', quantity)
+    if not order or 'orderId' not in order:
+        return None
+    acked = time.perf_counter()
+
+    account_state = getattr(client, 'account_state', None)
+    if account_state is not None and account_state.ready:
+        fill = await account_state.wait_for_fill(order['orderId'], timeout=fill_timeout)
+    elif str(order.get('status')).upper() in ('FILLED', 'CLOSED') or not hasattr(client, 'get_order'):
+        # 주문 응답에 체결이 반영된 경우 (CCXT는 주문 조회 메서드가 없어 응답 기준)
+        fill = order
+    else:
+        fill = None
+        deadline = time.perf_counter() + fill_timeout
+        while time.perf_counter() < deadline:
+            detail = await client.get_order(symbol, order['orderId'])
+            if detail and detail.get('status') == 'FILLED':
+                fill = detail
+                break
+            await asyncio.sleep(0.05)
+    if not fill:
+        return None
+
+    return {'symbol': symbol, 'ack': acked - started, 'fill': time.perf_counter() - started}
+
+
+def make_signals(symbols, count):
+    """심볼을 돌아가며 매수/매도 번갈아 생성"""
+    return [(symbols[i % len(symbols)], 'BUY' if (i // len(symbols)) % 2 == 0 else 'SELL') for i in range(count)]
+
+
+async def run_sequential(client, signals, margin, leverage):
+    print(f"\n⏱️ 순차 실행: 시그널 {len(signals)}건")
+    acks, fills = [], []
+    started = time.perf_counter()
+    for symbol, side in signals:
+        result = await execute_signal(client, symbol, side, margin, leverage, client.place_order)
+        if result:
+            acks.append(result['ack'])
+            fills.append(result['fill'])
+    elapsed = time.perf_counter() - started
+
+    summarize("주문 응답", acks)
+    return summarize("시그널→체결", fills, elapsed)
+
+
+async def run_batch(client, signals, margin, leverage, max_concurrency):
+    print(f"\n⏱️ 동시 실행: 시그널 {len(signals)}건 (최대 동시 {max_concurrency})")
+    executor = OrderBatchExecutor(max_concurrency=max_concurrency)
+    batcher = OrderBatcher(client)
+    acks, fills = [], []
+
+    def job(symbol, side):
+        async def run():
+            result = await execute_signal(client, symbol, side, margin, leverage, batcher.submit)
+            if result:
+                acks.append(result['ack'])
+                fills.append(result['fill'])
+            return result is not None
+        return run
+
+    started = time.perf_counter()
+    results = await executor.run(
+        [(symbol, side, job(symbol, side)) for symbol, side in signals],
+        getattr(client, 'rate_governor', None)
+    )
+    # 배치 후 포지션 한 번 재조회 (execute_signal_batch와 동일)
+    await client.get_positions()
+    elapsed = time.perf_counter() - started
+
+    failed = sum(1 for r in results if not r['success'])
+    if failed:
+        print(f"   ⚠️ 실패 {failed}건")
+    summarize("주문 응답", acks)
+    return summarize("시그널→체결", fills, elapsed)
+
+
+async def run_ccxt(base_url, signals, margin, leverage):
+    try:
+        from ccxt_binance_client import CCXTBinanceClient
+    except ImportError as e:
+        print(f"⚠️ CCXT 측정 생략: {e}")
+        return {}
+
+    client = CCXTBinanceClient('sim-key', 'sim-secret', testnet=False, base_url=base_url)
+    print(f"\n⏱️ CCXT 순차 실행: 시그널 {len(signals)}건")
+    fills = []
+    started = time.perf_counter()
+    try:
+        for symbol, side in signals:
+            result = await execute_signal(client, symbol, side, margin, leverage, client.place_order)
+            if result:
+                fills.append(result['fill'])
+    finally:
+        await client.close()
+    return summarize("시그널→체결", fills, time.perf_counter() - started)
+
+
+async def benchmark(args):
+    exchange = None
+    base_url = args.url
+    if base_url is None:
+        exchange = SimulatedExchange(
+            matching=MatchingModel(fill_delay=args.fill_delay, partial_fills=args.partial_fills),
+            config=SimulatorConfig(
+                latency=args.latency,
+                jitter=args.jitter,
+                weight_limit=args.weight_limit,
+                rate_limit_rate=args.rate_limit_rate,
+            ),
+            balance=1_000_000,
+            seed=args.seed,
+        )
+        base_url = await exchange.start(port=0)
+
+    client = BinanceClient('sim-key', 'sim-secret', testnet=False, base_url=base_url)
+    try:
+        if not args.no_stream:
+            client.user_stream.start()
+            for _ in range(100):
+                if client.account_state.ready:
+                    break
+                await asyncio.sleep(0.05)
+            print(f"📡 사용자 데이터 스트림: {'연결됨' if client.account_state.ready else '미연결 (주문 조회로 체결 확인)'}")
+
+        symbols = args.symbols.split(',')
+        signals = make_signals(symbols, args.signals)
+
+        await run_sequential(client, signals, args.margin, args.leverage)
+        await run_batch(client, signals, args.margin, args.leverage, args.concurrency)
+
+        if args.ccxt:
+            await run_ccxt(base_url, signals, args.margin, args.leverage)
+
+        governor = client.rate_governor
+        print(f"\n📊 클라이언트 가중치 사용: {governor.used_weight}/{governor.weight_limit} (주문 {governor.order_count})")
+        if exchange is not None:
+            print(f"📊 시뮬레이터: {exchange.stats}")
+    finally:
+        await client.close()
+        if exchange is not None:
+            await exchange.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="주문 실행 경로 지연/처리량 측정")
+    parser.add_argument('--url', default=None, help='외부 시뮬레이터 주소 (없으면 내장 시뮬레이터 실행)')
+    parser.add_argument('--symbols', default='BTCUSDT,ETHUSDT,SOLUSDT,XRPUSDT,DOGEUSDT')
+    parser.add_argument('--signals', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=5)
+    parser.add_argument('--margin', type=float, default=100.0, help='시그널당 증거금 (USDT)')
+    parser.add_argument('--leverage', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--jitter', type=float, default=0.01)
+    parser.add_argument('--fill-delay', type=float, default=0.0)
+    parser.add_argument('--partial-fills', type=int, default=1)
+    parser.add_argument('--weight-limit', type=int, default=2400)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--no-stream', action='store_true', help='사용자 데이터 스트림 없이 주문 조회로 체결 확인')
+    parser.add_argument('--ccxt', action='store_true', help='CCXTBinanceClient도 측정')
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -4,13 +4,51 @@ import hmac
 import hashlib
 import time
 import os
+import copy
 from urllib.parse import urlencode
 import aiohttp
 import websockets
 from decimal import Decimal, ROUND_DOWN
 
+from exchange_metadata import ExchangeMetadata, CACHE_DIR
+from market_data_hub import MarketDataHub
+from user_data_stream import UserDataStream
+from symbol_settings import SymbolSettings, normalize_margin_type
+from rate_limiter import RateGovernor, endpoint_weight, endpoint_order_count, PRIORITY_TRADE, PRIORITY_ACCOUNT, PRIORITY_UI
+
+def build_order_params(symbol, side, order_type, quantity, price=None):
+    """주문 파라미터 생성 (단일 주문 / batchOrders 공용)"""
+    params = {
+        'symbol': symbol,
+        'side': side,
+        'type': order_type,
+        'quantity': str(quantity)
+    }
+    
+    if price and order_type == 'LIMIT':
+        params['price'] = str(price)
+        params['timeInForce'] = 'GTC'
+    
+    return params
+
+
 class BinanceClient:
-    def __init__(self, api_key, secret_key, testnet=True):
+    # batchOrders 한 번에 보낼 수 있는 최대 주문 수
+    BATCH_ORDER_LIMIT = 5
+
+    # 계좌 상태 조회 엔드포인트별 읽기 캐시 TTL (초)
+    # 체결 직후 여러 위젯이 같은 데이터를 동시에 조회하므로 짧게 공유, 주문/취소 시 즉시 무효화
+    READ_CACHE_TTL = {
+        "/fapi/v2/account": 1.0,
+        "/fapi/v2/balance": 1.0,
+        "/fapi/v2/positionRisk": 1.0,
+        "/fapi/v1/openOrders": 1.0,
+    }
+
+    def __init__(self, api_key, secret_key, testnet=True, base_url=None, ws_url=None):
+        """
+        base_url / ws_url: 지정하면 해당 주소로 접속 (exchange_simulator.py 등 로컬 거래소)
+        """
         self.api_key = api_key
         self.secret_key = secret_key
         self.testnet = testnet
@@ -21,9 +59,39 @@ class BinanceClient:
         else:
             self.base_url = "https://fapi.binance.com"
             self.ws_url = "wss://fstream.binance.com"
+
+        custom_endpoint = base_url is not None
+        if custom_endpoint:
+            self.base_url = base_url.rstrip('/')
+            self.ws_url = (ws_url or self.base_url.replace('http', 'ws', 1)).rstrip('/')
             
         self.session = None
         self.ws_connection = None
+
+        # 동일 GET 요청 공유 (single-flight) 및 짧은 읽기 캐시
+        self._inflight = {}
+        self._read_cache = {}
+        self._cache_generation = 0
+
+        if custom_endpoint:
+            # 로컬 거래소는 심볼/한도가 다르므로 테스트넷/실전 캐시와 분리
+            self.metadata = ExchangeMetadata(testnet, cache_path=os.path.join(CACHE_DIR, 'exchange_info_custom.json'))
+            self.rate_governor = RateGovernor()
+        else:
+            self.metadata = ExchangeMetadata.shared(testnet)
+            self.rate_governor = RateGovernor.shared(testnet)
+
+        # 시세 스트림 허브 (첫 구독 시 연결)
+        self.market_data = MarketDataHub(self)
+
+        # 사용자 데이터 스트림 (포지션/주문/잔고 실시간 상태, start() 호출 시 연결)
+        self.user_stream = UserDataStream(self)
+        self.account_state = self.user_stream.state
+
+        # 심볼별 레버리지/마진 모드 (동일 설정 재요청 생략)
+        self.symbol_settings = SymbolSettings()
+        self.account_state.symbol_settings = self.symbol_settings
+        self._settings_lock = asyncio.Lock()
         
     def _generate_signature(self, params):
         """API 서명 생성"""
@@ -34,16 +102,73 @@ class BinanceClient:
             hashlib.sha256
         ).hexdigest()
     
-    async def _make_request(self, method, endpoint, params=None, signed=False):
-        """API 요청 실행"""
+    def invalidate_read_cache(self):
+        """읽기 캐시 무효화 (주문/취소/레버리지 변경 후 호출)"""
+        self._cache_generation += 1
+        self._read_cache.clear()
+        # 진행 중인 요청은 기존 대기자에게만 결과를 돌려주고 새 호출은 다시 조회
+        self._inflight.clear()
+
+    async def _make_request(self, method, endpoint, params=None, signed=False, priority=None):
+        """
+        API 요청 실행
+
+        - GET: 같은 엔드포인트/파라미터 요청이 진행 중이면 그 결과를 함께 사용
+        - READ_CACHE_TTL에 등록된 GET은 TTL 동안 결과 재사용
+        - POST/DELETE: 상태가 바뀌므로 읽기 캐시 무효화
+        - priority: 가중치 한도 근접 시 처리 순서 (기본: 주문/취소는 최우선, 조회는 계좌 우선순위)
+        """
+        if priority is None:
+            priority = PRIORITY_ACCOUNT if method == "GET" else PRIORITY_TRADE
+
+        if method != "GET":
+            try:
+                return await self._send_request(method, endpoint, params, signed, priority)
+            finally:
+                self.invalidate_read_cache()
+
+        key = (endpoint, tuple(sorted((params or {}).items())))
+
+        ttl = self.READ_CACHE_TTL.get(endpoint)
+        if ttl:
+            cached = self._read_cache.get(key)
+            if cached and cached[0] > time.time():
+                return copy.deepcopy(cached[1])
+
+        future = self._inflight.get(key)
+        if future is None:
+            generation = self._cache_generation
+            future = asyncio.ensure_future(self._send_request(method, endpoint, params, signed, priority))
+            self._inflight[key] = future
+            try:
+                result = await asyncio.shield(future)
+            finally:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+
+            # 요청 중 주문이 발생했으면 이전 상태이므로 캐시하지 않음
+            if ttl and result is not None and generation == self._cache_generation:
+                self._read_cache[key] = (time.time() + ttl, result)
+                return copy.deepcopy(result)
+            return result
+
+        result = await asyncio.shield(future)
+        return copy.deepcopy(result)
+
+    async def _send_request(self, method, endpoint, params=None, signed=False, priority=PRIORITY_ACCOUNT):
+        """실제 HTTP 요청 (가중치/주문 수 예산 확보 후 전송)"""
+        weight = endpoint_weight(endpoint, params)
+        orders = endpoint_order_count(method, endpoint, params)
+        if not await self.rate_governor.acquire(weight, priority, orders):
+            return None
+
         if not self.session:
             self.session = aiohttp.ClientSession()
             
         url = f"{self.base_url}{endpoint}"
         headers = {"X-MBX-APIKEY": self.api_key}
         
-        if params is None:
-            params = {}
+        params = dict(params) if params else {}
             
         if signed:
             params['timestamp'] = int(time.time() * 1000)
@@ -52,6 +177,7 @@ class BinanceClient:
         try:
             if method == "GET":
                 async with self.session.get(url, params=params, headers=headers) as response:
+                    self.rate_governor.update_from_response(response.status, response.headers)
                     if response.status != 200:
                         text = await response.text()
                         print(f"❌ API 에러 [{endpoint}]: {response.status} - {text}")
@@ -60,6 +186,7 @@ class BinanceClient:
                     
             elif method == "POST":
                 async with self.session.post(url, data=params, headers=headers) as response:
+                    self.rate_governor.update_from_response(response.status, response.headers)
                     if response.status != 200:
                         text = await response.text()
                         print(f"❌ API 에러 [{endpoint}]: {response.status} - {text}")
@@ -68,6 +195,16 @@ class BinanceClient:
                     
             elif method == "DELETE":
                 async with self.session.delete(url, data=params, headers=headers) as response:
+                    self.rate_governor.update_from_response(response.status, response.headers)
+                    if response.status != 200:
+                        text = await response.text()
+                        print(f"❌ API 에러 [{endpoint}]: {response.status} - {text}")
+                        return None
+                    return await response.json()
+
+            elif method == "PUT":
+                async with self.session.put(url, data=params, headers=headers) as response:
+                    self.rate_governor.update_from_response(response.status, response.headers)
                     if response.status != 200:
                         text = await response.text()
                         print(f"❌ API 에러 [{endpoint}]: {response.status} - {text}")
@@ -126,22 +263,38 @@ class BinanceClient:
     
     async def place_order(self, symbol, side, order_type, quantity, price=None, leverage=None):
         """주문 실행"""
-        params = {
-            'symbol': symbol,
-            'side': side,
-            'type': order_type,
-            'quantity': str(quantity)
-        }
-        
-        if price and order_type == 'LIMIT':
-            params['price'] = str(price)
-            params['timeInForce'] = 'GTC'
+        params = build_order_params(symbol, side, order_type, quantity, price)
             
         if leverage:
             await self.set_leverage(symbol, leverage)
             
         return await self._make_request("POST", "/fapi/v1/order", params, signed=True)
     
+    async def place_batch_orders(self, orders):
+        """
+        여러 주문을 batchOrders로 묶어 실행 (BATCH_ORDER_LIMIT개씩)
+
+        Args:
+            orders: [{'symbol', 'side', 'order_type', 'quantity', 'price'(선택)}, ...]
+
+        Returns:
+            list: 입력 순서대로 주문 결과 dict, 실패한 주문은 {'code', 'msg'} dict (요청 자체 실패 시 None)
+        """
+        results = []
+        for i in range(0, len(orders), self.BATCH_ORDER_LIMIT):
+            chunk = orders[i:i + self.BATCH_ORDER_LIMIT]
+            batch = [build_order_params(**order) for order in chunk]
+            response = await self._make_request(
+                "POST", "/fapi/v1/batchOrders",
+                {'batchOrders': json.dumps(batch, separators=(',', ':'))},
+                signed=True
+            )
+            if isinstance(response, list) and len(response) == len(chunk):
+                results.extend(response)
+            else:
+                results.extend([None] * len(chunk))
+        return results
+
     async def cancel_order(self, symbol, order_id):
         """주문 취소"""
         params = {
@@ -150,13 +303,62 @@ class BinanceClient:
         }
         return await self._make_request("DELETE", "/fapi/v1/order", params, signed=True)
     
+    async def _ensure_symbol_settings(self):
+        """
+        레버리지/마진 모드 캐시를 positionRisk 전체 조회로 한 번 채움
+
+        - 사용자 데이터 스트림이 실제로 연결돼 있을 때만 캐시를 믿음 (앱 밖 변경은 ACCOUNT_CONFIG_UPDATE로만 알 수 있음)
+        - 끊겨 있거나 재연결 후 동기화 전이면 False → 설정 요청을 REST로 그대로 보냄
+        - 채우기 실패 시 잠시 재조회하지 않고 설정 요청을 그대로 보냄
+
+        Returns:
+            bool: 캐시로 요청 생략 여부를 판단해도 되는지
+        """
+        if not self.user_stream.connected:
+            return False
+        if self.symbol_settings.is_fresh():
+            return True
+        if not self.symbol_settings.can_seed():
+            return False
+        async with self._settings_lock:
+            if self.symbol_settings.is_fresh():
+                return True
+            positions = await self._make_request("GET", "/fapi/v2/positionRisk", signed=True)
+            if positions:
+                self.symbol_settings.load_position_risk(positions)
+                # 조회하는 동안 스트림이 끊겼으면 이후 변경을 놓칠 수 있으므로 이번 요청은 REST로 보냄
+                return self.user_stream.connected
+            self.symbol_settings.mark_seed_failed()
+            return False
+
     async def set_leverage(self, symbol, leverage):
-        """레버리지 설정"""
+        """레버리지 설정 (이미 같은 값이면 요청 생략)"""
+        if await self._ensure_symbol_settings() and self.symbol_settings.leverage_matches(symbol, leverage):
+            return {'symbol': symbol, 'leverage': int(leverage)}
+
         params = {
             'symbol': symbol,
             'leverage': int(leverage)
         }
-        return await self._make_request("POST", "/fapi/v1/leverage", params, signed=True)
+        result = await self._make_request("POST", "/fapi/v1/leverage", params, signed=True)
+        if result:
+            self.symbol_settings.set_leverage(symbol, result.get('leverage', leverage))
+        return result
+
+    async def set_margin_type(self, symbol, margin_type):
+        """마진 모드 설정 (CROSS/CROSSED/ISOLATED, 이미 같은 모드면 요청 생략)"""
+        margin_type = normalize_margin_type(margin_type)
+        if await self._ensure_symbol_settings() and self.symbol_settings.margin_type_matches(symbol, margin_type):
+            return {'code': 200, 'msg': 'unchanged'}
+
+        params = {
+            'symbol': symbol,
+            'marginType': margin_type
+        }
+        result = await self._make_request("POST", "/fapi/v1/marginType", params, signed=True)
+        if result:
+            self.symbol_settings.set_margin_type(symbol, margin_type)
+        return result
         
     async def get_order(self, symbol, order_id):
         """특정 주문 정보 조회"""
@@ -176,12 +378,12 @@ class BinanceClient:
             'symbol': symbol,
             'limit': limit
         }
-        return await self._make_request("GET", "/fapi/v1/depth", params)
+        return await self._make_request("GET", "/fapi/v1/depth", params, priority=PRIORITY_UI)
     
     async def get_ticker_price(self, symbol):
         """현재가 조회"""
         params = {'symbol': symbol}
-        return await self._make_request("GET", "/fapi/v1/ticker/price", params)
+        return await self._make_request("GET", "/fapi/v1/ticker/price", params, priority=PRIORITY_UI)
     
     async def get_ticker(self, symbol):
         """티커 정보 조회"""
@@ -194,7 +396,7 @@ class BinanceClient:
     async def get_24hr_ticker(self, symbol):
         """24시간 통계"""
         params = {'symbol': symbol}
-        return await self._make_request("GET", "/fapi/v1/ticker/24hr", params)
+        return await self._make_request("GET", "/fapi/v1/ticker/24hr", params, priority=PRIORITY_UI)
     
     def calculate_quantity(self, usdt_amount, price, leverage=1):
         """USDT 금액으로 수량 계산"""
@@ -227,42 +429,26 @@ class BinanceClient:
         except Exception as e:
             print(f"❌ 웹소켓 오류: {e}")
     
+    async def create_listen_key(self):
+        """사용자 데이터 스트림 listenKey 발급"""
+        return await self._make_request("POST", "/fapi/v1/listenKey")
+
+    async def keepalive_listen_key(self):
+        """listenKey 유효기간 연장 (60분)"""
+        return await self._make_request("PUT", "/fapi/v1/listenKey")
+
+    async def close_listen_key(self):
+        """listenKey 폐기"""
+        return await self._make_request("DELETE", "/fapi/v1/listenKey")
+
+    async def _fetch_exchange_info(self):
+        """exchangeInfo 원본 조회 (ExchangeMetadata 갱신용)"""
+        return await self._make_request("GET", "/fapi/v1/exchangeInfo")
+
     async def get_symbol_info(self, symbol):
-        """심볼 정보 조회"""
+        """심볼 정보 조회 (공용 exchangeInfo 캐시 사용)"""
         try:
-            exchange_info = await self._make_request("GET", "/fapi/v1/exchangeInfo")
-            
-            if exchange_info and 'symbols' in exchange_info:
-                for symbol_info in exchange_info['symbols']:
-                    if symbol_info['symbol'] == symbol:
-                        filters = {f['filterType']: f for f in symbol_info['filters']}
-                        
-                        result = {
-                            'symbol': symbol,
-                            'status': symbol_info['status'],
-                            'pricePrecision': symbol_info.get('pricePrecision', 2),
-                            'quantityPrecision': symbol_info.get('quantityPrecision', 3),
-                            'baseAssetPrecision': symbol_info.get('baseAssetPrecision', 8),
-                            'quotePrecision': symbol_info.get('quotePrecision', 8),
-                        }
-                        
-                        if 'LOT_SIZE' in filters:
-                            result['minQty'] = float(filters['LOT_SIZE']['minQty'])
-                            result['maxQty'] = float(filters['LOT_SIZE']['maxQty'])
-                            result['stepSize'] = float(filters['LOT_SIZE']['stepSize'])
-                        
-                        if 'PRICE_FILTER' in filters:
-                            result['minPrice'] = float(filters['PRICE_FILTER']['minPrice'])
-                            result['maxPrice'] = float(filters['PRICE_FILTER']['maxPrice'])
-                            result['tickSize'] = float(filters['PRICE_FILTER']['tickSize'])
-                        
-                        if 'MIN_NOTIONAL' in filters:
-                            result['minNotional'] = float(filters['MIN_NOTIONAL']['notional'])
-                        
-                        return result
-                        
-            return None
-            
+            return await self.metadata.get_symbol_info(symbol, self._fetch_exchange_info)
         except Exception as e:
             print(f"❌ 심볼 정보 조회 실패: {e}")
             return None
@@ -302,8 +488,9 @@ class BinanceClient:
                 quantity = abs(position_amt)
             
             try:
-                from strategy_widget import adjust_quantity_precision
-                adjusted_quantity = adjust_quantity_precision(symbol, quantity)
+                from strategy_widget import adjust_quantity_precision, fetch_symbol_precision
+                precision = await fetch_symbol_precision(self, symbol)
+                adjusted_quantity = adjust_quantity_precision(symbol, quantity, precision)
             except:
                 adjusted_quantity = round(quantity, 3)
             
@@ -320,6 +507,14 @@ class BinanceClient:
 
     async def close(self):
         """세션 안전하게 종료"""
+        try:
+            await self.user_stream.stop()
+        except:
+            pass
+        try:
+            await self.market_data.close()
+        except:
+            pass
         try:
             if self.session and not self.session.closed:
                 await self.session.close()
@@ -1,9 +1,20 @@
 import ccxt.async_support as ccxt
 import asyncio
+import json
 from decimal import Decimal, ROUND_DOWN
 
+from exchange_metadata import ExchangeMetadata
+from binance_client import build_order_params
+from symbol_settings import SymbolSettings, normalize_margin_type
+
 class CCXTBinanceClient:
-    def __init__(self, api_key, secret_key, testnet=True):
+    # batchOrders 한 번에 보낼 수 있는 최대 주문 수
+    BATCH_ORDER_LIMIT = 5
+
+    def __init__(self, api_key, secret_key, testnet=True, base_url=None):
+        """
+        base_url: 지정하면 선물(fapi) 요청을 해당 주소로 보냄 (exchange_simulator.py 등 로컬 거래소)
+        """
         self.api_key = api_key
         self.secret_key = secret_key
         self.testnet = testnet
@@ -21,7 +32,19 @@ class CCXTBinanceClient:
             'enableRateLimit': True,
         })
         
+        if base_url is not None:
+            base_url = base_url.rstrip('/')
+            for key, url in list(self.exchange.urls['api'].items()):
+                if key.startswith('fapi') and isinstance(url, str):
+                    # 'https://호스트/fapi/v1' → '{base_url}/fapi/v1'
+                    self.exchange.urls['api'][key] = f"{base_url}/{url.split('/', 3)[3]}"
+            # 현물 시장 목록은 로컬 거래소에 없으므로 선물만 로드
+            self.exchange.options['fetchMarkets'] = ['linear']
+
         print(f"CCXT 거래소 설정 완료: {self.exchange.id}")
+
+        self.metadata = ExchangeMetadata.shared(testnet)
+        self.symbol_settings = SymbolSettings()
         
     async def get_account_info(self):
         """계좌 정보 조회"""
@@ -102,8 +125,35 @@ class CCXTBinanceClient:
             print(f"CCXT 포지션 조회 오류: {e}")
             return []
     
+    # 사용자 데이터 스트림이 없으므로 앱 밖 설정 변경은 이 시간이 지나야 반영
+    SYMBOL_SETTINGS_TTL = 60
+
+    async def _ensure_symbol_settings(self):
+        """
+        레버리지/마진 모드 캐시를 positionRisk 전체 조회로 채움 (SYMBOL_SETTINGS_TTL마다 다시)
+
+        Returns:
+            bool: 캐시로 요청 생략 여부를 판단해도 되는지
+        """
+        if self.symbol_settings.is_fresh(self.SYMBOL_SETTINGS_TTL):
+            return True
+        if not self.symbol_settings.can_seed():
+            return False
+        try:
+            response = await self.exchange.fapiPrivateGetPositionRisk()
+            if response:
+                self.symbol_settings.load_position_risk(response)
+                return True
+        except Exception as e:
+            print(f"레버리지/마진 모드 조회 오류: {e}")
+        self.symbol_settings.mark_seed_failed()
+        return False
+
     async def _get_symbol_leverage(self, symbol):
-        """특정 심볼의 실제 레버리지 조회"""
+        """특정 심볼의 실제 레버리지 조회 (캐시 우선)"""
+        if await self._ensure_symbol_settings() and symbol in self.symbol_settings.leverages:
+            return float(self.symbol_settings.leverages[symbol])
+
         try:
             # 바이낸스 선물 API를 직접 호출하여 레버리지 정보 가져오기
             response = await self.exchange.fapiPrivateGetPositionRisk({
@@ -216,6 +266,31 @@ class CCXTBinanceClient:
             print(f"CCXT 주문 실행 오류: {e}")
             return None
     
+    async def place_batch_orders(self, orders):
+        """
+        여러 주문을 batchOrders로 묶어 실행 (BinanceClient.place_batch_orders와 같은 반환 형태)
+        """
+        results = []
+        for i in range(0, len(orders), self.BATCH_ORDER_LIMIT):
+            chunk = orders[i:i + self.BATCH_ORDER_LIMIT]
+            batch = []
+            for order in chunk:
+                order = dict(order)
+                order['symbol'] = order['symbol'].replace('/', '')
+                batch.append(build_order_params(**order))
+            try:
+                response = await self.exchange.fapiPrivatePostBatchOrders({
+                    'batchOrders': json.dumps(batch, separators=(',', ':'))
+                })
+                if isinstance(response, list) and len(response) == len(chunk):
+                    results.extend(response)
+                    continue
+                print(f"CCXT 일괄 주문 응답 형식 오류: {response}")
+            except Exception as e:
+                print(f"CCXT 일괄 주문 오류: {e}")
+            results.extend([None] * len(chunk))
+        return results
+
     async def cancel_order(self, symbol, order_id):
         """주문 취소"""
         try:
@@ -231,19 +306,45 @@ class CCXTBinanceClient:
             return None
     
     async def set_leverage(self, symbol, leverage):
-        """레버리지 설정"""
+        """레버리지 설정 (이미 같은 값이면 요청 생략)"""
         try:
+            symbol_clean = symbol.replace('/', '')
+            if await self._ensure_symbol_settings() and self.symbol_settings.leverage_matches(symbol_clean, leverage):
+                return True
+
             # 심볼 형태 변환
             if '/' not in symbol:
                 symbol = symbol[:-4] + '/' + symbol[-4:]
                 
             await self.exchange.set_leverage(leverage, symbol)
+            self.symbol_settings.set_leverage(symbol_clean, leverage)
             print(f"레버리지 설정 완료: {symbol} -> {leverage}x")
             return True
             
         except Exception as e:
             print(f"CCXT 레버리지 설정 오류: {e}")
             return False
+
+    async def set_margin_type(self, symbol, margin_type):
+        """마진 모드 설정 (CROSS/CROSSED/ISOLATED, 이미 같은 모드면 요청 생략)"""
+        try:
+            symbol_clean = symbol.replace('/', '')
+            margin_type = normalize_margin_type(margin_type)
+            if await self._ensure_symbol_settings() and self.symbol_settings.margin_type_matches(symbol_clean, margin_type):
+                return True
+
+            # 심볼 형태 변환
+            if '/' not in symbol:
+                symbol = symbol[:-4] + '/' + symbol[-4:]
+
+            await self.exchange.set_margin_mode('cross' if margin_type == 'CROSSED' else 'isolated', symbol)
+            self.symbol_settings.set_margin_type(symbol_clean, margin_type)
+            print(f"마진 모드 설정 완료: {symbol} -> {margin_type}")
+            return True
+
+        except Exception as e:
+            print(f"CCXT 마진 모드 설정 오류: {e}")
+            return False
     
     async def get_orderbook(self, symbol, limit=20):
         """호가창 조회"""
@@ -304,6 +405,18 @@ class CCXTBinanceClient:
             print(f"CCXT 24시간 통계 조회 오류: {e}")
             return None
     
+    async def _fetch_exchange_info(self):
+        """exchangeInfo 원본 조회 (ExchangeMetadata 갱신용)"""
+        return await self.exchange.fapiPublicGetExchangeInfo()
+
+    async def get_symbol_info(self, symbol):
+        """심볼 정보 조회 (공용 exchangeInfo 캐시 사용)"""
+        try:
+            return await self.metadata.get_symbol_info(symbol.replace('/', ''), self._fetch_exchange_info)
+        except Exception as e:
+            print(f"CCXT 심볼 정보 조회 오류: {e}")
+            return None
+
     def calculate_quantity(self, usdt_amount, price, leverage=1):
         """USDT 금액으로 수량 계산"""
         try:
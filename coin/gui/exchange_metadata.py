@@ -0,0 +1,176 @@
+# exchange_metadata.py - 바이낸스 선물 exchangeInfo 공용 캐시
+"""
+심볼별 거래 규칙(LOT_SIZE, PRICE_FILTER, MIN_NOTIONAL, 정밀도)을 한 곳에서 관리
+
+- exchangeInfo 전체 문서는 한 번만 받아 심볼별 dict로 색인 (조회는 O(1))
+- TTL이 지나면 다음 조회 시 갱신, 갱신 실패 시 기존 데이터 유지
+- 색인 결과를 디스크에 저장해 재시작 시 네트워크 없이 바로 사용
+- BinanceClient / CCXTBinanceClient가 테스트넷/실전별 인스턴스를 공유
+"""
+
+import asyncio
+import json
+import os
+import time
+
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+
+
+def parse_symbol_info(symbol_info):
+    """exchangeInfo의 심볼 항목을 get_symbol_info() 반환 형태로 변환"""
+    filters = {f['filterType']: f for f in symbol_info.get('filters', [])}
+
+    result = {
+        'symbol': symbol_info['symbol'],
+        'status': symbol_info.get('status'),
+        'pricePrecision': int(symbol_info.get('pricePrecision', 2)),
+        'quantityPrecision': int(symbol_info.get('quantityPrecision', 3)),
+        'baseAssetPrecision': int(symbol_info.get('baseAssetPrecision', 8)),
+        'quotePrecision': int(symbol_info.get('quotePrecision', 8)),
+    }
+
+    if 'LOT_SIZE' in filters:
+        result['minQty'] = float(filters['LOT_SIZE']['minQty'])
+        result['maxQty'] = float(filters['LOT_SIZE']['maxQty'])
+        result['stepSize'] = float(filters['LOT_SIZE']['stepSize'])
+
+    if 'MARKET_LOT_SIZE' in filters:
+        result['marketMinQty'] = float(filters['MARKET_LOT_SIZE']['minQty'])
+        result['marketMaxQty'] = float(filters['MARKET_LOT_SIZE']['maxQty'])
+
+    if 'PRICE_FILTER' in filters:
+        result['minPrice'] = float(filters['PRICE_FILTER']['minPrice'])
+        result['maxPrice'] = float(filters['PRICE_FILTER']['maxPrice'])
+        result['tickSize'] = float(filters['PRICE_FILTER']['tickSize'])
+
+    if 'MIN_NOTIONAL' in filters:
+        min_notional = filters['MIN_NOTIONAL'].get('notional', filters['MIN_NOTIONAL'].get('minNotional'))
+        if min_notional is not None:
+            result['minNotional'] = float(min_notional)
+
+    return result
+
+
+class ExchangeMetadata:
+    """테스트넷/실전별 exchangeInfo 색인 (ExchangeMetadata.shared()로 공유 인스턴스 사용)"""
+
+    _instances = {}
+
+    # 색인에 없는 심볼을 요청받았을 때 신규 상장일 수 있으므로 재조회하는 최소 간격
+    MISSING_SYMBOL_REFRESH_INTERVAL = 300
+
+    def __init__(self, testnet=True, ttl=3600, cache_path=None):
+        self.testnet = testnet
+        self.ttl = ttl
+        mode = 'testnet' if testnet else 'live'
+        self.cache_path = cache_path or os.path.join(CACHE_DIR, f'exchange_info_{mode}.json')
+
+        self.symbols = {}
+        self.fetched_at = 0.0
+        self._lock = asyncio.Lock()
+
+        self._load_from_disk()
+
+    @classmethod
+    def shared(cls, testnet=True):
+        """모드별 공유 인스턴스 반환"""
+        key = bool(testnet)
+        if key not in cls._instances:
+            cls._instances[key] = cls(testnet=key)
+        return cls._instances[key]
+
+    # ---------- 디스크 캐시 ----------
+    def _load_from_disk(self):
+        try:
+            if not os.path.exists(self.cache_path):
+                return
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.symbols = data.get('symbols', {})
+            self.fetched_at = float(data.get('fetched_at', 0))
+            print(f"📦 exchangeInfo 디스크 캐시 로드: {len(self.symbols)}개 심볼")
+        except Exception as e:
+            print(f"⚠️ exchangeInfo 디스크 캐시 로드 실패 (무시): {e}")
+            self.symbols = {}
+            self.fetched_at = 0.0
+
+    def _save_to_disk(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'fetched_at': self.fetched_at, 'symbols': self.symbols}, f)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            print(f"⚠️ exchangeInfo 디스크 캐시 저장 실패 (무시): {e}")
+
+    # ---------- 갱신 ----------
+    def is_stale(self):
+        return not self.symbols or (time.time() - self.fetched_at) > self.ttl
+
+    async def refresh(self, fetcher):
+        """
+        exchangeInfo를 다시 받아 색인
+
+        Args:
+            fetcher: exchangeInfo 원본 dict를 반환하는 코루틴 함수
+        """
+        async with self._lock:
+            return await self._refresh_unlocked(fetcher)
+
+    async def ensure_fresh(self, fetcher):
+        """TTL이 지났으면 갱신 (동시에 여러 곳에서 호출해도 한 번만 요청)"""
+        if not self.is_stale():
+            return
+        async with self._lock:
+            # 잠금을 기다리는 동안 다른 호출이 이미 갱신했으면 생략
+            if self.is_stale():
+                await self._refresh_unlocked(fetcher)
+
+    async def _refresh_unlocked(self, fetcher):
+        try:
+            exchange_info = await fetcher()
+            if not exchange_info or 'symbols' not in exchange_info:
+                print("⚠️ exchangeInfo 응답 없음 - 기존 캐시 유지")
+                return False
+
+            symbols = {}
+            for symbol_info in exchange_info['symbols']:
+                try:
+                    parsed = parse_symbol_info(symbol_info)
+                    symbols[parsed['symbol']] = parsed
+                except (KeyError, TypeError, ValueError):
+                    continue
+
+            self.symbols = symbols
+            self.fetched_at = time.time()
+            self._save_to_disk()
+            print(f"✅ exchangeInfo 갱신: {len(symbols)}개 심볼")
+            return True
+
+        except Exception as e:
+            print(f"❌ exchangeInfo 갱신 실패 - 기존 캐시 유지: {e}")
+            return False
+
+    # ---------- 조회 ----------
+    async def get_symbol_info(self, symbol, fetcher):
+        """심볼 정보 조회 (필요 시 갱신)"""
+        await self.ensure_fresh(fetcher)
+
+        info = self.symbols.get(symbol)
+        if info is None and time.time() - self.fetched_at > self.MISSING_SYMBOL_REFRESH_INTERVAL:
+            await self.refresh(fetcher)
+            info = self.symbols.get(symbol)
+        return info
+
+    def get_cached(self, symbol):
+        """네트워크 없이 현재 색인에서만 조회"""
+        return self.symbols.get(symbol)
+
+    def precision_map(self):
+        """{심볼: {'price': 가격 정밀도, 'quantity': 수량 정밀도}}"""
+        return {
+            symbol: {'price': info['pricePrecision'], 'quantity': info['quantityPrecision']}
+            for symbol, info in self.symbols.items()
+        }
@@ -0,0 +1,940 @@
+# exchange_simulator.py - 바이낸스 선물 오프라인 시뮬레이터
+"""
+실제 테스트넷 없이 BinanceClient / CCXTBinanceClient / 자동매매 주문 경로를 실행해보기 위한 로컬 거래소
+
+- REST: exchangeInfo, depth, ticker, order(생성/조회/취소), batchOrders, openOrders,
+  positionRisk, balance, account, userTrades, leverage, marginType, listenKey
+- 웹소켓: /stream (combined stream, SUBSCRIBE/UNSUBSCRIBE, depth/ticker)
+          /ws/{listenKey} (ACCOUNT_UPDATE, ORDER_TRADE_UPDATE, ACCOUNT_CONFIG_UPDATE)
+- MatchingModel로 체결 지연, 슬리피지, 분할 체결, 주문 거부 비율 설정
+- SimulatorConfig로 응답 지연/지터, 분당 가중치 한도(429 + Retry-After), 무작위 429 주입 설정
+
+단독 실행:
+    python exchange_simulator.py --port 8765 --latency 0.02 --fill-delay 0.05
+
+클라이언트 연결:
+    BinanceClient(api_key, secret_key, base_url="http://127.0.0.1:8765", ws_url="ws://127.0.0.1:8765")
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import math
+import random
+import time
+from urllib.parse import parse_qsl
+
+from aiohttp import web, WSMsgType
+
+from rate_limiter import endpoint_weight
+
+
+# 심볼: (초기가격, 가격 단위, 수량 단위, 가격 정밀도, 수량 정밀도)
+DEFAULT_SYMBOLS = {
+    'BTCUSDT': (60000.0, 0.1, 0.001, 1, 3),
+    'ETHUSDT': (3000.0, 0.01, 0.001, 2, 3),
+    'BNBUSDT': (550.0, 0.01, 0.01, 2, 2),
+    'SOLUSDT': (150.0, 0.01, 1, 2, 0),
+    'XRPUSDT': (0.6, 0.0001, 0.1, 4, 1),
+    'DOGEUSDT': (0.15, 0.00001, 1, 5, 0),
+    'ADAUSDT': (0.45, 0.0001, 1, 4, 0),
+    '1000PEPEUSDT': (0.012, 0.0000001, 1, 7, 0),
+}
+
+TAKER_FEE = 0.0004
+MAKER_FEE = 0.0002
+DEPTH_LEVELS = 20
+
+
+class MatchingModel:
+    """
+    체결 방식 설정
+
+    Args:
+        fill_delay: 주문 수락 후 체결까지 지연(초), 0이면 응답에 바로 FILLED 반영
+        slippage_bps: 시장가 체결 시 불리한 방향 슬리피지 (bp)
+        partial_fills: 시장가 주문을 나눠 체결할 조각 수
+        reject_rate: 증거금 부족(-2019)으로 거부할 주문 비율
+    """
+
+    def __init__(self, fill_delay=0.0, slippage_bps=1.0, partial_fills=1, reject_rate=0.0):
+        self.fill_delay = fill_delay
+        self.slippage_bps = slippage_bps
+        self.partial_fills = max(1, int(partial_fills))
+        self.reject_rate = reject_rate
+
+    def market_price(self, mark_price, side):
+        slip = mark_price * self.slippage_bps / 10000
+        return mark_price + slip if side == 'BUY' else mark_price - slip
+
+    @staticmethod
+    def limit_crosses(side, limit_price, mark_price):
+        return limit_price >= mark_price if side == 'BUY' else limit_price <= mark_price
+
+
+class SimulatorConfig:
+    """
+    네트워크/요청 제한 설정
+
+    Args:
+        latency / jitter: 모든 REST 응답 지연 (초, latency + U(0, jitter))
+        weight_limit / order_limit: 분당 가중치 / 주문 수 한도 (초과 시 429)
+        rate_limit_rate: 한도와 무관하게 429를 돌려줄 요청 비율
+        retry_after: 429 응답의 Retry-After (초)
+        volatility: 틱당 가격 변동 표준편차 (비율)
+        tick_interval: 가격/호가 갱신 및 스트림 전송 간격 (초)
+        secret_key: 지정하면 서명 검증 (-1022)
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, weight_limit=2400, order_limit=1200,
+                 rate_limit_rate=0.0, retry_after=1, volatility=0.0005, tick_interval=0.1,
+                 secret_key=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.weight_limit = weight_limit
+        self.order_limit = order_limit
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.volatility = volatility
+        self.tick_interval = tick_interval
+        self.secret_key = secret_key
+
+
+class ApiError(Exception):
+    def __init__(self, code, msg, status=400):
+        super().__init__(msg)
+        self.code = code
+        self.msg = msg
+        self.status = status
+
+
+def _fmt(value, precision=8):
+    return f"{value:.{precision}f}".rstrip('0').rstrip('.') or '0'
+
+
+class SimulatedExchange:
+    """시뮬레이터 상태 (가격, 호가, 포지션, 주문, 잔고) 및 aiohttp 앱"""
+
+    def __init__(self, symbols=None, matching=None, config=None, balance=10000.0, seed=None):
+        self.matching = matching or MatchingModel()
+        self.config = config or SimulatorConfig()
+        self.random = random.Random(seed)
+
+        self.symbols = {}
+        for symbol, (price, tick, step, price_precision, qty_precision) in (symbols or DEFAULT_SYMBOLS).items():
+            self.symbols[symbol] = {
+                'price': price, 'open': price, 'volume': 0.0, 'quote_volume': 0.0,
+                'tick': tick, 'step': step,
+                'price_precision': price_precision, 'qty_precision': qty_precision,
+                'bids': {}, 'asks': {}, 'update_id': 1,
+            }
+            self._rebuild_book(symbol)
+
+        self.wallet_balance = balance
+        self.positions = {s: {'amt': 0.0, 'entry': 0.0, 'leverage': 20, 'margin_type': 'CROSSED'} for s in self.symbols}
+        self.orders = {}
+        self.trades = []
+        self._order_ids = iter(range(1000001, 10 ** 12))
+        self._trade_ids = iter(range(5000001, 10 ** 12))
+
+        self.listen_keys = {}
+        self._user_sockets = {}
+        self._market_sockets = {}
+
+        self._window_minute = int(time.time() // 60)
+        self._used_weight = 0
+        self._order_count = 0
+        self._blocked_until = 0.0
+
+        self.stats = {'requests': 0, 'rate_limited': 0, 'orders': 0, 'fills': 0, 'rejected': 0}
+
+        self._runner = None
+        self._ticker_task = None
+        self._fill_tasks = set()
+
+    # ---------- 앱 / 서버 ----------
+    def build_app(self):
+        app = web.Application(middlewares=[self._middleware])
+        routes = [
+            ('GET', '/fapi/v1/ping', self.handle_ping),
+            ('GET', '/fapi/v1/time', self.handle_time),
+            ('GET', '/fapi/v1/exchangeInfo', self.handle_exchange_info),
+            ('GET', '/fapi/v1/depth', self.handle_depth),
+            ('GET', '/fapi/v1/ticker/price', self.handle_ticker_price),
+            ('GET', '/fapi/v1/ticker/24hr', self.handle_ticker_24hr),
+            ('POST', '/fapi/v1/order', self.handle_new_order),
+            ('GET', '/fapi/v1/order', self.handle_get_order),
+            ('DELETE', '/fapi/v1/order', self.handle_cancel_order),
+            ('POST', '/fapi/v1/batchOrders', self.handle_batch_orders),
+            ('GET', '/fapi/v1/openOrders', self.handle_open_orders),
+            ('GET', '/fapi/v1/userTrades', self.handle_user_trades),
+            ('GET', '/fapi/v2/positionRisk', self.handle_position_risk),
+            ('GET', '/fapi/v2/balance', self.handle_balance),
+            ('GET', '/fapi/v2/account', self.handle_account),
+            ('POST', '/fapi/v1/leverage', self.handle_leverage),
+            ('POST', '/fapi/v1/marginType', self.handle_margin_type),
+            ('POST', '/fapi/v1/listenKey', self.handle_create_listen_key),
+            ('PUT', '/fapi/v1/listenKey', self.handle_keepalive_listen_key),
+            ('DELETE', '/fapi/v1/listenKey', self.handle_close_listen_key),
+            ('GET', '/stream', self.handle_market_ws),
+            ('GET', '/ws/{listen_key}', self.handle_user_ws),
+        ]
+        for method, path, handler in routes:
+            app.router.add_route(method, path, handler)
+        return app
+
+    async def start(self, host='127.0.0.1', port=8765):
+        """서버 시작 (port=0이면 빈 포트 사용) 후 base_url 반환"""
+        self._runner = web.AppRunner(self.build_app())
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        port = self._runner.addresses[0][1]
+        self._ticker_task = asyncio.create_task(self._ticker_loop())
+        print(f"🧪 거래소 시뮬레이터 시작: http://{host}:{port} ({len(self.symbols)}개 심볼)")
+        return f"http://{host}:{port}"
+
+    async def stop(self):
+        if self._ticker_task is not None:
+            self._ticker_task.cancel()
+            self._ticker_task = None
+        for task in list(self._fill_tasks):
+            task.cancel()
+        for ws in list(self._market_sockets) + [ws for sockets in self._user_sockets.values() for ws in sockets]:
+            await ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    # ---------- 요청 공통 처리 ----------
+    @web.middleware
+    async def _middleware(self, request, handler):
+        if request.path in ('/stream',) or request.path.startswith('/ws/'):
+            return await handler(request)
+
+        self.stats['requests'] += 1
+        delay = self.config.latency + self.random.uniform(0, self.config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        params = await self._read_params(request)
+        request['params'] = params
+
+        self._roll_window()
+        weight = endpoint_weight(request.path, params)
+        is_order = request.method == 'POST' and request.path in ('/fapi/v1/order', '/fapi/v1/batchOrders')
+
+        now = time.time()
+        limited = (
+            now < self._blocked_until
+            or self._used_weight + weight > self.config.weight_limit
+            or (is_order and self._order_count + 1 > self.config.order_limit)
+            or self.random.random() < self.config.rate_limit_rate
+        )
+        if limited:
+            self.stats['rate_limited'] += 1
+            self._blocked_until = max(self._blocked_until, now + self.config.retry_after)
+            response = web.json_response(
+                {'code': -1003, 'msg': 'Too many requests; current limit is exceeded.'}, status=429
+            )
+            response.headers['Retry-After'] = str(self.config.retry_after)
+            return self._with_usage_headers(response)
+
+        self._used_weight += weight
+        if is_order:
+            self._order_count += 1
+
+        try:
+            if request.path != '/fapi/v1/listenKey':
+                self._check_signature(request)
+            response = await handler(request)
+        except ApiError as e:
+            response = web.json_response({'code': e.code, 'msg': e.msg}, status=e.status)
+        return self._with_usage_headers(response)
+
+    async def _read_params(self, request):
+        """쿼리스트링/폼 본문 파라미터 (서명 검증용 원문은 request['raw']에 보관)"""
+        raw = request.query_string
+        if request.method in ('POST', 'PUT', 'DELETE') and request.can_read_body:
+            raw = await request.text()
+        request['raw'] = raw
+        return dict(parse_qsl(raw, keep_blank_values=True))
+
+    def _check_signature(self, request):
+        params = request['params']
+        if not self.config.secret_key:
+            return
+        if 'signature' not in params:
+            if 'timestamp' in params:
+                raise ApiError(-1102, "Mandatory parameter 'signature' was not sent, was empty/null, or malformed.")
+            return
+        payload = request['raw'].split('&signature=')[0]
+        expected = hmac.new(self.config.secret_key.encode(), payload.encode(), hashlib.sha256).hexdigest()
+        if expected != params['signature']:
+            raise ApiError(-1022, 'Signature for this request is not valid.')
+
+    def _roll_window(self):
+        minute = int(time.time() // 60)
+        if minute != self._window_minute:
+            self._window_minute = minute
+            self._used_weight = 0
+            self._order_count = 0
+
+    def _with_usage_headers(self, response):
+        response.headers['X-MBX-USED-WEIGHT-1M'] = str(self._used_weight)
+        response.headers['X-MBX-ORDER-COUNT-1M'] = str(self._order_count)
+        return response
+
+    def _symbol(self, params, required=True):
+        symbol = params.get('symbol')
+        if symbol is None:
+            if required:
+                raise ApiError(-1102, "Mandatory parameter 'symbol' was not sent, was empty/null, or malformed.")
+            return None
+        if symbol not in self.symbols:
+            raise ApiError(-1121, 'Invalid symbol.')
+        return symbol
+
+    # ---------- 시장 데이터 ----------
+    def _rebuild_book(self, symbol):
+        """현재가 주변으로 호가 재생성 (바뀐 단계 반환: [(side, price, qty)])"""
+        s = self.symbols[symbol]
+        tick = s['tick']
+        mid = round(s['price'] / tick) * tick
+        bids = {round(mid - tick * (i + 1), 10): round(self.random.uniform(1, 50) * s['step'] * 10, 10) for i in range(DEPTH_LEVELS)}
+        asks = {round(mid + tick * (i + 1), 10): round(self.random.uniform(1, 50) * s['step'] * 10, 10) for i in range(DEPTH_LEVELS)}
+
+        changes = []
+        for side, old, new in (('b', s['bids'], bids), ('a', s['asks'], asks)):
+            for price in old.keys() - new.keys():
+                changes.append((side, price, 0.0))
+            for price, qty in new.items():
+                if old.get(price) != qty:
+                    changes.append((side, price, qty))
+
+        s['bids'], s['asks'] = bids, asks
+        return changes
+
+    async def _ticker_loop(self):
+        """가격 랜덤워크, 호가 갱신, 지정가 체결 확인, 시세 스트림 전송"""
+        while True:
+            await asyncio.sleep(self.config.tick_interval)
+            try:
+                now_ms = int(time.time() * 1000)
+                for symbol, s in self.symbols.items():
+                    s['price'] *= math.exp(self.random.gauss(0, self.config.volatility))
+                    changes = self._rebuild_book(symbol)
+                    prev_id = s['update_id']
+                    s['update_id'] += 1
+
+                    self._match_resting_orders(symbol)
+
+                    prefix = symbol.lower()
+                    self._broadcast_market(f"{prefix}@depth@100ms", {
+                        'e': 'depthUpdate', 'E': now_ms, 'T': now_ms, 's': symbol,
+                        'U': s['update_id'], 'u': s['update_id'], 'pu': prev_id,
+                        'b': [[_fmt(p), _fmt(q)] for side, p, q in changes if side == 'b'],
+                        'a': [[_fmt(p), _fmt(q)] for side, p, q in changes if side == 'a'],
+                    })
+                    self._broadcast_market(f"{prefix}@ticker", self._ticker_event(symbol, now_ms))
+            except Exception as e:
+                print(f"⚠️ 시뮬레이터 틱 처리 오류: {e}")
+
+    def _ticker_event(self, symbol, now_ms):
+        s = self.symbols[symbol]
+        change = s['price'] - s['open']
+        return {
+            'e': '24hrTicker', 'E': now_ms, 's': symbol,
+            'p': _fmt(change), 'P': _fmt(change / s['open'] * 100, 3),
+            'c': _fmt(s['price'], s['price_precision']), 'o': _fmt(s['open'], s['price_precision']),
+            'v': _fmt(s['volume']), 'q': _fmt(s['quote_volume'], 2),
+        }
+
+    def _broadcast_market(self, stream, data):
+        message = None
+        for ws, streams in list(self._market_sockets.items()):
+            if stream in streams and not ws.closed:
+                message = message or json.dumps({'stream': stream, 'data': data})
+                asyncio.ensure_future(self._safe_send(ws, message))
+
+    @staticmethod
+    async def _safe_send(ws, message):
+        try:
+            await ws.send_str(message)
+        except Exception:
+            pass
+
+    async def handle_ping(self, request):
+        return web.json_response({})
+
+    async def handle_time(self, request):
+        return web.json_response({'serverTime': int(time.time() * 1000)})
+
+    async def handle_exchange_info(self, request):
+        symbols = []
+        for symbol, s in self.symbols.items():
+            symbols.append({
+                'symbol': symbol,
+                'status': 'TRADING',
+                'contractType': 'PERPETUAL',
+                'baseAsset': symbol[:-4],
+                'quoteAsset': 'USDT',
+                'marginAsset': 'USDT',
+                'pricePrecision': s['price_precision'],
+                'quantityPrecision': s['qty_precision'],
+                'baseAssetPrecision': 8,
+                'quotePrecision': 8,
+                'filters': [
+                    {'filterType': 'PRICE_FILTER', 'minPrice': _fmt(s['tick']), 'maxPrice': '1000000', 'tickSize': _fmt(s['tick'])},
+                    {'filterType': 'LOT_SIZE', 'minQty': _fmt(s['step']), 'maxQty': '1000000', 'stepSize': _fmt(s['step'])},
+                    {'filterType': 'MARKET_LOT_SIZE', 'minQty': _fmt(s['step']), 'maxQty': '100000', 'stepSize': _fmt(s['step'])},
+                    {'filterType': 'MIN_NOTIONAL', 'notional': '5'},
+                ],
+            })
+        return web.json_response({
+            'timezone': 'UTC',
+            'serverTime': int(time.time() * 1000),
+            'rateLimits': [
+                {'rateLimitType': 'REQUEST_WEIGHT', 'interval': 'MINUTE', 'intervalNum': 1, 'limit': self.config.weight_limit},
+                {'rateLimitType': 'ORDERS', 'interval': 'MINUTE', 'intervalNum': 1, 'limit': self.config.order_limit},
+            ],
+            'symbols': symbols,
+        })
+
+    async def handle_depth(self, request):
+        params = request['params']
+        symbol = self._symbol(params)
+        limit = int(params.get('limit', 500))
+        s = self.symbols[symbol]
+        return web.json_response({
+            'lastUpdateId': s['update_id'],
+            'E': int(time.time() * 1000),
+            'bids': [[_fmt(p), _fmt(q)] for p, q in sorted(s['bids'].items(), reverse=True)[:limit]],
+            'asks': [[_fmt(p), _fmt(q)] for p, q in sorted(s['asks'].items())[:limit]],
+        })
+
+    async def handle_ticker_price(self, request):
+        symbol = self._symbol(request['params'], required=False)
+        now_ms = int(time.time() * 1000)
+        tickers = [
+            {'symbol': sym, 'price': _fmt(s['price'], s['price_precision']), 'time': now_ms}
+            for sym, s in self.symbols.items() if symbol in (None, sym)
+        ]
+        return web.json_response(tickers[0] if symbol else tickers)
+
+    async def handle_ticker_24hr(self, request):
+        symbol = self._symbol(request['params'], required=False)
+        now_ms = int(time.time() * 1000)
+        tickers = []
+        for sym in self.symbols:
+            if symbol not in (None, sym):
+                continue
+            event = self._ticker_event(sym, now_ms)
+            tickers.append({
+                'symbol': sym, 'priceChange': event['p'], 'priceChangePercent': event['P'],
+                'lastPrice': event['c'], 'openPrice': event['o'],
+                'volume': event['v'], 'quoteVolume': event['q'], 'closeTime': now_ms,
+            })
+        return web.json_response(tickers[0] if symbol else tickers)
+
+    # ---------- 주문 ----------
+    def _validate_order(self, params):
+        symbol = self._symbol(params)
+        side = params.get('side')
+        order_type = params.get('type')
+        if side not in ('BUY', 'SELL'):
+            raise ApiError(-1117, 'Invalid side.')
+        if order_type not in ('MARKET', 'LIMIT'):
+            raise ApiError(-1116, 'Invalid orderType.')
+
+        s = self.symbols[symbol]
+        try:
+            quantity = float(params['quantity'])
+        except (KeyError, ValueError):
+            raise ApiError(-1102, "Mandatory parameter 'quantity' was not sent, was empty/null, or malformed.")
+        steps = quantity / s['step']
+        if quantity <= 0 or abs(steps - round(steps)) > 1e-6:
+            raise ApiError(-1111, 'Precision is over the maximum defined for this asset.')
+
+        price = None
+        if order_type == 'LIMIT':
+            try:
+                price = float(params['price'])
+            except (KeyError, ValueError):
+                raise ApiError(-1102, "Mandatory parameter 'price' was not sent, was empty/null, or malformed.")
+
+        notional = quantity * (price or s['price'])
+        if notional < 5:
+            raise ApiError(-4164, "Order's notional must be no smaller than 5 (unless you choose reduce only).")
+
+        if self.random.random() < self.matching.reject_rate:
+            raise ApiError(-2019, 'Margin is insufficient.')
+
+        return symbol, side, order_type, quantity, price
+
+    def _create_order(self, params):
+        symbol, side, order_type, quantity, price = self._validate_order(params)
+        now_ms = int(time.time() * 1000)
+        order_id = next(self._order_ids)
+        order = {
+            'orderId': order_id,
+            'symbol': symbol,
+            'status': 'NEW',
+            'clientOrderId': params.get('newClientOrderId') or f"sim{order_id}",
+            'price': _fmt(price or 0),
+            'avgPrice': '0',
+            'origQty': _fmt(quantity),
+            'executedQty': '0',
+            'cumQuote': '0',
+            'timeInForce': params.get('timeInForce', 'GTC'),
+            'type': order_type,
+            'origType': order_type,
+            'reduceOnly': False,
+            'side': side,
+            'positionSide': 'BOTH',
+            'stopPrice': '0',
+            'time': now_ms,
+            'updateTime': now_ms,
+            '_commission': 0.0,
+        }
+        self.orders[order_id] = order
+        self.stats['orders'] += 1
+        self._emit_order_event(order, 'NEW')
+
+        mark = self.symbols[symbol]['price']
+        if order_type == 'MARKET' or MatchingModel.limit_crosses(side, price, mark):
+            if self.matching.fill_delay > 0:
+                self._schedule_fill(order_id, self.matching.fill_delay)
+            else:
+                self._fill_order(order)
+        return order
+
+    def _schedule_fill(self, order_id, delay):
+        async def fill_later():
+            await asyncio.sleep(delay)
+            order = self.orders.get(order_id)
+            if order and order['status'] in ('NEW', 'PARTIALLY_FILLED'):
+                self._fill_order(order)
+
+        task = asyncio.ensure_future(fill_later())
+        self._fill_tasks.add(task)
+        task.add_done_callback(self._fill_tasks.discard)
+
+    def _match_resting_orders(self, symbol):
+        mark = self.symbols[symbol]['price']
+        for order in list(self.orders.values()):
+            if (order['symbol'] == symbol and order['type'] == 'LIMIT'
+                    and order['status'] in ('NEW', 'PARTIALLY_FILLED')
+                    and MatchingModel.limit_crosses(order['side'], float(order['price']), mark)):
+                self._fill_order(order, maker=True)
+
+    def _fill_order(self, order, maker=False):
+        """주문 체결 (분할 체결 시 조각마다 이벤트 전송)"""
+        s = self.symbols[order['symbol']]
+        total = float(order['origQty'])
+        executed = float(order['executedQty'])
+        remaining = total - executed
+        if remaining <= 0:
+            return
+
+        if order['type'] == 'LIMIT':
+            fill_price = float(order['price'])
+        else:
+            fill_price = self.matching.market_price(s['price'], order['side'])
+        fill_price = round(fill_price / s['tick']) * s['tick']
+
+        pieces = self.matching.partial_fills if order['type'] == 'MARKET' else 1
+        step = s['step']
+        chunk = max(step, math.floor(remaining / pieces / step) * step)
+
+        while remaining > step * 1e-6:
+            qty = min(chunk, remaining) if pieces > 1 else remaining
+            qty = round(qty, s['qty_precision'])
+            remaining = round(remaining - qty, s['qty_precision'])
+
+            fee = qty * fill_price * (MAKER_FEE if maker else TAKER_FEE)
+            realized = self._apply_fill(order['symbol'], order['side'], qty, fill_price)
+            self.wallet_balance += realized - fee
+
+            prev_quote = float(order['cumQuote'])
+            executed += qty
+            order['executedQty'] = _fmt(executed)
+            order['cumQuote'] = _fmt(prev_quote + qty * fill_price)
+            order['avgPrice'] = _fmt((prev_quote + qty * fill_price) / executed)
+            order['status'] = 'FILLED' if remaining <= step * 1e-6 else 'PARTIALLY_FILLED'
+            order['updateTime'] = int(time.time() * 1000)
+            order['_commission'] += fee
+
+            s['volume'] += qty
+            s['quote_volume'] += qty * fill_price
+
+            trade = {
+                'id': next(self._trade_ids),
+                'orderId': order['orderId'],
+                'symbol': order['symbol'],
+                'side': order['side'],
+                'price': _fmt(fill_price),
+                'qty': _fmt(qty),
+                'quoteQty': _fmt(qty * fill_price),
+                'realizedPnl': _fmt(realized),
+                'commission': _fmt(fee),
+                'commissionAsset': 'USDT',
+                'maker': maker,
+                'buyer': order['side'] == 'BUY',
+                'positionSide': 'BOTH',
+                'time': order['updateTime'],
+            }
+            self.trades.append(trade)
+            self.stats['fills'] += 1
+
+            self._emit_order_event(order, 'TRADE', last_qty=qty, last_price=fill_price, fee=fee, realized=realized, maker=maker)
+            self._emit_account_update(order['symbol'], 'ORDER')
+
+    def _apply_fill(self, symbol, side, qty, price):
+        """단방향 모드 포지션 반영, 실현손익 반환"""
+        pos = self.positions[symbol]
+        signed_qty = qty if side == 'BUY' else -qty
+        amt = pos['amt']
+        realized = 0.0
+
+        if amt == 0 or (amt > 0) == (signed_qty > 0):
+            new_amt = amt + signed_qty
+            pos['entry'] = (abs(amt) * pos['entry'] + qty * price) / abs(new_amt)
+            pos['amt'] = new_amt
+            return realized
+
+        closing = min(abs(amt), qty)
+        realized = closing * (price - pos['entry']) * (1 if amt > 0 else -1)
+        new_amt = amt + signed_qty
+        if abs(new_amt) < 1e-12:
+            pos['amt'], pos['entry'] = 0.0, 0.0
+        elif (new_amt > 0) == (amt > 0):
+            pos['amt'] = new_amt
+        else:
+            # 반대 방향으로 넘어가면 남은 수량으로 새 포지션
+            pos['amt'], pos['entry'] = new_amt, price
+        return realized
+
+    def _order_response(self, order):
+        return {k: v for k, v in order.items() if not k.startswith('_')}
+
+    async def handle_new_order(self, request):
+        order = self._create_order(request['params'])
+        return web.json_response(self._order_response(order))
+
+    async def handle_batch_orders(self, request):
+        try:
+            batch = json.loads(request['params'].get('batchOrders', '[]'))
+        except ValueError:
+            raise ApiError(-1130, 'Data sent for parameter batchOrders is not valid.')
+        if not batch or len(batch) > 5:
+            raise ApiError(-1130, 'Data sent for parameter batchOrders is not valid.')
+
+        results = []
+        for params in batch:
+            try:
+                results.append(self._order_response(self._create_order(params)))
+            except ApiError as e:
+                self.stats['rejected'] += 1
+                results.append({'code': e.code, 'msg': e.msg})
+        return web.json_response(results)
+
+    def _find_order(self, params):
+        self._symbol(params)
+        try:
+            order = self.orders.get(int(params.get('orderId', 0)))
+        except ValueError:
+            order = None
+        if order is None or order['symbol'] != params['symbol']:
+            raise ApiError(-2013, 'Order does not exist.')
+        return order
+
+    async def handle_get_order(self, request):
+        return web.json_response(self._order_response(self._find_order(request['params'])))
+
+    async def handle_cancel_order(self, request):
+        order = self._find_order(request['params'])
+        if order['status'] not in ('NEW', 'PARTIALLY_FILLED'):
+            raise ApiError(-2011, 'Unknown order sent.')
+        order['status'] = 'CANCELED'
+        order['updateTime'] = int(time.time() * 1000)
+        self._emit_order_event(order, 'CANCELED')
+        return web.json_response(self._order_response(order))
+
+    async def handle_open_orders(self, request):
+        symbol = self._symbol(request['params'], required=False)
+        return web.json_response([
+            self._order_response(o) for o in self.orders.values()
+            if o['status'] in ('NEW', 'PARTIALLY_FILLED') and symbol in (None, o['symbol'])
+        ])
+
+    async def handle_user_trades(self, request):
+        params = request['params']
+        symbol = self._symbol(params)
+        limit = int(params.get('limit', 500))
+        trades = [t for t in self.trades if t['symbol'] == symbol]
+        return web.json_response(trades[-limit:])
+
+    # ---------- 계좌 ----------
+    def _position_risk(self, symbol):
+        pos = self.positions[symbol]
+        s = self.symbols[symbol]
+        mark = s['price']
+        unrealized = pos['amt'] * (mark - pos['entry'])
+        return {
+            'symbol': symbol,
+            'positionAmt': _fmt(pos['amt']),
+            'entryPrice': _fmt(pos['entry']),
+            'markPrice': _fmt(mark),
+            'unRealizedProfit': _fmt(unrealized),
+            'liquidationPrice': '0',
+            'leverage': str(pos['leverage']),
+            'maxNotionalValue': '1000000',
+            'marginType': pos['margin_type'].lower().replace('crossed', 'cross'),
+            'isolatedMargin': '0',
+            'isAutoAddMargin': 'false',
+            'positionSide': 'BOTH',
+            'notional': _fmt(pos['amt'] * mark),
+            'isolatedWallet': '0',
+            'updateTime': int(time.time() * 1000),
+        }
+
+    def _account_totals(self):
+        unrealized = 0.0
+        initial_margin = 0.0
+        for symbol, pos in self.positions.items():
+            if pos['amt']:
+                mark = self.symbols[symbol]['price']
+                unrealized += pos['amt'] * (mark - pos['entry'])
+                initial_margin += abs(pos['amt']) * mark / pos['leverage']
+        open_order_margin = sum(
+            (float(o['origQty']) - float(o['executedQty'])) * float(o['price']) / self.positions[o['symbol']]['leverage']
+            for o in self.orders.values() if o['status'] in ('NEW', 'PARTIALLY_FILLED') and o['type'] == 'LIMIT'
+        )
+        available = self.wallet_balance + unrealized - initial_margin - open_order_margin
+        return unrealized, initial_margin, open_order_margin, available
+
+    async def handle_position_risk(self, request):
+        symbol = self._symbol(request['params'], required=False)
+        return web.json_response([self._position_risk(s) for s in self.symbols if symbol in (None, s)])
+
+    async def handle_balance(self, request):
+        unrealized, _, _, available = self._account_totals()
+        return web.json_response([{
+            'accountAlias': 'sim',
+            'asset': 'USDT',
+            'balance': _fmt(self.wallet_balance),
+            'crossWalletBalance': _fmt(self.wallet_balance),
+            'crossUnPnl': _fmt(unrealized),
+            'availableBalance': _fmt(available),
+            'maxWithdrawAmount': _fmt(max(available, 0)),
+            'marginAvailable': True,
+            'updateTime': int(time.time() * 1000),
+        }])
+
+    async def handle_account(self, request):
+        unrealized, initial_margin, open_order_margin, available = self._account_totals()
+        return web.json_response({
+            'totalWalletBalance': _fmt(self.wallet_balance),
+            'totalUnrealizedProfit': _fmt(unrealized),
+            'totalMarginBalance': _fmt(self.wallet_balance + unrealized),
+            'totalPositionInitialMargin': _fmt(initial_margin),
+            'totalOpenOrderInitialMargin': _fmt(open_order_margin),
+            'totalMaintMargin': _fmt(initial_margin * 0.1),
+            'availableBalance': _fmt(available),
+            'maxWithdrawAmount': _fmt(max(available, 0)),
+            'assets': [{
+                'asset': 'USDT',
+                'walletBalance': _fmt(self.wallet_balance),
+                'unrealizedProfit': _fmt(unrealized),
+                'marginBalance': _fmt(self.wallet_balance + unrealized),
+                'crossWalletBalance': _fmt(self.wallet_balance),
+                'availableBalance': _fmt(available),
+            }],
+            'positions': [self._position_risk(s) for s in self.symbols if self.positions[s]['amt']],
+        })
+
+    async def handle_leverage(self, request):
+        params = request['params']
+        symbol = self._symbol(params)
+        try:
+            leverage = int(params['leverage'])
+        except (KeyError, ValueError):
+            raise ApiError(-1102, "Mandatory parameter 'leverage' was not sent, was empty/null, or malformed.")
+        if not 1 <= leverage <= 125:
+            raise ApiError(-4028, 'Leverage is not valid.')
+
+        self.positions[symbol]['leverage'] = leverage
+        self._emit_user_event({
+            'e': 'ACCOUNT_CONFIG_UPDATE', 'E': int(time.time() * 1000), 'T': int(time.time() * 1000),
+            'ac': {'s': symbol, 'l': leverage},
+        })
+        return web.json_response({'leverage': leverage, 'maxNotionalValue': '1000000', 'symbol': symbol})
+
+    async def handle_margin_type(self, request):
+        params = request['params']
+        symbol = self._symbol(params)
+        margin_type = params.get('marginType')
+        if margin_type not in ('CROSSED', 'ISOLATED'):
+            raise ApiError(-1116, 'Invalid marginType.')
+        pos = self.positions[symbol]
+        if pos['margin_type'] == margin_type:
+            raise ApiError(-4046, 'No need to change margin type.')
+        if pos['amt']:
+            raise ApiError(-4048, 'Margin type cannot be changed if there exists position.')
+        pos['margin_type'] = margin_type
+        return web.json_response({'code': 200, 'msg': 'success'})
+
+    # ---------- 사용자 데이터 스트림 ----------
+    async def handle_create_listen_key(self, request):
+        listen_key = next(iter(self.listen_keys), None)
+        if listen_key is None:
+            listen_key = hashlib.sha256(str(self.random.random()).encode()).hexdigest()
+        self.listen_keys[listen_key] = time.time()
+        return web.json_response({'listenKey': listen_key})
+
+    async def handle_keepalive_listen_key(self, request):
+        if not self.listen_keys:
+            raise ApiError(-1125, 'This listenKey does not exist.')
+        for key in self.listen_keys:
+            self.listen_keys[key] = time.time()
+        return web.json_response({})
+
+    async def handle_close_listen_key(self, request):
+        for key in list(self.listen_keys):
+            self.listen_keys.pop(key)
+            for ws in self._user_sockets.pop(key, set()):
+                await ws.close()
+        return web.json_response({})
+
+    async def handle_user_ws(self, request):
+        listen_key = request.match_info['listen_key']
+        if listen_key not in self.listen_keys:
+            raise web.HTTPBadRequest(text='Invalid listenKey')
+
+        ws = web.WebSocketResponse(heartbeat=20)
+        await ws.prepare(request)
+        self._user_sockets.setdefault(listen_key, set()).add(ws)
+        try:
+            async for _ in ws:
+                pass
+        finally:
+            self._user_sockets.get(listen_key, set()).discard(ws)
+        return ws
+
+    def _emit_user_event(self, event):
+        message = json.dumps(event)
+        for sockets in self._user_sockets.values():
+            for ws in list(sockets):
+                if not ws.closed:
+                    asyncio.ensure_future(self._safe_send(ws, message))
+
+    def _emit_order_event(self, order, execution_type, last_qty=0.0, last_price=0.0, fee=0.0, realized=0.0, maker=False):
+        now_ms = int(time.time() * 1000)
+        self._emit_user_event({
+            'e': 'ORDER_TRADE_UPDATE', 'E': now_ms, 'T': now_ms,
+            'o': {
+                's': order['symbol'], 'c': order['clientOrderId'], 'S': order['side'],
+                'o': order['type'], 'f': order['timeInForce'], 'q': order['origQty'],
+                'p': order['price'], 'ap': order['avgPrice'], 'sp': '0',
+                'x': execution_type, 'X': order['status'], 'i': order['orderId'],
+                'l': _fmt(last_qty), 'z': order['executedQty'], 'L': _fmt(last_price),
+                'N': 'USDT', 'n': _fmt(fee), 'T': order['updateTime'], 't': self.trades[-1]['id'] if last_qty else 0,
+                'm': maker, 'R': False, 'ps': 'BOTH', 'rp': _fmt(realized),
+            },
+        })
+
+    def _emit_account_update(self, symbol, reason):
+        now_ms = int(time.time() * 1000)
+        risk = self._position_risk(symbol)
+        self._emit_user_event({
+            'e': 'ACCOUNT_UPDATE', 'E': now_ms, 'T': now_ms,
+            'a': {
+                'm': reason,
+                'B': [{'a': 'USDT', 'wb': _fmt(self.wallet_balance), 'cw': _fmt(self.wallet_balance), 'bc': '0'}],
+                'P': [{
+                    's': symbol, 'pa': risk['positionAmt'], 'ep': risk['entryPrice'],
+                    'cr': '0', 'up': risk['unRealizedProfit'], 'mt': risk['marginType'],
+                    'iw': '0', 'ps': 'BOTH',
+                }],
+            },
+        })
+
+    # ---------- 시세 스트림 ----------
+    async def handle_market_ws(self, request):
+        ws = web.WebSocketResponse(heartbeat=20)
+        await ws.prepare(request)
+
+        streams = set(filter(None, request.query.get('streams', '').split('/')))
+        self._market_sockets[ws] = streams
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    command = json.loads(msg.data)
+                except ValueError:
+                    continue
+                method = command.get('method')
+                if method == 'SUBSCRIBE':
+                    streams.update(command.get('params', []))
+                elif method == 'UNSUBSCRIBE':
+                    streams.difference_update(command.get('params', []))
+                await ws.send_str(json.dumps({'result': None, 'id': command.get('id')}))
+        finally:
+            self._market_sockets.pop(ws, None)
+        return ws
+
+
+async def _serve(args):
+    exchange = SimulatedExchange(
+        matching=MatchingModel(
+            fill_delay=args.fill_delay,
+            slippage_bps=args.slippage_bps,
+            partial_fills=args.partial_fills,
+            reject_rate=args.reject_rate,
+        ),
+        config=SimulatorConfig(
+            latency=args.latency,
+            jitter=args.jitter,
+            weight_limit=args.weight_limit,
+            rate_limit_rate=args.rate_limit_rate,
+            secret_key=args.secret_key,
+        ),
+        balance=args.balance,
+        seed=args.seed,
+    )
+    await exchange.start(args.host, args.port)
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        await exchange.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="바이낸스 선물 오프라인 시뮬레이터")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='REST 응답 지연 (초)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='응답 지연 지터 (초)')
+    parser.add_argument('--fill-delay', type=float, default=0.0, help='주문 수락 후 체결 지연 (초)')
+    parser.add_argument('--slippage-bps', type=float, default=1.0)
+    parser.add_argument('--partial-fills', type=int, default=1)
+    parser.add_argument('--reject-rate', type=float, default=0.0)
+    parser.add_argument('--weight-limit', type=int, default=2400)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='무작위 429 응답 비율')
+    parser.add_argument('--balance', type=float, default=10000.0)
+    parser.add_argument('--secret-key', default=None, help='지정 시 요청 서명 검증')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        print("\n👋 시뮬레이터 종료")
+
+
+if __name__ == '__main__':
+    main()
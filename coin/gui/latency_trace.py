@@ -0,0 +1,183 @@
+# latency_trace.py - 시그널→체결 구간별 지연 추적
+"""
+시그널 1건마다 SignalTrace를 만들고 처리 단계마다 시각을 기록해 어디서 시간이 걸리는지 측정
+
+단계 (기록된 것만 사용):
+    created     trading_signals.created_at (DB 시각, 초 단위)
+    detected    DatabaseWatcher가 시그널을 읽은 시각
+    dispatched  StrategyWidget이 처리를 시작한 시각
+    precision   심볼 정보/정밀도 조회 완료
+    leverage    레버리지 설정 완료
+    order_sent  주문 전송 직전
+    ack         주문 응답 수신
+    fill        체결 확인 (get_fill_info)
+    db_saved    trade_history 저장 완료
+
+- 완료된 trace는 JSONL 파일에 한 줄씩 추가 (signal_latency.jsonl)
+- 최근 trace로 단계별 p50/p95/p99 요약 출력
+- 단독 실행 시 JSONL 파일을 읽어 요약:  python latency_trace.py signal_latency.jsonl
+"""
+
+import json
+import math
+import sys
+import time
+from collections import deque
+from datetime import datetime
+
+
+STAGES = ('created', 'detected', 'dispatched', 'precision', 'leverage', 'order_sent', 'ack', 'fill', 'db_saved')
+
+
+def _percentile(ordered, p):
+    return ordered[min(len(ordered) - 1, max(0, int(math.ceil(p / 100 * len(ordered))) - 1))]
+
+
+class SignalTrace:
+    """시그널 1건의 단계별 시각 (time.time() 초)"""
+
+    def __init__(self, symbol, signal_type=None, signal_id=None, created_at=None, detected_at=None):
+        self.symbol = symbol
+        self.signal_type = signal_type
+        self.signal_id = signal_id
+        self.stamps = {}
+        self.outcome = None
+
+        if isinstance(created_at, datetime):
+            created_at = created_at.timestamp()
+        if created_at:
+            self.stamps['created'] = float(created_at)
+        if detected_at:
+            self.stamps['detected'] = float(detected_at)
+
+    def mark(self, stage):
+        """단계 시각 기록 (같은 단계는 처음 기록만 유지)"""
+        self.stamps.setdefault(stage, time.time())
+
+    def durations(self):
+        """직전 기록 단계 대비 소요 시간 (ms)"""
+        result = {}
+        previous = None
+        for stage in STAGES:
+            if stage not in self.stamps:
+                continue
+            if previous is not None:
+                result[stage] = (self.stamps[stage] - self.stamps[previous]) * 1000
+            previous = stage
+        return result
+
+    def to_record(self):
+        durations = self.durations()
+        record = {
+            'symbol': self.symbol,
+            'signal_type': self.signal_type,
+            'signal_id': self.signal_id,
+            'outcome': self.outcome,
+            'stamps': {stage: round(ts, 6) for stage, ts in self.stamps.items()},
+            'durations_ms': {stage: round(ms, 2) for stage, ms in durations.items()},
+        }
+        start = self.stamps.get('detected', self.stamps.get('dispatched'))
+        if start is not None and 'fill' in self.stamps:
+            record['detect_to_fill_ms'] = round((self.stamps['fill'] - start) * 1000, 2)
+        if 'created' in self.stamps and 'fill' in self.stamps:
+            record['created_to_fill_ms'] = round((self.stamps['fill'] - self.stamps['created']) * 1000, 2)
+        return record
+
+
+class LatencyRecorder:
+    """완료된 trace를 JSONL로 저장하고 단계별 분포 요약"""
+
+    def __init__(self, path='signal_latency.jsonl', max_records=1000, summary_every=20):
+        self.path = path
+        self.summary_every = summary_every
+        self.records = deque(maxlen=max_records)
+        self._finished = 0
+
+    def start(self, signal):
+        """시그널 dict로 trace 생성 (이미 있으면 재사용)"""
+        trace = signal.get('_trace')
+        if trace is None:
+            trace = SignalTrace(
+                signal.get('binance_symbol', signal.get('symbol')),
+                signal_type=signal.get('signal_type'),
+                signal_id=signal.get('id'),
+                created_at=signal.get('created_at'),
+                detected_at=signal.get('detected_at'),
+            )
+            signal['_trace'] = trace
+        return trace
+
+    def finish(self, trace, outcome=None):
+        """trace 종료 및 저장 (outcome 미지정 시 체결 여부로 판단)"""
+        if trace is None or trace.outcome is not None:
+            return
+        trace.outcome = outcome or ('filled' if 'fill' in trace.stamps else 'aborted')
+        record = trace.to_record()
+        self.records.append(record)
+
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        except Exception as e:
+            print(f"⚠️ 지연 기록 저장 실패: {e}")
+
+        self._finished += 1
+        if self.summary_every and self._finished % self.summary_every == 0:
+            self.print_summary()
+
+    @staticmethod
+    def summarize(records):
+        """단계별 {'count', 'p50', 'p95', 'p99', 'max'} (ms)"""
+        samples = {}
+        for record in records:
+            if record.get('outcome') != 'filled':
+                continue
+            for stage, ms in record.get('durations_ms', {}).items():
+                samples.setdefault(stage, []).append(ms)
+            for key in ('detect_to_fill_ms', 'created_to_fill_ms'):
+                if key in record:
+                    samples.setdefault(key[:-3], []).append(record[key])
+
+        summary = {}
+        for stage in list(STAGES) + ['detect_to_fill', 'created_to_fill']:
+            values = samples.get(stage)
+            if not values:
+                continue
+            ordered = sorted(values)
+            summary[stage] = {
+                'count': len(ordered),
+                'p50': _percentile(ordered, 50),
+                'p95': _percentile(ordered, 95),
+                'p99': _percentile(ordered, 99),
+                'max': ordered[-1],
+            }
+        return summary
+
+    def print_summary(self, records=None):
+        records = self.records if records is None else records
+        summary = self.summarize(records)
+        if not summary:
+            print("📊 시그널 지연: 체결 완료된 기록 없음")
+            return summary
+
+        print(f"\n📊 시그널→체결 구간별 지연 (ms, 체결 {summary.get('detect_to_fill', {}).get('count', 0)}건)")
+        print(f"   {'구간':<16}{'건수':>6}{'p50':>10}{'p95':>10}{'p99':>10}{'최대':>10}")
+        for stage, s in summary.items():
+            print(f"   {stage:<16}{s['count']:>6}{s['p50']:>10.1f}{s['p95']:>10.1f}{s['p99']:>10.1f}{s['max']:>10.1f}")
+        return summary
+
+
+def load_records(paths):
+    records = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    records.append(json.loads(line))
+    return records
+
+
+if __name__ == '__main__':
+    files = sys.argv[1:] or ['signal_latency.jsonl']
+    LatencyRecorder(path=None).print_summary(load_records(files))
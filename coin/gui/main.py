@@ -149,6 +149,10 @@ class MainWindow(QMainWindow):
                 self.binance_client = BinanceClient(api_key, secret_key, testnet)
                 print(f"✅ {mode} 바이낸스 클라이언트 새로 생성")
             
+            # 사용자 데이터 스트림 시작 (포지션/주문/잔고 실시간 반영)
+            if hasattr(self.binance_client, 'user_stream'):
+                self.binance_client.user_stream.start()
+            
             # 모든 위젯에 클라이언트 객체 전달
             self.trading_widget.set_client(self.binance_client)
             self.position_widget.set_client(self.binance_client)
@@ -0,0 +1,307 @@
+# market_data_hub.py - 바이낸스 선물 시세 웹소켓 허브
+"""
+하나의 combined stream 웹소켓으로 여러 위젯의 시세 구독을 처리
+
+- 심볼별 depth(@depth@100ms) / ticker(@ticker) 스트림을 동적으로 SUBSCRIBE / UNSUBSCRIBE
+- REST 스냅샷 + diff depth 이벤트로 로컬 호가창 유지 (U/u/pu 연속성 검사, 끊기면 재동기화)
+- 연결이 끊기면 지수 백오프로 재접속 후 기존 구독 복원
+- 콜백은 qasync 이벤트 루프(메인 스레드)에서 호출되므로 위젯을 바로 갱신해도 됨
+"""
+
+import asyncio
+import heapq
+import json
+
+import websockets
+
+
+class LocalOrderBook:
+    """diff depth 이벤트로 갱신되는 로컬 호가창"""
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.reset()
+
+    def reset(self):
+        self.bids = {}
+        self.asks = {}
+        self.last_update_id = 0
+        self.prev_final_id = None
+        self.synced = False
+        self.buffer = []
+
+    def load_snapshot(self, snapshot):
+        """REST /fapi/v1/depth 스냅샷 적용"""
+        self.bids = {float(p): float(q) for p, q in snapshot['bids']}
+        self.asks = {float(p): float(q) for p, q in snapshot['asks']}
+        self.last_update_id = int(snapshot['lastUpdateId'])
+        self.prev_final_id = None
+
+    def apply_event(self, event):
+        """
+        depthUpdate 이벤트 적용
+
+        Returns:
+            bool: 연속성이 깨져 재동기화가 필요하면 False
+        """
+        first_id = event['U']
+        final_id = event['u']
+
+        # 스냅샷보다 오래된 이벤트는 버림
+        if final_id < self.last_update_id:
+            return True
+
+        if self.prev_final_id is None:
+            # 스냅샷 이후 첫 이벤트는 lastUpdateId를 포함해야 함
+            if first_id > self.last_update_id:
+                return False
+        elif event.get('pu') != self.prev_final_id:
+            return False
+
+        for price, qty in event.get('b', []):
+            self._set_level(self.bids, price, qty)
+        for price, qty in event.get('a', []):
+            self._set_level(self.asks, price, qty)
+
+        self.prev_final_id = final_id
+        self.last_update_id = final_id
+        return True
+
+    @staticmethod
+    def _set_level(side, price, qty):
+        price = float(price)
+        qty = float(qty)
+        if qty == 0:
+            side.pop(price, None)
+        else:
+            side[price] = qty
+
+    def top(self, depth):
+        """상위 depth 단계 ([[가격, 수량], ...], 매수는 높은 가격순 / 매도는 낮은 가격순)"""
+        bids = [[p, q] for p, q in heapq.nlargest(depth, self.bids.items())]
+        asks = [[p, q] for p, q in heapq.nsmallest(depth, self.asks.items())]
+        return bids, asks
+
+
+class MarketDataHub:
+    """combined stream 하나로 depth/ticker 구독을 공유"""
+
+    SNAPSHOT_LIMIT = 1000
+    MAX_RECONNECT_DELAY = 30
+
+    def __init__(self, client):
+        self.client = client
+        self.stream_url = f"{client.ws_url}/stream"
+
+        self.books = {}
+        self._listeners = {}
+        self._sync_tasks = {}
+
+        self._ws = None
+        self._task = None
+        self._running = False
+        self._request_id = 0
+
+    @staticmethod
+    def stream_name(symbol, kind):
+        if kind == 'depth':
+            return f"{symbol.lower()}@depth@100ms"
+        return f"{symbol.lower()}@ticker"
+
+    # ---------- 구독 관리 ----------
+    def subscribe(self, symbol, kind, callback):
+        """
+        스트림 구독
+
+        Args:
+            kind: 'depth' (콜백 인자: LocalOrderBook) 또는 'ticker' (콜백 인자: 24hr 티커 dict)
+        """
+        name = self.stream_name(symbol, kind)
+        is_new = name not in self._listeners
+        self._listeners.setdefault(name, []).append(callback)
+
+        if kind == 'depth' and symbol not in self.books:
+            self.books[symbol] = LocalOrderBook(symbol)
+
+        self._ensure_running()
+        if is_new and self._ws is not None:
+            asyncio.create_task(self._send_subscription("SUBSCRIBE", [name]))
+
+        # 이미 동기화된 호가창이 있으면 바로 전달
+        book = self.books.get(symbol)
+        if kind == 'depth' and book and book.synced:
+            self._call(callback, book)
+
+    def unsubscribe(self, symbol, kind, callback):
+        name = self.stream_name(symbol, kind)
+        callbacks = self._listeners.get(name)
+        if not callbacks:
+            return
+
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if callbacks:
+            return
+
+        del self._listeners[name]
+        if kind == 'depth':
+            self.books.pop(symbol, None)
+        if self._ws is not None:
+            asyncio.create_task(self._send_subscription("UNSUBSCRIBE", [name]))
+
+    async def _send_subscription(self, method, streams):
+        try:
+            if self._ws is None:
+                return
+            self._request_id += 1
+            await self._ws.send(json.dumps({
+                "method": method,
+                "params": streams,
+                "id": self._request_id,
+            }))
+        except Exception as e:
+            print(f"⚠️ 시세 스트림 {method} 실패 {streams}: {e}")
+
+    # ---------- 연결 ----------
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._running = True
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        delay = 1
+        while self._running:
+            try:
+                async with websockets.connect(self.stream_url, ping_interval=20) as ws:
+                    self._ws = ws
+                    delay = 1
+                    print(f"✅ 시세 스트림 연결: {len(self._listeners)}개 구독")
+
+                    # 재접속이면 끊긴 동안의 이벤트가 빠졌으므로 호가창 재동기화
+                    for book in self.books.values():
+                        book.reset()
+
+                    if self._listeners:
+                        await self._send_subscription("SUBSCRIBE", list(self._listeners))
+
+                    async for message in ws:
+                        self._dispatch(json.loads(message))
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ 시세 스트림 오류: {e}")
+            finally:
+                self._ws = None
+
+            if self._running:
+                print(f"🔄 시세 스트림 {delay}초 후 재연결")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.MAX_RECONNECT_DELAY)
+
+    async def close(self):
+        """스트림 종료"""
+        self._running = False
+        for task in list(self._sync_tasks.values()):
+            task.cancel()
+        self._sync_tasks.clear()
+
+        try:
+            if self._ws is not None:
+                await self._ws.close()
+        except Exception:
+            pass
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    # ---------- 메시지 처리 ----------
+    def _dispatch(self, message):
+        stream = message.get('stream')
+        data = message.get('data')
+        if not stream or data is None:
+            return  # 구독 응답 등
+
+        try:
+            if '@depth' in stream:
+                self._on_depth(data['s'], stream, data)
+            elif stream.endswith('@ticker'):
+                self._notify(stream, {
+                    'symbol': data['s'],
+                    'price': data['c'],
+                    'lastPrice': data['c'],
+                    'priceChange': data['p'],
+                    'priceChangePercent': data['P'],
+                    'volume': data['v'],
+                    'quoteVolume': data['q'],
+                })
+        except Exception as e:
+            print(f"⚠️ 시세 메시지 처리 오류 [{stream}]: {e}")
+
+    def _on_depth(self, symbol, stream, event):
+        book = self.books.get(symbol)
+        if book is None:
+            return
+
+        if not book.synced:
+            book.buffer.append(event)
+            self._start_sync(symbol)
+            return
+
+        if not book.apply_event(event):
+            print(f"⚠️ {symbol} 호가 이벤트 누락 - 재동기화")
+            book.reset()
+            book.buffer.append(event)
+            self._start_sync(symbol)
+            return
+
+        self._notify(stream, book)
+
+    def _start_sync(self, symbol):
+        if symbol not in self._sync_tasks:
+            self._sync_tasks[symbol] = asyncio.create_task(self._sync_book(symbol))
+
+    async def _sync_book(self, symbol):
+        """REST 스냅샷을 받아 버퍼된 이벤트와 이어붙임"""
+        try:
+            while self._running and symbol in self.books:
+                snapshot = await self.client.get_orderbook(symbol, self.SNAPSHOT_LIMIT)
+
+                book = self.books.get(symbol)
+                if book is None:
+                    return
+                if not snapshot or 'lastUpdateId' not in snapshot:
+                    await asyncio.sleep(1)
+                    continue
+
+                book.load_snapshot(snapshot)
+                buffered, book.buffer = book.buffer, []
+
+                if all(book.apply_event(event) for event in buffered):
+                    book.synced = True
+                    self._notify(self.stream_name(symbol, 'depth'), book)
+                    print(f"✅ {symbol} 로컬 호가창 동기화 완료 (lastUpdateId={book.last_update_id})")
+                    return
+
+                # 스냅샷이 버퍼보다 앞서거나 뒤처짐 - 새 이벤트를 모아 다시 시도
+                book.reset()
+                await asyncio.sleep(0.5)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"❌ {symbol} 호가창 동기화 실패: {e}")
+        finally:
+            self._sync_tasks.pop(symbol, None)
+
+    def _notify(self, stream, payload):
+        for callback in list(self._listeners.get(stream, [])):
+            self._call(callback, payload)
+
+    @staticmethod
+    def _call(callback, payload):
+        try:
+            callback(payload)
+        except Exception as e:
+            print(f"⚠️ 시세 콜백 오류: {e}")
@@ -0,0 +1,135 @@
+# order_executor.py - 다중 심볼 주문 동시 실행
+"""
+시그널 배치의 청산/진입 주문을 심볼별로 동시에 실행
+
+- 같은 심볼의 작업은 심볼 락으로 직렬화 (청산과 재진입이 겹치지 않음)
+- 동시 실행 수는 max_concurrency와 요청 가중치 여유분 중 작은 값
+- 작업 결과를 모아 반환 (예외는 실패로 기록하고 다른 작업은 계속 진행)
+"""
+
+import asyncio
+
+from rate_limiter import PRIORITY_BUDGET, PRIORITY_TRADE
+
+
+class OrderBatchExecutor:
+    # 진입 1건에 드는 대략적인 요청 가중치 (티커 2 + 레버리지 1 + 주문 1 + 주문 조회 1 + 포지션 5)
+    WEIGHT_PER_ORDER_FLOW = 10
+
+    def __init__(self, max_concurrency=5):
+        self.max_concurrency = max_concurrency
+        self._symbol_locks = {}
+
+    def symbol_lock(self, symbol):
+        """심볼별 락 (배치 밖의 실시간 시그널 처리와도 공유 가능)"""
+        if symbol not in self._symbol_locks:
+            self._symbol_locks[symbol] = asyncio.Lock()
+        return self._symbol_locks[symbol]
+
+    def concurrency_limit(self, rate_governor=None):
+        """가중치 여유분을 반영한 동시 실행 수"""
+        if rate_governor is None:
+            return self.max_concurrency
+
+        rate_governor._roll_window()
+        headroom = rate_governor.weight_limit * PRIORITY_BUDGET[PRIORITY_TRADE] - rate_governor.used_weight
+        return max(1, min(self.max_concurrency, int(headroom // self.WEIGHT_PER_ORDER_FLOW)))
+
+    async def run(self, jobs, rate_governor=None):
+        """
+        작업 동시 실행
+
+        Args:
+            jobs: [(symbol, label, 코루틴 함수), ...] - 코루틴 함수는 성공 시 True 반환
+            rate_governor: RateGovernor (없으면 max_concurrency 사용)
+
+        Returns:
+            list: [{'symbol', 'label', 'success', 'error'}, ...] (jobs 순서 유지)
+        """
+        if not jobs:
+            return []
+
+        semaphore = asyncio.Semaphore(self.concurrency_limit(rate_governor))
+
+        async def run_one(symbol, label, job):
+            async with self.symbol_lock(symbol):
+                async with semaphore:
+                    try:
+                        return {'symbol': symbol, 'label': label, 'success': bool(await job()), 'error': None}
+                    except Exception as e:
+                        print(f"❌ {symbol} {label} 실패: {e}")
+                        return {'symbol': symbol, 'label': label, 'success': False, 'error': str(e)}
+
+        return await asyncio.gather(*(run_one(symbol, label, job) for symbol, label, job in jobs))
+
+
+class OrderBatcher:
+    """
+    동시에 들어온 시장가/지정가 주문을 batchOrders 한 번으로 묶어 전송
+
+    OrderBatchExecutor로 여러 심볼을 동시에 처리할 때 각 작업의 submit() 호출이
+    FLUSH_DELAY 안에 모이면 한 요청으로 보내고, 결과는 주문별로 돌려줌
+    """
+
+    FLUSH_DELAY = 0.05
+
+    def __init__(self, client):
+        self.client = client
+        self.batch_limit = getattr(client, 'BATCH_ORDER_LIMIT', 5)
+        self._queue = []
+        self._flush_handle = None
+
+    async def submit(self, symbol, side, order_type, quantity, price=None):
+        """
+        주문 제출 (place_order와 같은 반환값: 성공 시 주문 dict, 실패 시 None)
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append(({
+            'symbol': symbol,
+            'side': side,
+            'order_type': order_type,
+            'quantity': quantity,
+            'price': price,
+        }, future))
+
+        if len(self._queue) >= self.batch_limit:
+            self._flush_now()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.FLUSH_DELAY, self._flush_now)
+
+        return await future
+
+    def _flush_now(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        queued, self._queue = self._queue, []
+        if queued:
+            asyncio.ensure_future(self._send(queued))
+
+    async def _send(self, queued):
+        orders = [order for order, _ in queued]
+        try:
+            if len(orders) == 1:
+                # 한 건이면 단일 주문 엔드포인트 사용 (가중치 1)
+                order = orders[0]
+                results = [await self.client.place_order(
+                    order['symbol'], order['side'], order['order_type'], order['quantity'], order['price']
+                )]
+            else:
+                results = await self.client.place_batch_orders(orders)
+                print(f"📦 일괄 주문 {len(orders)}건 전송")
+        except Exception as e:
+            print(f"❌ 일괄 주문 전송 실패: {e}")
+            results = [None] * len(orders)
+
+        for (order, future), result in zip(queued, results):
+            if future.done():
+                continue
+            if result and 'orderId' in result:
+                future.set_result(result)
+            else:
+                if result and 'msg' in result:
+                    print(f"❌ {order['symbol']} 주문 거부: [{result.get('code')}] {result['msg']}")
+                future.set_result(None)
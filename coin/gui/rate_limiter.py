@@ -0,0 +1,204 @@
+# rate_limiter.py - 바이낸스 선물 API 가중치 기반 요청 조절
+"""
+바이낸스 선물 IP 가중치 한도(분당 2400)를 클라이언트 측에서 관리
+
+- 엔드포인트별 가중치를 미리 차감하고, 응답 헤더(X-MBX-USED-WEIGHT-1M)로 보정
+- 신규 주문은 분당 주문 수 한도(1200)도 같은 방식으로 차감/보정 (X-MBX-ORDER-COUNT-1M)
+- 우선순위: 주문/취소 > 계좌·포지션 조회 > 화면 갱신(호가창, 티커)
+- 한도에 가까워지면 화면 갱신 요청은 건너뛰고, 계좌 조회는 다음 분까지 대기
+- 429/418 응답의 Retry-After 동안 모든 요청 대기
+"""
+
+import asyncio
+import json
+import time
+
+
+PRIORITY_TRADE = 0
+PRIORITY_ACCOUNT = 1
+PRIORITY_UI = 2
+
+# 우선순위별 사용 가능한 한도 비율 (나머지는 상위 우선순위 몫으로 남겨둠)
+PRIORITY_BUDGET = {
+    PRIORITY_TRADE: 1.0,
+    PRIORITY_ACCOUNT: 0.9,
+    PRIORITY_UI: 0.7,
+}
+
+# 엔드포인트별 요청 가중치 (바이낸스 선물 문서 기준)
+ENDPOINT_WEIGHTS = {
+    "/fapi/v2/account": 5,
+    "/fapi/v2/balance": 5,
+    "/fapi/v2/positionRisk": 5,
+    "/fapi/v1/userTrades": 5,
+    "/fapi/v1/allOrders": 5,
+    "/fapi/v1/income": 30,
+    "/fapi/v1/exchangeInfo": 1,
+    "/fapi/v1/order": 1,
+    "/fapi/v1/batchOrders": 5,
+    "/fapi/v1/leverage": 1,
+    "/fapi/v1/marginType": 1,
+    "/fapi/v1/listenKey": 1,
+    "/fapi/v1/ticker/price": 1,
+    "/fapi/v1/ticker/24hr": 1,
+}
+
+
+def endpoint_weight(endpoint, params=None):
+    """요청 가중치 계산 (파라미터에 따라 달라지는 엔드포인트 포함)"""
+    params = params or {}
+
+    if endpoint == "/fapi/v1/depth":
+        limit = int(params.get('limit', 500))
+        if limit <= 50:
+            return 2
+        if limit <= 100:
+            return 5
+        if limit <= 500:
+            return 10
+        return 20
+
+    if endpoint == "/fapi/v1/openOrders":
+        return 1 if params.get('symbol') else 40
+
+    if endpoint == "/fapi/v1/ticker/24hr" and not params.get('symbol'):
+        return 40
+
+    if endpoint == "/fapi/v1/ticker/price" and not params.get('symbol'):
+        return 2
+
+    return ENDPOINT_WEIGHTS.get(endpoint, 1)
+
+
+def endpoint_order_count(method, endpoint, params=None):
+    """분당 주문 수 한도에서 차감할 주문 수 (신규 주문만, 취소/조회는 0)"""
+    if method != "POST":
+        return 0
+
+    if endpoint == "/fapi/v1/order":
+        return 1
+
+    if endpoint == "/fapi/v1/batchOrders":
+        batch = (params or {}).get('batchOrders', '[]')
+        try:
+            return len(json.loads(batch) if isinstance(batch, str) else batch)
+        except (TypeError, ValueError):
+            return 1
+
+    return 0
+
+
+class RateGovernor:
+    """분 단위 가중치 예산 관리 (RateGovernor.shared()로 모드별 공유 인스턴스 사용)"""
+
+    _instances = {}
+
+    def __init__(self, weight_limit=2400, order_limit=1200):
+        self.weight_limit = weight_limit
+        self.order_limit = order_limit
+
+        self.window_minute = int(time.time() // 60)
+        self.used_weight = 0
+        self.order_count = 0
+        self.blocked_until = 0.0
+
+        self._waiting = {PRIORITY_TRADE: 0, PRIORITY_ACCOUNT: 0, PRIORITY_UI: 0}
+        self._condition = None
+        self._shed_count = 0
+
+    @classmethod
+    def shared(cls, testnet=True):
+        """모드별 공유 인스턴스 반환 (한도는 IP 단위이므로 클라이언트끼리 공유)"""
+        key = bool(testnet)
+        if key not in cls._instances:
+            cls._instances[key] = cls()
+        return cls._instances[key]
+
+    def _roll_window(self):
+        minute = int(time.time() // 60)
+        if minute != self.window_minute:
+            if self._shed_count:
+                print(f"⚠️ 지난 1분간 화면 갱신 요청 {self._shed_count}건 생략 (가중치 {self.used_weight}/{self.weight_limit})")
+            self.window_minute = minute
+            self.used_weight = 0
+            self.order_count = 0
+            self._shed_count = 0
+
+    def _can_send(self, weight, priority, orders=0):
+        if time.time() < self.blocked_until:
+            return False
+        # 더 높은 우선순위가 대기 중이면 양보
+        if any(self._waiting[p] for p in self._waiting if p < priority):
+            return False
+        if orders and self.order_count + orders > self.order_limit:
+            return False
+        return self.used_weight + weight <= self.weight_limit * PRIORITY_BUDGET[priority]
+
+    async def acquire(self, weight, priority=PRIORITY_ACCOUNT, orders=0):
+        """
+        가중치 예산 (신규 주문이면 분당 주문 수 예산도) 확보
+
+        Args:
+            weight: 요청 가중치
+            priority: PRIORITY_TRADE / PRIORITY_ACCOUNT / PRIORITY_UI
+            orders: 요청에 포함된 신규 주문 수 (endpoint_order_count)
+
+        Returns:
+            bool: 전송 가능하면 True, 화면 갱신 요청이 생략되면 False
+        """
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+
+        async with self._condition:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    self._roll_window()
+
+                    if self._can_send(weight, priority, orders):
+                        self.used_weight += weight
+                        self.order_count += orders
+                        return True
+
+                    if priority == PRIORITY_UI:
+                        self._shed_count += 1
+                        return False
+
+                    # 제한 중이면 해제 시각까지, 아니면 다음 분까지 (다른 요청이 끝나면 깨어나 재확인)
+                    now = time.time()
+                    if now < self.blocked_until:
+                        wait_time = self.blocked_until - now
+                    else:
+                        wait_time = (self.window_minute + 1) * 60 - now
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), timeout=max(wait_time, 0.05))
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self._waiting[priority] -= 1
+                self._condition.notify_all()
+
+    def update_from_response(self, status, headers):
+        """응답 헤더로 사용량 보정 및 429/418 처리"""
+        try:
+            self._roll_window()
+
+            used = headers.get('X-MBX-USED-WEIGHT-1M')
+            if used is not None:
+                # 서버 값에는 아직 응답이 오지 않은 요청이 빠져 있을 수 있으므로 큰 값 사용
+                self.used_weight = max(self.used_weight, int(used))
+
+            orders = headers.get('X-MBX-ORDER-COUNT-1M')
+            if orders is not None:
+                # 가중치와 같이 아직 반영되지 않은 주문이 있을 수 있으므로 큰 값 사용
+                self.order_count = max(self.order_count, int(orders))
+                if self.order_count >= self.order_limit * 0.9:
+                    print(f"⚠️ 분당 주문 수 한도 근접: {self.order_count}/{self.order_limit}")
+
+            if status in (429, 418):
+                retry_after = int(headers.get('Retry-After', 60))
+                self.blocked_until = time.time() + retry_after
+                print(f"🚫 바이낸스 요청 제한 ({status}) - {retry_after}초 대기")
+
+        except Exception as e:
+            print(f"⚠️ 요청 가중치 헤더 처리 실패 (무시): {e}")
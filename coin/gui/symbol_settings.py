@@ -0,0 +1,75 @@
+# symbol_settings.py - 심볼별 레버리지/마진 모드 캐시
+"""
+주문 전 set_leverage / marginType 호출을 설정이 실제로 바뀔 때만 보내기 위한 캐시
+
+- 첫 사용 시 positionRisk(전체 심볼)로 현재 설정을 한 번에 읽어 채움
+- 설정 변경 성공, 사용자 데이터 스트림(ACCOUNT_CONFIG_UPDATE / ACCOUNT_UPDATE) 수신 시 갱신
+- 앱 밖에서 바뀐 설정은 스트림으로만 알 수 있으므로, 스트림이 없으면 TTL이 지난 캐시는 다시 채움
+- 채우기 실패 시 SEED_RETRY_INTERVAL 동안 재조회하지 않음 (positionRisk 전체 조회는 weight 5)
+- 마진 모드는 바이낸스 설정값(CROSSED / ISOLATED)으로 통일
+"""
+import time
+
+
+def normalize_margin_type(margin_type):
+    """'CROSS', 'cross', 'crossed' → 'CROSSED' / 'isolated' → 'ISOLATED'"""
+    if not margin_type:
+        return None
+    value = str(margin_type).upper()
+    if value.startswith('CROSS'):
+        return 'CROSSED'
+    if value.startswith('ISOLATED'):
+        return 'ISOLATED'
+    return value
+
+
+class SymbolSettings:
+    SEED_RETRY_INTERVAL = 60
+
+    def __init__(self):
+        self.leverages = {}
+        self.margin_types = {}
+        self.seeded = False
+        self.seeded_at = 0.0
+        self.seed_failed_at = 0.0
+
+    def is_fresh(self, ttl=None):
+        """채워진 캐시를 믿을 수 있는지 (ttl 초가 지나면 만료, None이면 만료 없음)"""
+        return self.seeded and (ttl is None or time.time() - self.seeded_at < ttl)
+
+    def can_seed(self):
+        """마지막 채우기 실패 후 SEED_RETRY_INTERVAL이 지났는지"""
+        return time.time() - self.seed_failed_at >= self.SEED_RETRY_INTERVAL
+
+    def mark_seed_failed(self):
+        self.seed_failed_at = time.time()
+
+    def invalidate(self):
+        """스트림 재연결 등으로 변경 이벤트를 놓쳤을 수 있을 때 → 다음 사용 시 다시 채움"""
+        self.seeded = False
+
+    def load_position_risk(self, positions):
+        """positionRisk 응답 (포지션 없는 심볼 포함)으로 전체 설정 채우기"""
+        for pos in positions or []:
+            symbol = pos.get('symbol')
+            if not symbol:
+                continue
+            if pos.get('leverage') is not None:
+                self.leverages[symbol] = int(float(pos['leverage']))
+            if pos.get('marginType'):
+                self.margin_types[symbol] = normalize_margin_type(pos['marginType'])
+        self.seeded = True
+        self.seeded_at = time.time()
+        print(f"✅ 레버리지/마진 모드 캐시: {len(self.leverages)}개 심볼")
+
+    def leverage_matches(self, symbol, leverage):
+        return self.leverages.get(symbol) == int(leverage)
+
+    def margin_type_matches(self, symbol, margin_type):
+        return self.margin_types.get(symbol) == normalize_margin_type(margin_type)
+
+    def set_leverage(self, symbol, leverage):
+        self.leverages[symbol] = int(float(leverage))
+
+    def set_margin_type(self, symbol, margin_type):
+        self.margin_types[symbol] = normalize_margin_type(margin_type)
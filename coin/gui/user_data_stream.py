@@ -0,0 +1,346 @@
+# user_data_stream.py - 바이낸스 선물 사용자 데이터 스트림
+"""
+listenKey 웹소켓으로 포지션/주문/잔고 변경을 실시간 수신해 메모리 상태로 유지
+
+- ACCOUNT_UPDATE: 잔고, 포지션 수량/진입가/미실현손익
+- ORDER_TRADE_UPDATE: 미체결 주문 목록, 주문별 체결 정보 (wait_for_fill로 대기)
+- ACCOUNT_CONFIG_UPDATE: 심볼별 레버리지 (SymbolSettings 캐시에도 반영)
+- 연결(재연결) 직후 REST로 전체 상태를 다시 읽어 끊긴 동안의 누락 보정
+- listenKey는 30분마다 연장, 만료 이벤트 수신 시 새로 발급 후 재연결
+
+포지션/주문 dict는 REST(positionRisk, openOrders) 응답과 같은 키를 사용하므로
+기존 테이블 채우기 코드가 그대로 사용 가능
+"""
+
+import asyncio
+import json
+import time
+
+import websockets
+
+
+class AccountState:
+    """사용자 데이터 스트림으로 갱신되는 계좌 상태 (위젯/PositionManager 공용)"""
+
+    # 체결 정보 보관 개수 (오래된 것부터 삭제)
+    MAX_FILLS = 500
+
+    def __init__(self):
+        self.ready = False
+        self.positions = {}
+        self.open_orders = {}
+        self.balances = {}
+        self.leverages = {}
+        self.fills = {}
+        self.updated_at = 0.0
+
+        self.symbol_settings = None  # 클라이언트의 SymbolSettings (설정 변경 이벤트 반영)
+
+        self._fill_events = {}
+        self._listeners = {'account': [], 'positions': [], 'orders': []}
+
+    # ---------- 구독 ----------
+    def add_listener(self, kind, callback):
+        """kind: 'account' | 'positions' | 'orders'"""
+        if callback not in self._listeners[kind]:
+            self._listeners[kind].append(callback)
+
+    def remove_listener(self, kind, callback):
+        if callback in self._listeners[kind]:
+            self._listeners[kind].remove(callback)
+
+    def _notify(self, *kinds):
+        self.updated_at = time.time()
+        for kind in kinds:
+            for callback in list(self._listeners[kind]):
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"⚠️ 계좌 상태 콜백 오류 [{kind}]: {e}")
+
+    # ---------- 조회 ----------
+    def positions_list(self):
+        """활성 포지션 목록 (get_positions()와 같은 형태)"""
+        return [dict(p) for p in self.positions.values() if float(p.get('positionAmt', 0)) != 0]
+
+    def open_orders_list(self):
+        """미체결 주문 목록 (get_open_orders()와 같은 형태, 주문 시간순)"""
+        return sorted((dict(o) for o in self.open_orders.values()), key=lambda o: o.get('time', 0))
+
+    async def wait_for_fill(self, order_id, timeout=5.0):
+        """
+        주문이 FILLED 될 때까지 대기
+
+        Returns:
+            dict | None: {'avgPrice', 'executedQty', 'commission'} 또는 시간 초과 시 None
+        """
+        order_id = int(order_id)
+        fill = self.fills.get(order_id)
+        if fill and fill['status'] == 'FILLED':
+            return fill
+
+        event = self._fill_events.setdefault(order_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._fill_events.pop(order_id, None)
+
+        return self.fills.get(order_id)
+
+    # ---------- REST 동기화 ----------
+    def load_snapshot(self, positions, open_orders, account_info):
+        """REST 조회 결과로 전체 상태 교체"""
+        self.positions = {}
+        for pos in positions or []:
+            symbol = pos.get('symbol')
+            if symbol:
+                self.positions[symbol] = dict(pos)
+                self.leverages[symbol] = pos.get('leverage', self.leverages.get(symbol, '1'))
+
+        self.open_orders = {int(o['orderId']): dict(o) for o in (open_orders or []) if 'orderId' in o}
+
+        if account_info:
+            self.balances = {
+                a['asset']: {'walletBalance': a.get('walletBalance'), 'crossWalletBalance': a.get('crossWalletBalance')}
+                for a in account_info.get('assets', [])
+            }
+
+        # 연결이 끊긴 동안의 설정 변경 이벤트는 받지 못했으므로 레버리지/마진 모드 캐시도 다시 채우게 함
+        if self.symbol_settings is not None:
+            self.symbol_settings.invalidate()
+
+        self.ready = True
+        self._notify('account', 'positions', 'orders')
+
+    # ---------- 이벤트 적용 ----------
+    def apply_account_update(self, data):
+        update = data.get('a', {})
+
+        for balance in update.get('B', []):
+            self.balances[balance['a']] = {
+                'walletBalance': balance.get('wb'),
+                'crossWalletBalance': balance.get('cw'),
+            }
+
+        positions_changed = False
+        for p in update.get('P', []):
+            symbol = p['s']
+            if self.symbol_settings is not None and p.get('mt'):
+                self.symbol_settings.set_margin_type(symbol, p['mt'])
+
+            amount = float(p.get('pa', 0))
+            if amount == 0:
+                positions_changed |= self.positions.pop(symbol, None) is not None
+                continue
+
+            pos = self.positions.setdefault(symbol, {'symbol': symbol})
+            entry_price = float(p.get('ep', 0))
+            unrealized = float(p.get('up', 0))
+            pos.update({
+                'positionAmt': p.get('pa'),
+                'entryPrice': p.get('ep'),
+                'unRealizedProfit': p.get('up'),
+                'marginType': p.get('mt', pos.get('marginType')),
+                'positionSide': p.get('ps', pos.get('positionSide', 'BOTH')),
+                # 이벤트에 markPrice가 없어 미실현손익으로 역산
+                'markPrice': str(entry_price + unrealized / amount),
+                'leverage': self.leverages.get(symbol, pos.get('leverage', '1')),
+            })
+            positions_changed = True
+
+        if positions_changed:
+            self._notify('account', 'positions')
+        else:
+            self._notify('account')
+
+    def apply_order_update(self, data):
+        o = data.get('o', {})
+        order_id = int(o['i'])
+        status = o.get('X')
+
+        if status in ('NEW', 'PARTIALLY_FILLED'):
+            order = self.open_orders.setdefault(order_id, {'orderId': order_id, 'time': o.get('T')})
+            order.update({
+                'symbol': o.get('s'),
+                'clientOrderId': o.get('c'),
+                'side': o.get('S'),
+                'type': o.get('o'),
+                'price': o.get('p'),
+                'stopPrice': o.get('sp'),
+                'origQty': o.get('q'),
+                'executedQty': o.get('z'),
+                'avgPrice': o.get('ap'),
+                'status': status,
+                'reduceOnly': o.get('R'),
+                'positionSide': o.get('ps'),
+                'updateTime': o.get('T'),
+            })
+        else:
+            self.open_orders.pop(order_id, None)
+
+        # 체결 누적 (부분 체결마다 수수료 합산)
+        if o.get('x') == 'TRADE' or status == 'FILLED':
+            fill = self.fills.setdefault(order_id, {'commission': 0.0})
+            if o.get('x') == 'TRADE':
+                fill['commission'] += float(o.get('n', 0) or 0)
+            fill.update({
+                'symbol': o.get('s'),
+                'status': status,
+                'avgPrice': float(o.get('ap', 0) or 0),
+                'executedQty': float(o.get('z', 0) or 0),
+                'realizedPnl': float(o.get('rp', 0) or 0),
+            })
+            while len(self.fills) > self.MAX_FILLS:
+                self.fills.pop(next(iter(self.fills)))
+
+            if status == 'FILLED' and order_id in self._fill_events:
+                self._fill_events[order_id].set()
+
+        self._notify('orders')
+
+    def apply_config_update(self, data):
+        config = data.get('ac')
+        if config and 's' in config:
+            self.leverages[config['s']] = str(config.get('l'))
+            if self.symbol_settings is not None:
+                self.symbol_settings.set_leverage(config['s'], config.get('l'))
+            if config['s'] in self.positions:
+                self.positions[config['s']]['leverage'] = str(config.get('l'))
+                self._notify('positions')
+
+
+class UserDataStream:
+    """listenKey 발급/연장 및 웹소켓 수신 관리"""
+
+    KEEPALIVE_INTERVAL = 30 * 60
+    MAX_RECONNECT_DELAY = 30
+
+    def __init__(self, client):
+        self.client = client
+        self.state = AccountState()
+
+        self._listen_key = None
+        self._task = None
+        self._keepalive_task = None
+        self._ws = None
+        self._running = False
+
+    @property
+    def connected(self):
+        """웹소켓이 연결돼 있고 재연결 후 REST 동기화까지 끝났는지 (캐시를 믿어도 되는 상태)"""
+        return self._ws is not None and self.state.ready
+
+    def start(self):
+        """스트림 시작 (이미 실행 중이면 무시)"""
+        if self._task is None or self._task.done():
+            self._running = True
+            self._task = asyncio.create_task(self._run())
+            self._keepalive_task = asyncio.create_task(self._keepalive_loop())
+
+    async def stop(self):
+        self._running = False
+        for task in (self._keepalive_task, self._task):
+            if task is not None:
+                task.cancel()
+        self._task = None
+        self._keepalive_task = None
+
+        try:
+            if self._ws is not None:
+                await self._ws.close()
+        except Exception:
+            pass
+
+        if self._listen_key:
+            await self.client.close_listen_key()
+            self._listen_key = None
+        self.state.ready = False
+
+    async def resync(self):
+        """REST로 전체 상태 다시 읽기 (연결 직후/누락 의심 시)"""
+        try:
+            positions, open_orders, account_info = await asyncio.gather(
+                self.client.get_positions(),
+                self.client.get_open_orders(),
+                self.client.get_account_info(),
+            )
+            if account_info is None:
+                print("⚠️ 계좌 상태 동기화 실패 - 다음 재연결 시 재시도")
+                self.state.ready = False
+                return False
+            self.state.load_snapshot(positions, open_orders, account_info)
+            print(f"✅ 계좌 상태 동기화: 포지션 {len(self.state.positions)}개, 미체결 {len(self.state.open_orders)}건")
+            return True
+        except Exception as e:
+            print(f"❌ 계좌 상태 동기화 오류: {e}")
+            self.state.ready = False
+            return False
+
+    async def _run(self):
+        delay = 1
+        while self._running:
+            try:
+                if not self._listen_key:
+                    result = await self.client.create_listen_key()
+                    self._listen_key = result.get('listenKey') if result else None
+                    if not self._listen_key:
+                        raise RuntimeError("listenKey 발급 실패")
+
+                url = f"{self.client.ws_url}/ws/{self._listen_key}"
+                async with websockets.connect(url, ping_interval=20) as ws:
+                    self._ws = ws
+                    delay = 1
+                    print("✅ 사용자 데이터 스트림 연결")
+
+                    # 연결 전/끊긴 동안의 변경은 이벤트로 오지 않으므로 REST로 보정
+                    await self.resync()
+
+                    async for message in ws:
+                        if not self._dispatch(json.loads(message)):
+                            break
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ 사용자 데이터 스트림 오류: {e}")
+            finally:
+                # 끊긴 동안의 이벤트는 받지 못하므로 재연결 후 resync 성공 전까지 캐시 사용 금지
+                self._ws = None
+                self.state.ready = False
+
+            if self._running:
+                print(f"🔄 사용자 데이터 스트림 {delay}초 후 재연결")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.MAX_RECONNECT_DELAY)
+
+    def _dispatch(self, event):
+        """이벤트 반영 (False 반환 시 재연결)"""
+        event_type = event.get('e')
+        try:
+            if event_type == 'ACCOUNT_UPDATE':
+                self.state.apply_account_update(event)
+            elif event_type == 'ORDER_TRADE_UPDATE':
+                self.state.apply_order_update(event)
+            elif event_type == 'ACCOUNT_CONFIG_UPDATE':
+                self.state.apply_config_update(event)
+            elif event_type == 'listenKeyExpired':
+                print("⚠️ listenKey 만료 - 새로 발급 후 재연결")
+                self._listen_key = None
+                self.state.ready = False
+                return False
+        except Exception as e:
+            print(f"⚠️ 사용자 데이터 이벤트 처리 오류 [{event_type}]: {e}")
+        return True
+
+    async def _keepalive_loop(self):
+        while self._running:
+            await asyncio.sleep(self.KEEPALIVE_INTERVAL)
+            if self._listen_key:
+                result = await self.client.keepalive_listen_key()
+                if result is None:
+                    print("⚠️ listenKey 연장 실패 - 재발급 예정")
+                    self._listen_key = None
+                    if self._ws is not None:
+                        await self._ws.close()
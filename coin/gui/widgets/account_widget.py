@@ -12,6 +12,8 @@ class AccountWidget(QWidget):
         super().__init__()
         self.client = None
         self.update_timer = None
+        self.account_state = None  # 사용자 데이터 스트림 상태 (없으면 REST 폴링)
+        self._refresh_pending = False
         self.init_ui()
         
     def init_ui(self):
@@ -295,12 +297,38 @@ class AccountWidget(QWidget):
         # 즉시 한 번 업데이트
         asyncio.create_task(self.update_account_info())
         
-        # 🔥 타이머로 주기적 업데이트 (1분마다 = 60,000ms)
+        if self.account_state is not None:
+            self.account_state.remove_listener('account', self._on_account_event)
+        self.account_state = getattr(client, 'account_state', None)
+
+        if self.account_state is not None:
+            # 잔고/포지션 변경 이벤트마다 갱신, 타이머는 미실현 손익 갱신용
+            self.account_state.add_listener('account', self._on_account_event)
+            interval, label = 300000, "5분"
+        else:
+            interval, label = 60000, "1분"
+
+        # 🔥 타이머로 주기적 업데이트
+        if self.update_timer:
+            self.update_timer.stop()
         self.update_timer = QTimer()
         self.update_timer.timeout.connect(lambda: asyncio.create_task(self.update_account_info()))
-        self.update_timer.start(60000)  # 1분 = 60초 = 60,000ms
+        self.update_timer.start(interval)
         
-        print("✅ 계정정보 자동 업데이트: 1분마다")
+        print(f"✅ 계정정보 자동 업데이트: {label}마다 + 계좌 이벤트 시")
+
+    def _on_account_event(self):
+        """사용자 데이터 스트림 계좌 변경 콜백 - 연속 이벤트는 1초 안에 한 번만 조회"""
+        if not self.client or self._refresh_pending:
+            return
+        self._refresh_pending = True
+
+        def refresh():
+            self._refresh_pending = False
+            if self.client:
+                asyncio.create_task(self.update_account_info())
+
+        QTimer.singleShot(1000, refresh)
         
     async def update_account_info(self):
         """계좌 정보 업데이트 - 직접 바이낸스 API 사용"""
@@ -2,7 +2,170 @@
 
 import mysql.connector
 from mysql.connector import Error
-from datetime import datetime
+from datetime import datetime, date, time, timedelta
+
+
+# 🔥 일별/심볼별/방향별 집계 테이블 (통계를 O(거래 수) 대신 O(일 수)로 조회)
+DAILY_STATS_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS trade_daily_stats (
+    trade_date DATE NOT NULL,
+    symbol VARCHAR(20) NOT NULL,
+    side ENUM('LONG', 'SHORT') NOT NULL,
+    trade_count INT NOT NULL DEFAULT 0,
+    entry_count INT NOT NULL DEFAULT 0,
+    exit_count INT NOT NULL DEFAULT 0,
+    total_volume DECIMAL(30, 8) NOT NULL DEFAULT 0,
+    total_commission DECIMAL(20, 8) NOT NULL DEFAULT 0,
+    total_pnl DECIMAL(20, 8) NOT NULL DEFAULT 0,
+    max_pnl DECIMAL(20, 8) DEFAULT NULL,
+    min_pnl DECIMAL(20, 8) DEFAULT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (trade_date, symbol, side)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+DAILY_STATS_UPSERT_QUERY = """
+INSERT INTO trade_daily_stats
+(trade_date, symbol, side, trade_count, entry_count, exit_count,
+ total_volume, total_commission, total_pnl, max_pnl, min_pnl)
+VALUES (DATE(COALESCE(%s, NOW())), %s, %s, 1, %s, %s, %s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+    trade_count = trade_count + 1,
+    entry_count = entry_count + VALUES(entry_count),
+    exit_count = exit_count + VALUES(exit_count),
+    total_volume = total_volume + VALUES(total_volume),
+    total_commission = total_commission + VALUES(total_commission),
+    total_pnl = total_pnl + VALUES(total_pnl),
+    max_pnl = GREATEST(COALESCE(max_pnl, VALUES(max_pnl)), VALUES(max_pnl)),
+    min_pnl = LEAST(COALESCE(min_pnl, VALUES(min_pnl)), VALUES(min_pnl))
+"""
+
+DAILY_STATS_REBUILD_QUERY = """
+INSERT INTO trade_daily_stats
+(trade_date, symbol, side, trade_count, entry_count, exit_count,
+ total_volume, total_commission, total_pnl, max_pnl, min_pnl)
+SELECT
+    DATE(trade_time), symbol, side,
+    COUNT(*),
+    SUM(CASE WHEN trade_type = 'ENTRY' THEN 1 ELSE 0 END),
+    SUM(CASE WHEN trade_type = 'EXIT' THEN 1 ELSE 0 END),
+    COALESCE(SUM(quantity * price), 0),
+    COALESCE(SUM(commission), 0),
+    COALESCE(SUM(realized_pnl), 0),
+    MAX(realized_pnl),
+    MIN(realized_pnl)
+FROM trade_history
+GROUP BY DATE(trade_time), symbol, side
+"""
+
+_daily_stats_ready = set()  # 테이블 확인을 마친 (host, database)
+
+
+def ensure_daily_stats_table(connection, db_config):
+    """
+    집계 테이블이 없으면 만들고, 비어 있는데 거래 내역이 있으면 한 번 백필합니다.
+    (프로세스당 DB별로 한 번만 실행. CREATE TABLE은 암묵적 커밋이 일어나므로
+    거래 INSERT 전에 호출해야 합니다.)
+
+    Returns:
+        bool: 집계 테이블 사용 가능 여부 (실패하면 다음 호출 때 다시 시도)
+    """
+    key = (db_config.get('host'), db_config.get('database'))
+    if key in _daily_stats_ready:
+        return True
+
+    try:
+        cursor = connection.cursor()
+        cursor.execute(DAILY_STATS_TABLE_QUERY)
+        cursor.execute("SELECT 1 FROM trade_daily_stats LIMIT 1")
+        has_stats = cursor.fetchone() is not None
+        cursor.execute("SELECT 1 FROM trade_history LIMIT 1")
+        has_trades = cursor.fetchone() is not None
+
+        if has_trades and not has_stats:
+            print("📊 trade_daily_stats 백필 중...")
+            cursor.execute(DAILY_STATS_REBUILD_QUERY)
+            connection.commit()
+
+        cursor.close()
+        _daily_stats_ready.add(key)
+        return True
+    except Error as e:
+        print(f"⚠️ 일별 집계 테이블 준비 실패: {e}")
+        return False
+
+
+def record_daily_stats(cursor, trade_data):
+    """
+    trade_history INSERT와 같은 트랜잭션에서 일별 집계를 갱신합니다.
+    실패해도 거래 저장은 계속 진행하고, rebuild_daily_stats()로 복구할 수 있습니다.
+    """
+    trade_type = trade_data.get('trade_type')
+    quantity = float(trade_data.get('quantity') or 0)
+    price = float(trade_data.get('price') or 0)
+    realized_pnl = trade_data.get('realized_pnl', 0.0) or 0.0
+
+    try:
+        cursor.execute(DAILY_STATS_UPSERT_QUERY, (
+            trade_data.get('trade_time'),
+            trade_data.get('symbol'),
+            trade_data.get('side'),
+            1 if trade_type == 'ENTRY' else 0,
+            1 if trade_type == 'EXIT' else 0,
+            quantity * price,
+            trade_data.get('commission', 0.0) or 0.0,
+            realized_pnl,
+            realized_pnl,
+            realized_pnl
+        ))
+    except Error as e:
+        print(f"⚠️ 일별 집계 갱신 실패 (rebuild_daily_stats로 복구 가능): {e}")
+
+
+def _to_datetime(value):
+    """date/datetime/문자열을 datetime으로 변환 (date는 자정 기준)"""
+    if value is None or isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, time.min)
+    return datetime.fromisoformat(str(value))
+
+
+def split_stats_range(start, end_exclusive, now=None):
+    """
+    [start, end_exclusive) 구간을 집계 테이블로 읽을 완전한 날짜 구간과
+    trade_history 원본으로 읽을 부분 구간들로 나눕니다.
+
+    오늘(진행 중인 날)과 자정에 맞지 않는 경계 구간은 원본에서 읽습니다.
+
+    Returns:
+        tuple: ((day_from, day_to) 또는 None, [(raw_from, raw_to), ...])
+               day_to는 포함하지 않음, None은 경계 없음
+    """
+    today = datetime.combine((now or datetime.now()).date(), time.min)
+
+    if start is None:
+        day_from = None
+    elif start == datetime.combine(start.date(), time.min):
+        day_from = start
+    else:
+        day_from = datetime.combine(start.date() + timedelta(days=1), time.min)
+
+    if end_exclusive is None:
+        day_to = today
+    else:
+        day_to = min(datetime.combine(end_exclusive.date(), time.min), today)
+
+    if day_from is not None and day_from >= day_to:
+        return None, [(start, end_exclusive)]
+
+    raw_ranges = []
+    if start is not None and start < day_from:
+        raw_ranges.append((start, day_from))
+    if end_exclusive is None or day_to < end_exclusive:
+        raw_ranges.append((day_to, end_exclusive))
+
+    return (day_from, day_to), raw_ranges
 
 
 class DatabaseManager:
@@ -57,6 +220,8 @@ class DatabaseManager:
             print("❌ DB 연결 실패로 거래 저장 불가")
             return False
 
+        ensure_daily_stats_table(connection, self.db_config)
+
         query = """
         INSERT INTO trade_history
         (order_id, symbol, side, trade_type, quantity, price, leverage, realized_pnl, commission, trade_time)
@@ -85,6 +250,7 @@ class DatabaseManager:
                 trade_data.get('commission', 0.0),
                 trade_data.get('trade_time')
             ))
+            record_daily_stats(cursor, trade_data)
             connection.commit()
             
             # 🔥 저장 확인
@@ -154,9 +320,18 @@ class DatabaseManager:
             print(f"❌ 거래 내역 조회 실패: {e}")
             return []
     
-    def get_statistics(self, start_date=None, end_date=None):
+    def get_statistics(self, start_date=None, end_date=None, symbol=None, side=None):
         """
         거래 통계 조회
+
+        지난 날짜는 trade_daily_stats 집계에서, 오늘과 자정에 맞지 않는 경계 구간은
+        trade_history 원본에서 읽어 합칩니다. (조회 비용이 거래 수가 아니라 일 수에 비례)
+
+        Args:
+            start_date: 시작 시각 (포함, 선택)
+            end_date: 종료 시각 (포함, 선택)
+            symbol: 심볼 필터 (선택)
+            side: 'LONG' or 'SHORT' (선택)
         
         Returns:
             dict: 통계 정보
@@ -164,46 +339,149 @@ class DatabaseManager:
         connection = self.get_connection()
         if not connection:
             return None
+
+        stats_ready = ensure_daily_stats_table(connection, self.db_config)
+
+        start = _to_datetime(start_date)
+        end = _to_datetime(end_date)
+        # trade_time은 초 단위이므로 "<= end"는 "< end + 1초"와 같음
+        end_exclusive = end + timedelta(seconds=1) if end is not None else None
+        if stats_ready:
+            day_range, raw_ranges = split_stats_range(start, end_exclusive)
+        else:
+            # 집계 테이블을 쓸 수 없으면 (권한 없음 등) 전체 구간을 원본에서 계산
+            day_range, raw_ranges = None, [(start, end_exclusive)]
         
         try:
             cursor = connection.cursor(dictionary=True)
-            
-            query = """
-            SELECT 
-                COUNT(*) as total_trades,
-                SUM(CASE WHEN side = 'LONG' THEN 1 ELSE 0 END) as long_trades,
-                SUM(CASE WHEN side = 'SHORT' THEN 1 ELSE0 END) as short_trades,
-                SUM(CASE WHEN trade_type = 'ENTRY' THEN 1 ELSE 0 END) as entries,
-                SUM(CASE WHEN trade_type = 'EXIT' THEN 1 ELSE 0 END) as exits,
-                SUM(realized_pnl) as total_pnl,
-                SUM(commission) as total_commission,
-                AVG(realized_pnl) as avg_pnl,
-                MAX(realized_pnl) as max_profit,
-                MIN(realized_pnl) as max_loss
-            FROM trade_history
-            WHERE 1=1
-            """
-            params = []
-            
-            if start_date:
-                query += " AND trade_time >= %s"
-                params.append(start_date)
-            
-            if end_date:
-                query += " AND trade_time <= %s"
-                params.append(end_date)
-            
-            cursor.execute(query, params)
-            stats = cursor.fetchone()
+            parts = []
+
+            filter_sql = ""
+            filter_params = []
+            if symbol:
+                filter_sql += " AND symbol = %s"
+                filter_params.append(symbol)
+            if side:
+                filter_sql += " AND side = %s"
+                filter_params.append(side)
+
+            # 1. 완전한 날짜 구간: 사전 집계 테이블
+            if day_range is not None:
+                day_from, day_to = day_range
+                query = """
+                SELECT
+                    COALESCE(SUM(trade_count), 0) as total_trades,
+                    COALESCE(SUM(CASE WHEN side = 'LONG' THEN trade_count ELSE 0 END), 0) as long_trades,
+                    COALESCE(SUM(CASE WHEN side = 'SHORT' THEN trade_count ELSE 0 END), 0) as short_trades,
+                    COALESCE(SUM(entry_count), 0) as entries,
+                    COALESCE(SUM(exit_count), 0) as exits,
+                    COALESCE(SUM(total_volume), 0) as total_volume,
+                    COALESCE(SUM(total_pnl), 0) as total_pnl,
+                    COALESCE(SUM(total_commission), 0) as total_commission,
+                    MAX(max_pnl) as max_profit,
+                    MIN(min_pnl) as max_loss
+                FROM trade_daily_stats
+                WHERE trade_date < %s
+                """
+                params = [day_to.date()]
+                if day_from is not None:
+                    query += " AND trade_date >= %s"
+                    params.append(day_from.date())
+                cursor.execute(query + filter_sql, params + filter_params)
+                parts.append(cursor.fetchone())
+
+            # 2. 오늘/경계 구간: 원본 테이블 (인덱스 범위 스캔)
+            for raw_from, raw_to in raw_ranges:
+                query = """
+                SELECT 
+                    COUNT(*) as total_trades,
+                    COALESCE(SUM(CASE WHEN side = 'LONG' THEN 1 ELSE 0 END), 0) as long_trades,
+                    COALESCE(SUM(CASE WHEN side = 'SHORT' THEN 1 ELSE 0 END), 0) as short_trades,
+                    COALESCE(SUM(CASE WHEN trade_type = 'ENTRY' THEN 1 ELSE 0 END), 0) as entries,
+                    COALESCE(SUM(CASE WHEN trade_type = 'EXIT' THEN 1 ELSE 0 END), 0) as exits,
+                    COALESCE(SUM(quantity * price), 0) as total_volume,
+                    COALESCE(SUM(realized_pnl), 0) as total_pnl,
+                    COALESCE(SUM(commission), 0) as total_commission,
+                    MAX(realized_pnl) as max_profit,
+                    MIN(realized_pnl) as max_loss
+                FROM trade_history
+                WHERE 1=1
+                """
+                params = []
+                if raw_from is not None:
+                    query += " AND trade_time >= %s"
+                    params.append(raw_from)
+                if raw_to is not None:
+                    query += " AND trade_time < %s"
+                    params.append(raw_to)
+                cursor.execute(query + filter_sql, params + filter_params)
+                parts.append(cursor.fetchone())
             
             cursor.close()
             connection.close()
             
-            return stats
+            return self._combine_statistics(parts)
             
         except Error as e:
             print(f"❌ 통계 조회 실패: {e}")
+            connection.close()
             return None
+
+    @staticmethod
+    def _combine_statistics(parts):
+        """집계 구간과 원본 구간의 부분 통계를 합칩니다."""
+        stats = {
+            'total_trades': 0, 'long_trades': 0, 'short_trades': 0,
+            'entries': 0, 'exits': 0,
+            'total_volume': 0.0, 'total_pnl': 0.0, 'total_commission': 0.0,
+            'avg_pnl': None, 'max_profit': None, 'max_loss': None
+        }
+
+        for part in parts:
+            for key in ('total_trades', 'long_trades', 'short_trades', 'entries', 'exits'):
+                stats[key] += int(part[key] or 0)
+            for key in ('total_volume', 'total_pnl', 'total_commission'):
+                stats[key] += float(part[key] or 0)
+            if part['max_profit'] is not None:
+                value = float(part['max_profit'])
+                stats['max_profit'] = value if stats['max_profit'] is None else max(stats['max_profit'], value)
+            if part['max_loss'] is not None:
+                value = float(part['max_loss'])
+                stats['max_loss'] = value if stats['max_loss'] is None else min(stats['max_loss'], value)
+
+        if stats['total_trades'] > 0:
+            stats['avg_pnl'] = stats['total_pnl'] / stats['total_trades']
+
+        return stats
+
+    def rebuild_daily_stats(self):
+        """
+        trade_daily_stats를 trade_history에서 다시 계산합니다.
+        (집계 갱신이 실패했거나 거래 내역을 직접 수정한 경우)
+        
+        Returns:
+            bool: 성공 여부
+        """
+        connection = self.get_connection()
+        if not connection:
+            return False
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute(DAILY_STATS_TABLE_QUERY)
+            cursor.execute("DELETE FROM trade_daily_stats")
+            cursor.execute(DAILY_STATS_REBUILD_QUERY)
+            connection.commit()
+            print(f"✅ 일별 집계 재계산 완료: {cursor.rowcount}개 행")
+            cursor.close()
+            connection.close()
+            return True
+
+        except Error as e:
+            print(f"❌ 일별 집계 재계산 실패: {e}")
+            connection.rollback()
+            connection.close()
+            return False
     
     def test_connection(self):
         """
@@ -302,9 +580,13 @@ class DatabaseManager:
             
             # 전체 삭제
             cursor.execute("DELETE FROM trade_history")
+            deleted = cursor.rowcount
+            try:
+                cursor.execute("DELETE FROM trade_daily_stats")
+            except Error as e:
+                print(f"⚠️ 일별 집계 삭제 실패: {e}")
             connection.commit()
             
-            deleted = cursor.rowcount
             print(f"✅ {deleted}개의 거래 내역이 삭제되었습니다.")
             
             cursor.close()
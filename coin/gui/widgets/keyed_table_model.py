@@ -0,0 +1,178 @@
+# widgets/keyed_table_model.py - 키 기반 증분 테이블 모델
+"""
+포지션(심볼) / 미체결 주문(orderId)처럼 키가 있는 행을 QTableView에 표시하는 모델
+
+- set_records()는 바로 그리지 않고 한 프레임(FRAME_MS) 동안 모아 마지막 목록만 반영
+  (스트림 이벤트가 몰려도 화면 갱신은 프레임당 한 번)
+- 반영 시 키로 이전 행과 비교해 사라진 행 삭제, 바뀐 셀만 dataChanged, 새 키는 끝에 추가
+- 청산/취소 버튼은 행마다 위젯을 만들지 않고 ButtonDelegate가 그리고 클릭을 처리
+"""
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant, QTimer, QEvent, pyqtSignal
+from PyQt5.QtGui import QColor, QBrush, QFont, QPainter
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+
+
+class KeyedTableModel(QAbstractTableModel):
+    # 갱신 묶음 간격 (약 60fps)
+    FRAME_MS = 16
+
+    def __init__(self, headers, key_func, row_func, parent=None):
+        """
+        Args:
+            headers: 열 제목 목록
+            key_func: record → 행 키 (예: 심볼, orderId)
+            row_func: record → [(표시 문자열, 글자색 또는 None), ...] (열 수만큼)
+        """
+        super().__init__(parent)
+        self.headers = list(headers)
+        self.key_func = key_func
+        self.row_func = row_func
+
+        self._keys = []
+        self._rows = {}       # 키 → 셀 목록
+        self._records = {}    # 키 → 원본 record
+        self._brushes = {}
+
+        self._pending = None
+        self._flush_scheduled = False
+
+    # ---------- Qt 모델 인터페이스 ----------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._keys)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+        cells = self._rows[self._keys[index.row()]]
+        if index.column() >= len(cells):
+            return QVariant()
+        text, color = cells[index.column()]
+
+        if role == Qt.DisplayRole:
+            return text
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == Qt.ForegroundRole and color:
+            if color not in self._brushes:
+                self._brushes[color] = QBrush(QColor(color))
+            return self._brushes[color]
+        return QVariant()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return QVariant()
+
+    # ---------- 조회 ----------
+    def record(self, row):
+        if 0 <= row < len(self._keys):
+            return self._records[self._keys[row]]
+        return None
+
+    def records(self):
+        return [self._records[key] for key in self._keys]
+
+    # ---------- 갱신 ----------
+    def set_records(self, records):
+        """다음 프레임에 반영할 전체 목록 지정 (같은 프레임 안의 이전 호출은 무시)"""
+        self._pending = list(records)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            QTimer.singleShot(self.FRAME_MS, self.flush)
+
+    def flush(self):
+        """대기 중인 목록을 즉시 반영"""
+        self._flush_scheduled = False
+        records, self._pending = self._pending, None
+        if records is None:
+            return
+
+        new_records = {}
+        new_order = []
+        for record in records:
+            key = self.key_func(record)
+            if key not in new_records:
+                new_order.append(key)
+            new_records[key] = record
+
+        # 1) 사라진 행 삭제 (뒤에서부터 연속 구간 단위)
+        removed = [row for row, key in enumerate(self._keys) if key not in new_records]
+        for start, end in reversed(self._runs(removed)):
+            self.beginRemoveRows(QModelIndex(), start, end)
+            for key in self._keys[start:end + 1]:
+                del self._rows[key]
+                del self._records[key]
+            del self._keys[start:end + 1]
+            self.endRemoveRows()
+
+        # 2) 남은 행은 바뀐 셀만 알림
+        for row, key in enumerate(self._keys):
+            record = new_records[key]
+            cells = self.row_func(record)
+            old_cells = self._rows[key]
+            self._rows[key] = cells
+            self._records[key] = record
+            changed = [col for col, cell in enumerate(cells) if col >= len(old_cells) or old_cells[col] != cell]
+            if changed:
+                self.dataChanged.emit(self.index(row, changed[0]), self.index(row, changed[-1]))
+
+        # 3) 새 키는 끝에 추가
+        added = [key for key in new_order if key not in self._rows]
+        if added:
+            start = len(self._keys)
+            self.beginInsertRows(QModelIndex(), start, start + len(added) - 1)
+            for key in added:
+                self._keys.append(key)
+                self._records[key] = new_records[key]
+                self._rows[key] = self.row_func(new_records[key])
+            self.endInsertRows()
+
+    @staticmethod
+    def _runs(rows):
+        """정렬된 행 번호 → [(시작, 끝), ...] 연속 구간"""
+        runs = []
+        for row in rows:
+            if runs and runs[-1][1] == row - 1:
+                runs[-1] = (runs[-1][0], row)
+            else:
+                runs.append((row, row))
+        return runs
+
+
+class ButtonDelegate(QStyledItemDelegate):
+    """행마다 QPushButton을 만들지 않고 버튼 모양을 그려 클릭만 처리하는 델리게이트"""
+
+    clicked = pyqtSignal(int)  # 행 번호
+
+    def __init__(self, text, color='#cc0000', hover_color='#aa0000', parent=None):
+        super().__init__(parent)
+        self.text = text
+        self.color = QColor(color)
+        self.hover_color = QColor(hover_color)
+        self.font = QFont("맑은 고딕", 9, QFont.Bold)
+
+    def _button_rect(self, option):
+        return option.rect.adjusted(6, 4, -6, -4)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.hover_color if hovered else self.color)
+        painter.drawRoundedRect(self._button_rect(option), 3, 3)
+        painter.setPen(Qt.white)
+        painter.setFont(self.font)
+        painter.drawText(self._button_rect(option), Qt.AlignCenter, self.text)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton
+                and self._button_rect(option).contains(event.pos())):
+            self.clicked.emit(index.row())
+            return True
+        return False
@@ -1,16 +1,19 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QPushButton, QTableWidget, QTableWidgetItem, 
+                             QPushButton, QTableView, QAbstractItemView,
                              QHeaderView, QGroupBox, QMessageBox)
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QFont, QColor
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QFont
 from datetime import datetime
 import asyncio
 
+from widgets.keyed_table_model import KeyedTableModel, ButtonDelegate
+
 class OrderQueueWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.client = None
         self.update_timer = None
+        self.account_state = None  # 사용자 데이터 스트림 상태 (없으면 REST 폴링)
         self.init_ui()
         
     def init_ui(self):
@@ -59,11 +62,21 @@ class OrderQueueWidget(QWidget):
         table_layout = QVBoxLayout(table_group)
         
         # 주문 테이블
-        self.order_table = QTableWidget()
-        self.order_table.setColumnCount(8)
-        self.order_table.setHorizontalHeaderLabels([
-            "주문시간", "심볼", "방향", "타입", "수량", "가격", "상태", "액션"
-        ])
+        # orderId 키 모델: 바뀐 행/셀만 갱신, 취소 버튼은 델리게이트로 그림
+        self.order_model = KeyedTableModel(
+            ["주문시간", "심볼", "방향", "타입", "수량", "가격", "상태", "액션"],
+            key_func=lambda o: str(o.get('orderId', '')),
+            row_func=self._order_row,
+        )
+        self.order_table = QTableView()
+        self.order_table.setModel(self.order_model)
+        self.order_table.verticalHeader().setVisible(False)
+        self.order_table.verticalHeader().setDefaultSectionSize(35)
+        self.order_table.setMouseTracking(True)
+
+        self.cancel_delegate = ButtonDelegate("취소", parent=self.order_table)
+        self.cancel_delegate.clicked.connect(self._on_cancel_clicked)
+        self.order_table.setItemDelegateForColumn(7, self.cancel_delegate)
         
         # 테이블 헤더 설정
         header = self.order_table.horizontalHeader()
@@ -80,29 +93,29 @@ class OrderQueueWidget(QWidget):
         
         # 테이블 스타일
         self.order_table.setAlternatingRowColors(True)
-        self.order_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.order_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.order_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: #2b2b2b;
                 color: white;
                 gridline-color: #555;
                 border: 1px solid #555;
                 alternate-background-color: #353535;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 8px;
                 border-bottom: 1px solid #444;
                 color: white;
                 background-color: transparent;
             }
-            QTableWidget::item:alternate {
+            QTableView::item:alternate {
                 background-color: #353535;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #0078d4;
                 color: white;
             }
-            QTableWidget::item:hover {
+            QTableView::item:hover {
                 background-color: #404040;
             }
             QHeaderView::section {
@@ -172,28 +185,47 @@ class OrderQueueWidget(QWidget):
         """수동 주문 조회"""
         if self.client:
             print("🔄 수동 주문 조회 실행...")
-            self.update_orders()
+            asyncio.create_task(self._update_orders_async())
     
     def set_client(self, client):
         """바이낸스 클라이언트 설정"""
+        if self.account_state is not None:
+            self.account_state.remove_listener('orders', self._on_account_orders)
         self.client = client
+        self.account_state = getattr(client, 'account_state', None)
         
         # 즉시 주문 업데이트
         self.update_orders()
         
-        # 🔥 자동 업데이트 타이머 시작 (5분마다)
         if self.update_timer:
             self.update_timer.stop()
-            
+            self.update_timer = None
+
+        if self.account_state is not None:
+            # 주문 변경은 모두 ORDER_TRADE_UPDATE로 오므로 폴링 불필요
+            self.account_state.add_listener('orders', self._on_account_orders)
+            print("✅ 주문대기열 실시간 업데이트: 사용자 데이터 스트림")
+            return
+
+        # 🔥 자동 업데이트 타이머 시작 (5분마다)
         self.update_timer = QTimer()
         self.update_timer.timeout.connect(self.update_orders)
         self.update_timer.start(300000)  # 5분 = 300,000ms
         
         print("✅ 주문대기열 자동 업데이트: 5분마다")
+
+    def _on_account_orders(self):
+        """사용자 데이터 스트림 주문 변경 콜백"""
+        if self.client and self.account_state.ready:
+            asyncio.create_task(self.populate_order_table(self.account_state.open_orders_list()))
         
     def update_orders(self):
         """주문 정보 업데이트"""
-        if self.client:
+        if not self.client:
+            return
+        if self.account_state is not None and self.account_state.ready:
+            asyncio.create_task(self.populate_order_table(self.account_state.open_orders_list()))
+        else:
             asyncio.create_task(self._update_orders_async())
             
     async def _update_orders_async(self):
@@ -213,97 +245,41 @@ class OrderQueueWidget(QWidget):
             import traceback
             traceback.print_exc()
             
+    @staticmethod
+    def _order_row(order):
+        """모델 행 생성 - 바이낸스 원본 API 필드 직접 사용"""
+        side = order.get('side', '').upper()
+        orig_qty = float(order.get('origQty', 0))
+        price = float(order.get('price', 0)) if order.get('price') else 0
+        status = order.get('status', '').upper()
+        time_stamp = int(order.get('time', 0))
+
+        # 시간 변환
+        if time_stamp:
+            order_time = datetime.fromtimestamp(time_stamp / 1000).strftime('%H:%M:%S')
+        else:
+            order_time = "-"
+
+        return [
+            (order_time, None),
+            (order.get('symbol', ''), None),
+            (side, '#00ff00' if side == "BUY" else '#ff4444'),
+            (order.get('type', '').upper(), None),
+            (f"{orig_qty:.6f}", None),
+            (f"{price:.4f}" if price > 0 else "시장가", None),
+            (status, '#ffaa00' if status == "NEW" else None),
+            ("", None),  # 액션 (취소 버튼 델리게이트)
+        ]
+
     async def populate_order_table(self, orders):
         """주문 테이블 채우기 - 바이낸스 원본 데이터 사용"""
         try:
-            # print(f"=== 주문 테이블 업데이트: {len(orders)}개 ===")
-            
-            self.order_table.setRowCount(len(orders))
-            
-            buy_count = 0
-            sell_count = 0
-            
-            for row, order in enumerate(orders):
-                print(f"주문 {row}: {order}")
-                
-                # 바이낸스 원본 API 필드 직접 사용
-                order_id = str(order.get('orderId', ''))
-                symbol = order.get('symbol', '')
-                side = order.get('side', '').upper()
-                order_type = order.get('type', '').upper()
-                orig_qty = float(order.get('origQty', 0))
-                price = float(order.get('price', 0)) if order.get('price') else 0
-                status = order.get('status', '').upper()
-                time_stamp = int(order.get('time', 0))
-                
-                # 시간 변환
-                if time_stamp:
-                    order_time = datetime.fromtimestamp(time_stamp / 1000).strftime('%H:%M:%S')
-                else:
-                    order_time = "-"
-                
-                # 방향별 카운트
-                if side == "BUY":
-                    buy_count += 1
-                else:
-                    sell_count += 1
-                
-                # 테이블 아이템 설정 (바이낸스 원본 데이터 직접 사용)
-                items = [
-                    QTableWidgetItem(order_time),
-                    QTableWidgetItem(symbol),
-                    QTableWidgetItem(side),
-                    QTableWidgetItem(order_type),
-                    QTableWidgetItem(f"{orig_qty:.6f}"),
-                    QTableWidgetItem(f"{price:.4f}" if price > 0 else "시장가"),
-                    QTableWidgetItem(status),
-                ]
-                
-                # 각 열에 아이템 설정
-                for col, item in enumerate(items):
-                    item.setTextAlignment(Qt.AlignCenter)
-                    
-                    # 색상 설정
-                    if col == 2:  # 방향 열
-                        if side == "BUY":
-                            item.setForeground(QColor('#00ff00'))
-                        else:
-                            item.setForeground(QColor('#ff4444'))
-                    elif col == 6:  # 상태 열
-                        if status == "NEW":
-                            item.setForeground(QColor('#ffaa00'))
-                        
-                    self.order_table.setItem(row, col, item)
-                
-                # 취소 버튼 추가
-                cancel_button = QPushButton("취소")
-                cancel_button.setFixedSize(70, 25)
-                cancel_button.setStyleSheet("""
-                    QPushButton {
-                        background-color: #cc0000;
-                        color: white;
-                        border: none;
-                        border-radius: 3px;
-                        font-size: 10px;
-                        font-weight: bold;
-                    }
-                    QPushButton:hover {
-                        background-color: #aa0000;
-                    }
-                """)
-                cancel_button.clicked.connect(
-                    lambda checked, oid=order_id, sym=symbol: self.cancel_order(sym, oid)
-                )
-                
-                # 버튼을 중앙 정렬
-                button_widget = QWidget()
-                button_layout = QHBoxLayout(button_widget)
-                button_layout.setContentsMargins(5, 2, 5, 2)
-                button_layout.addWidget(cancel_button, 0, Qt.AlignCenter)
-                
-                self.order_table.setCellWidget(row, 7, button_widget)
-                self.order_table.setRowHeight(row, 35)
-            
+            # 실제 반영은 모델이 프레임 단위로 묶어서 처리
+            self.order_model.set_records(orders)
+
+            buy_count = sum(1 for order in orders if order.get('side', '').upper() == "BUY")
+            sell_count = len(orders) - buy_count
+
             # 요약 정보 업데이트
             total_count = len(orders)
             self.total_orders_label.setText(f"총 주문: {total_count}건")
@@ -316,6 +292,11 @@ class OrderQueueWidget(QWidget):
             print(f"주문 테이블 업데이트 오류: {e}")
             import traceback
             traceback.print_exc()
+
+    def _on_cancel_clicked(self, row):
+        order = self.order_model.record(row)
+        if order:
+            self.cancel_order(order.get('symbol', ''), str(order.get('orderId', '')))
             
     def cancel_order(self, symbol, order_id):
         """개별 주문 취소"""
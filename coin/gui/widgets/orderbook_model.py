@@ -0,0 +1,113 @@
+# widgets/orderbook_model.py - 호가창 테이블 모델
+"""
+호가 한쪽(매수/매도)을 QTableView에 표시하는 모델
+
+- 가격/수량/누적을 NumPy 배열로 보관하고 표시 문자열은 data()에서 그때그때 생성
+- 새 호가가 들어오면 이전 배열과 비교해 바뀐 셀만 dataChanged로 알림
+  (행 수가 바뀔 때만 행 추가/삭제 알림)
+- 스트림 호가창(100ms)처럼 자주 갱신해도 아이템 생성/전체 다시 그리기가 없음
+"""
+
+import numpy as np
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+from PyQt5.QtGui import QColor, QBrush
+
+
+class OrderbookTableModel(QAbstractTableModel):
+    HEADERS = ["가격(USDT)", "수량", "누적"]
+    FORMATS = ("{:.4f}", "{:.6f}", "{:.6f}")
+
+    def __init__(self, color, reverse=False, parent=None):
+        """
+        Args:
+            color: 글자색 (매도 '#ff4444', 매수 '#00ff00')
+            reverse: True면 받은 순서를 뒤집어 표시 (매도 호가: 높은 가격이 위)
+        """
+        super().__init__(parent)
+        self.reverse = reverse
+        self._brush = QBrush(QColor(color))
+        # 열 순서: 가격, 수량, 누적
+        self._values = np.zeros((0, 3), dtype=np.float64)
+
+    # ---------- Qt 모델 인터페이스 ----------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._values)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 3
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+        if role == Qt.DisplayRole:
+            return self.FORMATS[index.column()].format(self._values[index.row(), index.column()])
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == Qt.ForegroundRole:
+            return self._brush
+        return QVariant()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return QVariant()
+
+    # ---------- 갱신 ----------
+    def best_price(self):
+        """최우선 호가 (없으면 None)"""
+        if not len(self._values):
+            return None
+        return float(self._values[-1, 0] if self.reverse else self._values[0, 0])
+
+    def set_levels(self, levels):
+        """
+        호가 반영 (바뀐 셀만 알림)
+
+        Args:
+            levels: [[가격, 수량], ...] 최우선 호가부터 (문자열/숫자 모두 가능)
+        """
+        levels = np.asarray(levels, dtype=np.float64).reshape(-1, 2)
+        if self.reverse:
+            levels = levels[::-1]
+
+        new_values = np.empty((len(levels), 3), dtype=np.float64)
+        new_values[:, :2] = levels
+        # 누적은 화면 위쪽 행부터 합산
+        np.cumsum(levels[:, 1], out=new_values[:, 2])
+
+        old_rows = len(self._values)
+        new_rows = len(new_values)
+
+        if new_rows > old_rows:
+            self.beginInsertRows(QModelIndex(), old_rows, new_rows - 1)
+            self._values = np.vstack([self._values, new_values[old_rows:]])
+            self.endInsertRows()
+        elif new_rows < old_rows:
+            self.beginRemoveRows(QModelIndex(), new_rows, old_rows - 1)
+            self._values = self._values[:new_rows]
+            self.endRemoveRows()
+
+        common = min(old_rows, new_rows)
+        if common == 0:
+            self._values = new_values
+            return
+
+        changed = self._values[:common] != new_values[:common]
+        self._values = new_values
+        for column in range(3):
+            self._emit_changed_runs(np.flatnonzero(changed[:, column]), column)
+
+    def _emit_changed_runs(self, rows, column):
+        """연속된 변경 행을 묶어 dataChanged 발생"""
+        if not len(rows):
+            return
+        breaks = np.flatnonzero(np.diff(rows) > 1)
+        starts = np.concatenate(([rows[0]], rows[breaks + 1]))
+        ends = np.concatenate((rows[breaks], [rows[-1]]))
+        for start, end in zip(starts, ends):
+            self.dataChanged.emit(
+                self.index(int(start), column), self.index(int(end), column), [Qt.DisplayRole]
+            )
+
+    def clear(self):
+        self.set_levels([])
@@ -1,19 +1,30 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QPushButton, QTableWidget, QTableWidgetItem, 
+                             QPushButton, QTableView, 
                              QHeaderView, QGroupBox, QComboBox, QSpinBox)
 from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QFont, QColor
+from PyQt5.QtGui import QFont
 import asyncio
 
 from config.symbol_config import get_symbol_list
+from widgets.orderbook_model import OrderbookTableModel
 
 class OrderbookWidget(QWidget):
+    # 스트림 모드에서 호가창 다시 그리는 최소 간격 (depth 스트림 주기와 동일)
+    RENDER_INTERVAL_MS = 100
+
     def __init__(self):
         super().__init__()
         self.client = None
         self.current_symbol = "BTCUSDT"
         self.update_timer = None
         self.ticker_timer = None
+
+        # 웹소켓 시세 허브 (클라이언트가 지원하지 않으면 REST 폴링)
+        self.market_data = None
+        self._subscribed_symbol = None
+        self._latest_book = None
+        self._render_pending = False
+
         self.init_ui()
         
     def init_ui(self):
@@ -79,9 +90,11 @@ class OrderbookWidget(QWidget):
         ask_label.setStyleSheet("color: #ff4444; font-weight: bold; font-size: 12px;")
         orderbook_layout.addWidget(ask_label)
         
-        self.ask_table = QTableWidget()
-        self.ask_table.setColumnCount(3)
-        self.ask_table.setHorizontalHeaderLabels(["가격(USDT)", "수량", "누적"])
+        # 매도 호가는 빨간색, 높은 가격이 위로 오도록 뒤집어 표시
+        self.ask_model = OrderbookTableModel('#ff4444', reverse=True)
+        self.ask_table = QTableView()
+        self.ask_table.setModel(self.ask_model)
+        self.ask_table.setSelectionMode(QTableView.NoSelection)
         self.ask_table.setMaximumHeight(300)
         
         # 테이블 헤더 설정
@@ -109,9 +122,11 @@ class OrderbookWidget(QWidget):
         bid_label.setStyleSheet("color: #00ff00; font-weight: bold; font-size: 12px;")
         orderbook_layout.addWidget(bid_label)
         
-        self.bid_table = QTableWidget()
-        self.bid_table.setColumnCount(3)
-        self.bid_table.setHorizontalHeaderLabels(["가격(USDT)", "수량", "누적"])
+        # 매수 호가는 초록색, 높은 가격부터
+        self.bid_model = OrderbookTableModel('#00ff00')
+        self.bid_table = QTableView()
+        self.bid_table.setModel(self.bid_model)
+        self.bid_table.setSelectionMode(QTableView.NoSelection)
         self.bid_table.setMaximumHeight(300)
         
         # 테이블 헤더 설정
@@ -133,14 +148,14 @@ class OrderbookWidget(QWidget):
 
         # 테이블 스타일 적용
         table_style = """
-            QTableWidget {
+            QTableView {
                 background-color: #2b2b2b;
                 color: white;
                 gridline-color: #555;
                 border: 1px solid #555;
                 selection-background-color: transparent;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 6px;
                 border-bottom: 1px solid #444;
             }
@@ -197,8 +212,55 @@ class OrderbookWidget(QWidget):
         
     def set_client(self, client):
         """바이낸스 클라이언트 설정"""
+        self._unsubscribe_stream()
         self.client = client
-        self.start_auto_update()
+        self.market_data = getattr(client, 'market_data', None)
+
+        if self.market_data is not None:
+            self._subscribe_stream()
+        else:
+            self.start_auto_update()
+
+    def _subscribe_stream(self):
+        """현재 심볼의 depth/ticker 스트림 구독"""
+        if self.market_data is None:
+            return
+        if self.update_timer:
+            self.update_timer.stop()
+        if self.ticker_timer:
+            self.ticker_timer.stop()
+
+        self._subscribed_symbol = self.current_symbol
+        self.market_data.subscribe(self.current_symbol, 'depth', self._on_book_update)
+        self.market_data.subscribe(self.current_symbol, 'ticker', self._on_ticker_update)
+        print(f"✅ 호가창 스트림 구독: {self.current_symbol}")
+
+    def _unsubscribe_stream(self):
+        if self.market_data is None or self._subscribed_symbol is None:
+            return
+        self.market_data.unsubscribe(self._subscribed_symbol, 'depth', self._on_book_update)
+        self.market_data.unsubscribe(self._subscribed_symbol, 'ticker', self._on_ticker_update)
+        self._subscribed_symbol = None
+        self._latest_book = None
+
+    def _on_book_update(self, book):
+        """로컬 호가창 갱신 콜백 - RENDER_INTERVAL_MS마다 한 번만 다시 그림"""
+        self._latest_book = book
+        if not self._render_pending:
+            self._render_pending = True
+            QTimer.singleShot(self.RENDER_INTERVAL_MS, self._render_latest_book)
+
+    def _render_latest_book(self):
+        self._render_pending = False
+        book = self._latest_book
+        if book is None or not self.client or book.symbol != self.current_symbol:
+            return
+        bids, asks = book.top(self.depth_spinbox.value())
+        asyncio.create_task(self.populate_orderbook_tables({'bids': bids, 'asks': asks}))
+
+    def _on_ticker_update(self, ticker):
+        if ticker.get('symbol') == self.current_symbol:
+            self.apply_ticker_info(ticker)
         
     def start_auto_update(self):
         """자동 업데이트 시작"""
@@ -228,19 +290,29 @@ class OrderbookWidget(QWidget):
 
     def restart_timer(self):
         """타이머 재시작"""
-        if self.client:
+        if self.client and self.market_data is None:
             self.start_auto_update()
             
     def on_symbol_changed(self):
         """심볼 변경 시 호출"""
         self.current_symbol = self.symbol_combo.currentText()
-        if self.client:
+        if not self.client:
+            return
+        if self.market_data is not None:
+            self._unsubscribe_stream()
+            self._subscribe_stream()
+        else:
             self.update_orderbook()
             self.update_ticker_info()
             
     def update_orderbook(self):
         """호가창 업데이트"""
-        if self.client:
+        if not self.client:
+            return
+        if self.market_data is not None:
+            # 스트림 모드: 로컬 호가창을 즉시 다시 그림
+            self._render_latest_book()
+        else:
             asyncio.create_task(self._update_orderbook_async())
             
     async def _update_orderbook_async(self):
@@ -256,60 +328,16 @@ class OrderbookWidget(QWidget):
             print(f"호가창 업데이트 오류: {e}")
             
     async def populate_orderbook_tables(self, orderbook):
-        """호가창 테이블 채우기"""
+        """호가창 테이블 채우기 (모델이 바뀐 셀만 다시 그림)"""
         try:
-            bids = orderbook['bids'][:self.depth_spinbox.value()]
-            asks = orderbook['asks'][:self.depth_spinbox.value()]
-            
-            # ASK 테이블 채우기 (높은 가격부터)
-            asks.reverse()  # 높은 가격이 위로 오도록
-            self.ask_table.setRowCount(len(asks))
-            
-            ask_cumulative = 0
-            for row, (price, quantity) in enumerate(asks):
-                price = float(price)
-                quantity = float(quantity)
-                ask_cumulative += quantity
-                
-                price_item = QTableWidgetItem(f"{price:.4f}")
-                quantity_item = QTableWidgetItem(f"{quantity:.6f}")
-                cumulative_item = QTableWidgetItem(f"{ask_cumulative:.6f}")
-                
-                # 매도 호가는 빨간색
-                for item in [price_item, quantity_item, cumulative_item]:
-                    item.setTextAlignment(Qt.AlignCenter)
-                    item.setForeground(QColor('#ff4444'))
-                    
-                self.ask_table.setItem(row, 0, price_item)
-                self.ask_table.setItem(row, 1, quantity_item)
-                self.ask_table.setItem(row, 2, cumulative_item)
-            
-            # BID 테이블 채우기 (높은 가격부터)
-            self.bid_table.setRowCount(len(bids))
-            
-            bid_cumulative = 0
-            for row, (price, quantity) in enumerate(bids):
-                price = float(price)
-                quantity = float(quantity)
-                bid_cumulative += quantity
-                
-                price_item = QTableWidgetItem(f"{price:.4f}")
-                quantity_item = QTableWidgetItem(f"{quantity:.6f}")
-                cumulative_item = QTableWidgetItem(f"{bid_cumulative:.6f}")
-                
-                # 매수 호가는 초록색
-                for item in [price_item, quantity_item, cumulative_item]:
-                    item.setTextAlignment(Qt.AlignCenter)
-                    item.setForeground(QColor('#00ff00'))
-                    
-                self.bid_table.setItem(row, 0, price_item)
-                self.bid_table.setItem(row, 1, quantity_item)
-                self.bid_table.setItem(row, 2, cumulative_item)
+            depth = self.depth_spinbox.value()
+            self.ask_model.set_levels(orderbook['asks'][:depth])
+            self.bid_model.set_levels(orderbook['bids'][:depth])
             
             # 스프레드 계산 및 표시
-            if bids and asks:
-                best_bid = float(bids[0][0])
-                best_ask = float(asks[-1][0])  # reverse 했으므로 마지막이 최저가
+            best_bid = self.bid_model.best_price()
+            best_ask = self.ask_model.best_price()
+            if best_bid is not None and best_ask is not None:
                 spread = best_ask - best_bid
                 spread_percent = (spread / best_ask) * 100
                 
@@ -330,6 +358,15 @@ class OrderbookWidget(QWidget):
         try:
             ticker = await self.client.get_24hr_ticker(self.current_symbol)
             
+            if ticker:
+                self.apply_ticker_info(ticker)
+                
+        except Exception as e:
+            print(f"티커 정보 업데이트 오류: {e}")
+
+    def apply_ticker_info(self, ticker):
+        """24시간 티커 정보 표시 (REST 응답 / 스트림 공통)"""
+        try:
             if ticker:
                 # 현재가
                 current_price = float(ticker.get('lastPrice', 0))
@@ -362,6 +399,7 @@ class OrderbookWidget(QWidget):
             
     def closeEvent(self, event):
         """위젯 종료 시 타이머 정리"""
+        self._unsubscribe_stream()
         if self.update_timer:
             self.update_timer.stop()
         if hasattr(self, 'ticker_timer') and self.ticker_timer:
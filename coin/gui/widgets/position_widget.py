@@ -1,12 +1,14 @@
 # position_widget.py - 완전 수정본 (바이낸스 API 직접 조회)
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                             QPushButton, QTableWidget, QTableWidgetItem,
+                             QPushButton, QTableView, QAbstractItemView,
                              QHeaderView, QGroupBox, QMessageBox)
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QFont, QColor
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QFont
 import asyncio
 
+from widgets.keyed_table_model import KeyedTableModel, ButtonDelegate
+
 class PositionWidget(QWidget):
     def __init__(self):
         super().__init__()
@@ -14,9 +16,9 @@ class PositionWidget(QWidget):
         self.update_timer = None
         self.db_manager = None  
         self._update_lock = asyncio.Lock()  
+        self.account_state = None  # 사용자 데이터 스트림 상태 (없으면 REST 폴링)
         self.init_ui()
         self._update_task = None
-        self.precision_cache = {}
 
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -58,16 +60,26 @@ class PositionWidget(QWidget):
         table_group = QGroupBox("보유 포지션")
         table_layout = QVBoxLayout(table_group)
 
-        self.position_table = QTableWidget()
-        self.position_table.setColumnCount(10)
-        self.position_table.setHorizontalHeaderLabels([
-            "심볼", "방향", "레버리지", "수량", "진입가", 
-            "현재가", "미실현손익", "수익률(%)", "마진", "청산"
-        ])
+        # 심볼 키 모델: 바뀐 행/셀만 갱신, 청산 버튼은 델리게이트로 그림
+        self.position_model = KeyedTableModel(
+            ["심볼", "방향", "레버리지", "수량", "진입가",
+             "현재가", "미실현손익", "수익률(%)", "마진", "청산"],
+            key_func=lambda p: p.get('symbol', ''),
+            row_func=self._position_row,
+        )
+        self.position_table = QTableView()
+        self.position_table.setModel(self.position_model)
+        self.position_table.verticalHeader().setVisible(False)
+        self.position_table.setSelectionMode(QAbstractItemView.NoSelection)
+        self.position_table.setMouseTracking(True)
         self.position_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        
+
+        self.close_delegate = ButtonDelegate("청산", parent=self.position_table)
+        self.close_delegate.clicked.connect(self._on_close_clicked)
+        self.position_table.setItemDelegateForColumn(9, self.close_delegate)
+
         self.position_table.setStyleSheet("""
-            QTableWidget { 
+            QTableView { 
                 background-color: #2b2b2b; color: white; gridline-color: #555; 
                 border: 1px solid #555; alternate-background-color: #353535; 
             }
@@ -113,24 +125,16 @@ class PositionWidget(QWidget):
 
     async def get_quantity_precision(self, symbol):
         """
-        바이낸스 API에서 심볼의 수량 정밀도를 조회 (캐싱)
+        심볼의 수량 정밀도를 조회 (클라이언트 공용 exchangeInfo 캐시 사용)
         
         Returns:
             int: 소수점 자릿수 (예: 3 = 0.001, 0 = 정수만)
         """
-        # 캐시에 있으면 바로 반환
-        if symbol in self.precision_cache:
-            return self.precision_cache[symbol]
-        
         try:
-            print(f"   📡 {symbol} 정밀도 API 조회 중...")
             symbol_info = await self.client.get_symbol_info(symbol)
             
             if symbol_info:
-                quantity_precision = symbol_info.get('quantityPrecision', 3)
-                self.precision_cache[symbol] = quantity_precision
-                print(f"   ✅ {symbol} 수량 정밀도: {quantity_precision}자리")
-                return quantity_precision
+                return symbol_info.get('quantityPrecision', 3)
             else:
                 print(f"   ⚠️ {symbol} 정보 없음 - 기본값 3 사용")
                 return 3
@@ -140,16 +144,32 @@ class PositionWidget(QWidget):
             return 3  # 기본값
 
     def set_client(self, client):
+        if self.account_state is not None:
+            self.account_state.remove_listener('positions', self._on_account_positions)
         self.client = client
+        self.account_state = getattr(client, 'account_state', None)
+
         if self.client:
             asyncio.create_task(self._update_positions_async())
-        
-        # 🔥 1분마다 자동 업데이트
-        if not self.update_timer:
-            self.update_timer = QTimer()
-            self.update_timer.timeout.connect(self.update_positions)
-            self.update_timer.start(60000)  # 1분 = 60,000ms
-            print("✅ 포지션 자동 업데이트: 1분마다")
+
+        if self.account_state is not None:
+            # 사용자 데이터 스트림으로 포지션 변경 즉시 반영, 타이머는 현재가/손익 갱신용
+            self.account_state.add_listener('positions', self._on_account_positions)
+            interval, label = 300000, "5분"
+        else:
+            interval, label = 60000, "1분"
+
+        if self.update_timer:
+            self.update_timer.stop()
+        self.update_timer = QTimer()
+        self.update_timer.timeout.connect(self.update_positions)
+        self.update_timer.start(interval)
+        print(f"✅ 포지션 자동 업데이트: {label}마다")
+
+    def _on_account_positions(self):
+        """사용자 데이터 스트림 포지션 변경 콜백"""
+        if self.client and self.account_state.ready:
+            asyncio.create_task(self.populate_position_table(self.account_state.positions_list()))
 
     def set_db_manager(self, db_manager):
         """DB 매니저 설정"""
@@ -175,90 +195,75 @@ class PositionWidget(QWidget):
             if positions:
                 await self.populate_position_table(positions)
             else:
-                self.position_table.setRowCount(0)
+                self.position_model.set_records([])
                 self.update_summary([], 0, 0)
         except Exception as e:
             print(f"포지션 업데이트 오류: {e}")
         finally:
             self._update_task = None
 
-    async def populate_position_table(self, positions):
-        try:
-            self.position_table.setRowCount(len(positions))
-            total_pnl = 0
-            total_margin = 0
+    @staticmethod
+    def _position_metrics(position):
+        """포지션 → (수량, 진입가, 현재가, 레버리지, 마진, 수수료 차감 손익, 수익률%)"""
+        position_amt = float(position.get('positionAmt', 0))
+        entry_price = float(position.get('entryPrice', 0))
+        mark_price = float(position.get('markPrice', 0))
+        unrealized_pnl = float(position.get('unRealizedProfit', 0))
+        leverage = float(position.get('leverage', 1))
 
-            for row, position in enumerate(positions):
-                symbol = position.get('symbol', '')
-                position_amt = float(position.get('positionAmt', 0))
-                entry_price = float(position.get('entryPrice', 0))
-                mark_price = float(position.get('markPrice', 0))
-                unrealized_pnl = float(position.get('unRealizedProfit', 0))
-                leverage = float(position.get('leverage', 1))
+        notional_value = abs(position_amt) * entry_price
+        position_margin = notional_value / leverage if leverage > 0 else 0
 
-                notional_value = abs(position_amt) * entry_price
-                position_margin = notional_value / leverage if leverage > 0 else 0
+        commission = notional_value * 0.0004
+        pnl_after_fee = unrealized_pnl - commission
 
-                commission = notional_value * 0.0004
-                pnl_after_fee = unrealized_pnl - commission
+        if position_margin > 0:
+            roe_percent = (pnl_after_fee / position_margin) * 100
+        else:
+            roe_percent = 0
+
+        return position_amt, entry_price, mark_price, leverage, position_margin, pnl_after_fee, roe_percent
+
+    def _position_row(self, position):
+        """모델 행 생성 (헤더 순서: 심볼, 방향, 레버리지, 수량, 진입가, 현재가, 미실현손익, 수익률, 마진, 청산)"""
+        (position_amt, entry_price, mark_price, leverage,
+         position_margin, pnl_after_fee, roe_percent) = self._position_metrics(position)
+
+        green, red = '#00ff00', '#ff4444'
+        return [
+            (position.get('symbol', ''), None),                                  # 0: 심볼
+            ("LONG" if position_amt > 0 else "SHORT", green if position_amt > 0 else red),  # 1: 방향
+            (f"{int(leverage)}x", None),                                         # 2: 레버리지
+            (f"{abs(position_amt):.4f}", None),                                  # 3: 수량
+            (f"{entry_price:.4f}", None),                                        # 4: 진입가
+            (f"{mark_price:.4f}", None),                                         # 5: 현재가
+            (f"{pnl_after_fee:+.2f}", green if pnl_after_fee > 0 else red),      # 6: 미실현손익
+            (f"{roe_percent:.2f}%", green if roe_percent > 0 else red),          # 7: 수익률(%)
+            (f"{position_margin:.2f}", None),                                    # 8: 마진
+            ("", None),                                                          # 9: 청산 (델리게이트)
+        ]
 
-                if position_margin > 0:
-                    roe_percent = (pnl_after_fee / position_margin) * 100
-                else:
-                    roe_percent = 0
-
-                side = "LONG" if position_amt > 0 else "SHORT"
-                side_color = QColor(0, 255, 0) if position_amt > 0 else QColor(255, 68, 68)
-
-                # ✅ 수정: 헤더 순서에 맞게 items 배열 재정렬
-                # 헤더: ["심볼", "방향", "레버리지", "수량", "진입가", "현재가", "미실현손익", "수익률(%)", "마진", "청산"]
-                items = [
-                    QTableWidgetItem(symbol),                        # 0: 심볼
-                    QTableWidgetItem(side),                          # 1: 방향
-                    QTableWidgetItem(f"{int(leverage)}x"),           # 2: 레버리지 ✅
-                    QTableWidgetItem(f"{abs(position_amt):.4f}"),    # 3: 수량 ✅
-                    QTableWidgetItem(f"{entry_price:.4f}"),          # 4: 진입가 ✅
-                    QTableWidgetItem(f"{mark_price:.4f}"),           # 5: 현재가
-                    QTableWidgetItem(f"{pnl_after_fee:+.2f}"),       # 6: 미실현손익
-                    QTableWidgetItem(f"{roe_percent:.2f}%"),         # 7: 수익률(%)
-                    QTableWidgetItem(f"{position_margin:.2f}"),      # 8: 마진
-                ]
-
-                for col, item in enumerate(items):
-                    item.setTextAlignment(Qt.AlignCenter)
-                    if col == 1:  # 방향
-                        item.setForeground(side_color)
-                    elif col == 6:  # 미실현손익
-                        item.setForeground(QColor(0, 255, 0) if pnl_after_fee > 0 else QColor(255, 68, 68))
-                    elif col == 7:  # 수익률
-                        item.setForeground(QColor(0, 255, 0) if roe_percent > 0 else QColor(255, 68, 68))
-                    self.position_table.setItem(row, col, item)
-
-                # 청산 버튼 (9번 컬럼)
-                close_button = QPushButton("청산")
-                close_button.setStyleSheet("""
-                    QPushButton { 
-                        background-color: #cc0000; 
-                        color: white; 
-                        font-weight: bold; 
-                        padding: 5px; 
-                        border: none; 
-                        border-radius: 3px; 
-                    }
-                    QPushButton:hover { 
-                        background-color: #aa0000; 
-                    }
-                """)
-                close_button.clicked.connect(lambda ch, s=symbol: asyncio.create_task(self.close_position(s)))
-                self.position_table.setCellWidget(row, 9, close_button)
-
-                total_pnl += pnl_after_fee
-                total_margin += position_margin
+    async def populate_position_table(self, positions):
+        try:
+            # 실제 반영은 모델이 프레임 단위로 묶어서 처리
+            self.position_model.set_records(positions)
+
+            total_pnl = 0
+            total_margin = 0
+            for position in positions:
+                metrics = self._position_metrics(position)
+                total_margin += metrics[4]
+                total_pnl += metrics[5]
 
             self.update_summary(positions, total_margin, total_pnl)
         except Exception as e:
             print(f"테이블 업데이트 오류: {e}")
 
+    def _on_close_clicked(self, row):
+        position = self.position_model.record(row)
+        if position:
+            asyncio.create_task(self.close_position(position.get('symbol', '')))
+
     def update_summary(self, positions, total_margin, total_pnl):
         self.total_positions_label.setText(f"이 포지션: {len(positions)}개")
         self.total_margin_label.setText(f"이 마진: {total_margin:.2f} USDT")
@@ -21,6 +21,9 @@ import csv
 import os
 from pathlib import Path
 
+from widgets.database_manager import ensure_daily_stats_table, record_daily_stats
+from order_executor import OrderBatchExecutor, OrderBatcher
+from latency_trace import LatencyRecorder
 
 
 class DatabaseManager:
@@ -54,6 +57,8 @@ class DatabaseManager:
             print("❌ DB 연결 실패로 거래 저장 불가")
             return False
 
+        ensure_daily_stats_table(connection, self.db_config)
+
         query = """
         INSERT INTO trade_history
         (order_id, symbol, side, trade_type, quantity, price, leverage, realized_pnl, commission, trade_time)
@@ -89,6 +94,7 @@ class DatabaseManager:
                 trade_data.get('commission', 0.0),
                 trade_data['trade_time']
             ))
+            record_daily_stats(cursor, trade_data)
             connection.commit()
             
             rows_affected = cursor.rowcount
@@ -114,9 +120,16 @@ class PositionManager:
         self.max_positions = max_positions
         self.active_positions = {}
         
+    async def _fetch_exchange_positions(self):
+        """활성 포지션 목록 (사용자 데이터 스트림 상태가 있으면 REST 조회 생략)"""
+        account_state = getattr(self.client, 'account_state', None)
+        if account_state is not None and account_state.ready:
+            return account_state.positions_list()
+        return await self.client.get_positions()
+
     async def get_current_positions(self):
         try:
-            positions = await self.client.get_positions()
+            positions = await self._fetch_exchange_positions()
             self.active_positions = {}
             
             for pos in positions:
@@ -148,7 +161,7 @@ class PositionManager:
             print("\n🔄 포지션 동기화 시작...")
             
             # 거래소에서 실제 포지션 조회
-            exchange_positions = await self.client.get_positions()
+            exchange_positions = await self._fetch_exchange_positions()
             
             # 실제로 존재하는 포지션만 추출 (position_amt != 0)
             actual_positions = {}
@@ -194,8 +207,7 @@ class PositionManager:
 # 바이낸스 심볼 정밀도 설정 (완전 보완된 버전)
 # strategy_widget.py의 SYMBOL_PRECISION에 추가
 
-# 매매 수량설정인데 그냥 바이낸스 API에서 심볼정보 가져와 캐싱하는걸로 대체
-SYMBOL_PRECISION = {}
+# 매매 수량설정인데 그냥 바이낸스 API 심볼정보(공용 exchangeInfo 캐시)로 대체 → fetch_symbol_precision()
 # SYMBOL_PRECISION = {
 #     'BTCUSDT': {'price': 1, 'quantity': 3},
 #     'ETHUSDT': {'price': 2, 'quantity': 3},
@@ -227,33 +239,22 @@ SYMBOL_PRECISION = {}
 #     'SEIUSDT': {'price': 4, 'quantity': 0},
 # }
 
-# 바이낸스 API에서 심볼 정보를 가져와 캐싱하는 함수 추가
+# 바이낸스 API에서 심볼 정보를 가져오는 함수 (공용 exchangeInfo 캐시 사용)
 async def fetch_symbol_precision(client, symbol):
     """
-    바이낸스 API에서 심볼 정밀도 조회 및 캐싱
+    심볼 정밀도 조회
+
+    - 클라이언트의 공용 exchangeInfo 캐시(ExchangeMetadata)에서 매번 조회 → TTL 만료 시 자동 갱신
+    - 별도 정밀도 캐시는 두지 않음
     """
-    global SYMBOL_PRECISION
-    
-    # 이미 캐싱된 경우 바로 반환
-    if symbol in SYMBOL_PRECISION:
-        print(f"         ✅ {symbol} 정밀도 캐시 사용: {SYMBOL_PRECISION[symbol]}")
-        return SYMBOL_PRECISION[symbol]
-    
     try:
-        print(f"         📡 {symbol} API 조회 중...")
         symbol_info = await client.get_symbol_info(symbol)
         
         if symbol_info:
-            price_precision = symbol_info.get('pricePrecision', 2)
-            quantity_precision = symbol_info.get('quantityPrecision', 3)
-            
-            SYMBOL_PRECISION[symbol] = {
-                'price': price_precision,
-                'quantity': quantity_precision
+            return {
+                'price': symbol_info.get('pricePrecision', 2),
+                'quantity': symbol_info.get('quantityPrecision', 3)
             }
-            
-            print(f"✅ {symbol} 정밀도 로드 완료: 가격 {price_precision}자리, 수량 {quantity_precision}자리")
-            return SYMBOL_PRECISION[symbol]
         else:
             print(f"⚠️ {symbol} API 응답 없음 - 기본값 사용")
             
@@ -262,7 +263,7 @@ async def fetch_symbol_precision(client, symbol):
         import traceback
         traceback.print_exc()
     
-    # 실패 시 기본값 반환 (캐싱하지 않음)
+    # 실패 시 기본값 반환
     default_precision = {'price': 2, 'quantity': 3}
     print(f"⚠️ {symbol} 기본 정밀도 사용: {default_precision}")
     return default_precision
@@ -276,15 +277,14 @@ SYMBOL_MAPPING = {
     'SHIBUSDT': '1000SHIBUSDT',
 }
 
-def adjust_quantity_precision(symbol, quantity):
+def adjust_quantity_precision(symbol, quantity, precision=None):
     """
     심볼에 맞게 수량 정밀도 조정 + 최소값 보장
     
-    ⚠️ 주의: SYMBOL_PRECISION에 해당 심볼이 없으면 기본값 사용
-    사용 전에 fetch_symbol_precision()을 먼저 호출해야 함!
+    precision: fetch_symbol_precision() 결과 (없으면 기본값 사용)
     """
-    if symbol in SYMBOL_PRECISION:
-        precision = SYMBOL_PRECISION[symbol]['quantity']
+    if precision is not None:
+        precision = precision['quantity']
         adjusted = round(quantity, precision)
         
         # 최소값 보장
@@ -296,21 +296,20 @@ def adjust_quantity_precision(symbol, quantity):
         print(f"   📏 {symbol} 수량 조정: {quantity:.8f} -> {adjusted} (정밀도: {precision}자리)")
         return adjusted
     else:
-        # ⚠️ 경고: 캐싱되지 않은 경우 - 기본값 사용
+        # ⚠️ 경고: 정밀도를 넘기지 않은 경우 - 기본값 사용
         print(f"⚠️ {symbol} 정밀도 정보 없음! 기본값 사용 (소수점 3자리)")
         print(f"   💡 fetch_symbol_precision()을 먼저 호출하세요!")
         return max(round(quantity, 3), 0.001)
 
 
-def adjust_price_precision(symbol, price):
+def adjust_price_precision(symbol, price, precision=None):
     """
     심볼에 맞게 가격 정밀도 조정
     
-    ⚠️ 주의: SYMBOL_PRECISION에 해당 심볼이 없으면 기본값 사용
+    precision: fetch_symbol_precision() 결과 (없으면 기본값 사용)
     """
-    if symbol in SYMBOL_PRECISION:
-        precision = SYMBOL_PRECISION[symbol]['price']
-        return round(price, precision)
+    if precision is not None:
+        return round(price, precision['price'])
     else:
         print(f"⚠️ {symbol} 가격 정밀도 정보 없음! 기본값 사용 (소수점 2자리)")
         return round(price, 2)
@@ -424,6 +423,11 @@ class DatabaseWatcher(QThread):
             cursor.execute(query, params)
             signals = cursor.fetchall()
             
+            # 지연 추적용 감지 시각
+            detected_at = time.time()
+            for signal in signals:
+                signal['detected_at'] = detected_at
+            
             if len(signals) > 0:
                 print(f"  → {len(signals)}개 시그널")
 
@@ -480,6 +484,8 @@ class StrategyWidget(QWidget):
         self.position_manager = None
         self.is_processing = False
         self.pending_execution = False  # 🔥 추가
+        self.order_executor = OrderBatchExecutor(max_concurrency=5)  # 배치 주문 동시 실행
+        self.order_batcher = None  # 동시 주문을 batchOrders로 묶어 전송
         
         # 매매방식 변수 
         self.trading_mode = "CONSERVATIVE"  # "CONSERVATIVE" 또는 "AGGRESSIVE"
@@ -488,6 +494,9 @@ class StrategyWidget(QWidget):
         self.failed_orders_log = 'failed_orders.csv'
         self._ensure_log_directory()
         
+        # 시그널→체결 구간별 지연 기록 (signal_latency.jsonl)
+        self.latency_recorder = LatencyRecorder('signal_latency.jsonl')
+        
         self.ai_strategies = ['AI_XGBOOST_PREDICTION', 'AI_LSTM_PREDICTION', 'AI_RANDOM_FOREST']
         self.quant_strategies = ['RSI_REVERSAL', 'MACD_MOMENTUM', 'BOLLINGER_BREAKOUT', 'EMA_CROSSOVER']
         
@@ -890,6 +899,7 @@ class StrategyWidget(QWidget):
         
         # [1단계] 기존 포지션 관리
         print("   [1단계] 기존 포지션 관리")
+        closes = []
         for symbol, position_data in list(current_positions.items()):
             if symbol not in valid_signals:
                 print(f"      - {symbol}: 시그널 없음 → 유지")
@@ -910,25 +920,15 @@ class StrategyWidget(QWidget):
                 elif signal_type == 'SHORT':
                     # 🔥 핵심: 숏 시그널 → 청산만
                     print(f"      - {symbol}: 숏 시그널 → 롱 청산")
-                    await self.close_position_only(symbol, position_data)
+                    closes.append((symbol, position_data))
             
             # 숏 포지션 보유 시 (보수 모드에서는 이론적으로 없음)
             elif position_data['side'] == 'SHORT':
                 print(f"      - {symbol}: 숏 포지션 청산 (보수 모드)")
-                await self.close_position_only(symbol, position_data)
-            
-            await asyncio.sleep(2)
+                closes.append((symbol, position_data))
         
         # [2단계] 신규 롱 진입만
         print("\n   [2단계] 신규 롱 진입 검토")
-        await self.position_manager.get_current_positions()
-        current_positions = self.position_manager.active_positions
-        
-        if len(current_positions) >= self.position_manager.max_positions:
-            print(f"      ⚠️ 최대 포지션 도달")
-            return
-        
-        new_count = 0
         
         # 🔥 수정: 롱 시그널만 필터링해서 진입
         long_signals = {sym: sig for sym, sig in valid_signals.items() 
@@ -936,24 +936,11 @@ class StrategyWidget(QWidget):
         
         print(f"   📊 롱 시그널: {len(long_signals)}개 발견")
         
-        for symbol, signal in long_signals.items():
-            if len(current_positions) >= self.position_manager.max_positions:
-                break
-            
-            if symbol in current_positions:
-                continue
-            
-            print(f"      - {symbol}: 롱 진입 시도")
-            success = await self.open_position(signal)
-            if success:
-                new_count += 1
-                print(f"      - ✅ {symbol}: 롱 진입 성공")
-                await self.position_manager.get_current_positions()
-                current_positions = self.position_manager.active_positions
-            else:
-                print(f"      - ❌ {symbol}: 롱 진입 실패")
-            
-            await asyncio.sleep(2)
+        entries = [(symbol, signal) for symbol, signal in long_signals.items()
+                   if symbol not in current_positions]
+        
+        result = await self.execute_signal_batch(closes=closes, entries=entries)
+        new_count = result['opened']
         
         # 숏 시그널은 무시 (로그만 출력)
         short_signals = {sym: sig for sym, sig in valid_signals.items() 
@@ -972,6 +959,7 @@ class StrategyWidget(QWidget):
         
         # [1단계] 기존 포지션 관리
         print("   [1단계] 기존 포지션 관리")
+        switches = []
         for symbol, position_data in list(current_positions.items()):
             if symbol not in valid_signals:
                 print(f"      - {symbol}: 시그널 없음 → 유지")
@@ -990,23 +978,12 @@ class StrategyWidget(QWidget):
             
             # 반대 방향 → 포지션 전환
             print(f"      - {symbol}: 전환 ({position_data['side']} → {signal_type})")
-            await self.close_and_open(symbol, position_data, signal)
-            await asyncio.sleep(2)
+            switches.append((symbol, position_data, signal))
         
         # [2단계] 신규 진입 (롱/숏 모두)
         print("\n   [2단계] 신규 진입")
-        await self.position_manager.get_current_positions()
-        current_positions = self.position_manager.active_positions
-        
-        if len(current_positions) >= self.position_manager.max_positions:
-            print(f"      ⚠️ 최대 포지션 도달")
-            return
-        
-        new_count = 0
+        entries = []
         for symbol, signal in valid_signals.items():
-            if len(current_positions) >= self.position_manager.max_positions:
-                break
-            
             if symbol in current_positions:
                 continue
             
@@ -1017,17 +994,163 @@ class StrategyWidget(QWidget):
                 continue
             
             # 공격 모드: 롱/숏 모두 진입
-            print(f"      - {symbol}: {signal_type} 진입 시도")
-            success = await self.open_position(signal)
-            if success:
-                new_count += 1
-                await self.position_manager.get_current_positions()
-                current_positions = self.position_manager.active_positions
-            
-            await asyncio.sleep(2)
+            entries.append((symbol, signal))
+        
+        result = await self.execute_signal_batch(switches=switches, entries=entries)
+        new_count = result['opened']
         
         print(f"\n   ✅ 공격 모드 완료 - 신규 진입: {new_count}개")
 
+    async def _submit_order(self, symbol, side, order_type, quantity):
+        """주문 전송 (동시에 들어온 주문은 OrderBatcher가 batchOrders로 묶음)"""
+        if self.order_batcher is not None:
+            return await self.order_batcher.submit(symbol, side, order_type, quantity)
+        return await self.client.place_order(
+            symbol=symbol, side=side, order_type=order_type, quantity=quantity
+        )
+
+    def _plan_position_changes(self, current_positions, valid_signals):
+        """
+        기존 포지션별 처리 결정 (주문은 execute_signal_batch에서 실행)
+
+        Returns:
+            (closes, switches): [(symbol, position_data)], [(symbol, position_data, signal)]
+        """
+        closes = []
+        switches = []
+        for symbol, position_data in list(current_positions.items()):
+            if symbol not in valid_signals:
+                continue
+
+            signal = valid_signals[symbol]
+            signal_type = signal['signal_type']
+
+            if signal_type == 'HOLD':
+                continue
+
+            # 보수 모드
+            if self.trading_mode == "CONSERVATIVE":
+                if position_data['side'] == 'LONG' and signal_type == 'LONG':
+                    continue
+                elif position_data['side'] == 'LONG':
+                    print(f"{symbol}: 롱 청산")
+                    closes.append((symbol, position_data))
+                    continue
+                elif position_data['side'] == 'SHORT':
+                    print(f"{symbol}: 숏 청산")
+                    closes.append((symbol, position_data))
+                    continue
+
+            # 공격 모드
+            if signal_type == position_data['side']:
+                continue
+
+            print(f"{symbol}: {position_data['side']}→{signal_type}")
+            switches.append((symbol, position_data, signal))
+
+        return closes, switches
+
+    async def execute_signal_batch(self, closes=(), switches=(), entries=()):
+        """
+        시그널 배치 동시 실행
+
+        1) 청산 + 전환 대상 청산을 동시에 실행
+        2) 포지션 재조회 후 전환 재진입 + 신규 진입을 동시에 실행
+           (신규 진입은 남은 슬롯만큼, 실패한 만큼 다음 후보로 채움)
+
+        Args:
+            closes: [(symbol, position_data)] 청산만
+            switches: [(symbol, position_data, signal)] 청산 후 반대 방향 진입
+            entries: [(symbol, signal)] 신규 진입 후보 (우선순위 순)
+
+        Returns:
+            dict: {'closed', 'switched', 'opened', 'failed'}
+        """
+        summary = {'closed': 0, 'switched': 0, 'opened': 0, 'failed': []}
+        rate_governor = getattr(self.client, 'rate_governor', None)
+        start = time.time()
+
+        # [1단계] 청산
+        close_jobs = [
+            (symbol, 'CLOSE', lambda s=symbol, p=position_data: self.close_position_only(s, p))
+            for symbol, position_data in closes
+        ]
+        close_jobs += [
+            (symbol, 'SWITCH_CLOSE', lambda s=symbol, p=position_data: self.close_position_only(s, p))
+            for symbol, position_data, _ in switches
+        ]
+        close_results = await self.order_executor.run(close_jobs, rate_governor)
+
+        closed_ok = set()
+        for result in close_results:
+            if result['success']:
+                closed_ok.add(result['symbol'])
+                if result['label'] == 'CLOSE':
+                    summary['closed'] += 1
+            else:
+                summary['failed'].append((result['symbol'], result['label']))
+                if result['label'] == 'SWITCH_CLOSE':
+                    print(f"  ❌ {result['symbol']} 청산 실패로 전환 중단")
+
+        # [2단계] 진입
+        await self.position_manager.get_current_positions()
+        # 사용자 데이터 스트림 상태는 체결 직후 아직 포지션 갱신 전일 수 있음 → 방금 청산한 심볼은 제외
+        current_positions = {
+            symbol: position for symbol, position in self.position_manager.active_positions.items()
+            if symbol not in closed_ok
+        }
+
+        reopen_jobs = [
+            (symbol, 'SWITCH_OPEN', lambda sig=signal: self.open_position(sig, refresh_positions=False))
+            for symbol, _, signal in switches if symbol in closed_ok
+        ]
+
+        pending = [(symbol, signal) for symbol, signal in entries
+                   if symbol not in current_positions and symbol not in closed_ok]
+        slots = self.position_manager.max_positions - len(current_positions) - len(reopen_jobs)
+        if slots <= 0 and pending:
+            print(f"최대 도달 ({len(current_positions)}/{self.position_manager.max_positions})")
+        else:
+            print(f"가능: {max(slots, 0)}개")
+
+        jobs = reopen_jobs
+        while jobs or (slots > 0 and pending):
+            wave = pending[:max(slots, 0)]
+            pending = pending[len(wave):]
+            for symbol, signal in wave:
+                confidence = signal.get('confidence')
+                if confidence is not None:
+                    print(f"{symbol}: {signal['signal_type']} 진입 (신뢰도: {confidence:.1%})")
+                else:
+                    print(f"{symbol}: {signal['signal_type']} 진입")
+            jobs = jobs + [
+                (symbol, 'OPEN', lambda sig=signal: self.open_position(sig, refresh_positions=False))
+                for symbol, signal in wave
+            ]
+
+            for result in await self.order_executor.run(jobs, rate_governor):
+                if result['label'] == 'SWITCH_OPEN':
+                    if result['success']:
+                        summary['switched'] += 1
+                        print(f"  ✅ 포지션 전환 완료: {result['symbol']}")
+                    else:
+                        summary['failed'].append((result['symbol'], result['label']))
+                        # 재진입 실패 → 예약했던 슬롯을 다음 신규 진입 후보에 넘김
+                        slots += 1
+                elif result['success']:
+                    summary['opened'] += 1
+                    slots -= 1
+                else:
+                    summary['failed'].append((result['symbol'], result['label']))
+            jobs = []
+
+        if closed_ok or summary['opened'] or summary['switched']:
+            await self.position_manager.get_current_positions()
+
+        print(f"⚡ 배치 실행 {time.time() - start:.1f}초: 청산 {summary['closed']}, 전환 {summary['switched']}, "
+              f"신규 {summary['opened']}, 실패 {len(summary['failed'])}")
+        return summary
+
     async def close_position_manual(self, symbol, position_data):
         """
         수동 청산 함수 (Position Widget의 청산 버튼용)
@@ -1038,7 +1161,8 @@ class StrategyWidget(QWidget):
             # 기존 청산 로직
             close_qty = position_data['quantity']
             close_side = 'SELL' if position_data['side'] == 'LONG' else 'BUY'
-            close_qty = adjust_quantity_precision(symbol, close_qty)
+            precision = await fetch_symbol_precision(self.client, symbol)
+            close_qty = adjust_quantity_precision(symbol, close_qty, precision)
             
             print(f"🖐️ [수동 청산] {symbol} {position_data['side']} {close_qty}")
             
@@ -1090,23 +1214,18 @@ class StrategyWidget(QWidget):
         try:
             close_qty = position_data['quantity']
             close_side = 'SELL' if position_data['side'] == 'LONG' else 'BUY'
-            close_qty = adjust_quantity_precision(symbol, close_qty)
+            precision = await fetch_symbol_precision(self.client, symbol)
+            close_qty = adjust_quantity_precision(symbol, close_qty, precision)
             
             print(f"  📤 청산 주문: {symbol} {close_side} {close_qty}")
             
-            result = await self.client.place_order(
-                symbol=symbol, 
-                side=close_side, 
-                order_type='MARKET', 
-                quantity=close_qty
-            )
+            result = await self._submit_order(symbol, close_side, 'MARKET', close_qty)
             
             if result and 'orderId' in result:
                 order_id = result['orderId']
                 print(f"  ✅ 청산 성공: ID {order_id}")
                 
-                # 체결 정보 조회
-                await asyncio.sleep(2)
+                # 체결 정보 조회 (get_fill_info가 체결 대기 처리)
                 fill_info = await self.get_fill_info(symbol, order_id)
                 
                 if fill_info and self.db_manager:
@@ -1221,56 +1340,13 @@ class StrategyWidget(QWidget):
             
             # [1단계] 기존 포지션 처리
             print(f"\n[1단계] 기존 포지션 처리")
-            for symbol, position_data in list(current_positions.items()):
-                if symbol not in valid_signals:
-                    continue
-                
-                signal = valid_signals[symbol]
-                signal_type = signal['signal_type']
-                
-                if signal_type == 'HOLD':
-                    continue
-                
-                # 보수 모드
-                if self.trading_mode == "CONSERVATIVE":
-                    if position_data['side'] == 'LONG' and signal_type == 'LONG':
-                        continue
-                    elif position_data['side'] == 'LONG':
-                        print(f"{symbol}: 롱 청산")
-                        await self.close_position_only(symbol, position_data)
-                        continue
-                    elif position_data['side'] == 'SHORT':
-                        print(f"{symbol}: 숏 청산")
-                        await self.close_position_only(symbol, position_data)
-                        continue
-                
-                # 공격 모드
-                if signal_type == position_data['side']:
-                    continue
-                
-                print(f"{symbol}: {position_data['side']}→{signal_type}")
-                await self.close_and_open(symbol, position_data, signal)
-                await asyncio.sleep(1)
-            
-            # 포지션 재조회
-            await self.position_manager.get_current_positions()
-            current_positions = self.position_manager.active_positions
+            closes, switches = self._plan_position_changes(current_positions, valid_signals)
             
             # [2단계] 신규 진입
             print(f"\n[신규 진입]")
             
-            if len(current_positions) >= self.position_manager.max_positions:
-                print(f"최대 도달 ({len(current_positions)}/{self.position_manager.max_positions})")
-                return
-            
-            available_slots = self.position_manager.max_positions - len(current_positions)
-            print(f"가능: {available_slots}개")
-            
-            new_entry_count = 0
+            entries = []
             for symbol, signal in valid_signals.items():
-                if len(current_positions) >= self.position_manager.max_positions:
-                    break
-                
                 if symbol in current_positions:
                     continue
                 
@@ -1289,17 +1365,12 @@ class StrategyWidget(QWidget):
                     print(f"{symbol}: 숏 진입 차단 (보수 모드)")
                     continue
                 
-                print(f"{symbol}: {signal_type} 진입")
-                
-                success = await self.open_position(signal)
-                if success:
-                    new_entry_count += 1
-                    await self.position_manager.get_current_positions()
-                    current_positions = self.position_manager.active_positions
-                
-                await asyncio.sleep(1)
+                entries.append((symbol, signal))
             
-            print(f"\n완료: 신규 {new_entry_count}개, 총 {len(current_positions)}개")
+            result = await self.execute_signal_batch(closes=closes, switches=switches, entries=entries)
+            current_positions = self.position_manager.active_positions
+            
+            print(f"\n완료: 신규 {result['opened']}개, 총 {len(current_positions)}개")
             print(f"{'='*50}\n")
         
         except Exception as e:
@@ -1541,6 +1612,7 @@ class StrategyWidget(QWidget):
     def set_client(self, client):
         """바이낸스 클라이언트 설정 (완전 안전 버전)"""
         self.client = client
+        self.order_batcher = OrderBatcher(client) if hasattr(client, 'place_batch_orders') else None
         
         max_pos = 5
         
@@ -1901,52 +1973,11 @@ class StrategyWidget(QWidget):
 
             # [1단계] 기존 포지션 관리
             print("\n[기존 포지션]")
-            for symbol, position_data in list(current_positions.items()):
-                if symbol not in valid_signals:
-                    continue
-
-                signal = valid_signals[symbol]
-                signal_type = signal['signal_type']
-
-                if signal_type == 'HOLD':
-                    continue
-
-                # 보수 모드
-                if self.trading_mode == "CONSERVATIVE":
-                    if position_data['side'] == 'LONG' and signal_type == 'LONG':
-                        continue
-                    elif position_data['side'] == 'LONG':
-                        print(f"{symbol}: 롱 청산")
-                        await self.close_position_only(symbol, position_data)
-                        continue
-                    elif position_data['side'] == 'SHORT':
-                        print(f"{symbol}: 숏 청산")
-                        await self.close_position_only(symbol, position_data)
-                        continue
-
-                # 공격 모드
-                if signal_type == position_data['side']:
-                    continue
-
-                print(f"{symbol}: {position_data['side']}→{signal_type}")
-                await self.close_and_open(symbol, position_data, signal)
-                await asyncio.sleep(1)  # 🔥 2초→1초
-
-            # 포지션 재조회
-            await self.position_manager.get_current_positions()
-            current_positions = self.position_manager.active_positions
-
+            closes, switches = self._plan_position_changes(current_positions, valid_signals)
 
             # [2단계] 신규 진입
             print(f"\n[신규 진입]")
             
-            if len(current_positions) >= self.position_manager.max_positions:
-                print(f"최대 도달 ({len(current_positions)}/{self.position_manager.max_positions})")
-                return
-            
-            available_slots = self.position_manager.max_positions - len(current_positions)
-            print(f"가능: {available_slots}개")
-            
             # 🔥 신규 진입 대상 시그널 필터링
             new_entry_signals = []
             for symbol, signal in valid_signals.items():
@@ -1974,25 +2005,10 @@ class StrategyWidget(QWidget):
             
             print(f"신규 진입 후보: {len(new_entry_signals)}개 (신뢰도순 정렬)")
             
-            new_entry_count = 0
-            for symbol, signal in new_entry_signals:
-                if len(current_positions) >= self.position_manager.max_positions:
-                    break
-                
-                confidence = signal.get('confidence', 0)
-                signal_type = signal['signal_type']
-                
-                print(f"{symbol}: {signal_type} 진입 (신뢰도: {confidence:.1%})")
-                
-                success = await self.open_position(signal)
-                if success:
-                    new_entry_count += 1
-                    await self.position_manager.get_current_positions()
-                    current_positions = self.position_manager.active_positions
-                
-                await asyncio.sleep(1)
+            result = await self.execute_signal_batch(closes=closes, switches=switches, entries=new_entry_signals)
+            current_positions = self.position_manager.active_positions
             
-            print(f"\n완료: 신규 {new_entry_count}개, 총 {len(current_positions)}개")
+            print(f"\n완료: 신규 {result['opened']}개, 총 {len(current_positions)}개")
             print(f"{'='*50}\n")
 
         except Exception as e:
@@ -2021,11 +2037,7 @@ class StrategyWidget(QWidget):
 
     def start_auto_trading(self):
         """🔥 수정: 초기 스캔 실행 추가"""
-        global SYMBOL_PRECISION
-        SYMBOL_PRECISION = {}
-        print("🔄 정밀도 캐시 초기화")
-        
-            # 수동 청산 기록 초기화
+        # 수동 청산 기록 초기화
         if not hasattr(self, 'manually_closed_symbols'):
             self.manually_closed_symbols = set()
         self.manually_closed_symbols.clear()
@@ -2330,7 +2342,23 @@ class StrategyWidget(QWidget):
     async def get_fill_info(self, symbol, order_id):
         """주문 체결 정보 조회"""
         try:
-            await asyncio.sleep(1)
+            # 사용자 데이터 스트림이 있으면 체결 이벤트를 기다림 (고정 대기 없음)
+            account_state = getattr(self.client, 'account_state', None)
+            if account_state is not None and account_state.ready:
+                fill = await account_state.wait_for_fill(order_id, timeout=5.0)
+                if fill:
+                    print(f"         📊 실제 체결 정보 (스트림):")
+                    print(f"            가격: {fill['avgPrice']}")
+                    print(f"            수량: {fill['executedQty']}")
+                    print(f"            수수료: {fill['commission']:.4f} USDT")
+                    return {
+                        'avgPrice': fill['avgPrice'],
+                        'executedQty': fill['executedQty'],
+                        'commission': fill['commission']
+                    }
+                print(f"         ⚠️ 체결 이벤트 대기 시간 초과 - REST 조회")
+            else:
+                await asyncio.sleep(1)
             
             order_info = await self.client.get_order(symbol, order_id)
             
@@ -2369,8 +2397,13 @@ class StrategyWidget(QWidget):
             return 1000
         return 1
 
-    async def open_position(self, signal):
-        """포지션 진입 (레버리지 및 수량 계산 수정)"""
+    async def open_position(self, signal, refresh_positions=True):
+        """
+        포지션 진입 (레버리지 및 수량 계산 수정)
+
+        refresh_positions=False면 진입 후 포지션 재조회 생략 (배치 실행 시 한 번에 조회)
+        """
+        trace = self.latency_recorder.start(signal)
         try:
             symbol = signal.get('binance_symbol', signal['symbol'])
             signal_type = signal['signal_type']
@@ -2379,8 +2412,7 @@ class StrategyWidget(QWidget):
                 return False
             
             # 🔥 1. 정밀도 및 심볼 정보 로드
-            if symbol not in SYMBOL_PRECISION:
-                await fetch_symbol_precision(self.client, symbol)
+            precision = await fetch_symbol_precision(self.client, symbol)
             
             symbol_info = await self.client.get_symbol_info(symbol)
             if not symbol_info:
@@ -2389,6 +2421,7 @@ class StrategyWidget(QWidget):
             
             min_qty = float(symbol_info.get('minQty', 0))
             min_notional = float(symbol_info.get('minNotional', 5.0))
+            trace.mark('precision')
             
             # 🔥 2. 현재가 조회
             ticker = await self.client.get_ticker(symbol)
@@ -2444,6 +2477,7 @@ class StrategyWidget(QWidget):
                 return False  # 🔥 레버리지 설정 실패시 거래 중단
             else:
                 print(f"  ✅ 레버리지 {leverage}x 설정 완료")
+            trace.mark('leverage')
             
             # 🔥 가격 조회: 바이낸스 API 가격 사용 (필수!)
             ticker = await self.client.get_ticker(symbol)
@@ -2472,7 +2506,7 @@ class StrategyWidget(QWidget):
             
             # ✅ 4. 주문 수량 계산
             raw_quantity = target_position_value / current_price
-            quantity = adjust_quantity_precision(symbol, raw_quantity)
+            quantity = adjust_quantity_precision(symbol, raw_quantity, precision)
             
             # ✅ 5. 실제 필요 증거금 재계산 (검증용)
             actual_position_value = quantity * current_price
@@ -2496,7 +2530,7 @@ class StrategyWidget(QWidget):
                 print(f"  ⚠️ 경고: 필요 증거금({required_margin:.2f})이 할당량({margin_per_position:.2f})을 초과!")
                 # 수량 재조정
                 safe_quantity = (margin_per_position * 0.95 * leverage) / current_price
-                quantity = adjust_quantity_precision(symbol, safe_quantity)
+                quantity = adjust_quantity_precision(symbol, safe_quantity, precision)
                 print(f"  🔧 수량 자동 조정: {quantity}")
             
             # 최소 주문 금액 검증
@@ -2523,20 +2557,18 @@ class StrategyWidget(QWidget):
             
             print(f"  📤 주문 실행: {symbol} {side} {quantity} @ ${current_price}")
             
-            result = await self.client.place_order(
-                symbol=symbol,
-                side=side,
-                order_type='MARKET',
-                quantity=quantity
-            )
+            trace.mark('order_sent')
+            result = await self._submit_order(symbol, side, 'MARKET', quantity)
             
             if result and 'orderId' in result:
+                trace.mark('ack')
                 order_id = result['orderId']
                 print(f"  ✅ 주문 성공: ID {order_id}")
                 
-                # 체결 정보 조회
-                await asyncio.sleep(2)
+                # 체결 정보 조회 (get_fill_info가 체결 대기 처리)
                 fill_info = await self.get_fill_info(symbol, order_id)
+                if fill_info:
+                    trace.mark('fill')
                 
                 if fill_info and self.db_manager:
                     # DB 저장
@@ -2552,11 +2584,13 @@ class StrategyWidget(QWidget):
                         'commission': fill_info['commission'],
                         'trade_time': datetime.now()
                     }
-                    self.db_manager.save_trade(trade_data)
+                    if self.db_manager.save_trade(trade_data):
+                        trace.mark('db_saved')
                 
                 self.trade_executed.emit()
-                await asyncio.sleep(2)
-                await self.position_manager.get_current_positions()
+                if refresh_positions:
+                    await asyncio.sleep(2)
+                    await self.position_manager.get_current_positions()
                 
                 return True
             else:
@@ -2568,24 +2602,25 @@ class StrategyWidget(QWidget):
             import traceback
             traceback.print_exc()
             return False
+        finally:
+            self.latency_recorder.finish(trace)
 
 
-    # 🔥 4. 프로그램 시작 시 캐시 초기화 함수 추가
-    def clear_precision_cache():
-        """정밀도 캐시 초기화"""
-        global SYMBOL_PRECISION
-        SYMBOL_PRECISION.clear()
-        print("🔄 정밀도 캐시 초기화 완료")
-
     async def set_margin_mode(self, symbol, margin_type):
         """마진 모드 설정 (CROSS/ISOLATED)"""
         if not self.client:
             return
         
         try:
+            # 클라이언트 캐시로 이미 같은 모드면 요청 생략
+            if hasattr(self.client, 'set_margin_type'):
+                result = await self.client.set_margin_type(symbol, margin_type)
+                print(f"✅ {symbol} 마진 모드: {margin_type}")
+                return result
+
             params = {
                 'symbol': symbol,
-                'marginType': margin_type
+                'marginType': 'CROSSED' if margin_type == 'CROSS' else margin_type
             }
             
             result = await self.client._make_request(
@@ -2616,6 +2651,9 @@ class StrategyWidget(QWidget):
             self.db_watcher.stop_watching()
             print("   ✅ DB Watcher 중지 완료")
         
+        if self.latency_recorder.records:
+            self.latency_recorder.print_summary()
+        
         self.signal_status_label.setText("🔴 중지")
         self.signal_status_label.setStyleSheet("color: #ff4444;")
         self.auto_status_label.setText("자동매매: 중지")
@@ -2661,6 +2699,7 @@ class StrategyWidget(QWidget):
             return
         
         self.is_processing = True
+        self.latency_recorder.start(signal).mark('dispatched')
         
         try:
             symbol = signal['symbol']
@@ -2724,6 +2763,8 @@ class StrategyWidget(QWidget):
             import traceback
             traceback.print_exc()
         finally:
+            # 진입 없이 끝난 시그널 (HOLD, 동일 방향, 청산만 등)
+            self.latency_recorder.finish(signal.get('_trace'), 'skipped')
             self.is_processing = False
 
     def closeEvent(self, event):
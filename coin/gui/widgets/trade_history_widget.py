@@ -1,26 +1,353 @@
-# trade_history_widget.py - 페이지네이션 기능 추가
+# trade_history_widget.py - 키셋 페이지네이션 + 지연 로딩 모델
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                             QPushButton, QTableWidget, QTableWidgetItem,
+                             QPushButton, QTableView,
                              QHeaderView, QGroupBox, QComboBox, QDateEdit,
-                             QCheckBox, QMessageBox, QFileDialog)
-from PyQt5.QtCore import Qt, QDate
+                             QCheckBox, QMessageBox, QFileDialog, QProgressDialog)
+from PyQt5.QtCore import Qt, QDate, QAbstractTableModel, QModelIndex, QThread, pyqtSignal
 from PyQt5.QtGui import QFont, QColor
 from datetime import datetime, timedelta
+import asyncio
+import csv
+import os
 import mysql.connector
 
+from widgets.database_manager import DatabaseManager
+
+
+class TradeHistoryModel(QAbstractTableModel):
+    """
+    trade_history 테이블을 (trade_time, id) 키셋 페이지네이션으로 읽는 지연 로딩 모델
+
+    - OFFSET 없이 마지막 행의 (trade_time, id) 다음부터 조회하므로 뒤쪽 페이지도 일정한 속도
+    - 뷰가 스크롤 끝에 닿으면 canFetchMore/fetchMore로 다음 페이지를 붙임
+    - 한 페이지를 붙이면 다음 페이지를 백그라운드(executor)에서 미리 읽어둠
+    """
+
+    HEADERS = ["시간", "심볼", "방향", "타입", "수량", "가격",
+               "레버리지", "거래금액", "수수료", "실현손익", "순수익%"]
+
+    def __init__(self, page_size=50, parent=None):
+        super().__init__(parent)
+        self.page_size = page_size
+        self.db_config = None
+        self.where_conditions = "WHERE 1=1"
+        self.params = []
+
+        self._rows = []           # DB 원본 행 (dict)
+        self._display = []        # 행별 표시 문자열 (미리 포맷)
+        self._last_key = None     # 마지막으로 붙인 행의 (trade_time, id)
+        self._exhausted = True
+        self._prefetched = None   # 미리 읽어둔 다음 페이지
+        self._prefetch_future = None
+        self._fetch_requested = False
+        self._generation = 0      # 필터 변경 시 증가 (이전 prefetch 결과 폐기용)
+
+    # ---------- 쿼리 ----------
+    def reset_query(self, db_config, where_conditions, params):
+        """필터 변경 시 모델 초기화"""
+        self.beginResetModel()
+        self.db_config = db_config
+        self.where_conditions = where_conditions
+        self.params = list(params)
+        self._rows = []
+        self._display = []
+        self._last_key = None
+        self._exhausted = False
+        self._prefetched = None
+        self._prefetch_future = None
+        self._fetch_requested = False
+        self._generation += 1
+        self.endResetModel()
+
+    def _query_page(self, last_key):
+        """키셋 조건으로 한 페이지 조회 (executor 스레드에서도 호출되므로 연결을 따로 생성)"""
+        query = f"SELECT * FROM trade_history {self.where_conditions}"
+        params = list(self.params)
+
+        if last_key is not None:
+            last_time, last_id = last_key
+            query += " AND (trade_time < %s OR (trade_time = %s AND id < %s))"
+            params.extend([last_time, last_time, last_id])
+
+        query += " ORDER BY trade_time DESC, id DESC LIMIT %s"
+        params.append(self.page_size)
+
+        connection = mysql.connector.connect(**self.db_config)
+        try:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            cursor.close()
+            return rows
+        finally:
+            connection.close()
+
+    # ---------- 지연 로딩 ----------
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.db_config is None:
+            return False
+        return not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted or self.db_config is None:
+            return
+
+        if self._prefetched is not None:
+            rows = self._prefetched
+            self._prefetched = None
+            self._append_rows(rows)
+            self._start_prefetch()
+        elif self._prefetch_future is None:
+            # 첫 페이지 또는 prefetch 불가 환경 → 동기 조회
+            try:
+                rows = self._query_page(self._last_key)
+            except Exception as e:
+                print(f"거래내역 페이지 조회 오류: {e}")
+                self._exhausted = True
+                return
+            self._append_rows(rows)
+            self._start_prefetch()
+        else:
+            # prefetch 진행 중 → 완료되면 바로 붙임
+            self._fetch_requested = True
+
+    def _append_rows(self, rows):
+        if len(rows) < self.page_size:
+            self._exhausted = True
+        if not rows:
+            return
+
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self._rows.extend(rows)
+        self._display.extend(self._format_row(row) for row in rows)
+        self.endInsertRows()
+
+        last = rows[-1]
+        self._last_key = (last.get('trade_time'), last.get('id'))
+
+    def _start_prefetch(self):
+        """다음 페이지를 백그라운드에서 미리 조회"""
+        if self._exhausted:
+            return
+        try:
+            loop = asyncio.get_event_loop()
+        except RuntimeError:
+            return
+
+        generation = self._generation
+        future = loop.run_in_executor(None, self._query_page, self._last_key)
+        self._prefetch_future = future
+        future.add_done_callback(lambda f, g=generation: self._on_prefetch_done(f, g))
+
+    def _on_prefetch_done(self, future, generation):
+        if generation != self._generation:
+            return  # 필터가 바뀐 뒤 도착한 결과는 버림
+
+        self._prefetch_future = None
+        try:
+            rows = future.result()
+        except Exception as e:
+            print(f"거래내역 prefetch 오류: {e}")
+            return
+
+        self._prefetched = rows
+        if self._fetch_requested:
+            self._fetch_requested = False
+            self.fetchMore()
+
+    # ---------- 표시 ----------
+    def _format_row(self, trade):
+        trade_time = trade.get('trade_time')
+        if trade_time and isinstance(trade_time, datetime):
+            time_str = trade_time.strftime('%Y-%m-%d %H:%M:%S')
+        else:
+            time_str = str(trade_time) if trade_time else 'N/A'
+
+        try:
+            quantity = float(trade.get('quantity') or 0)
+            price = float(trade.get('price') or 0)
+            leverage = int(trade.get('leverage') or 1)
+            commission = float(trade.get('commission') or 0)
+            realized_pnl = float(trade.get('realized_pnl') or 0)
+        except (ValueError, TypeError):
+            quantity = price = commission = realized_pnl = 0.0
+            leverage = 1
+
+        entry_value = quantity * price
+        net_profit_percent = (realized_pnl / entry_value * 100) if entry_value > 0 else 0
+
+        return (
+            time_str,
+            str(trade.get('symbol', 'N/A')),
+            str(trade.get('side', 'N/A')),
+            str(trade.get('trade_type', 'N/A')),
+            f"{quantity:.4f}",
+            f"{price:.2f}",
+            f"{leverage}x",
+            f"{entry_value:.2f}",
+            f"{commission:.6f}",
+            f"{realized_pnl:.2f}",
+            f"{net_profit_percent:.2f}%",
+        ), realized_pnl
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        texts, realized_pnl = self._display[index.row()]
+        col = index.column()
+
+        if role == Qt.DisplayRole:
+            return texts[col]
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == Qt.ForegroundRole:
+            if col == 2:
+                if texts[2] == 'LONG':
+                    return QColor("#00ff00")
+                if texts[2] == 'SHORT':
+                    return QColor("#ff4444")
+            elif col in (9, 10):
+                if realized_pnl > 0:
+                    return QColor("#00ff00")
+                if realized_pnl < 0:
+                    return QColor("#ff4444")
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def loaded_trades(self):
+        """현재까지 로드된 원본 행"""
+        return list(self._rows)
+
+
+class TradeExportWorker(QThread):
+    """
+    거래 내역을 DB에서 청크 단위로 스트리밍하여 파일로 내보내는 백그라운드 작업
+
+    - 비버퍼 커서(서버 측 커서)로 chunk_size 행씩 읽어 메모리 사용량이 행 수와 무관
+    - xlsx는 openpyxl write-only 모드, csv는 csv.writer로 바로 기록
+    """
+    progress = pyqtSignal(int, int)    # (기록한 행 수, 전체 행 수)
+    finished_export = pyqtSignal(str, int)  # (파일 경로, 기록한 행 수)
+    failed = pyqtSignal(str)
+
+    COLUMNS = ["시간", "심볼", "방향", "타입", "수량", "가격", "레버리지", "수수료", "실현손익"]
+
+    def __init__(self, db_config, where_conditions, params, file_path,
+                 file_format='xlsx', total_count=0, chunk_size=5000):
+        super().__init__()
+        self.db_config = db_config
+        self.where_conditions = where_conditions
+        self.params = list(params)
+        self.file_path = file_path
+        self.file_format = file_format
+        self.total_count = total_count
+        self.chunk_size = chunk_size
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def _remove_partial_file(self, started):
+        """취소/오류로 중간까지만 기록된 파일 삭제 (쓰기 시작 전이면 건드리지 않음)"""
+        if not started or not os.path.exists(self.file_path):
+            return
+        try:
+            os.remove(self.file_path)
+        except OSError as e:
+            print(f"미완성 내보내기 파일 삭제 실패: {e}")
+
+    def _iter_chunks(self, cursor):
+        query = f"""
+            SELECT trade_time, symbol, side, trade_type, quantity, price,
+                   leverage, commission, realized_pnl
+            FROM trade_history
+            {self.where_conditions}
+            ORDER BY trade_time DESC, id DESC
+        """
+        cursor.execute(query, self.params)
+        while not self._cancelled:
+            rows = cursor.fetchmany(self.chunk_size)
+            if not rows:
+                break
+            yield rows
+
+    def run(self):
+        connection = None
+        written = 0
+        started = False
+        try:
+            connection = mysql.connector.connect(**self.db_config)
+            cursor = connection.cursor(buffered=False)
+
+            if self.file_format == 'csv':
+                # utf-8-sig: 엑셀에서 한글이 깨지지 않도록 BOM 포함
+                started = True
+                with open(self.file_path, 'w', newline='', encoding='utf-8-sig') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(self.COLUMNS)
+                    for rows in self._iter_chunks(cursor):
+                        writer.writerows(rows)
+                        written += len(rows)
+                        self.progress.emit(written, self.total_count)
+            else:
+                from openpyxl import Workbook
+
+                workbook = Workbook(write_only=True)
+                sheet = workbook.create_sheet("거래내역")
+                sheet.append(self.COLUMNS)
+                for rows in self._iter_chunks(cursor):
+                    for row in rows:
+                        sheet.append(row)
+                    written += len(rows)
+                    self.progress.emit(written, self.total_count)
+                if not self._cancelled:
+                    started = True
+                    workbook.save(self.file_path)
+
+            if self._cancelled:
+                self._remove_partial_file(started)
+                self.failed.emit("사용자가 내보내기를 취소했습니다.")
+            else:
+                self.finished_export.emit(self.file_path, written)
+
+        except Exception as e:
+            print(f"거래내역 내보내기 오류: {e}")
+            self._remove_partial_file(started)
+            self.failed.emit(str(e))
+        finally:
+            if connection is not None:
+                try:
+                    connection.close()
+                except Exception:
+                    pass  # 취소로 남은 미수신 결과가 있어도 무시
+
+
 class TradeHistoryWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.client = None
         self.db_config = None
+        self.db_manager = None
         
-        # 🔥 페이지네이션 변수
-        self.current_page = 1
-        self.items_per_page = 20
-        self.max_items = 200  # 최대 200개 (10페이지)
+        # 🔥 키셋 페이지네이션 변수
+        self.page_size = 50
         self.total_count = 0
-        self.all_trades = []  # 조회된 전체 데이터 (최대 200개)
+        self._stats_cache = {}  # (필터, MAX(id)) -> 집계 결과
+        self.export_worker = None
+        self.export_progress = None
         
         self.init_ui()
 
@@ -60,7 +387,7 @@ class TradeHistoryWidget(QWidget):
         self.search_button = QPushButton("조회")
         self.search_button.clicked.connect(self.load_trade_history)
         row2_layout.addWidget(self.search_button)
-        self.export_button = QPushButton("엑셀 내보내기")
+        self.export_button = QPushButton("엑셀/CSV 내보내기")
         self.export_button.clicked.connect(self.export_to_excel)
         row2_layout.addWidget(self.export_button)
         filter_layout.addLayout(row2_layout)
@@ -80,30 +407,28 @@ class TradeHistoryWidget(QWidget):
             summary_layout.addWidget(label)
         layout.addWidget(summary_group)
 
-        # 🔥 페이지네이션 컨트롤
+        # 🔥 페이지네이션 컨트롤 (스크롤 시 자동 로드 + 수동 더보기)
         pagination_layout = QHBoxLayout()
-        self.page_info_label = QLabel("페이지: 0 / 0")
-        self.prev_button = QPushButton("◀ 이전")
-        self.prev_button.clicked.connect(self.prev_page)
-        self.next_button = QPushButton("다음 ▶")
-        self.next_button.clicked.connect(self.next_page)
+        self.page_info_label = QLabel("로드: 0 / 0건")
+        self.load_more_button = QPushButton("더 불러오기 ▼")
+        self.load_more_button.clicked.connect(self.load_more)
         
         pagination_layout.addWidget(self.page_info_label)
         pagination_layout.addStretch()
-        pagination_layout.addWidget(self.prev_button)
-        pagination_layout.addWidget(self.next_button)
+        pagination_layout.addWidget(self.load_more_button)
         layout.addLayout(pagination_layout)
 
         # 거래내역 테이블 섹션
         table_group = QGroupBox("거래 내역")
         table_layout = QVBoxLayout(table_group)
 
-        self.history_table = QTableWidget()
-        self.history_table.setColumnCount(11)
-        self.history_table.setHorizontalHeaderLabels([
-            "시간", "심볼", "방향", "타입", "수량", "가격", 
-            "레버리지", "거래금액", "수수료", "실현손익", "순수익%"
-        ])
+        self.history_model = TradeHistoryModel(page_size=self.page_size, parent=self)
+        self.history_model.rowsInserted.connect(self.update_page_info)
+        self.history_model.modelReset.connect(self.update_page_info)
+
+        self.history_table = QTableView()
+        self.history_table.setModel(self.history_model)
+        self.history_table.verticalHeader().setVisible(False)
         self.history_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         table_layout.addWidget(self.history_table)
         layout.addWidget(table_group)
@@ -132,12 +457,12 @@ class TradeHistoryWidget(QWidget):
             QPushButton:disabled { background-color: #555; color: #888; }
             QLabel { color: white; padding: 2px; }
             QCheckBox { color: white; }
-            QTableWidget { 
+            QTableView { 
                 background-color: #2b2b2b; color: white; gridline-color: #555; 
                 border: 1px solid #555; alternate-background-color: #353535; 
             }
-            QTableWidget::item { padding: 8px; border-bottom: 1px solid #444; }
-            QTableWidget::item:selected { background-color: #0078d4; }
+            QTableView::item { padding: 8px; border-bottom: 1px solid #444; }
+            QTableView::item:selected { background-color: #0078d4; }
             QHeaderView::section { 
                 background-color: #444; color: white; padding: 8px; 
                 border: 1px solid #555; font-weight: bold; 
@@ -146,190 +471,118 @@ class TradeHistoryWidget(QWidget):
 
     def set_db_config(self, db_config):
         self.db_config = db_config
+        self.db_manager = DatabaseManager(db_config) if db_config else None
         self.load_trade_history()
 
     def load_trade_history(self):
         """거래 내역 조회 시작"""
         if self.db_config:
-            self.current_page = 1  # 조회 시 페이지 초기화
             self._load_trade_history_from_db()
         else:
             QMessageBox.warning(self, "오류", "먼저 DB에 연결해주세요.")
 
+    def _build_where_conditions(self):
+        """현재 필터로 WHERE 절과 파라미터 구성"""
+        where_conditions = "WHERE 1=1"
+        params = []
+
+        symbol = self.symbol_combo.currentText()
+        if symbol != "전체":
+            where_conditions += " AND symbol = %s"
+            params.append(symbol)
+
+        side = self.side_combo.currentText()
+        if side != "전체":
+            side_param = 'LONG' if side == 'BUY' else 'SHORT'
+            where_conditions += " AND side = %s"
+            params.append(side_param)
+
+        start_date = self.start_date.date().toPyDate()
+        end_date = self.end_date.date().toPyDate() + timedelta(days=1)
+        
+        where_conditions += " AND trade_time >= %s AND trade_time < %s"
+        params.extend([start_date, end_date])
+
+        return where_conditions, params
+
+    def _get_summary_stats(self, cursor, where_conditions, params):
+        """
+        필터별 집계 조회 (캐시 사용)
+
+        캐시 키에 MAX(id)를 포함시켜 새 거래가 저장되면 자동으로 다시 집계한다.
+        MAX(id)는 PK 인덱스로 바로 구해지므로 매번 확인해도 비용이 거의 없다.
+        집계 자체는 DatabaseManager.get_statistics가 일별 집계 테이블 + 당일 원본으로 계산한다.
+        """
+        cursor.execute("SELECT MAX(id) AS max_id FROM trade_history")
+        max_id = cursor.fetchone()['max_id']
+
+        cache_key = (where_conditions, tuple(params), max_id)
+        if cache_key in self._stats_cache:
+            return self._stats_cache[cache_key]
+
+        symbol = self.symbol_combo.currentText()
+        side = self.side_combo.currentText()
+        start_date = self.start_date.date().toPyDate()
+        # get_statistics의 종료 시각은 포함(<=)이므로 다음날 자정 1초 전까지
+        end_time = datetime.combine(self.end_date.date().toPyDate() + timedelta(days=1),
+                                    datetime.min.time()) - timedelta(seconds=1)
+
+        result = self.db_manager.get_statistics(
+            start_date=start_date,
+            end_date=end_time,
+            symbol=None if symbol == "전체" else symbol,
+            side=None if side == "전체" else ('LONG' if side == 'BUY' else 'SHORT')
+        )
+        if result is None:
+            raise RuntimeError("거래 통계 조회 실패")
+
+        stats = {
+            'total_count': result['total_trades'],
+            'total_volume': result['total_volume'],
+            'total_fee': result['total_commission'],
+            'total_pnl': result['total_pnl']
+        }
+
+        # 오래된 MAX(id) 기준 캐시는 다시 쓰일 일이 없으므로 정리
+        self._stats_cache = {k: v for k, v in self._stats_cache.items() if k[2] == max_id}
+        self._stats_cache[cache_key] = stats
+        return stats
+
     def _load_trade_history_from_db(self):
         try:
-            connection = mysql.connector.connect(**self.db_config)
-            cursor = connection.cursor(dictionary=True)
-
             # 🔥 1단계: WHERE 조건 구성
-            where_conditions = "WHERE 1=1"
-            params = []
-
-            symbol = self.symbol_combo.currentText()
-            if symbol != "전체":
-                where_conditions += " AND symbol = %s"
-                params.append(symbol)
-
-            side = self.side_combo.currentText()
-            if side != "전체":
-                side_param = 'LONG' if side == 'BUY' else 'SHORT'
-                where_conditions += " AND side = %s"
-                params.append(side_param)
-
-            start_date = self.start_date.date().toPyDate()
-            end_date = self.end_date.date().toPyDate() + timedelta(days=1)
-            
-            where_conditions += " AND trade_time >= %s AND trade_time < %s"
-            params.extend([start_date, end_date])
-            
-            # 🔥 2단계: 전체 건수 및 통계 조회
-            count_query = f"""
-                SELECT 
-                    COUNT(*) as total_count,
-                    COALESCE(SUM(quantity * price), 0) as total_volume,
-                    COALESCE(SUM(commission), 0) as total_fee,
-                    COALESCE(SUM(realized_pnl), 0) as total_pnl
-                FROM trade_history
-                {where_conditions}
-            """
-            cursor.execute(count_query, params)
-            stats = cursor.fetchone()
-            self.total_count = stats['total_count']
-            
-            # 🔥 3단계: 화면 표시용 데이터 조회 (최대 100개만)
-            data_query = f"""
-                SELECT * FROM trade_history 
-                {where_conditions} 
-                ORDER BY trade_time DESC 
-                LIMIT {self.max_items}
-            """
-            cursor.execute(data_query, params)
-            self.all_trades = cursor.fetchall()
+            where_conditions, params = self._build_where_conditions()
 
+            # 🔥 2단계: 전체 건수 및 통계 조회 (필터별 캐시)
+            connection = mysql.connector.connect(**self.db_config)
+            cursor = connection.cursor(dictionary=True)
+            stats = self._get_summary_stats(cursor, where_conditions, params)
             cursor.close()
             connection.close()
-            
-            print(f"DB에서 전체 {self.total_count}건 중 {len(self.all_trades)}개 로드 (최대 200개)")
-            
-            # 통계 업데이트
+
+            self.total_count = stats['total_count']
             self.update_summary(stats)
+
+            # 🔥 3단계: 모델 초기화 후 첫 페이지만 조회 (이후는 스크롤 시 키셋으로 로드)
+            self.history_model.reset_query(self.db_config, where_conditions, params)
+            self.history_model.fetchMore()
             
-            # 첫 페이지 표시
-            self.display_current_page()
+            print(f"DB에서 전체 {self.total_count}건 중 첫 {self.history_model.rowCount()}개 로드")
 
         except Exception as e:
             print(f"DB 거래내역 로드 오류: {e}")
             QMessageBox.critical(self, "DB 오류", f"거래내역을 불러오는 중 오류가 발생했습니다:\n{e}")
-            self.history_table.setRowCount(0)
 
-    def display_current_page(self):
-        """현재 페이지 데이터 표시"""
-        try:
-            # 페이지 범위 계산
-            start_idx = (self.current_page - 1) * self.items_per_page
-            end_idx = min(start_idx + self.items_per_page, len(self.all_trades))
-            
-            # 현재 페이지 데이터 추출
-            page_trades = self.all_trades[start_idx:end_idx]
-            
-            # 테이블 업데이트
-            self.populate_history_table(page_trades)
-            
-            # 페이지 정보 업데이트
-            total_pages = (len(self.all_trades) + self.items_per_page - 1) // self.items_per_page
-            self.page_info_label.setText(f"페이지: {self.current_page} / {total_pages} (총 {len(self.all_trades)}개 중 {start_idx + 1}-{end_idx})")
-            
-            # 버튼 활성화/비활성화
-            self.prev_button.setEnabled(self.current_page > 1)
-            self.next_button.setEnabled(end_idx < len(self.all_trades))
-            
-        except Exception as e:
-            print(f"페이지 표시 오류: {e}")
-
-    def prev_page(self):
-        """이전 페이지"""
-        if self.current_page > 1:
-            self.current_page -= 1
-            self.display_current_page()
-
-    def next_page(self):
-        """다음 페이지"""
-        total_pages = (len(self.all_trades) + self.items_per_page - 1) // self.items_per_page
-        if self.current_page < total_pages:
-            self.current_page += 1
-            self.display_current_page()
-
-    def populate_history_table(self, trades):
-        """거래내역 테이블 채우기"""
-        try:
-            self.history_table.setRowCount(len(trades))
+    def load_more(self):
+        """다음 페이지 로드"""
+        if self.history_model.canFetchMore():
+            self.history_model.fetchMore()
 
-            for row, trade in enumerate(trades):
-                try:
-                    # 시간 변환
-                    trade_time = trade.get('trade_time')
-                    if trade_time and isinstance(trade_time, datetime):
-                        time_str = trade_time.strftime('%Y-%m-%d %H:%M:%S')
-                    else:
-                        time_str = str(trade_time) if trade_time else 'N/A'
-                    
-                    # 데이터 추출
-                    symbol = str(trade.get('symbol', 'N/A'))
-                    side = str(trade.get('side', 'N/A'))
-                    trade_type = str(trade.get('trade_type', 'N/A'))
-                    
-                    try:
-                        quantity = float(trade.get('quantity') or 0)
-                        price = float(trade.get('price') or 0)
-                        leverage = int(trade.get('leverage') or 1)
-                        commission = float(trade.get('commission') or 0)
-                        realized_pnl = float(trade.get('realized_pnl') or 0)
-                    except (ValueError, TypeError):
-                        quantity = price = commission = realized_pnl = 0.0
-                        leverage = 1
-                    
-                    entry_value = quantity * price
-                    net_profit_percent = (realized_pnl / entry_value * 100) if entry_value > 0 else 0
-                    
-                    # 테이블 아이템 생성
-                    items = [
-                        QTableWidgetItem(time_str),
-                        QTableWidgetItem(symbol),
-                        QTableWidgetItem(side),
-                        QTableWidgetItem(trade_type),
-                        QTableWidgetItem(f"{quantity:.4f}"),
-                        QTableWidgetItem(f"{price:.2f}"),
-                        QTableWidgetItem(f"{leverage}x"),
-                        QTableWidgetItem(f"{entry_value:.2f}"),
-                        QTableWidgetItem(f"{commission:.6f}"),
-                        QTableWidgetItem(f"{realized_pnl:.2f}"),
-                        QTableWidgetItem(f"{net_profit_percent:.2f}%")
-                    ]
-                    
-                    # 색상 적용
-                    if side == 'LONG':
-                        items[2].setForeground(QColor("#00ff00"))
-                    elif side == 'SHORT':
-                        items[2].setForeground(QColor("#ff4444"))
-                    
-                    if realized_pnl > 0:
-                        items[9].setForeground(QColor("#00ff00"))
-                        items[10].setForeground(QColor("#00ff00"))
-                    elif realized_pnl < 0:
-                        items[9].setForeground(QColor("#ff4444"))
-                        items[10].setForeground(QColor("#ff4444"))
-                    
-                    # 테이블에 추가
-                    for col, item in enumerate(items):
-                        item.setTextAlignment(Qt.AlignCenter)
-                        self.history_table.setItem(row, col, item)
-
-                except Exception as e:
-                    print(f"행 {row} 처리 오류: {e}")
-                    continue
-
-        except Exception as e:
-            print(f"테이블 업데이트 오류: {e}")
+    def update_page_info(self, *args):
+        """로드 현황 업데이트"""
+        loaded = self.history_model.rowCount()
+        self.page_info_label.setText(f"로드: {loaded} / {self.total_count}건")
+        self.load_more_button.setEnabled(self.history_model.canFetchMore())
 
     def update_summary(self, stats):
         """손익 요약 업데이트"""
@@ -356,42 +609,69 @@ class TradeHistoryWidget(QWidget):
         self.total_pnl_label.setStyleSheet(pnl_color)
 
     def export_to_excel(self):
-        """엑셀 내보내기"""
-        try:
-            import pandas as pd
-        except ImportError:
-            QMessageBox.warning(self, "오류", "엑셀 내보내기를 위해 pandas와 openpyxl 패키지가 필요합니다.\npip install pandas openpyxl 명령으로 설치해주세요.")
+        """엑셀/CSV 내보내기 (현재 필터 전체를 DB에서 스트리밍, 백그라운드 실행)"""
+        if not self.db_config:
+            QMessageBox.warning(self, "오류", "먼저 DB에 연결해주세요.")
             return
 
-        try:
-            file_path, _ = QFileDialog.getSaveFileName(
-                self, "엑셀 파일 저장", 
-                f"거래내역_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx", 
-                "Excel files (*.xlsx)"
-            )
-            
-            if not file_path:
+        if self.export_worker and self.export_worker.isRunning():
+            QMessageBox.information(self, "알림", "이미 내보내기가 진행 중입니다.")
+            return
+
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "거래내역 저장", 
+            f"거래내역_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx", 
+            "Excel files (*.xlsx);;CSV files (*.csv)"
+        )
+        
+        if not file_path:
+            return
+
+        file_format = 'csv' if file_path.lower().endswith('.csv') or 'csv' in selected_filter.lower() else 'xlsx'
+        if file_format == 'xlsx':
+            try:
+                import openpyxl  # noqa: F401
+            except ImportError:
+                QMessageBox.warning(self, "오류", "엑셀 내보내기를 위해 openpyxl 패키지가 필요합니다.\npip install openpyxl 명령으로 설치하거나 CSV로 저장해주세요.")
                 return
-            
-            # 현재 표시된 모든 거래 데이터 (최대 200개)
-            data = []
-            for trade in self.all_trades:
-                data.append({
-                    '시간': trade.get('trade_time'),
-                    '심볼': trade.get('symbol'),
-                    '방향': trade.get('side'),
-                    '타입': trade.get('trade_type'),
-                    '수량': trade.get('quantity'),
-                    '가격': trade.get('price'),
-                    '레버리지': trade.get('leverage'),
-                    '수수료': trade.get('commission'),
-                    '실현손익': trade.get('realized_pnl')
-                })
-            
-            df = pd.DataFrame(data)
-            df.to_excel(file_path, index=False, engine='openpyxl')
-            
-            QMessageBox.information(self, "완료", f"엑셀 파일이 저장되었습니다:\n{file_path}")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "오류", f"엑셀 내보내기 중 오류: {str(e)}")
\ No newline at end of file
+
+        where_conditions, params = self._build_where_conditions()
+
+        self.export_worker = TradeExportWorker(
+            self.db_config, where_conditions, params, file_path,
+            file_format=file_format, total_count=self.total_count
+        )
+        self.export_worker.progress.connect(self.on_export_progress)
+        self.export_worker.finished_export.connect(self.on_export_finished)
+        self.export_worker.failed.connect(self.on_export_failed)
+
+        self.export_progress = QProgressDialog("거래내역 내보내는 중...", "취소", 0, max(self.total_count, 1), self)
+        self.export_progress.setWindowTitle("내보내기")
+        self.export_progress.setWindowModality(Qt.WindowModal)
+        self.export_progress.setMinimumDuration(500)
+        self.export_progress.canceled.connect(self.export_worker.cancel)
+
+        self.export_button.setEnabled(False)
+        self.export_worker.start()
+        print(f"📤 거래내역 내보내기 시작: {file_path} ({file_format}, 약 {self.total_count}건)")
+
+    def on_export_progress(self, written, total):
+        if self.export_progress:
+            self.export_progress.setMaximum(max(total, written, 1))
+            self.export_progress.setValue(written)
+            self.export_progress.setLabelText(f"거래내역 내보내는 중... {written:,} / {total:,}건")
+
+    def _finish_export(self):
+        if self.export_progress:
+            self.export_progress.close()
+            self.export_progress = None
+        self.export_button.setEnabled(True)
+
+    def on_export_finished(self, file_path, written):
+        self._finish_export()
+        print(f"✅ 거래내역 내보내기 완료: {written}건 -> {file_path}")
+        QMessageBox.information(self, "완료", f"{written:,}건이 저장되었습니다:\n{file_path}")
+
+    def on_export_failed(self, message):
+        self._finish_export()
+        QMessageBox.critical(self, "오류", f"내보내기 중 오류: {message}")
@@ -74,6 +74,8 @@ class TradingWidget(QWidget):
         self.client = None
         self.current_price = 0
         self.db_manager = None  # 🔥 추가
+        self.market_data = None  # 웹소켓 시세 허브 (없으면 30초 폴링)
+        self._ticker_symbol = None
         self.init_ui()
         
     def init_ui(self):
@@ -367,18 +369,42 @@ class TradingWidget(QWidget):
         """)
     def set_client(self, client):
         """바이낸스 클라이언트 설정"""
+        self._unsubscribe_ticker()
         self.client = client
+        self.market_data = getattr(client, 'market_data', None)
         # 클라이언트 설정 후 지연 실행으로 현재가 업데이트 (태스크 충돌 방지)
         QTimer.singleShot(500, lambda: asyncio.create_task(self.update_current_price()))
         
-        # 주기적 현재가 업데이트 (30초마다)
-        self.price_timer = QTimer()
-        self.price_timer.timeout.connect(lambda: asyncio.create_task(self.update_current_price()))
-        self.price_timer.start(30000)
+        if self.market_data is not None:
+            # 웹소켓 티커 스트림으로 현재가 실시간 갱신
+            self._subscribe_ticker()
+        else:
+            # 주기적 현재가 업데이트 (30초마다)
+            self.price_timer = QTimer()
+            self.price_timer.timeout.connect(lambda: asyncio.create_task(self.update_current_price()))
+            self.price_timer.start(30000)
         
         # 심볼 변경시 정밀도 정보 업데이트
         self.update_precision_info()
 
+        # 거래소 정밀도로 정적 테이블 갱신 (캐시가 비어 있으면 기존 값 유지)
+        QTimer.singleShot(1000, lambda: asyncio.create_task(self.sync_symbol_precision()))
+
+    async def sync_symbol_precision(self):
+        """공용 exchangeInfo 캐시의 정밀도를 SYMBOL_PRECISION에 반영"""
+        metadata = getattr(self.client, 'metadata', None)
+        if metadata is None:
+            return
+        try:
+            await metadata.ensure_fresh(self.client._fetch_exchange_info)
+            precision_map = metadata.precision_map()
+            if precision_map:
+                SYMBOL_PRECISION.update(precision_map)
+                self.update_precision_info()
+                print(f"✅ 심볼 정밀도 동기화: {len(precision_map)}개")
+        except Exception as e:
+            print(f"⚠️ 심볼 정밀도 동기화 실패 (정적 테이블 사용): {e}")
+
     def set_db_config(self, db_config):
         """
         DB 설정 받기 (Strategy Widget에서 호출)
@@ -400,9 +426,28 @@ class TradingWidget(QWidget):
         self.db_manager = db_manager
         print("✅ Trading Widget: DB 매니저 직접 연결됨")
 
+    def _subscribe_ticker(self):
+        symbol = self.symbol_combo.currentText()
+        self._ticker_symbol = symbol
+        self.market_data.subscribe(symbol, 'ticker', self._on_ticker_update)
+
+    def _unsubscribe_ticker(self):
+        if self.market_data is not None and self._ticker_symbol:
+            self.market_data.unsubscribe(self._ticker_symbol, 'ticker', self._on_ticker_update)
+        self._ticker_symbol = None
+
+    def _on_ticker_update(self, ticker):
+        """티커 스트림 콜백"""
+        symbol = self.symbol_combo.currentText()
+        if self.client and ticker.get('symbol') == symbol:
+            self._set_current_price(symbol, float(ticker['price']))
+
     def on_symbol_changed(self):
         """심볼 변경 시 현재가 업데이트"""
         if self.client:
+            if self.market_data is not None:
+                self._unsubscribe_ticker()
+                self._subscribe_ticker()
             asyncio.create_task(self.update_current_price())
         self.update_precision_info()
         self.update_position_value_display()
@@ -540,17 +585,7 @@ class TradingWidget(QWidget):
             print(f"현재가 조회: {symbol} -> {ticker}")
             
             if ticker and 'price' in ticker:
-                self.current_price = float(ticker['price'])
-                adjusted_price = adjust_price_precision(symbol, self.current_price)
-                self.current_price_label.setText(f"현재가: {adjusted_price} USDT")
-                
-                # 지정가 주문인 경우 가격 자동 설정 (입력값이 0일 때만)
-                if (self.order_type_combo.currentText() == "LIMIT" and 
-                    (self.price_input.text() == "0" or not self.price_input.text())):
-                    self.price_input.setText(f"{adjusted_price}")
-                    
-                # 수량 미리보기 업데이트
-                self.update_quantity_preview()
+                self._set_current_price(symbol, float(ticker['price']))
             else:
                 print(f"현재가 정보가 없습니다: {ticker}")
                     
@@ -558,6 +593,20 @@ class TradingWidget(QWidget):
             print(f"현재가 업데이트 오류: {e}")
             import traceback
             traceback.print_exc()
+
+    def _set_current_price(self, symbol, price):
+        """현재가 표시 및 지정가/수량 미리보기 갱신 (REST 조회 / 티커 스트림 공통)"""
+        self.current_price = price
+        adjusted_price = adjust_price_precision(symbol, self.current_price)
+        self.current_price_label.setText(f"현재가: {adjusted_price} USDT")
+        
+        # 지정가 주문인 경우 가격 자동 설정 (입력값이 0일 때만)
+        if (self.order_type_combo.currentText() == "LIMIT" and 
+            (self.price_input.text() == "0" or not self.price_input.text())):
+            self.price_input.setText(f"{adjusted_price}")
+            
+        # 수량 미리보기 업데이트
+        self.update_quantity_preview()
             
     def get_price_value(self):
         """가격 입력값 가져오기"""
@@ -730,9 +779,15 @@ class TradingWidget(QWidget):
             return
         
         try:
+            # 클라이언트 캐시로 이미 같은 모드면 요청 생략
+            if hasattr(self.client, 'set_margin_type'):
+                result = await self.client.set_margin_type(symbol, margin_type)
+                print(f"✅ {symbol} 마진 모드: {margin_type}")
+                return result
+
             params = {
                 'symbol': symbol,
-                'marginType': margin_type
+                'marginType': 'CROSSED' if margin_type == 'CROSS' else margin_type
             }
             
             result = await self.client._make_request(
@@ -887,6 +942,7 @@ class TradingWidget(QWidget):
 
     def closeEvent(self, event):
         """위젯 종료 시 타이머 정리"""
+        self._unsubscribe_ticker()
         if hasattr(self, 'price_timer') and self.price_timer:
             self.price_timer.stop()
         event.accept()
\ No newline at end of file
@@ -4,17 +4,21 @@
 - 동일한 날짜 + 동일종목은 덮어씌우도록 로직구현 (일봉이니까)
 - 정기적으로 신규 데이터 수집
 - 모델 예측 수행
+- 모델 레지스트리 사용 시 사이클마다 새 버전 확인 → 재시작 없이 교체
 - MySQL 데이터베이스에 시그널 저장
 """
 import schedule
 import time
 import pickle
 import json
+import os
 import mysql.connector
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
 from crypto_preprocessor import CryptoPreprocessor
+from compact_predictor import CompactTreeEnsemble
+from model_registry import ModelRegistry, ModelWatcher
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -22,17 +26,24 @@ warnings.filterwarnings('ignore')
 class AutoTradingSignal:
     """자동 트레이딩 시그널 생성기"""
     
-    def __init__(self, model_path, db_config):
+    def __init__(self, model_path, db_config, registry_dir=None):
         """
         Args:
-            model_path: 학습된 모델 파일 경로 (.pkl)
+            model_path: 학습된 모델 파일 경로 (.pkl 또는 compact_predictor.py로 변환한 .npz)
             db_config: MySQL 데이터베이스 연결 설정 (dict)
+            registry_dir: 모델 레지스트리 폴더 (지정하면 활성 버전 사용 + 자동 교체,
+                          등록된 버전이 없으면 model_path 사용)
         """
         self.model_path = model_path
         self.db_config = db_config
         self.preprocessor = CryptoPreprocessor()
         self.model = None
-        self.load_model()
+        self.model_version = None
+        self.feature_columns = None
+        self.watcher = ModelWatcher(ModelRegistry(registry_dir)) if registry_dir else None
+
+        if not self.reload_model_if_updated():
+            self.load_model()
         
         # 🔥 11개 주요 종목만 감시
         self.symbols = [
@@ -66,15 +77,124 @@ class AutoTradingSignal:
         print(f"감시 종목 ({len(self.symbols)}개): {', '.join(self.symbols)}")
     
     def load_model(self):
-        """학습된 모델 로드"""
+        """
+        학습된 모델 로드
+
+        - .npz: 평면 배열 예측기 바로 로드 (xgboost 불필요)
+        - .pkl: XGBClassifier 로드 후 평면 배열 예측기로 변환
+          (1행 예측 시 sklearn 래퍼/DataFrame 검증 오버헤드 제거, 변환 실패 시 원본 모델 사용)
+        """
         try:
-            with open(self.model_path, 'rb') as f:
-                self.model = pickle.load(f)
-            print(f"모델 로드 완료: {self.model_path}")
+            if self.model_path.endswith('.npz'):
+                self.model = CompactTreeEnsemble.load(self.model_path)
+            else:
+                with open(self.model_path, 'rb') as f:
+                    self.model = pickle.load(f)
+                try:
+                    self.model = CompactTreeEnsemble.from_model(self.model)
+                except Exception as e:
+                    print(f"압축 예측기 변환 실패 (원본 모델 사용): {e}")
+            self.model_version = os.path.splitext(os.path.basename(self.model_path))[0]
+            print(f"모델 로드 완료: {self.model_path} ({type(self.model).__name__})")
         except Exception as e:
             print(f"모델 로드 실패: {e}")
             raise
     
+    def reload_model_if_updated(self):
+        """
+        레지스트리 활성 버전이 바뀌었으면 새 모델로 교체 (사이클 시작 시 호출)
+        
+        - 새 버전을 완전히 로드한 뒤 한 번에 교체 → 사이클 도중에 모델이 바뀌지 않음
+        - 로드 실패 또는 피처 불일치(전처리기가 만들지 않는 피처 요구) 시 기존 모델 유지
+        
+        Returns:
+            bool: 교체 여부
+        """
+        if self.watcher is None:
+            return False
+        
+        loaded = self.watcher.poll()
+        if loaded is None:
+            return False
+        
+        missing = self.missing_model_features(loaded.feature_columns)
+        if missing:
+            print(f"❌ 모델 {loaded.version} 교체 거부: 전처리기에 없는 피처 {len(missing)}개 {missing[:10]}"
+                  f" (기존 모델 {self.model_version} 유지)")
+            self.watcher.reject(loaded.version)
+            return False
+        
+        previous = self.model_version
+        self.model, self.feature_columns, self.model_version = loaded.model, loaded.feature_columns, loaded.version
+        if previous:
+            print(f"🔄 모델 교체: {previous} → {loaded.version} ({type(loaded.model).__name__})")
+        else:
+            print(f"모델 로드 완료: 레지스트리 {loaded.version} ({type(loaded.model).__name__})")
+        self.save_model_info(loaded)
+        return True
+    
+    def missing_model_features(self, feature_columns, probe_symbol='BTC'):
+        """
+        모델이 요구하지만 전처리기가 만들지 않는 피처 목록
+
+        - probe_symbol 1개를 실제로 전처리해서 출력 컬럼과 비교
+        - 피처 목록이 없거나 전처리 자체가 실패하면 빈 목록 (예측 시 다시 확인)
+        """
+        if not feature_columns:
+            return []
+        try:
+            features_df = self.preprocessor.preprocess_for_prediction(probe_symbol)
+        except Exception as e:
+            print(f"⚠️ 피처 확인용 전처리 실패 ({probe_symbol}): {e}")
+            return []
+        if features_df is None or features_df.empty:
+            return []
+        return [col for col in feature_columns if col not in features_df.columns]
+    
+    def save_model_info(self, loaded):
+        """활성 모델 버전을 ai_models 테이블에 기록 (다른 버전은 비활성)"""
+        conn = self.connect_db()
+        if conn is None:
+            return False
+        
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE ai_models SET is_active = FALSE WHERE model_name = %s",
+                ('AI_XGBOOST_PREDICTION',)
+            )
+            query = """
+            INSERT INTO ai_models
+            (model_name, model_type, version, file_path, features, target_variable,
+             performance_metrics, training_date, is_active)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, TRUE)
+            ON DUPLICATE KEY UPDATE is_active = TRUE
+            """
+            values = (
+                'AI_XGBOOST_PREDICTION',
+                'XGBOOST',
+                loaded.version,
+                loaded.path,
+                json.dumps(loaded.feature_columns),
+                'Future_Label',
+                json.dumps(loaded.metadata.get('metrics', {}), default=str),
+                loaded.metadata.get('trained_at'),
+            )
+            cursor.execute(query, values)
+            conn.commit()
+            cursor.close()
+            conn.close()
+            return True
+            
+        except Exception as e:
+            print(f"   ❌ 모델 정보 저장 실패: {e}")
+            conn.rollback()
+            if cursor is not None:
+                cursor.close()
+            conn.close()
+            return False
+    
     def connect_db(self):
         """MySQL 데이터베이스 연결"""
         try:
@@ -102,14 +222,19 @@ class AutoTradingSignal:
                 print(f"{symbol}: 전처리 실패")
                 return None
             
-            # 2. 예측
+            # 2. 예측 (레지스트리 버전이면 학습 피처 순서로 정렬, 빠진 피처가 있으면 예측하지 않음)
+            if self.feature_columns:
+                missing = [col for col in self.feature_columns if col not in features_df.columns]
+                if missing:
+                    print(f"{symbol}: 모델 {self.model_version} 피처 {len(missing)}개 없음 {missing[:10]} - 예측 생략")
+                    return None
+                features_df = features_df[self.feature_columns]
             features_array = features_df.values
-            prediction = self.model.predict(features_array)
             prediction_proba = self.model.predict_proba(features_array)
             
             # 3. 시그널 타입 결정 (0: SHORT, 1: HOLD, 2: LONG)
             signal_map = {0: 'SHORT', 1: 'HOLD', 2: 'LONG'}
-            predicted_class = int(prediction[0])
+            predicted_class = int(np.argmax(prediction_proba[0]))
             signal_type = signal_map[predicted_class]
             
             # 4. 신뢰도 = 모델 확신도 (최대 확률값)
@@ -130,6 +255,7 @@ class AutoTradingSignal:
                 'prediction_probability': prediction_probability,
                 'price': current_price,
                 'features': features_df.to_dict('records')[0],
+                'model_version': self.model_version,
                 'timestamp': datetime.now()
             }
             
@@ -194,6 +320,7 @@ class AutoTradingSignal:
                     confidence = %s,
                     prediction_probability = %s,
                     features_data = %s,
+                    model_version = %s,
                     message = %s,
                     created_at = %s,
                     processed = FALSE
@@ -205,6 +332,7 @@ class AutoTradingSignal:
                     signal_data['confidence'],
                     signal_data['prediction_probability'],
                     json.dumps(signal_data['features'], default=str),
+                    signal_data['model_version'],
                     f"Updated at {signal_data['timestamp'].strftime('%H:%M:%S')}",
                     signal_data['timestamp'],
                     existing[0]
@@ -232,7 +360,7 @@ class AutoTradingSignal:
                     signal_data['confidence'],
                     signal_data['prediction_probability'],
                     json.dumps(signal_data['features'], default=str),
-                    'v1.0',
+                    signal_data['model_version'],
                     f"Created at {signal_data['timestamp'].strftime('%H:%M:%S')}",
                     signal_data['timestamp'],
                     False
@@ -260,6 +388,10 @@ class AutoTradingSignal:
         print(f"🤖 AI 예측 사이클 시작: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("="*70)
         
+        # 사이클 사이에만 모델 교체
+        self.reload_model_if_updated()
+        print(f"🧠 모델 버전: {self.model_version}")
+        
         success_count = 0
         fail_count = 0
         
@@ -340,6 +472,7 @@ def main():
     
     # 설정
     model_path = "models/xgboost_crypto_model.pkl"  # 모델 경로 수정 필요
+    registry_dir = "models/registry"  # 등록된 버전이 있으면 우선 사용 (python model_registry.py publish ...)
     db_config = {
         'host': 'localhost',
         'database': 'trading_signals',
@@ -355,7 +488,7 @@ def main():
     
     try:
         # 시스템 초기화
-        auto_signal = AutoTradingSignal(model_path, db_config)
+        auto_signal = AutoTradingSignal(model_path, db_config, registry_dir=registry_dir)
         
         # 사용자 선택
         print("\n" + "="*70)
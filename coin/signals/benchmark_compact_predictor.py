@@ -0,0 +1,119 @@
+"""
+XGBClassifier.predict_proba vs CompactTreeEnsemble 비교
+- 확률 일치 여부 (최대 절대 오차, 예측 클래스 일치율)
+- 1행 예측 지연 시간 (시그널 서버에서 종목마다 1행씩 예측하는 경우)
+- 배치 예측 처리량
+
+실행 예:
+    python benchmark_compact_predictor.py --model models/xgboost_crypto_model.pkl --data train_data.csv
+    python benchmark_compact_predictor.py --synthetic          # 임시 모델 학습 후 비교
+"""
+import argparse
+import pickle
+import time
+import numpy as np
+import pandas as pd
+import warnings
+warnings.filterwarnings('ignore')
+
+from compact_predictor import CompactTreeEnsemble
+
+
+def make_synthetic(n_rows=20000, n_features=150, n_estimators=300, max_depth=8, seed=42):
+    """학습 노트북과 비슷한 3클래스 모델 학습 (결측 포함)"""
+    import xgboost as xgb
+
+    rng = np.random.default_rng(seed)
+    features = [f'feature_{i}' for i in range(n_features)]
+    X = pd.DataFrame(rng.normal(size=(n_rows, n_features)).astype(np.float32), columns=features)
+    X = X.mask(rng.random(X.shape) < 0.01)
+    signal = X['feature_0'].fillna(0) + 0.5 * X['feature_1'].fillna(0) + rng.normal(size=n_rows)
+    y = np.digitize(signal, [-0.7, 0.7])
+
+    split = int(n_rows * 0.8)
+    model = xgb.XGBClassifier(
+        objective='multi:softprob', n_estimators=n_estimators, max_depth=max_depth,
+        learning_rate=0.1, early_stopping_rounds=30, eval_metric='mlogloss',
+        tree_method='hist', random_state=seed, verbosity=0,
+    )
+    model.fit(X.iloc[:split], y[:split], eval_set=[(X.iloc[split:], y[split:])], verbose=False)
+    return model, X.iloc[split:]
+
+
+def time_per_call(func, rows, repeats):
+    """rows를 순서대로 repeats번 호출한 평균 (μs)"""
+    func(rows[0])
+    started = time.perf_counter()
+    for i in range(repeats):
+        func(rows[i % len(rows)])
+    return (time.perf_counter() - started) / repeats * 1e6
+
+
+def benchmark(model, X, repeats=500):
+    compact = CompactTreeEnsemble.from_model(model)
+    print(f"🌲 트리 {len(compact.roots)}개 | 노드 {len(compact.feature):,}개 | 최대 깊이 {compact.max_depth}")
+
+    # 1. 일치 검사
+    expected = model.predict_proba(X)
+    actual = compact.predict_proba(X.to_numpy(dtype=np.float32))
+    max_error = float(np.abs(expected - actual).max())
+    agreement = float((expected.argmax(axis=1) == actual.argmax(axis=1)).mean())
+    print(f"\n✅ 확률 일치: 최대 절대 오차 {max_error:.2e} | 클래스 일치율 {agreement:.4%} ({len(X):,}행)")
+    if max_error > 1e-4:
+        print("⚠️  오차가 큽니다 - 모델 변환을 확인하세요")
+
+    # 2. 1행 지연 시간 (ai_trading_signal.py predict_signal과 같은 입력 형태)
+    frames = [X.iloc[[i]] for i in range(min(len(X), 200))]
+    arrays = [frame.to_numpy(dtype=np.float32) for frame in frames]
+    single = {
+        'XGBClassifier (DataFrame)': time_per_call(model.predict_proba, frames, repeats),
+        'XGBClassifier (ndarray)': time_per_call(model.predict_proba, arrays, repeats),
+        'Compact (ndarray)': time_per_call(compact.predict_proba, arrays, repeats),
+    }
+
+    # 3. 배치 처리량
+    batch = X.to_numpy(dtype=np.float32)
+    batch_times = {}
+    for name, func in [('XGBClassifier', model.predict_proba), ('Compact', compact.predict_proba)]:
+        started = time.perf_counter()
+        func(batch)
+        batch_times[name] = time.perf_counter() - started
+
+    print(f"\n{'='*60}")
+    print(f"{'1행 예측':<30}{'평균(μs)':>14}{'배율':>10}")
+    baseline = single['XGBClassifier (DataFrame)']
+    for name, micros in single.items():
+        print(f"{name:<30}{micros:>14.1f}{baseline / micros:>9.1f}x")
+    print(f"\n{'배치 예측 (' + format(len(batch), ',') + '행)':<30}{'전체(ms)':>14}{'행당(μs)':>10}")
+    for name, seconds in batch_times.items():
+        print(f"{name:<30}{seconds * 1e3:>14.1f}{seconds / len(batch) * 1e6:>10.2f}")
+    print(f"{'='*60}")
+    return {'max_error': max_error, 'agreement': agreement, 'single_us': single, 'batch_sec': batch_times}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="압축 트리 예측기 일치 검사 / 지연 시간 비교")
+    parser.add_argument('--model', default=None, help='학습된 모델 파일 (.pkl)')
+    parser.add_argument('--data', default=None, help='피처 CSV (모델 피처 컬럼 포함)')
+    parser.add_argument('--rows', type=int, default=5000, help='비교에 사용할 최대 행 수')
+    parser.add_argument('--repeats', type=int, default=500, help='1행 예측 반복 횟수')
+    parser.add_argument('--synthetic', action='store_true', help='임시 모델 학습 후 비교')
+    args = parser.parse_args()
+
+    if args.synthetic:
+        print("🧪 임시 모델 학습 중...")
+        model, X = make_synthetic()
+    else:
+        if not args.model or not args.data:
+            parser.error('--model/--data 또는 --synthetic 이 필요합니다')
+        with open(args.model, 'rb') as f:
+            model = pickle.load(f)
+        feature_names = model.get_booster().feature_names
+        X = pd.read_csv(args.data, usecols=feature_names, nrows=args.rows)[feature_names]
+        X = X.replace([np.inf, -np.inf], np.nan).astype(np.float32)
+
+    benchmark(model, X.iloc[:args.rows], repeats=args.repeats)
+
+
+if __name__ == '__main__':
+    main()
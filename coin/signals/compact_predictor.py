@@ -0,0 +1,229 @@
+"""
+XGBoost 트리 앙상블 → 평면 NumPy 배열 예측기
+- 학습된 booster의 트리를 (피처 인덱스, 임계값, 자식 포인터, 결측 방향, 리프 값) 배열로 변환
+- pandas/sklearn 래퍼 없이 1행/배치 모두 벡터 연산으로 확률 계산
+- .npz로 저장/로드 → 실시간 시그널 서버는 XGBClassifier 피클 없이 예측 가능
+
+사용 예:
+    python compact_predictor.py models/xgboost_crypto_model.pkl                 # → models/xgboost_crypto_model.npz
+    python compact_predictor.py models/xgboost_crypto_model.pkl -o compact.npz
+"""
+import argparse
+import json
+import os
+import pickle
+import numpy as np
+import warnings
+warnings.filterwarnings('ignore')
+
+
+SUPPORTED_OBJECTIVES = ('multi:softprob', 'multi:softmax', 'binary:logistic')
+
+
+class CompactTreeEnsemble:
+    """
+    평면 배열로 표현한 트리 앙상블
+
+    - 모든 트리의 노드를 하나의 배열에 이어 붙이고 자식 포인터는 전역 인덱스로 저장
+    - 리프는 자기 자신을 자식으로 가리켜서, 최대 깊이만큼 반복하면 모든 트리가 리프에 도달
+    - 분기 규칙은 XGBoost와 동일: x < threshold 이면 왼쪽, 결측(NaN)이면 default_left 방향
+    """
+
+    def __init__(self, feature, threshold, left, right, default_left, value, roots, tree_class,
+                 base_margin, n_classes, max_depth, objective, feature_names=None):
+        self.feature = np.asarray(feature, dtype=np.int32)
+        self.threshold = np.asarray(threshold, dtype=np.float32)
+        self.left = np.asarray(left, dtype=np.int32)
+        self.right = np.asarray(right, dtype=np.int32)
+        self.default_left = np.asarray(default_left, dtype=bool)
+        self.value = np.asarray(value, dtype=np.float32)
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.tree_class = np.asarray(tree_class, dtype=np.int32)
+        self.base_margin = np.asarray(base_margin, dtype=np.float64).reshape(-1)
+        self.n_classes = int(n_classes)
+        self.max_depth = int(max_depth)
+        self.objective = objective
+        self.feature_names = list(feature_names) if feature_names is not None else None
+
+        # 클래스별 리프 값 합산용 (트리 수 × 출력 수) 원-핫 행렬
+        n_outputs = 1 if self.objective == 'binary:logistic' else self.n_classes
+        self._class_matrix = np.zeros((len(self.roots), n_outputs), dtype=np.float64)
+        self._class_matrix[np.arange(len(self.roots)), self.tree_class] = 1.0
+
+    # ------------------------------------------------------------------
+    # 변환
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_model(cls, model):
+        """
+        XGBClassifier 또는 Booster → CompactTreeEnsemble
+
+        - 조기 종료로 best_iteration이 있으면 predict_proba와 같이 그 라운드까지만 사용
+        """
+        import xgboost as xgb
+
+        booster = model.get_booster() if hasattr(model, 'get_booster') else model
+        config = json.loads(booster.save_raw('json'))['learner']
+
+        objective = config['objective']['name']
+        if objective not in SUPPORTED_OBJECTIVES:
+            raise ValueError(f"지원하지 않는 objective: {objective}")
+        gbm = config['gradient_booster']
+        if gbm.get('name', 'gbtree') != 'gbtree':
+            raise ValueError(f"gbtree만 지원합니다: {gbm.get('name')}")
+
+        trees = gbm['model']['trees']
+        tree_info = gbm['model']['tree_info']
+        n_classes = int(config['learner_model_param'].get('num_class', '0')) or 2
+
+        # best_iteration까지의 트리만 사용 (sklearn predict_proba 기본 동작과 동일)
+        n_trees = len(trees)
+        best_iteration = getattr(model, 'best_iteration', None) if hasattr(model, 'get_booster') else None
+        indptr = gbm['model'].get('iteration_indptr')
+        if best_iteration is not None and indptr:
+            n_trees = int(indptr[best_iteration + 1])
+
+        feature, threshold, left, right, default_left, value, roots = [], [], [], [], [], [], []
+        max_depth = 0
+        offset = 0
+        for tree in trees[:n_trees]:
+            if any(tree.get('split_type', [])):
+                raise ValueError("범주형 분기 트리는 지원하지 않습니다")
+            tree_left = np.asarray(tree['left_children'], dtype=np.int64)
+            tree_right = np.asarray(tree['right_children'], dtype=np.int64)
+            n_nodes = len(tree_left)
+            nodes = np.arange(n_nodes)
+            is_leaf = tree_left == -1
+
+            roots.append(offset)
+            feature.append(np.where(is_leaf, 0, tree['split_indices']))
+            threshold.append(np.asarray(tree['split_conditions'], dtype=np.float32))
+            left.append(np.where(is_leaf, nodes, tree_left) + offset)
+            right.append(np.where(is_leaf, nodes, tree_right) + offset)
+            default_left.append(np.asarray(tree['default_left'], dtype=bool))
+            # 리프의 split_conditions에는 리프 값이 들어 있음
+            value.append(np.where(is_leaf, np.asarray(tree['split_conditions'], dtype=np.float32), 0))
+            max_depth = max(max_depth, _tree_depth(tree_left, tree_right))
+            offset += n_nodes
+
+        tree_class = np.asarray(tree_info[:n_trees], dtype=np.int32)
+        if objective == 'binary:logistic':
+            tree_class = np.zeros_like(tree_class)
+
+        compact = cls(
+            np.concatenate(feature), np.concatenate(threshold), np.concatenate(left),
+            np.concatenate(right), np.concatenate(default_left), np.concatenate(value),
+            roots, tree_class, base_margin=0.0, n_classes=n_classes, max_depth=max_depth,
+            objective=objective, feature_names=booster.feature_names,
+        )
+
+        # base_score 저장 형식이 버전마다 달라서 (확률/마진, 스칼라/벡터)
+        # 0 입력의 XGBoost 마진과 트리 합의 차이로 기본 마진을 구함
+        probe = np.zeros((1, booster.num_features()), dtype=np.float32)
+        iteration_range = (0, best_iteration + 1) if best_iteration is not None and indptr else (0, 0)
+        xgb_margin = booster.predict(xgb.DMatrix(probe, feature_names=booster.feature_names),
+                                     output_margin=True, iteration_range=iteration_range)
+        compact.base_margin = np.asarray(xgb_margin, dtype=np.float64).reshape(-1) - compact.margin(probe)[0]
+        return compact
+
+    @classmethod
+    def from_pickle(cls, model_path):
+        with open(model_path, 'rb') as f:
+            return cls.from_model(pickle.load(f))
+
+    # ------------------------------------------------------------------
+    # 저장 / 로드
+    # ------------------------------------------------------------------
+    def save(self, path):
+        np.savez(
+            path,
+            feature=self.feature, threshold=self.threshold, left=self.left, right=self.right,
+            default_left=self.default_left, value=self.value, roots=self.roots,
+            tree_class=self.tree_class, base_margin=self.base_margin,
+            meta=np.array(json.dumps({
+                'n_classes': self.n_classes,
+                'max_depth': self.max_depth,
+                'objective': self.objective,
+                'feature_names': self.feature_names,
+            })),
+        )
+        print(f"💾 압축 예측기 저장: {path} (트리 {len(self.roots)}개, 노드 {len(self.feature):,}개)")
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            return cls(
+                data['feature'], data['threshold'], data['left'], data['right'],
+                data['default_left'], data['value'], data['roots'], data['tree_class'],
+                data['base_margin'], meta['n_classes'], meta['max_depth'], meta['objective'],
+                meta['feature_names'],
+            )
+
+    # ------------------------------------------------------------------
+    # 예측
+    # ------------------------------------------------------------------
+    def _as_array(self, X):
+        if hasattr(X, 'columns') and self.feature_names is not None:
+            X = X[self.feature_names]
+        X = np.asarray(X, dtype=np.float32)
+        return X.reshape(1, -1) if X.ndim == 1 else X
+
+    def leaf_values(self, X):
+        """(행 수 × 트리 수) 리프 값"""
+        X = self._as_array(X)
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[nodes]]
+            go_left = np.where(np.isnan(x), self.default_left[nodes], x < self.threshold[nodes])
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return self.value[nodes]
+
+    def margin(self, X):
+        """(행 수 × 출력 수) 원시 마진"""
+        return self.leaf_values(X) @ self._class_matrix + self.base_margin
+
+    def predict_proba(self, X):
+        margin = self.margin(X)
+        if self.objective == 'binary:logistic':
+            positive = 1.0 / (1.0 + np.exp(-margin[:, 0]))
+            return np.column_stack([1.0 - positive, positive])
+        margin -= margin.max(axis=1, keepdims=True)
+        proba = np.exp(margin)
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    def predict(self, X):
+        return np.argmax(self.predict_proba(X), axis=1)
+
+
+def _tree_depth(left, right):
+    """루트부터 가장 깊은 리프까지의 분기 수"""
+    depth = 0
+    level = np.array([0])
+    while True:
+        level = level[left[level] != -1]
+        if len(level) == 0:
+            return depth
+        level = np.concatenate([left[level], right[level]])
+        depth += 1
+
+
+def export_model(model_path, output_path=None):
+    """피클 모델(.pkl) → 압축 예측기(.npz)"""
+    output_path = output_path or os.path.splitext(model_path)[0] + '.npz'
+    compact = CompactTreeEnsemble.from_pickle(model_path)
+    compact.save(output_path)
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="XGBoost 피클 모델 → 평면 배열 예측기(.npz) 변환")
+    parser.add_argument('model_path', help='학습된 모델 파일 (.pkl)')
+    parser.add_argument('-o', '--output', default=None, help='저장 경로 (기본: 모델 경로의 .npz)')
+    args = parser.parse_args()
+    export_model(args.model_path, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,331 @@
+"""
+로컬 모델 레지스트리
+- 버전별 폴더에 모델(.pkl / .npz), 변환 정보(피처 목록 등), 메타데이터 저장
+- CURRENT 파일이 현재 사용할 버전을 가리킴 (교체는 os.replace로 원자적)
+- 시그널 생성기는 사이클 사이에 CURRENT를 확인해서 재시작 없이 새 모델로 교체
+
+폴더 구조:
+    models/registry/
+        CURRENT                       # 활성 버전 이름 (예: 20250101_090000)
+        20250101_090000/
+            model.pkl                 # 학습된 XGBClassifier
+            model.npz                 # compact_predictor.py 변환본 (있으면 우선 사용)
+            features.json             # 모델 입력 피처 순서
+            metadata.json             # 버전, 등록 시각, 해시, 성능 지표 등 (마지막에 기록)
+            (추가 변환 파일 ...)
+
+사용 예:
+    python model_registry.py publish models/xgboost_crypto_model.pkl --features models/training_features.txt --metrics models/xgboost_results.json
+    python model_registry.py list
+    python model_registry.py activate 20250101_090000     # 롤백
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from datetime import datetime
+import warnings
+warnings.filterwarnings('ignore')
+
+from compact_predictor import CompactTreeEnsemble
+
+
+DEFAULT_REGISTRY_DIR = 'models/registry'
+CURRENT_FILE = 'CURRENT'
+METADATA_FILE = 'metadata.json'
+FEATURES_FILE = 'features.json'
+
+
+class LoadedModel:
+    """레지스트리에서 로드한 한 버전 (모델 + 피처 순서 + 메타데이터)"""
+
+    def __init__(self, version, model, feature_columns, metadata, path):
+        self.version = version
+        self.model = model
+        self.feature_columns = feature_columns
+        self.metadata = metadata
+        self.path = path
+
+    def artifact_path(self, name):
+        """버전 폴더 내 추가 변환 파일 경로"""
+        return os.path.join(self.path, name)
+
+
+class ModelRegistry:
+    """버전별 모델 폴더 + CURRENT 포인터"""
+
+    def __init__(self, root=DEFAULT_REGISTRY_DIR):
+        self.root = root
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def list_versions(self):
+        """등록이 끝난 버전 목록 (metadata.json 있는 폴더만, 오래된 순)"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if not name.startswith('.') and os.path.exists(os.path.join(self.root, name, METADATA_FILE))
+        )
+
+    def current_version(self):
+        """CURRENT가 가리키는 버전 (없으면 가장 최근 등록 버전)"""
+        try:
+            with open(os.path.join(self.root, CURRENT_FILE), 'r') as f:
+                version = f.read().strip()
+            if version:
+                return version
+        except FileNotFoundError:
+            pass
+        versions = self.list_versions()
+        return versions[-1] if versions else None
+
+    def metadata(self, version):
+        with open(os.path.join(self.root, version, METADATA_FILE), 'r') as f:
+            return json.load(f)
+
+    def load(self, version=None):
+        """
+        버전 로드 (기본: 현재 버전)
+
+        - model.npz가 있으면 평면 배열 예측기, 없으면 model.pkl을 로드해 변환
+        """
+        version = version or self.current_version()
+        if version is None:
+            raise FileNotFoundError(f"레지스트리에 등록된 모델이 없습니다: {self.root}")
+
+        path = os.path.join(self.root, version)
+        metadata = self.metadata(version)
+
+        npz_path = os.path.join(path, 'model.npz')
+        if os.path.exists(npz_path):
+            model = CompactTreeEnsemble.load(npz_path)
+        else:
+            with open(os.path.join(path, 'model.pkl'), 'rb') as f:
+                model = pickle.load(f)
+            try:
+                model = CompactTreeEnsemble.from_model(model)
+            except Exception as e:
+                print(f"압축 예측기 변환 실패 (원본 모델 사용): {e}")
+
+        feature_columns = None
+        features_path = os.path.join(path, FEATURES_FILE)
+        if os.path.exists(features_path):
+            with open(features_path, 'r') as f:
+                feature_columns = json.load(f)
+
+        return LoadedModel(version, model, feature_columns, metadata, path)
+
+    # ------------------------------------------------------------------
+    # 등록 / 활성화
+    # ------------------------------------------------------------------
+    def publish(self, model_path, version=None, feature_columns=None, artifacts=None,
+                metrics=None, notes=None, activate=True):
+        """
+        모델 등록
+
+        - 임시 폴더에 모두 쓴 뒤 폴더 이름 변경으로 한 번에 공개 (반쯤 쓰인 버전이 보이지 않음)
+        - activate=True면 CURRENT도 새 버전으로 교체
+
+        Parameters:
+        model_path: 학습된 모델 파일 (.pkl)
+        version: 버전 이름 (기본: 등록 시각 YYYYmmdd_HHMMSS)
+        feature_columns: 모델 입력 피처 순서 (None이면 모델의 feature_names)
+        artifacts: 같이 저장할 변환 파일 경로 목록 (스케일러 등)
+        metrics: 메타데이터에 기록할 성능 지표 dict
+        notes: 메모
+
+        Returns:
+        str: 등록된 버전
+        """
+        version = version or datetime.now().strftime('%Y%m%d_%H%M%S')
+        final_path = os.path.join(self.root, version)
+        if os.path.exists(final_path):
+            raise FileExistsError(f"이미 등록된 버전입니다: {version}")
+
+        temp_path = os.path.join(self.root, f".tmp_{version}")
+        shutil.rmtree(temp_path, ignore_errors=True)
+        os.makedirs(temp_path)
+
+        try:
+            shutil.copy2(model_path, os.path.join(temp_path, 'model.pkl'))
+            with open(model_path, 'rb') as f:
+                model_bytes = f.read()
+            model = pickle.loads(model_bytes)
+
+            compact = None
+            try:
+                compact = CompactTreeEnsemble.from_model(model)
+                compact.save(os.path.join(temp_path, 'model.npz'))
+            except Exception as e:
+                print(f"⚠️  압축 예측기 변환 실패 (model.pkl만 저장): {e}")
+
+            if feature_columns is None:
+                booster = model.get_booster() if hasattr(model, 'get_booster') else None
+                feature_columns = booster.feature_names if booster is not None else None
+            if feature_columns:
+                with open(os.path.join(temp_path, FEATURES_FILE), 'w') as f:
+                    json.dump(list(feature_columns), f, indent=2, ensure_ascii=False)
+
+            artifact_names = []
+            for artifact in artifacts or []:
+                shutil.copy2(artifact, os.path.join(temp_path, os.path.basename(artifact)))
+                artifact_names.append(os.path.basename(artifact))
+
+            metadata = {
+                'version': version,
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'trained_at': datetime.fromtimestamp(os.path.getmtime(model_path)).isoformat(timespec='seconds'),
+                'source': os.path.abspath(model_path),
+                'sha256': hashlib.sha256(model_bytes).hexdigest(),
+                'model_class': type(model).__name__,
+                'predictor': 'CompactTreeEnsemble' if compact is not None else type(model).__name__,
+                'feature_count': len(feature_columns) if feature_columns else None,
+                'artifacts': artifact_names,
+                'metrics': metrics or {},
+                'notes': notes,
+            }
+            # metadata.json은 마지막에 기록 → 있으면 등록 완료된 버전
+            with open(os.path.join(temp_path, METADATA_FILE), 'w') as f:
+                json.dump(metadata, f, indent=2, ensure_ascii=False, default=str)
+
+            os.rename(temp_path, final_path)
+        except Exception:
+            shutil.rmtree(temp_path, ignore_errors=True)
+            raise
+
+        print(f"📦 모델 등록: {version} → {final_path}")
+        if activate:
+            self.activate(version)
+        return version
+
+    def activate(self, version):
+        """CURRENT를 version으로 원자적 교체 (롤백에도 사용)"""
+        if not os.path.exists(os.path.join(self.root, version, METADATA_FILE)):
+            raise FileNotFoundError(f"등록되지 않은 버전입니다: {version}")
+        temp_file = os.path.join(self.root, f".{CURRENT_FILE}.tmp")
+        with open(temp_file, 'w') as f:
+            f.write(version + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, os.path.join(self.root, CURRENT_FILE))
+        print(f"✅ 활성 버전: {version}")
+
+
+class ModelWatcher:
+    """
+    레지스트리 CURRENT 변경 감지 → 새 버전 로드
+
+    - CURRENT 파일의 수정 시각이 바뀐 경우에만 내용을 읽음 (사이클마다 호출해도 부담 없음)
+    - 새 버전 로드가 끝난 뒤에만 교체하고, 실패하면 기존 버전 유지
+    - 호출 측에서 쓸 수 없는 버전이면 reject()로 되돌림 (CURRENT가 다른 버전을 가리킬 때까지 다시 로드하지 않음)
+    """
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.loaded = None
+        self.rejected = None
+        self._previous = None
+        self._stamp = None
+
+    def _current_stamp(self):
+        try:
+            stat = os.stat(os.path.join(self.registry.root, CURRENT_FILE))
+            return (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            return None
+
+    def poll(self):
+        """
+        Returns:
+        LoadedModel or None: 새 버전으로 바뀌었으면 로드된 버전, 아니면 None
+        """
+        stamp = self._current_stamp()
+        if self.loaded is not None and stamp == self._stamp:
+            return None
+
+        version = self.registry.current_version()
+        if version is None or version == self.rejected or (self.loaded is not None and version == self.loaded.version):
+            self._stamp = stamp
+            return None
+
+        try:
+            loaded = self.registry.load(version)
+        except Exception as e:
+            print(f"❌ 모델 {version} 로드 실패 (기존 버전 유지): {e}")
+            return None
+
+        self._stamp = stamp
+        self._previous, self.loaded = self.loaded, loaded
+        self.rejected = None
+        return loaded
+
+    def reject(self, version):
+        """poll()로 받은 버전을 사용하지 않기로 했을 때 이전 버전으로 되돌림"""
+        if self.loaded is None or self.loaded.version != version:
+            return
+        self.loaded, self._previous = self._previous, None
+        self.rejected = version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 모델 레지스트리 관리")
+    parser.add_argument('--registry', default=DEFAULT_REGISTRY_DIR, help='레지스트리 폴더')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    publish = sub.add_parser('publish', help='모델 등록')
+    publish.add_argument('model_path', help='학습된 모델 파일 (.pkl)')
+    publish.add_argument('--version', default=None)
+    publish.add_argument('--features', default=None, help='피처 목록 (training_features.txt 또는 feature_list.json)')
+    publish.add_argument('--metrics', default=None, help='성능 지표 JSON (xgboost_results.json 등)')
+    publish.add_argument('--artifact', action='append', default=[], help='같이 저장할 변환 파일 (여러 번 지정 가능)')
+    publish.add_argument('--notes', default=None)
+    publish.add_argument('--no-activate', action='store_true', help='등록만 하고 CURRENT는 유지')
+
+    sub.add_parser('list', help='등록된 버전 목록')
+
+    activate = sub.add_parser('activate', help='활성 버전 변경 (롤백)')
+    activate.add_argument('version')
+
+    args = parser.parse_args()
+    registry = ModelRegistry(args.registry)
+
+    if args.command == 'publish':
+        feature_columns = None
+        if args.features:
+            with open(args.features, 'r') as f:
+                if args.features.endswith('.json'):
+                    content = json.load(f)
+                    feature_columns = content['feature_list'] if isinstance(content, dict) else content
+                else:
+                    feature_columns = [line.strip() for line in f if line.strip()]
+        metrics = None
+        if args.metrics:
+            with open(args.metrics, 'r') as f:
+                metrics = json.load(f)
+        registry.publish(
+            args.model_path, version=args.version, feature_columns=feature_columns,
+            artifacts=args.artifact, metrics=metrics, notes=args.notes,
+            activate=not args.no_activate,
+        )
+
+    elif args.command == 'list':
+        current = registry.current_version()
+        versions = registry.list_versions()
+        if not versions:
+            print(f"등록된 모델이 없습니다: {registry.root}")
+        for version in versions:
+            metadata = registry.metadata(version)
+            marker = '▶' if version == current else ' '
+            print(f"{marker} {version}  {metadata.get('created_at', '')}  "
+                  f"피처 {metadata.get('feature_count')}  {metadata.get('predictor', '')}  {metadata.get('notes') or ''}")
+
+    elif args.command == 'activate':
+        registry.activate(args.version)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""
+1시간봉 기준 저장소 + 상위 시간봉(4h / 1d) 리샘플링
+
+- 1시간봉만 한 번 다운로드/저장 (data/1h/raw_data_1h/{심볼}_1h.csv, crypto_downloader 저장 형식 그대로)
+- 4시간봉/일봉은 저장소에서 바로 계산: 시가=첫 봉 Open, 고가=max(High), 저가=min(Low), 종가=마지막 봉 Close, 거래량=합계
+- 구간 경계는 UTC 기준 (일봉 = UTC 00:00 ~ 24:00, yfinance 암호화폐 일봉과 동일 / 4시간봉 = 00, 04, 08 ... UTC)
+- 전 종목을 (Symbol, 구간) 한 번의 groupby로 처리
+
+사용 예:
+    store = HourlyBarStore('/workspace/AI모델/projects/coin/data/1h/raw_data_1h')
+    daily = store.bars('1d')                                                # 전 종목 일봉 (Symbol, Date, OHLCV)
+    store.export('1d', '/workspace/AI모델/projects/coin/data/raw_data')     # 일봉 파이프라인 입력 CSV 생성
+    python bar_store.py --store data/1h/raw_data_1h --export 1d --output data/raw_data
+"""
+import argparse
+import os
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+import warnings
+warnings.filterwarnings('ignore')
+
+
+OHLCV_AGG = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+# 구간당 필요한 1시간봉 비율 기본값 (야후 1시간봉은 한두 시간씩 빠지는 날이 흔함 → 일봉 기준 20/24)
+DEFAULT_MIN_FRACTION = 20 / 24
+
+# 시간봉 → (pandas 주기, 구간당 1시간봉 수)
+TIMEFRAMES = {
+    '1h': ('1h', 1),
+    '2h': ('2h', 2),
+    '4h': ('4h', 4),
+    '6h': ('6h', 6),
+    '12h': ('12h', 12),
+    '1d': ('1D', 24),
+}
+
+
+def resample_ohlcv(panel, timeframe, drop_incomplete=True, min_fraction=DEFAULT_MIN_FRACTION):
+    """
+    여러 종목 1시간봉 → 상위 시간봉 (전 종목 한 번에)
+
+    Parameters:
+    panel: Symbol, Datetime(UTC), Open/High/Low/Close/Volume 컬럼의 긴 형식 DataFrame
+    timeframe: '4h', '1d' 등 (TIMEFRAMES)
+    drop_incomplete: True면 1시간봉이 모자란 구간 제거
+                     - 종목별 마지막 구간은 1시간봉이 다 차지 않았으면 항상 제거 (진행 중인 봉)
+                     - 그 외 구간은 min_fraction 미만일 때만 제거 (데이터 구멍)
+    min_fraction: 구간당 필요한 1시간봉 비율 (1.0 = 전부, 기본 20/24)
+
+    Returns:
+    DataFrame: Symbol, Datetime(일봉은 Date), OHLCV, Bars(구간에 들어간 1시간봉 수)
+    """
+    rule, bars_per_bucket = TIMEFRAMES[timeframe]
+    timestamps = pd.to_datetime(panel['Datetime'], utc=True)
+
+    frame = panel[['Symbol'] + [col for col in OHLCV_AGG if col in panel.columns]].copy()
+    frame['Bucket'] = timestamps.dt.floor(rule)
+    # first/last가 시간 순서를 따르도록 정렬 (이미 정렬돼 있으면 그대로)
+    order = np.lexsort((timestamps.values, frame['Symbol'].values))
+    if not (order == np.arange(len(order))).all():
+        frame = frame.iloc[order]
+
+    agg = {col: how for col, how in OHLCV_AGG.items() if col in frame.columns}
+    grouped = frame.groupby(['Symbol', 'Bucket'], sort=False)
+    bars = grouped.agg(agg)
+    bars['Bars'] = grouped.size()
+    bars = bars.reset_index()
+
+    if drop_incomplete:
+        # 종목별로 시간순 정렬된 상태 → 종목의 마지막 행 = 진행 중일 수 있는 구간
+        trailing = ~bars['Symbol'].duplicated(keep='last')
+        enough = bars['Bars'] >= int(np.ceil(bars_per_bucket * min_fraction))
+        forming = trailing & (bars['Bars'] < bars_per_bucket)
+        bars = bars[enough & ~forming]
+
+    if timeframe == '1d':
+        # 일봉 파이프라인 형식 (tz 없는 날짜, 컬럼 이름 Date)
+        bars['Bucket'] = bars['Bucket'].dt.tz_localize(None)
+        bars = bars.rename(columns={'Bucket': 'Date'})
+    else:
+        bars = bars.rename(columns={'Bucket': 'Datetime'})
+    return bars.reset_index(drop=True)
+
+
+def merge_bars(existing, new):
+    """같은 시각은 새 데이터로 덮어쓰고 시간순 정렬 (인덱스 = 시각)"""
+    if existing is None or existing.empty:
+        return new.sort_index()
+    merged = pd.concat([existing, new])
+    return merged[~merged.index.duplicated(keep='last')].sort_index()
+
+
+class HourlyBarStore:
+    """
+    종목별 1시간봉 CSV 폴더 (crypto_downloader interval='1h' 저장 형식)
+
+    - 파일: {root}/{심볼}_1h.csv, 컬럼 Datetime(UTC) + OHLCV
+    - 새로 받은 데이터는 merge로 누적 → 야후 1시간봉 제공 기간(최근 730일)보다 긴 이력 유지
+    """
+
+    SUFFIX = '_1h.csv'
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, symbol):
+        return os.path.join(self.root, f"{symbol}{self.SUFFIX}")
+
+    def symbols(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name[:-len(self.SUFFIX)] for name in os.listdir(self.root) if name.endswith(self.SUFFIX))
+
+    def load(self, symbol, start=None, end=None):
+        """한 종목 1시간봉 (인덱스 Datetime, UTC)"""
+        data = pd.read_csv(self.path(symbol))
+        time_column = 'Datetime' if 'Datetime' in data.columns else data.columns[0]
+        data.index = pd.to_datetime(data.pop(time_column), utc=True)
+        data.index.name = 'Datetime'
+        if start is not None:
+            data = data[data.index >= pd.Timestamp(start, tz='UTC')]
+        if end is not None:
+            data = data[data.index < pd.Timestamp(end, tz='UTC')]
+        return data
+
+    def load_panel(self, symbols=None, start=None, end=None):
+        """여러 종목 1시간봉 → 긴 형식 (Symbol, Datetime, OHLCV)"""
+        frames = []
+        for symbol in tqdm(symbols or self.symbols(), desc="1시간봉 로드"):
+            try:
+                data = self.load(symbol, start, end)
+            except Exception as e:
+                print(f"⚠️ {symbol} 로드 실패: {e}")
+                continue
+            if data.empty:
+                continue
+            data = data.reset_index()
+            data.insert(0, 'Symbol', symbol)
+            frames.append(data)
+        if not frames:
+            return pd.DataFrame(columns=['Symbol', 'Datetime'] + list(OHLCV_AGG))
+        return pd.concat(frames, ignore_index=True)
+
+    def merge(self, symbol, data):
+        """
+        새 1시간봉 병합 저장 (인덱스 = 시각)
+
+        Returns:
+        int: 추가된 행 수
+        """
+        os.makedirs(self.root, exist_ok=True)
+        data = data.copy()
+        data.index = pd.to_datetime(data.index, utc=True)
+        data.index.name = 'Datetime'
+
+        existing = self.load(symbol) if os.path.exists(self.path(symbol)) else None
+        merged = merge_bars(existing, data)
+
+        temp_path = f"{self.path(symbol)}.tmp"
+        merged.reset_index().to_csv(temp_path, index=False)
+        os.replace(temp_path, self.path(symbol))
+        return len(merged) - (len(existing) if existing is not None else 0)
+
+    def bars(self, timeframe, symbols=None, start=None, end=None, drop_incomplete=True,
+             min_fraction=DEFAULT_MIN_FRACTION):
+        """전 종목 timeframe 봉 (긴 형식)"""
+        panel = self.load_panel(symbols, start, end)
+        if timeframe == '1h' or panel.empty:
+            return panel
+        return resample_ohlcv(panel, timeframe, drop_incomplete=drop_incomplete, min_fraction=min_fraction)
+
+    def export(self, timeframe, output_dir, symbols=None, backfill=True, drop_incomplete=True,
+               min_fraction=DEFAULT_MIN_FRACTION):
+        """
+        리샘플링한 봉을 종목별 CSV로 저장 (기존 파이프라인 입력 형식)
+
+        - 1d: {output_dir}/{심볼}.csv, 컬럼 Date + OHLCV (A00_01 일봉 raw_data와 동일)
+        - 그 외: {output_dir}/{심볼}_{timeframe}.csv, 컬럼 Datetime + OHLCV
+        - backfill=True면 기존 파일에서 1시간봉 저장소 시작 이전 구간은 유지
+          (예: 2015년부터 받아둔 일봉 + 최근 구간은 1시간봉에서 계산)
+        - min_fraction: 구간당 필요한 1시간봉 비율 (resample_ohlcv 참고)
+
+        Returns:
+        dict: {심볼: 저장 행 수}
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        bars = self.bars(timeframe, symbols, drop_incomplete=drop_incomplete, min_fraction=min_fraction)
+        if bars.empty:
+            print(f"⚠️ 1시간봉 저장소가 비어 있습니다: {self.root}")
+            return {}
+
+        time_column = 'Date' if timeframe == '1d' else 'Datetime'
+        suffix = '' if timeframe == '1d' else f"_{timeframe}"
+        columns = [time_column] + [col for col in OHLCV_AGG if col in bars.columns]
+
+        saved = {}
+        backfilled = 0
+        for symbol, symbol_bars in bars.groupby('Symbol', sort=False):
+            filename = os.path.join(output_dir, f"{symbol}{suffix}.csv")
+            data = symbol_bars[columns]
+
+            if backfill and os.path.exists(filename):
+                previous = pd.read_csv(filename)
+                if time_column in previous.columns:
+                    previous_times = pd.to_datetime(previous[time_column], utc=(timeframe != '1d'))
+                    if timeframe == '1d' and previous_times.dt.tz is not None:
+                        previous_times = previous_times.dt.tz_localize(None)
+                    older = previous[previous_times < data[time_column].min()]
+                    if not older.empty:
+                        older = older.assign(**{time_column: previous_times[older.index]})
+                        data = pd.concat([older[[col for col in columns if col in older.columns]], data],
+                                         ignore_index=True)
+                        backfilled += len(older)
+
+            temp_path = f"{filename}.tmp"
+            data.to_csv(temp_path, index=False)
+            os.replace(temp_path, filename)
+            saved[symbol] = len(data)
+
+        print(f"✅ {timeframe} 봉 저장: {len(saved)}개 종목 → {output_dir} (기존 파일 이전 구간 {backfilled:,}행 유지)")
+        return saved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="1시간봉 저장소 → 상위 시간봉 CSV 생성")
+    parser.add_argument('--store', required=True, help='1시간봉 저장소 폴더 (raw_data_1h)')
+    parser.add_argument('--export', default='1d', choices=[tf for tf in TIMEFRAMES if tf != '1h'])
+    parser.add_argument('--output', required=True, help='저장 폴더 (일봉이면 raw_data)')
+    parser.add_argument('--symbols', default=None, help='쉼표로 구분한 종목 (기본: 저장소 전체)')
+    parser.add_argument('--no-backfill', action='store_true', help='기존 파일의 이전 구간을 버림')
+    parser.add_argument('--keep-incomplete', action='store_true', help='1시간봉이 모자란 구간도 저장')
+    parser.add_argument('--min-fraction', type=float, default=DEFAULT_MIN_FRACTION,
+                        help='구간당 필요한 1시간봉 비율 (기본 20/24, 1.0이면 빠진 시간이 있는 구간 제거)')
+    args = parser.parse_args()
+
+    store = HourlyBarStore(args.store)
+    store.export(
+        args.export, args.output,
+        symbols=args.symbols.split(',') if args.symbols else None,
+        backfill=not args.no_backfill,
+        drop_incomplete=not args.keep_incomplete,
+        min_fraction=args.min_fraction,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+"""
+OHLCV 다운로더 비교 - 로컬 fixture 서버 사용 (네트워크 불필요)
+
+- Yahoo chart(v8)/quote(v7)와 같은 JSON을 돌려주는 aiohttp 서버를 띄움
+  (요청마다 지연 + 일정 비율 429 응답으로 실제 API 흉내)
+- 순차 방식 (동시 1개 + 종목 사이 0.5초 대기, 기존 노트북 방식) vs 동시 다운로드 비교
+- 체크포인트 재개: 중간에 끊긴 뒤 다시 실행하면 남은 종목만 받는지 확인
+
+실행 예:
+    python benchmark_downloader.py --symbols 150 --days 700 --latency 0.8
+"""
+import argparse
+import asyncio
+import shutil
+import tempfile
+import threading
+import time
+import numpy as np
+import pandas as pd
+from aiohttp import web
+import warnings
+warnings.filterwarnings('ignore')
+
+from crypto_downloader import SimpleCryptoDownloader, YahooChartProvider
+
+
+class FixtureServer:
+    """Yahoo chart/quote 형식의 가짜 시세 서버 (별도 스레드에서 실행)"""
+
+    def __init__(self, latency=0.5, error_rate=0.05, seed=42):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = np.random.default_rng(seed)
+        self.request_count = 0
+        self.port = None
+        self._loop = None
+        self._runner = None
+        self._thread = None
+
+    async def chart(self, request):
+        self.request_count += 1
+        await asyncio.sleep(self.latency)
+        if self.rng.random() < self.error_rate:
+            return web.Response(status=429, headers={'Retry-After': '0.2'})
+
+        symbol = request.match_info['symbol']
+        step = 3600 if request.query.get('interval') == '1h' else 86400
+        start = int(request.query['period1']) // step * step
+        end = int(request.query['period2'])
+        timestamps = np.arange(start, end, step)
+
+        # 종목별로 고정된 랜덤 워크 가격
+        rng = np.random.default_rng(abs(hash(symbol)) % (2 ** 32) + start // step)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(timestamps))))
+        quote = {
+            'open': np.round(close * (1 + rng.normal(0, 0.002, len(close))), 6).tolist(),
+            'high': np.round(close * 1.01, 6).tolist(),
+            'low': np.round(close * 0.99, 6).tolist(),
+            'close': np.round(close, 6).tolist(),
+            'volume': rng.integers(1_000, 1_000_000, len(close)).tolist(),
+        }
+        return web.json_response({'chart': {'result': [{
+            'meta': {'symbol': symbol},
+            'timestamp': timestamps.tolist(),
+            'indicators': {'quote': [quote]},
+        }], 'error': None}})
+
+    async def quote(self, request):
+        self.request_count += 1
+        await asyncio.sleep(self.latency)
+        symbols = request.query['symbols'].split(',')
+        return web.json_response({'quoteResponse': {'result': [
+            {'symbol': symbol, 'marketCap': int(1e12 / (i + 1))} for i, symbol in enumerate(symbols)
+        ]}})
+
+    def start(self):
+        ready = threading.Event()
+
+        async def serve():
+            app = web.Application()
+            app.router.add_get('/v8/finance/chart/{symbol}', self.chart)
+            app.router.add_get('/v7/finance/quote', self.quote)
+            self._runner = web.AppRunner(app)
+            await self._runner.setup()
+            site = web.TCPSite(self._runner, '127.0.0.1', 0)
+            await site.start()
+            self.port = site._server.sockets[0].getsockname()[1]
+            ready.set()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(serve())
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        ready.wait()
+        return f"http://127.0.0.1:{self.port}"
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+class SequentialProvider(YahooChartProvider):
+    """기존 노트북 방식 흉내: 종목마다 요청 후 0.5초 대기"""
+
+    async def fetch_ohlcv(self, symbol, start_date, end_date, interval):
+        data = await super().fetch_ohlcv(symbol, start_date, end_date, interval)
+        await asyncio.sleep(0.5)
+        return data
+
+
+def run_mode(name, base_url, symbols, start_date, end_date, interval, provider_class, **kwargs):
+    output = tempfile.mkdtemp(prefix=f'download_{name}_')
+    try:
+        downloader = SimpleCryptoDownloader(
+            start_date, end_date, output=output, interval=interval,
+            provider=provider_class(base_url), **kwargs,
+        )
+        started = time.perf_counter()
+        data = downloader.run_download(symbols)
+        elapsed = time.perf_counter() - started
+        rows = sum(len(df) for df in data.values())
+        return {'seconds': elapsed, 'symbols': len(data), 'rows': rows, 'failed': len(downloader.failed_symbols)}
+    finally:
+        shutil.rmtree(output, ignore_errors=True)
+
+
+def check_resume(base_url, symbols, start_date, end_date, interval, workers):
+    """절반만 받은 상태(체크포인트)에서 재실행 → 남은 종목만 요청하는지 확인"""
+    output = tempfile.mkdtemp(prefix='download_resume_')
+    try:
+        first = SimpleCryptoDownloader(start_date, end_date, output=output, interval=interval,
+                                       provider=YahooChartProvider(base_url), max_workers=workers, rate_per_sec=None)
+        first.run_download(symbols[:len(symbols) // 2])
+
+        second = SimpleCryptoDownloader(start_date, end_date, output=output, interval=interval,
+                                        provider=YahooChartProvider(base_url), max_workers=workers, rate_per_sec=None)
+        started = time.perf_counter()
+        data = second.run_download(symbols)
+        return {'seconds': time.perf_counter() - started, 'symbols': len(data)}
+    finally:
+        shutil.rmtree(output, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="순차 vs 동시 OHLCV 다운로드 비교 (로컬 fixture 서버)")
+    parser.add_argument('--symbols', type=int, default=150)
+    parser.add_argument('--days', type=int, default=700, help='다운로드 기간 (일)')
+    parser.add_argument('--interval', default='1h')
+    parser.add_argument('--latency', type=float, default=0.8, help='fixture 서버 응답 지연 (초)')
+    parser.add_argument('--error-rate', type=float, default=0.05, help='429 응답 비율')
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--rate', type=float, default=20.0, help='초당 최대 요청 수')
+    parser.add_argument('--skip-sequential', action='store_true')
+    args = parser.parse_args()
+
+    server = FixtureServer(latency=args.latency, error_rate=args.error_rate)
+    base_url = server.start()
+    print(f"🧪 fixture 서버: {base_url} (지연 {args.latency}초, 429 비율 {args.error_rate:.0%})")
+
+    symbols = [f'COIN{i}-USD' for i in range(args.symbols)]
+    end = pd.Timestamp('2025-09-21')
+    start_date, end_date = str((end - pd.Timedelta(days=args.days)).date()), str(end.date())
+
+    results = {}
+    try:
+        if not args.skip_sequential:
+            results['sequential'] = run_mode('sequential', base_url, symbols, start_date, end_date, args.interval,
+                                             SequentialProvider, max_workers=1, rate_per_sec=None, resume=False)
+        results['concurrent'] = run_mode('concurrent', base_url, symbols, start_date, end_date, args.interval,
+                                         YahooChartProvider, max_workers=args.workers, rate_per_sec=args.rate,
+                                         resume=False)
+        resume = check_resume(base_url, symbols, start_date, end_date, args.interval, args.workers)
+    finally:
+        server.stop()
+
+    print(f"\n{'='*60}")
+    print(f"{'방식':<14}{'시간(초)':>10}{'종목':>8}{'행 수':>14}{'실패':>6}")
+    for name, r in results.items():
+        print(f"{name:<14}{r['seconds']:>10.1f}{r['symbols']:>8}{r['rows']:>14,}{r['failed']:>6}")
+    if 'sequential' in results:
+        print(f"속도 향상: {results['sequential']['seconds'] / results['concurrent']['seconds']:.1f}x")
+    print(f"재개 (절반 완료 후): {resume['seconds']:.1f}초, 결과 {resume['symbols']}종목")
+    print(f"{'='*60}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+"""
+메모리 내 학습 vs 조각(shard) 스트리밍/외부 메모리 학습 비교 (최대 RSS, 소요 시간)
+
+- memory:   train/val CSV를 pd.read_csv로 읽어 XGBClassifier 학습 (학습 노트북 방식)
+- stream:   조각을 한 개씩 읽어 메모리 내 QuantileDMatrix 생성 후 학습
+- external: 조각 → 디스크 페이지 캐시(ExtMemQuantileDMatrix) 학습
+각 방식은 별도 프로세스에서 실행해 최대 RSS를 따로 측정
+
+실행 예:
+    python benchmark_external_memory.py --data-dir /workspace/AI모델/projects/coin/data/1h/xgboost_B
+    python benchmark_external_memory.py --synthetic 2000000 --n-features 150   # 임시 데이터 생성 후 비교
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import warnings
+warnings.filterwarnings('ignore')
+
+
+def peak_rss_mb():
+    """현재 프로세스 최대 RSS (MB, Linux ru_maxrss는 KB / macOS는 byte)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def make_synthetic(data_dir, rows, n_features, rows_per_shard, seed=42):
+    """CSV(train/val)와 같은 내용의 조각 폴더 생성"""
+    from feature_shards import write_feature_shards
+
+    rng = np.random.default_rng(seed)
+    n_symbols = 50
+    dates = pd.date_range('2021-01-01', periods=rows // n_symbols, freq='h')
+    features = [f'feature_{i}' for i in range(n_features)]
+
+    df = pd.DataFrame(rng.normal(size=(len(dates) * n_symbols, n_features)).astype(np.float32), columns=features)
+    df.insert(0, 'Date', np.repeat(dates, n_symbols))
+    df.insert(1, 'Symbol', np.tile([f'S{i}' for i in range(n_symbols)], len(dates)))
+    signal = df['feature_0'] + 0.5 * df['feature_1'] + rng.normal(size=len(df))
+    df['Future_Label'] = np.digitize(signal, [-0.7, 0.7]).astype(int)
+
+    split = int(len(df) * 0.85)
+    df.iloc[:split].to_csv(os.path.join(data_dir, 'train_data.csv'), index=False)
+    df.iloc[split:].to_csv(os.path.join(data_dir, 'val_data.csv'), index=False)
+    with open(os.path.join(data_dir, 'training_features.txt'), 'w') as f:
+        for feature in features:
+            f.write(f"{feature}\n")
+
+    write_feature_shards(df.iloc[:split], os.path.join(data_dir, 'shards', 'train'), features, rows_per_shard=rows_per_shard)
+    write_feature_shards(df.iloc[split:], os.path.join(data_dir, 'shards', 'val'), features, rows_per_shard=rows_per_shard)
+
+
+def run_memory(data_dir, params, feature_columns):
+    """학습 노트북 load_and_prepare_data + 최종 모델 학습과 같은 경로"""
+    import xgboost as xgb
+    from walk_forward_cv import balanced_sample_weights
+
+    started = time.perf_counter()
+    train_df = pd.read_csv(os.path.join(data_dir, 'train_data.csv'))
+    val_df = pd.read_csv(os.path.join(data_dir, 'val_data.csv'))
+    X_train = train_df[feature_columns].fillna(0).replace([np.inf, -np.inf], 0)
+    y_train = train_df['Future_Label']
+    X_val = val_df[feature_columns].fillna(0).replace([np.inf, -np.inf], 0)
+    y_val = val_df['Future_Label']
+    loaded = time.perf_counter()
+
+    model = xgb.XGBClassifier(**params)
+    model.fit(X_train, y_train, sample_weight=balanced_sample_weights(y_train),
+              eval_set=[(X_val, y_val)], verbose=False)
+    finished = time.perf_counter()
+    return {'build_sec': loaded - started, 'train_sec': finished - loaded, 'total_sec': finished - started}
+
+
+def run_shards(data_dir, params, feature_columns, external_memory):
+    from feature_shards import train_from_shards
+
+    cache_dir = tempfile.mkdtemp(prefix='xgb_cache_')
+    try:
+        _, timings = train_from_shards(
+            params,
+            os.path.join(data_dir, 'shards', 'train'),
+            os.path.join(data_dir, 'shards', 'val'),
+            feature_columns=feature_columns,
+            external_memory=external_memory,
+            cache_dir=cache_dir,
+        )
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return timings
+
+
+def _child(mode, data_dir, params, feature_columns, queue):
+    try:
+        if mode == 'memory':
+            timings = run_memory(data_dir, params, feature_columns)
+        else:
+            timings = run_shards(data_dir, params, feature_columns, external_memory=(mode == 'external'))
+        timings['peak_rss_mb'] = peak_rss_mb()
+        queue.put((mode, timings, None))
+    except Exception as e:
+        queue.put((mode, None, repr(e)))
+
+
+def benchmark(data_dir, params, modes):
+    with open(os.path.join(data_dir, 'training_features.txt'), 'r') as f:
+        feature_columns = [line.strip() for line in f if line.strip()]
+    from feature_shards import load_manifest
+    stored = set(load_manifest(os.path.join(data_dir, 'shards', 'train'))['features'])
+    feature_columns = [col for col in feature_columns if col in stored]
+
+    ctx = mp.get_context('spawn')
+    results = {}
+    for mode in modes:
+        print(f"\n⏱️ {mode} 학습 중...")
+        queue = ctx.Queue()
+        process = ctx.Process(target=_child, args=(mode, data_dir, params, feature_columns, queue))
+        process.start()
+        mode, timings, error = queue.get()
+        process.join()
+        if error:
+            print(f"❌ {mode} 실패: {error}")
+            continue
+        results[mode] = timings
+
+    print(f"\n{'='*70}")
+    print(f"{'방식':<10}{'최대 RSS(MB)':>14}{'준비(초)':>12}{'학습(초)':>12}{'전체(초)':>12}")
+    for mode, t in results.items():
+        print(f"{mode:<10}{t['peak_rss_mb']:>14.0f}{t['build_sec']:>12.1f}{t['train_sec']:>12.1f}{t['total_sec']:>12.1f}")
+    print(f"{'='*70}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메모리 내 vs 외부 메모리 XGBoost 학습 비교")
+    parser.add_argument('--data-dir', default=None, help='train_data.csv / val_data.csv / shards/ 폴더')
+    parser.add_argument('--synthetic', type=int, default=None, help='임시 데이터 행 수 (--data-dir 대신)')
+    parser.add_argument('--n-features', type=int, default=100)
+    parser.add_argument('--rows-per-shard', type=int, default=200_000)
+    parser.add_argument('--modes', default='memory,stream,external')
+    parser.add_argument('--n-estimators', type=int, default=200)
+    parser.add_argument('--max-depth', type=int, default=8)
+    parser.add_argument('--max-bin', type=int, default=256)
+    parser.add_argument('--threads', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    params = {
+        'objective': 'multi:softprob',
+        'num_class': 3,
+        'eval_metric': 'mlogloss',
+        'tree_method': 'hist',
+        'n_estimators': args.n_estimators,
+        'max_depth': args.max_depth,
+        'max_bin': args.max_bin,
+        'learning_rate': 0.1,
+        'early_stopping_rounds': 50,
+        'n_jobs': args.threads,
+        'random_state': 42,
+        'verbosity': 0,
+    }
+
+    temp_dir = None
+    data_dir = args.data_dir
+    if data_dir is None:
+        if not args.synthetic:
+            parser.error('--data-dir 또는 --synthetic 중 하나가 필요합니다')
+        temp_dir = tempfile.mkdtemp(prefix='xgb_bench_')
+        data_dir = temp_dir
+        print(f"🧪 임시 데이터 생성: {args.synthetic:,}행 × {args.n_features}피처 → {data_dir}")
+        make_synthetic(data_dir, args.synthetic, args.n_features, args.rows_per_shard)
+    elif not os.path.exists(os.path.join(data_dir, 'shards', 'train')):
+        parser.error(f"{data_dir}/shards/train 없음 - prepare_xgboost_data(..., shard_rows=...)로 먼저 생성하세요")
+
+    try:
+        benchmark(data_dir, params, args.modes.split(','))
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
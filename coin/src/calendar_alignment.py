@@ -0,0 +1,422 @@
+"""
+전 종목 공통 캘린더 정렬 + 결측 봉 분석 / 채우기
+
+- 모든 종목을 하나의 시간 축(T)에 한 번에 정렬 → (컬럼 × 종목 × 시간) 배열
+- 결측 봉 비트맵 (종목 × 시간): 상장(첫 봉) ~ 상장폐지(마지막 봉) 구간 안에서 봉이 없거나 Close가 NaN인 칸
+- 결측 통계(종목별 결측 수/비율, 구멍 개수, 최장 구멍, 시각별 결측 종목 수)는 비트맵에서 벡터 연산으로 계산
+- 채우기 정책을 전 종목에 벡터 연산으로 적용 (상장 전/폐지 후는 채우지 않음)
+  - 'flat': 직전 종가로 O/H/L/C 채움 (가격 컬럼 기본값 - 거래 없는 봉)
+  - 'ffill': 직전 값 유지
+  - 'zero': 0
+  - 'none': NaN 그대로
+
+사용 예:
+    panel = align_universe(crypto_data)                    # {심볼: DataFrame}
+    stats = gap_statistics(panel)                          # 종목별 결측 통계
+    filled = apply_fill_policy(panel)                      # 기본 정책 적용
+    crypto_data = filled.to_frames()                       # 다시 {심볼: DataFrame}
+    python calendar_alignment.py --input data/raw_data --output data/raw_data_aligned
+"""
+import argparse
+import os
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+import warnings
+warnings.filterwarnings('ignore')
+
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+# 컬럼 그룹별 기본 채우기 정책 (컬럼 이름으로 직접 지정도 가능)
+DEFAULT_FILL_POLICY = {
+    'price': 'flat',
+    'Volume': 'zero',
+    'signal': 'zero',
+    'default': 'ffill',
+}
+
+
+def column_group(column):
+    """컬럼 → 정책 그룹 (price / signal / default)"""
+    if column in PRICE_COLUMNS:
+        return 'price'
+    if '_Signal' in column:
+        return 'signal'
+    return 'default'
+
+
+class AlignedPanel:
+    """
+    공통 캘린더로 정렬된 전 종목 데이터
+
+    - 배열은 (컬럼 ×) 종목 × 시간 배치 → 시간 방향 누적 연산이 연속 메모리에서 동작
+    - 시간 × 종목 표는 bitmap() / column()으로 DataFrame 변환
+
+    Attributes:
+    index: 공통 시간 축 (DatetimeIndex, 일정 간격)
+    symbols: 종목 목록
+    columns: 컬럼 목록
+    values: (컬럼 × 종목 × 시간) float 배열, 원본에 없는 칸은 NaN
+    present: (종목 × 시간) 원본에 봉이 있고 Close가 NaN이 아닌 칸
+    listed: (종목 × 시간) 첫 봉 ~ 마지막 봉 구간
+    filled: (종목 × 시간) 채우기 정책으로 채워진 칸
+    """
+
+    def __init__(self, index, symbols, columns, values, present, filled=None):
+        self.index = index
+        self.symbols = list(symbols)
+        self.columns = list(columns)
+        self.values = values
+        self.present = present
+
+        # 종목별 첫/마지막 봉 위치 (봉이 하나도 없으면 -1)
+        has_any = present.any(axis=1)
+        self.first = np.where(has_any, present.argmax(axis=1), -1)
+        self.last = np.where(has_any, len(index) - 1 - present[:, ::-1].argmax(axis=1), -1)
+        positions = np.arange(len(index))[None, :]
+        self.listed = (positions >= self.first[:, None]) & (positions <= self.last[:, None]) & has_any[:, None]
+        self.filled = filled if filled is not None else np.zeros_like(present)
+
+    @property
+    def missing(self):
+        """상장 구간 안의 결측 봉 비트맵 (종목 × 시간)"""
+        return self.listed & ~self.present
+
+    def bitmap(self, name='missing'):
+        """비트맵 (missing / present / listed / filled) → 시간 × 종목 DataFrame"""
+        return pd.DataFrame(getattr(self, name).T, index=self.index, columns=self.symbols)
+
+    def column(self, name):
+        """한 컬럼의 시간 × 종목 DataFrame"""
+        return pd.DataFrame(self.values[self.columns.index(name)].T, index=self.index, columns=self.symbols)
+
+    def to_frames(self, listed_only=True):
+        """{심볼: DataFrame} (listed_only=True면 상장 구간만)"""
+        frames = {}
+        for j, symbol in enumerate(self.symbols):
+            if self.first[j] < 0:
+                continue
+            rows = slice(self.first[j], self.last[j] + 1) if listed_only else slice(None)
+            frames[symbol] = pd.DataFrame(self.values[:, j, rows].T, index=self.index[rows], columns=self.columns)
+        return frames
+
+
+def infer_frequency(crypto_data):
+    """종목들의 가장 흔한 봉 간격 (예: 1일 / 1시간)"""
+    deltas = []
+    for df in crypto_data.values():
+        if len(df) > 1:
+            deltas.append(np.diff(df.index.values[:1000].astype('datetime64[ns]').astype(np.int64)))
+    if not deltas:
+        raise ValueError("봉 간격을 추정할 데이터가 없습니다")
+    values, counts = np.unique(np.concatenate(deltas), return_counts=True)
+    return pd.Timedelta(int(values[counts.argmax()]), unit='ns')
+
+
+def _as_utc_naive(index):
+    """tz가 있으면 UTC로 바꾼 뒤 tz 제거 (종목 간 비교용)"""
+    index = pd.DatetimeIndex(index)
+    return index.tz_convert('UTC').tz_localize(None) if index.tz is not None else index
+
+
+def align_universe(crypto_data, columns=None, freq=None, start=None, end=None, dtype=np.float64):
+    """
+    전 종목을 공통 캘린더에 정렬
+
+    - 시간 축: 전체 종목 최초 봉 ~ 최종 봉, freq 간격 (없으면 추정)
+    - 각 종목 봉 위치는 (시각 - 시작) / 간격 으로 바로 계산해서 배열에 한 번에 기록
+    - 간격에 맞지 않는 시각(예: 일봉인데 00:00이 아닌 봉)은 버리고 개수를 출력
+
+    Parameters:
+    crypto_data: {심볼: DataFrame (DatetimeIndex)}
+    columns: 정렬할 컬럼 (기본: 모든 종목 공통 숫자 컬럼)
+    freq: 봉 간격 ('1D', '1h' 등)
+
+    Returns:
+    AlignedPanel
+    """
+    symbols = [symbol for symbol, df in crypto_data.items() if not df.empty]
+    if not symbols:
+        raise ValueError("정렬할 데이터가 없습니다")
+
+    if columns is None:
+        common = None
+        for symbol in symbols:
+            numeric = crypto_data[symbol].select_dtypes(include=[np.number]).columns
+            common = list(numeric) if common is None else [col for col in common if col in set(numeric)]
+        columns = common
+    columns = list(columns)
+
+    step = pd.Timedelta(freq) if freq is not None else infer_frequency({s: crypto_data[s] for s in symbols})
+    indexes = {symbol: _as_utc_naive(crypto_data[symbol].index) for symbol in symbols}
+    begin = pd.Timestamp(start) if start is not None else min(index.min() for index in indexes.values())
+    finish = pd.Timestamp(end) if end is not None else max(index.max() for index in indexes.values())
+    begin = begin.floor(step)
+    index = pd.date_range(begin, finish, freq=step)
+
+    values = np.full((len(columns), len(symbols), len(index)), np.nan, dtype=dtype)
+    present = np.zeros((len(symbols), len(index)), dtype=bool)
+    close_position = columns.index('Close') if 'Close' in columns else None
+
+    step_ns = step.value
+    begin_ns = begin.value
+    off_grid = 0
+    for j, symbol in enumerate(symbols):
+        df = crypto_data[symbol]
+        offsets = indexes[symbol].values.astype('datetime64[ns]').astype(np.int64) - begin_ns
+        positions = offsets // step_ns
+        valid = (offsets % step_ns == 0) & (positions >= 0) & (positions < len(index))
+        off_grid += int((~valid).sum())
+
+        block = df.reindex(columns=columns).to_numpy(dtype=dtype, na_value=np.nan)[valid]
+        rows = positions[valid]
+        values[:, j, rows] = block.T
+        if close_position is not None:
+            present[j, rows] = ~np.isnan(block[:, close_position])
+        else:
+            present[j, rows] = ~np.isnan(block).all(axis=1)
+
+    if off_grid:
+        print(f"⚠️ 간격({step})에 맞지 않거나 기간 밖인 봉 {off_grid:,}개 제외")
+
+    return AlignedPanel(index, symbols, columns, values, present)
+
+
+def _runs(mask):
+    """
+    (종목 × 시간) 불리언의 연속 True 구간
+
+    Returns:
+    tuple: (종목 번호, 시작 위치, 길이) 배열 - 종목, 시간 순
+    """
+    padded = np.zeros((mask.shape[0], mask.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    symbol, start = np.nonzero(edges == 1)
+    _, stop = np.nonzero(edges == -1)
+    return symbol, start, stop - start
+
+
+def gap_statistics(panel):
+    """
+    종목별 결측 봉 통계 (비트맵 벡터 연산)
+
+    Returns:
+    DataFrame: symbol, listed_from, listed_to, listed_bars, present_bars, missing_bars, missing_pct,
+               gap_count, longest_gap, longest_gap_start (결측 비율 내림차순)
+    """
+    n_symbols = len(panel.symbols)
+    missing = panel.missing
+    listed_bars = panel.listed.sum(axis=1)
+    missing_bars = missing.sum(axis=1)
+
+    symbol, start, length = _runs(missing)
+    gap_count = np.bincount(symbol, minlength=n_symbols)
+    longest = np.zeros(n_symbols, dtype=np.int64)
+    longest_start = np.zeros(n_symbols, dtype=np.int64)
+    if len(symbol):
+        # 종목별 (길이 오름차순) 정렬 후 마지막 = 최장 구멍
+        order = np.lexsort((length, symbol))
+        is_last = np.r_[symbol[order][1:] != symbol[order][:-1], True]
+        best = order[is_last]
+        longest[symbol[best]] = length[best]
+        longest_start[symbol[best]] = start[best]
+
+    has_any = panel.first >= 0
+    stats = pd.DataFrame({
+        'symbol': panel.symbols,
+        'listed_from': panel.index[np.maximum(panel.first, 0)].where(has_any),
+        'listed_to': panel.index[np.maximum(panel.last, 0)].where(has_any),
+        'listed_bars': listed_bars,
+        'present_bars': (panel.present & panel.listed).sum(axis=1),
+        'missing_bars': missing_bars,
+        'missing_pct': missing_bars / np.maximum(listed_bars, 1) * 100,
+        'gap_count': gap_count,
+        'longest_gap': longest,
+        'longest_gap_start': panel.index[longest_start].where(longest > 0),
+    })
+    return stats.sort_values('missing_pct', ascending=False).reset_index(drop=True)
+
+
+def missing_by_time(panel):
+    """시각별 상장 종목 수 / 결측 종목 수 / 결측 비율 (시간 순)"""
+    listed = panel.listed.sum(axis=0)
+    missing = panel.missing.sum(axis=0)
+    return pd.DataFrame({
+        'listed_symbols': listed,
+        'missing_symbols': missing,
+        'missing_pct': missing / np.maximum(listed, 1) * 100,
+    }, index=panel.index)
+
+
+def missing_value_matrix(crypto_data):
+    """
+    종목 × 컬럼 결측값(NaN) 개수 표 (종목마다 isna().sum() 한 번, 컬럼 합집합 기준)
+
+    - 종목에 없는 컬럼은 NaN
+    """
+    counts = {symbol: df.isna().sum() for symbol, df in crypto_data.items()}
+    return pd.DataFrame(counts).T
+
+
+def missing_by_date(crypto_data):
+    """
+    시각별 결측값 비율 (전 종목 모든 컬럼 기준, 종목마다 행 단위 isna 합계 한 번)
+
+    Returns:
+    DataFrame: missing_cells, total_cells, missing_pct (시간 순)
+    """
+    missing = pd.concat({symbol: df.isna().sum(axis=1) for symbol, df in crypto_data.items()}, axis=1)
+    widths = pd.Series({symbol: df.shape[1] for symbol, df in crypto_data.items()})
+    total = missing.notna().mul(widths[missing.columns], axis=1).sum(axis=1)
+    missing_cells = missing.sum(axis=1)
+    return pd.DataFrame({
+        'missing_cells': missing_cells,
+        'total_cells': total,
+        'missing_pct': missing_cells / total.clip(lower=1) * 100,
+    })
+
+
+def _ffill_positions(valid):
+    """(종목 × 시간) 각 칸에서 가장 최근 valid 위치 (없으면 -1)"""
+    positions = np.arange(valid.shape[1])[None, :]
+    return np.maximum.accumulate(np.where(valid, positions, -1), axis=1)
+
+
+def apply_fill_policy(panel, policy=None, limit=None):
+    """
+    채우기 정책 적용 (새 AlignedPanel 반환, 원본은 그대로)
+
+    - 상장 구간(listed) 안의 칸만 채움
+    - limit: 연속 결측이 이 봉 수보다 길면 그 구간은 채우지 않음 (None이면 제한 없음)
+
+    Parameters:
+    policy: {컬럼 이름 또는 그룹('price', 'signal', 'default'): 'flat' / 'ffill' / 'zero' / 'none'}
+            기본 DEFAULT_FILL_POLICY
+    """
+    policy = {**DEFAULT_FILL_POLICY, **(policy or {})}
+    values = panel.values.copy()
+    _, n_symbols, n_time = values.shape
+    rows = np.arange(n_symbols)[:, None]
+
+    fillable = panel.listed.copy()
+    if limit is not None:
+        # limit보다 긴 연속 결측 구간은 통째로 제외
+        symbol, start, length = _runs(panel.missing)
+        long_runs = length > limit
+        run_mask = np.zeros((n_symbols, n_time + 1), dtype=np.int32)
+        np.add.at(run_mask, (symbol[long_runs], start[long_runs]), 1)
+        np.add.at(run_mask, (symbol[long_runs], start[long_runs] + length[long_runs]), -1)
+        fillable &= np.cumsum(run_mask, axis=1)[:, :-1] == 0
+
+    # 가격 'flat' 기준: 직전 실제 봉의 종가
+    prev_close = None
+    if 'Close' in panel.columns:
+        source = _ffill_positions(panel.present)
+        close = values[panel.columns.index('Close')]
+        prev_close = np.where(source >= 0, close[rows, np.maximum(source, 0)], np.nan)
+
+    filled_any = np.zeros((n_symbols, n_time), dtype=bool)
+    for k, column in enumerate(panel.columns):
+        how = policy.get(column, policy.get(column_group(column), policy['default']))
+        data = values[k]
+        target = np.isnan(data) & fillable
+        if how == 'none' or not target.any():
+            continue
+
+        if how == 'zero':
+            data[target] = 0.0
+        elif how == 'flat' and prev_close is not None:
+            data[target] = prev_close[target]
+        elif how in ('ffill', 'flat'):
+            source = _ffill_positions(~np.isnan(data))
+            forward = np.where(source >= 0, data[rows, np.maximum(source, 0)], np.nan)
+            data[target] = forward[target]
+        else:
+            raise ValueError(f"알 수 없는 채우기 정책: {column} → {how}")
+        filled_any |= target & ~np.isnan(data)
+
+    filled = panel.filled | (filled_any & ~panel.present)
+    return AlignedPanel(panel.index, panel.symbols, panel.columns, values, panel.present, filled=filled)
+
+
+def print_gap_report(stats, top_n=15):
+    """gap_statistics 요약 출력"""
+    affected = stats[stats['missing_bars'] > 0]
+    print("=" * 60)
+    print("🕳️ 결측 봉 분석 (상장 ~ 마지막 봉 구간 기준)")
+    print("=" * 60)
+    print(f"전체 종목: {len(stats)}개 | 결측 봉 있는 종목: {len(affected)}개")
+    print(f"전체 결측 봉: {int(stats['missing_bars'].sum()):,}개 / 상장 봉 {int(stats['listed_bars'].sum()):,}개")
+    if affected.empty:
+        print("🎉 모든 종목이 상장 구간 안에서 빠진 봉이 없습니다!")
+        return
+    print(f"\n{'심볼':<10} {'상장':<20} {'마지막':<20} {'결측':>7} {'비율(%)':>8} {'구멍':>6} {'최장':>6}")
+    print("-" * 85)
+    for _, row in affected.head(top_n).iterrows():
+        print(f"{row['symbol']:<10} {str(row['listed_from']):<20} {str(row['listed_to']):<20} "
+              f"{row['missing_bars']:>7} {row['missing_pct']:>8.2f} {row['gap_count']:>6} {row['longest_gap']:>6}")
+
+
+def load_directory(input_dir, suffix='.csv'):
+    """원본 OHLCV 폴더 → {심볼: DataFrame} (첫 컬럼 Date/Datetime을 인덱스로)"""
+    crypto_data = {}
+    for name in tqdm(sorted(f for f in os.listdir(input_dir) if f.endswith(suffix)), desc="CSV 로드"):
+        df = pd.read_csv(os.path.join(input_dir, name))
+        time_column = next((col for col in ('Date', 'Datetime') if col in df.columns), df.columns[0])
+        df.index = pd.to_datetime(df.pop(time_column), utc=(time_column == 'Datetime'))
+        df.index.name = time_column
+        crypto_data[name[:-len(suffix)]] = df.sort_index()
+    return crypto_data
+
+
+def align_directory(input_dir, output_dir, freq=None, policy=None, limit=None, report=True):
+    """
+    원본 OHLCV 폴더 정렬 + 채우기 → output_dir에 같은 파일 이름으로 저장
+
+    - 지표 계산 등 이후 단계는 output_dir을 입력으로 사용 → 모든 단계가 같은 캘린더
+    - 종목별 결측 통계는 output_dir 옆 {폴더 이름}_gap_report.csv 에 저장 (종목 CSV 폴더에 섞이지 않게)
+
+    Returns:
+    tuple: (채워진 AlignedPanel, gap_statistics DataFrame)
+    """
+    crypto_data = load_directory(input_dir)
+    time_column = next(iter(crypto_data.values())).index.name if crypto_data else 'Date'
+    intraday = time_column == 'Datetime'
+
+    panel = align_universe(crypto_data, freq=freq)
+    stats = gap_statistics(panel)
+    if report:
+        print_gap_report(stats)
+
+    filled = apply_fill_policy(panel, policy=policy, limit=limit)
+    os.makedirs(output_dir, exist_ok=True)
+    for symbol, frame in tqdm(filled.to_frames().items(), desc="정렬 데이터 저장"):
+        frame.index = frame.index.tz_localize('UTC') if intraday else frame.index
+        frame.index.name = time_column
+        frame.reset_index().to_csv(os.path.join(output_dir, f"{symbol}.csv"), index=False)
+    report_path = f"{os.path.normpath(output_dir)}_gap_report.csv"
+    stats.to_csv(report_path, index=False)
+
+    print(f"✅ 정렬 완료: {len(filled.symbols)}개 종목 × {len(filled.index):,}봉 → {output_dir}"
+          f" (채운 봉 {int(filled.filled.sum()):,}개, 결측 통계 {report_path})")
+    return filled, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전 종목 공통 캘린더 정렬 + 결측 봉 채우기")
+    parser.add_argument('--input', required=True, help='원본 OHLCV CSV 폴더 (raw_data / raw_data_1h)')
+    parser.add_argument('--output', required=True, help='정렬된 CSV 저장 폴더')
+    parser.add_argument('--freq', default=None, help="봉 간격 ('1D', '1h' 등, 기본: 추정)")
+    parser.add_argument('--price', default='flat', choices=['flat', 'ffill', 'none'], help='가격 컬럼 채우기')
+    parser.add_argument('--volume', default='zero', choices=['zero', 'ffill', 'none'], help='거래량 채우기')
+    parser.add_argument('--limit', type=int, default=None, help='이보다 긴 연속 결측은 채우지 않음 (봉 수)')
+    args = parser.parse_args()
+
+    align_directory(args.input, args.output, freq=args.freq,
+                    policy={'price': args.price, 'Volume': args.volume}, limit=args.limit)
+
+
+if __name__ == '__main__':
+    main()
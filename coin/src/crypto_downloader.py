@@ -0,0 +1,636 @@
+"""
+암호화폐 OHLCV 동시 다운로더 (A00_01_data_generation 1단계)
+
+- 공급자(provider) 인터페이스
+  - YFinanceProvider: yfinance (yf.download / Ticker.info)를 스레드에서 실행
+  - YahooChartProvider: Yahoo chart/quote JSON API를 aiohttp로 직접 호출
+                        (base_url을 바꾸면 로컬 fixture 서버로 테스트 가능)
+- 스케줄러: 동시 작업 수 제한 + 초당 요청 수 제한 + 재시도(지수 백오프) + 완료 종목 체크포인트
+  → 중간에 끊겨도 다시 실행하면 남은 종목만 다운로드
+
+사용 예 (노트북):
+    from crypto_downloader import SimpleCryptoDownloader
+    downloader = SimpleCryptoDownloader(start_date, end_date, output='/workspace/.../data/1h', top_n=20, interval='1h')
+    crypto_data = downloader.run_download()
+"""
+import asyncio
+import json
+import os
+import random
+import time
+import concurrent.futures
+from datetime import datetime, timedelta
+import aiohttp
+import pandas as pd
+from tqdm import tqdm
+import warnings
+warnings.filterwarnings('ignore')
+
+from bar_store import HourlyBarStore
+
+
+# 주요 코인들의 야후 파이낸스 티커 (USD 기준)
+MAJOR_CRYPTOS = [
+    'BTC-USD', 'ETH-USD', 'USDT-USD', 'BNB-USD', 'SOL-USD',
+    'USDC-USD', 'XRP-USD', 'DOGE-USD', 'TON11419-USD', 'ADA-USD',
+    'SHIB-USD', 'AVAX-USD', 'TRX-USD', 'DOT-USD', 'BCH-USD',
+    'NEAR-USD', 'MATIC-USD', 'ICP-USD', 'UNI7083-USD', 'LTC-USD',
+    'DAI-USD', 'LEO-USD', 'ETC-USD', 'APT21794-USD', 'STX4847-USD',
+    'CRO-USD', 'OKB-USD', 'ATOM-USD', 'FIL-USD', 'IMX10603-USD',
+    'VET-USD', 'MNT27075-USD', 'ARB11841-USD', 'HBAR-USD', 'OP-USD',
+    'MKR-USD', 'AAVE-USD', 'GRT6719-USD', 'SEI23149-USD', 'SUI20947-USD',
+    'THETA-USD', 'RUNE-USD', 'FTM-USD', 'ALGO-USD', 'FLOW-USD',
+    'SAND-USD', 'XLM-USD', 'AXS-USD', 'MANA-USD', 'CHZ-USD',
+    'EGLD-USD', 'KCS-USD', 'XTZ-USD', 'EOS-USD', 'CAKE-USD',
+    'QNT-USD', 'ASTR-USD', 'FEI-USD', 'KLAY-USD', 'NEO-USD',
+    'IOTA-USD', 'BSV-USD', 'XMR-USD', 'COMP-USD', 'ZEC-USD',
+    'DASH-USD', 'WAVES-USD', 'QTUM-USD', 'BAT-USD', 'DYDX-USD',
+    'CRV-USD', 'ENJ-USD', '1INCH-USD', 'ZIL-USD', 'SUSHI-USD',
+    'YFI-USD', 'REN-USD', 'BNT-USD', 'SNX-USD', 'UMA-USD',
+    'STORJ-USD', 'BAL-USD', 'NMR-USD', 'LRC-USD', 'KNC-USD',
+    'BAND-USD', 'RSR-USD', 'RLC-USD', 'REP-USD', 'ZRX-USD',
+    'OXT-USD', 'MLN-USD', 'FARM-USD', 'BADGER-USD', 'PICKLE-USD',
+    'ALPHA-USD', 'CREAM-USD', 'TORN-USD', 'COVER-USD', 'INDEX-USD',
+    'DPI-USD', 'PERP-USD', 'API3-USD', 'KEEP-USD', 'NU-USD',
+    'MASK-USD', 'TRU-USD', 'RAD-USD', 'CTX-USD', 'BOND-USD',
+    'POOL-USD', 'FOX-USD', 'TRIBE-USD', 'RALLY-USD', 'XYO-USD',
+    'REQ-USD', 'POLY-USD', 'PRQ-USD', 'REEF-USD', 'POLS-USD',
+    'OGN-USD', 'NKN-USD', 'LPT-USD', 'RGT-USD', 'PPAY-USD',
+    'ANKR-USD', 'CVC-USD', 'GNO-USD', 'MPH-USD', 'RARI-USD',
+    'TOKE-USD', 'ALCX-USD', 'FXS-USD', 'CVX-USD', 'SPELL-USD',
+    'JPEG-USD', 'TRIBE-USD', 'VISR-USD', 'TRAC-USD', 'QSP-USD',
+    'RBN-USD', 'OCEAN-USD', 'FET-USD', 'AGIX-USD', 'RNDR-USD',
+    'INJ-USD', 'CFG-USD', 'COTI-USD', 'ERG-USD', 'CKB-USD'
+]
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# 한 번의 chart 요청으로 받을 수 있는 최대 기간 (일) - 넘으면 나눠서 요청
+INTERVAL_MAX_DAYS = {'1m': 7, '5m': 60, '15m': 60, '30m': 60, '1h': 730, '1d': None}
+
+
+class RetryableError(Exception):
+    """재시도하면 성공할 수 있는 오류 (429, 5xx, 네트워크)"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def clean_ohlcv(data):
+    """기본 OHLCV 컬럼만 유지 (OHLC 최소 4개, 모두 NaN인 행 제거) - 유효하지 않으면 None"""
+    if data is None or data.empty:
+        return None
+    if isinstance(data.columns, pd.MultiIndex):
+        # 최신 yfinance는 단일 종목도 (Price, Ticker) 2단 컬럼
+        data = data.droplevel(-1, axis=1)
+    available_columns = [col for col in OHLCV_COLUMNS if col in data.columns]
+    if len(available_columns) < 4:
+        return None
+    clean_data = data[available_columns].dropna(how='all')
+    return clean_data if len(clean_data) > 0 else None
+
+
+# =============================================================================
+# 공급자
+# =============================================================================
+
+class OHLCVProvider:
+    """
+    다운로드 공급자 인터페이스
+
+    - fetch_ohlcv: 한 종목의 OHLCV DataFrame (인덱스 Date/Datetime, 없으면 None)
+    - fetch_market_caps: {종목: 시가총액} (조회 실패 종목은 제외)
+    - 일시적 오류는 RetryableError로 올리면 스케줄러가 재시도
+    """
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def fetch_ohlcv(self, symbol, start_date, end_date, interval):
+        raise NotImplementedError
+
+    async def fetch_market_caps(self, symbols):
+        raise NotImplementedError
+
+
+class YFinanceProvider(OHLCVProvider):
+    """yfinance 호출을 스레드 풀에서 실행 (쿠키/crumb 처리는 yfinance에 맡김)"""
+
+    def __init__(self, max_threads=8):
+        import yfinance as yf
+        self.yf = yf
+        self.max_threads = max_threads
+        self.executor = None
+
+    async def open(self):
+        if self.executor is None:
+            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_threads)
+
+    async def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    def _download(self, symbol, start_date, end_date, interval):
+        return self.yf.download(
+            symbol,
+            start=start_date,
+            end=end_date,
+            interval=interval,
+            progress=False,
+            auto_adjust=True,
+            prepost=False,
+            threads=False,
+        )
+
+    async def fetch_ohlcv(self, symbol, start_date, end_date, interval):
+        loop = asyncio.get_running_loop()
+        try:
+            data = await loop.run_in_executor(self.executor, self._download, symbol, start_date, end_date, interval)
+        except Exception as e:
+            raise RetryableError(f"{symbol}: {e}")
+        return clean_ohlcv(data)
+
+    def _market_cap(self, symbol):
+        try:
+            return self.yf.Ticker(symbol).info.get('marketCap', 0)
+        except Exception:
+            return 0
+
+    async def fetch_market_caps(self, symbols):
+        loop = asyncio.get_running_loop()
+        caps = await asyncio.gather(*[loop.run_in_executor(self.executor, self._market_cap, s) for s in symbols])
+        return {symbol: cap for symbol, cap in zip(symbols, caps) if cap and cap > 0}
+
+
+class YahooChartProvider(OHLCVProvider):
+    """
+    Yahoo chart(v8) / quote(v7) JSON API 직접 호출
+
+    - base_url을 로컬 fixture 서버 주소로 바꾸면 네트워크 없이 테스트 가능
+    - 실제 야후 quote(v7)는 crumb 인증을 요구할 수 있음 → 시가총액 조회가 막히면 YFinanceProvider 사용
+    - 분/시간봉은 INTERVAL_MAX_DAYS 단위로 기간을 나눠 요청 후 합침
+    """
+
+    def __init__(self, base_url='https://query2.finance.yahoo.com', timeout=30, quote_batch=50):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.quote_batch = quote_batch
+        self.session = None
+
+    async def open(self):
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                timeout=self.timeout,
+                headers={'User-Agent': 'Mozilla/5.0'},
+                connector=aiohttp.TCPConnector(limit=32),
+            )
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def _get_json(self, path, params):
+        try:
+            async with self.session.get(f"{self.base_url}{path}", params=params) as response:
+                if response.status == 429 or response.status >= 500:
+                    retry_after = response.headers.get('Retry-After')
+                    raise RetryableError(f"HTTP {response.status}",
+                                         retry_after=float(retry_after) if retry_after else None)
+                if response.status == 404:
+                    return None
+                response.raise_for_status()
+                return await response.json(content_type=None)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            raise RetryableError(f"{type(e).__name__}: {e}")
+
+    @staticmethod
+    def _windows(start, end, interval):
+        max_days = INTERVAL_MAX_DAYS.get(interval)
+        if not max_days:
+            return [(start, end)]
+        windows = []
+        step = timedelta(days=max_days)
+        while start < end:
+            windows.append((start, min(start + step, end)))
+            start += step
+        return windows
+
+    @staticmethod
+    def _chart_to_frame(payload, interval):
+        result = (payload or {}).get('chart', {}).get('result') or []
+        if not result or not result[0].get('timestamp'):
+            return None
+        result = result[0]
+        quote = result['indicators']['quote'][0]
+        frame = pd.DataFrame({
+            'Open': quote.get('open'),
+            'High': quote.get('high'),
+            'Low': quote.get('low'),
+            'Close': quote.get('close'),
+            'Volume': quote.get('volume'),
+        }, index=pd.to_datetime(result['timestamp'], unit='s', utc=True), dtype=float)
+
+        if interval == '1d':
+            # yf.download 일봉과 같은 형식 (tz 없는 날짜, 인덱스 이름 Date)
+            frame.index = frame.index.tz_localize(None).normalize()
+            frame.index.name = 'Date'
+        else:
+            frame.index.name = 'Datetime'
+        return frame
+
+    async def fetch_ohlcv(self, symbol, start_date, end_date, interval):
+        start = pd.Timestamp(start_date, tz='UTC')
+        end = pd.Timestamp(end_date, tz='UTC')
+        frames = []
+        for window_start, window_end in self._windows(start, end, interval):
+            payload = await self._get_json(f"/v8/finance/chart/{symbol}", {
+                'period1': int(window_start.timestamp()),
+                'period2': int(window_end.timestamp()),
+                'interval': interval,
+                'includePrePost': 'false',
+                'events': 'div,splits',
+            })
+            frame = self._chart_to_frame(payload, interval)
+            if frame is not None:
+                frames.append(frame)
+        if not frames:
+            return None
+        data = pd.concat(frames)
+        data = data[~data.index.duplicated(keep='last')].sort_index()
+        return clean_ohlcv(data)
+
+    async def fetch_market_caps(self, symbols):
+        caps = {}
+        for i in range(0, len(symbols), self.quote_batch):
+            batch = symbols[i:i + self.quote_batch]
+            payload = await self._get_json('/v7/finance/quote', {'symbols': ','.join(batch)})
+            for quote in (payload or {}).get('quoteResponse', {}).get('result', []):
+                cap = quote.get('marketCap', 0)
+                if cap and cap > 0:
+                    caps[quote['symbol']] = cap
+        return caps
+
+
+# =============================================================================
+# 스케줄러
+# =============================================================================
+
+class AsyncRateLimiter:
+    """초당 rate개 요청 (토큰 버킷, 순간 burst개까지 허용)"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate or 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.rate:
+            return
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class DownloadCheckpoint:
+    """
+    완료/실패 종목 기록 (JSON, 임시 파일 → os.replace로 원자적 저장)
+
+    - 완료 종목은 CSV가 이미 저장된 상태 → 재실행 시 건너뜀
+    - 다운로드 조건(기간/간격)이 바뀌면 기존 기록은 무시
+    """
+
+    def __init__(self, path, params):
+        self.path = path
+        self.params = params
+        self.completed = {}
+        self.failed = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    saved = json.load(f)
+                if saved.get('params') == params:
+                    self.completed = saved.get('completed', {})
+                else:
+                    print(f"⚠️ 다운로드 조건이 바뀌어 체크포인트를 새로 시작합니다: {path}")
+            except Exception as e:
+                print(f"⚠️ 체크포인트 읽기 실패 (새로 시작): {e}")
+
+    def save(self):
+        if not self.path:
+            return
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({
+                'params': self.params,
+                'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'completed': self.completed,
+                'failed': self.failed,
+            }, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def mark_done(self, symbol, info):
+        self.completed[symbol] = info
+        self.failed.pop(symbol, None)
+        self.save()
+
+    def mark_failed(self, symbol, reason):
+        self.failed[symbol] = reason
+        self.save()
+
+
+class ConcurrentDownloader:
+    """
+    종목별 다운로드 작업 스케줄러
+
+    Parameters:
+    provider: OHLCVProvider
+    max_workers: 동시에 진행할 종목 수
+    rate_per_sec: 초당 최대 요청 수 (None이면 제한 없음)
+    max_retries: RetryableError 재시도 횟수
+    backoff: 재시도 대기 기본 초 (backoff * 2^시도 + 지터)
+    """
+
+    def __init__(self, provider, max_workers=8, rate_per_sec=4.0, max_retries=4, backoff=1.0):
+        self.provider = provider
+        self.max_workers = max_workers
+        self.rate_per_sec = rate_per_sec
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.request_count = 0
+        self.retry_count = 0
+
+    async def _call(self, limiter, func, *args):
+        for attempt in range(self.max_retries + 1):
+            await limiter.acquire()
+            self.request_count += 1
+            try:
+                return await func(*args)
+            except RetryableError as e:
+                if attempt == self.max_retries:
+                    raise
+                self.retry_count += 1
+                wait = e.retry_after or self.backoff * (2 ** attempt)
+                await asyncio.sleep(wait + random.uniform(0, self.backoff))
+
+    async def download_all(self, symbols, start_date, end_date, interval, on_done=None, checkpoint=None):
+        """
+        전체 종목 동시 다운로드
+
+        Parameters:
+        on_done: on_done(symbol, DataFrame) - 종목 완료 직후 호출 (CSV 저장 등), 반환값은 체크포인트에 기록
+        checkpoint: DownloadCheckpoint (완료 종목 건너뜀)
+
+        Returns:
+        tuple: (이번에 받은 {종목: DataFrame}, {실패 종목: 사유})
+        """
+        pending = [s for s in symbols if not (checkpoint and s in checkpoint.completed)]
+        if checkpoint and len(pending) < len(symbols):
+            print(f"⏭️ 체크포인트: {len(symbols) - len(pending)}개 완료 종목 건너뜀")
+
+        limiter = AsyncRateLimiter(self.rate_per_sec)
+        semaphore = asyncio.Semaphore(self.max_workers)
+        results, failures = {}, {}
+        progress = tqdm(total=len(pending), desc=f"{interval} 데이터")
+
+        async def worker(symbol):
+            async with semaphore:
+                try:
+                    data = await self._call(limiter, self.provider.fetch_ohlcv, symbol, start_date, end_date, interval)
+                    if data is None:
+                        failures[symbol] = '빈 데이터'
+                    else:
+                        results[symbol] = data
+                        info = on_done(symbol, data) if on_done else None
+                        if checkpoint:
+                            checkpoint.mark_done(symbol, info or {'rows': len(data)})
+                except Exception as e:
+                    failures[symbol] = str(e)
+                if symbol in failures and checkpoint:
+                    checkpoint.mark_failed(symbol, failures[symbol])
+                progress.update(1)
+
+        await self.provider.open()
+        try:
+            await asyncio.gather(*[worker(symbol) for symbol in pending])
+        finally:
+            progress.close()
+            await self.provider.close()
+        return results, failures
+
+    async def market_caps(self, symbols):
+        limiter = AsyncRateLimiter(self.rate_per_sec)
+        await self.provider.open()
+        try:
+            return await self._call(limiter, self.provider.fetch_market_caps, symbols)
+        finally:
+            await self.provider.close()
+
+
+def run_async(coro):
+    """코루틴 실행 (Jupyter처럼 이벤트 루프가 이미 돌고 있으면 별도 스레드에서 실행)"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+# =============================================================================
+# 노트북용 다운로더
+# =============================================================================
+
+class SimpleCryptoDownloader:
+    def __init__(self, start_date="2015-01-01", end_date="2025-12-30", output="/workspace/AI모델/projects/coin/data",
+                 top_n=150, interval='1d', provider=None, max_workers=8, rate_per_sec=4.0, max_retries=4, resume=True):
+        """
+        Parameters:
+        start_date, end_date: 다운로드 기간
+        output: 저장 폴더 (일봉: output/raw_data/{심볼}.csv, 그 외: output/raw_data_{interval}/{심볼}_{interval}.csv)
+        top_n: 시가총액 상위 종목 수
+        interval: '1d', '1h' 등 (1시간봉은 야후에서 최근 730일만 제공)
+        provider: OHLCVProvider (기본 YFinanceProvider)
+        max_workers: 동시 다운로드 종목 수
+        rate_per_sec: 초당 최대 요청 수
+        resume: True면 체크포인트의 완료 종목 건너뜀
+        """
+        self.top_n = top_n
+        self.start_date = start_date
+        self.end_date = end_date
+        self.output = output
+        self.interval = interval
+        self.provider = provider
+        self.max_workers = max_workers
+        self.rate_per_sec = rate_per_sec
+        self.max_retries = max_retries
+        self.resume = resume
+        self.symbols = []
+        self.crypto_data = {}
+        self.crypto_info = {}
+        self.failed_symbols = []
+
+        self.suffix = '' if interval == '1d' else f"_{interval}"
+        self.raw_dir = os.path.join(output, f"raw_data{self.suffix}")
+
+    def _scheduler(self):
+        return ConcurrentDownloader(
+            self.provider or YFinanceProvider(max_threads=self.max_workers),
+            max_workers=self.max_workers,
+            rate_per_sec=self.rate_per_sec,
+            max_retries=self.max_retries,
+        )
+
+    def get_top_crypto_symbols(self, candidates=None):
+        """시가총액 기준 상위 코인 티커 (후보 전체 시가총액을 동시에 조회)"""
+        print(f"🔍 시가총액 기준 상위 {self.top_n}개 코인 티커 검색 중...")
+        candidates = list(dict.fromkeys(candidates or MAJOR_CRYPTOS))
+
+        print("📊 각 코인의 시가총액 정보 수집 중...")
+        try:
+            market_caps = run_async(self._scheduler().market_caps(candidates))
+        except Exception as e:
+            print(f"⚠️ 시가총액 조회 실패: {e}")
+            market_caps = {}
+
+        # 시가총액 순으로 정렬하여 상위 N개 선택
+        sorted_symbols = sorted(market_caps, key=lambda x: market_caps[x], reverse=True)
+        self.symbols = sorted_symbols[:self.top_n]
+        self.crypto_info = {symbol: {'marketCap': market_caps[symbol]} for symbol in self.symbols}
+
+        print(f"✅ 상위 {len(self.symbols)}개 코인 티커 선정 완료")
+        print("📈 Top 10 코인:")
+        for i, symbol in enumerate(self.symbols[:10]):
+            market_cap_b = market_caps[symbol] / 1e9
+            print(f"   {i+1:2d}. {symbol:<12} (시총: ${market_cap_b:.1f}B)")
+
+        return self.symbols
+
+    def _csv_path(self, symbol):
+        # 파일명에서 특수문자 제거
+        safe_symbol = symbol.replace('-USD', '').replace('/', '_')
+        return os.path.join(self.raw_dir, f"{safe_symbol}{self.suffix}.csv")
+
+    def _save_symbol(self, symbol, data):
+        """
+        종목 완료 즉시 CSV 저장 (인덱스 Date/Datetime을 컬럼으로)
+
+        - 1시간봉은 기준 저장소(bar_store.HourlyBarStore)에 병합 → 야후 제공 기간(730일)을 넘는 이력 누적
+        """
+        filename = self._csv_path(symbol)
+        if self.interval == '1h':
+            safe_symbol = os.path.basename(filename)[:-len(HourlyBarStore.SUFFIX)]
+            added = HourlyBarStore(self.raw_dir).merge(safe_symbol, data)
+            return {'rows': int(len(data)), 'added': int(added), 'file': os.path.basename(filename),
+                    'first': str(data.index[0]), 'last': str(data.index[-1])}
+        temp_path = f"{filename}.tmp"
+        data.reset_index().to_csv(temp_path, index=False)
+        os.replace(temp_path, filename)
+        return {'rows': int(len(data)), 'file': os.path.basename(filename),
+                'first': str(data.index[0]), 'last': str(data.index[-1])}
+
+    def download_basic_data(self):
+        """기본 OHLCV 데이터 동시 다운로드 (완료 종목은 바로 CSV 저장 + 체크포인트 기록)"""
+        rate = f"초당 {self.rate_per_sec}회" if self.rate_per_sec else "요청 속도 제한 없음"
+        print(f"📈 기본 OHLCV {self.interval} 데이터 다운로드 중... (동시 {self.max_workers}개, {rate})")
+        os.makedirs(self.raw_dir, exist_ok=True)
+
+        checkpoint = DownloadCheckpoint(
+            os.path.join(self.output, f"download_checkpoint{self.suffix}.json") if self.resume else None,
+            {'start_date': str(self.start_date), 'end_date': str(self.end_date), 'interval': self.interval},
+        )
+        # 이전 실행에서 완료된 종목은 저장된 CSV를 다시 읽어 결과에 포함
+        for symbol, info in checkpoint.completed.items():
+            if symbol in self.symbols:
+                path = self._csv_path(symbol)
+                if os.path.exists(path):
+                    self.crypto_data[symbol] = pd.read_csv(path, index_col=0, parse_dates=True)
+                else:
+                    checkpoint.completed.pop(symbol)
+
+        started = time.perf_counter()
+        scheduler = self._scheduler()
+        results, failures = run_async(scheduler.download_all(
+            self.symbols, self.start_date, self.end_date, self.interval,
+            on_done=self._save_symbol, checkpoint=checkpoint,
+        ))
+        elapsed = time.perf_counter() - started
+
+        self.crypto_data.update(results)
+        self.failed_symbols = [symbol for symbol in self.symbols if symbol in failures]
+        for symbol, reason in failures.items():
+            print(f"❌ {symbol}: {reason}")
+        print(f"⏱️ {len(results)}개 종목 다운로드 {elapsed:.1f}초 (요청 {scheduler.request_count}회, 재시도 {scheduler.retry_count}회)")
+
+    def save_basic_data(self):
+        """다운로드 요약 저장 (종목별 CSV는 download_basic_data에서 이미 저장)"""
+        print("💾 다운로드 요약 저장 중...")
+        os.makedirs(self.output, exist_ok=True)
+
+        saved_count = len(self.crypto_data)
+        summary = {
+            'total_symbols': len(self.symbols),
+            'successful_downloads': saved_count,
+            'failed_downloads': len(self.failed_symbols),
+            'failed_symbols': self.failed_symbols,
+            'download_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'date_range': f"{self.start_date} to {self.end_date}",
+            'data_type': 'Basic OHLCV only' if self.interval == '1d' else f"OHLCV ({self.interval} interval)",
+            'interval': self.interval,
+        }
+        pd.DataFrame([summary]).to_csv(os.path.join(self.output, f"download_summary{self.suffix}.csv"), index=False)
+
+        # 성공한 심볼 리스트 저장
+        if saved_count > 0:
+            success_symbols = [symbol for symbol in self.symbols if symbol in self.crypto_data]
+            pd.DataFrame({'Symbol': success_symbols}).to_csv(
+                os.path.join(self.output, f"successful_symbols{self.suffix}.csv"), index=False)
+
+        print("✅ 데이터 저장 완료!")
+        print(f"📁 저장 위치: {self.raw_dir}/")
+        print(f"✅ 성공: {saved_count}개")
+        print(f"❌ 실패: {len(self.failed_symbols)}개")
+        if self.failed_symbols:
+            print(f"실패 종목: {', '.join(self.failed_symbols[:10])}{'...' if len(self.failed_symbols) > 10 else ''}")
+
+    def run_download(self, symbols=None):
+        """
+        다운로드 프로세스 실행
+
+        Parameters:
+        symbols: 받을 종목 (None이면 시가총액 상위 top_n개 선정)
+        """
+        print(f"🚀 암호화폐 {self.interval} 데이터 다운로드 시작!")
+        print(f"🪙 대상: {f'{len(symbols)}개 지정 코인' if symbols else f'시가총액 상위 {self.top_n}개 코인'}")
+        print(f"📅 기간: {self.start_date} ~ {self.end_date}")
+        print("="*50)
+
+        # 1. 상위 코인 티커 가져오기
+        if symbols:
+            self.symbols = list(symbols)
+        else:
+            self.get_top_crypto_symbols()
+
+        # 2. 기본 데이터 다운로드 (+ 종목별 CSV 저장)
+        self.download_basic_data()
+
+        # 3. 요약 저장
+        self.save_basic_data()
+
+        print("="*50)
+        print(f"🎉 {self.interval} 데이터 다운로드 완료!")
+
+        return self.crypto_data
@@ -0,0 +1,289 @@
+import argparse
+import os
+import shutil
+import time
+import numpy as np
+import pandas as pd
+import warnings
+warnings.filterwarnings('ignore')
+
+
+# 이 값 이상이면 사실상 완전 공선성으로 보고 VIF = inf
+VIF_INF = 1e10
+
+
+def correlation_matrix(X, feature_columns=None, sample_rows=1_000_000, seed=42):
+    """
+    전체 피처 상관행렬을 행렬곱 한 번으로 계산
+
+    Parameters:
+    X: 피처 DataFrame
+    feature_columns: 사용할 피처 (None이면 전체)
+    sample_rows: 행이 많으면 이 수만큼 무작위 추출 (None이면 전체 사용)
+
+    Returns:
+    tuple: (상관행렬 DataFrame, 분산 0이라 제외된 피처 목록)
+    """
+    feature_columns = list(feature_columns) if feature_columns is not None else list(X.columns)
+    values = X[feature_columns].to_numpy(dtype=np.float64, copy=True)
+    if sample_rows and len(values) > sample_rows:
+        rows = np.random.default_rng(seed).choice(len(values), sample_rows, replace=False)
+        values = values[np.sort(rows)]
+
+    # 무한값/결측은 열 중앙값으로 대체 (노트북 analyze_multicollinearity와 동일)
+    values[~np.isfinite(values)] = np.nan
+    medians = np.nanmedian(values, axis=0)
+    nan_rows, nan_cols = np.where(np.isnan(values))
+    values[nan_rows, nan_cols] = np.nan_to_num(medians[nan_cols])
+
+    std = values.std(axis=0)
+    constant = std == 0
+    zero_var = [col for col, flag in zip(feature_columns, constant) if flag]
+    values = values[:, ~constant]
+    kept = [col for col, flag in zip(feature_columns, constant) if not flag]
+
+    # 표준화 후 Zᵀ·Z / n = 상관행렬
+    values -= values.mean(axis=0)
+    values /= values.std(axis=0)
+    corr = (values.T @ values) / len(values)
+    np.fill_diagonal(corr, 1.0)
+    np.clip(corr, -1.0, 1.0, out=corr)
+    return pd.DataFrame(corr, index=kept, columns=kept), zero_var
+
+
+def _inverse(corr):
+    """상관행렬 역행렬 (특이 행렬이면 유사 역행렬)"""
+    try:
+        return np.linalg.inv(corr)
+    except np.linalg.LinAlgError:
+        return np.linalg.pinv(corr, hermitian=True)
+
+
+def _vif_from_inverse(inverse):
+    vif = np.diag(inverse).copy()
+    vif[(vif <= 0) | (vif > VIF_INF)] = np.inf
+    return vif
+
+
+def vif_from_correlation(corr):
+    """
+    모든 피처 VIF를 한 번에 계산: VIF_i = (R⁻¹)_ii
+
+    (피처마다 OLS를 돌리는 variance_inflation_factor와 같은 값, 상수항 포함 기준)
+    """
+    values = corr.values if hasattr(corr, 'values') else corr
+    vif = _vif_from_inverse(_inverse(values))
+    if hasattr(corr, 'columns'):
+        return pd.Series(vif, index=corr.columns, name='VIF')
+    return vif
+
+
+def compute_vif(X, feature_columns=None, sample_rows=1_000_000):
+    """X → VIF DataFrame (Feature, VIF), VIF 내림차순"""
+    corr, _ = correlation_matrix(X, feature_columns, sample_rows=sample_rows)
+    vif = vif_from_correlation(corr)
+    return vif.rename_axis('Feature').reset_index().sort_values('VIF', ascending=False)
+
+
+def high_correlation_pairs(corr, threshold=0.9):
+    """|상관계수| > threshold 인 피처 쌍 DataFrame (feature_1, feature_2, corr), 절댓값 내림차순"""
+    values = corr.values
+    i, j = np.triu_indices(len(values), k=1)
+    mask = np.abs(values[i, j]) > threshold
+    pairs = pd.DataFrame({
+        'feature_1': corr.columns[i[mask]],
+        'feature_2': corr.columns[j[mask]],
+        'corr': values[i[mask], j[mask]],
+    })
+    return pairs.reindex(pairs['corr'].abs().sort_values(ascending=False).index).reset_index(drop=True)
+
+
+def prune_features(X, feature_columns=None, corr_threshold=0.95, vif_threshold=10.0,
+                   priority=None, protected=None, sample_rows=1_000_000, verbose=True):
+    """
+    상관관계 → VIF 순서로 중복 피처를 탐욕적으로 제거
+
+    1) 분산 0 피처 제거
+    2) |상관계수| > corr_threshold 쌍을 높은 순서로 보며 둘 다 남아 있으면 하나 제거
+       - priority(앞쪽이 우선, 예: 피처 중요도 순)가 있으면 낮은 쪽 제거
+       - 없으면 다른 피처들과 평균 |상관계수|가 큰 쪽(더 중복된 쪽) 제거
+       예) Williams_R_14 vs Stoch_K_14 (상관 1.0) → 하나만 남김
+    3) VIF 최댓값이 vif_threshold 이하가 될 때까지 최대 VIF 피처 제거
+       (역행렬에서 한 행/열을 빼는 갱신으로 매번 전체 역행렬을 다시 구하지 않음)
+
+    Parameters:
+    X: 피처 DataFrame
+    feature_columns: 대상 피처 (None이면 전체)
+    corr_threshold: 상관 제거 기준 (None이면 생략)
+    vif_threshold: VIF 제거 기준 (None이면 생략)
+    priority: 남길 우선순위 피처 목록
+    protected: 절대 제거하지 않을 피처
+    sample_rows: 상관행렬 계산용 최대 행 수
+
+    Returns:
+    dict: {'selected': 남은 피처, 'dropped': 제거 내역 DataFrame, 'vif': 남은 피처 VIF, 'corr': 상관행렬}
+    """
+    started = time.perf_counter()
+    feature_columns = list(feature_columns) if feature_columns is not None else list(X.columns)
+    protected = set(protected or [])
+
+    corr, zero_var = correlation_matrix(X, feature_columns, sample_rows=sample_rows)
+    dropped = [{'feature': col, 'reason': 'zero_variance', 'partner': None, 'value': 0.0} for col in zero_var]
+    corr_elapsed = time.perf_counter() - started
+
+    names = list(corr.columns)
+    keep = np.ones(len(names), dtype=bool)
+
+    # 2) 상관관계 기반 제거
+    if corr_threshold is not None:
+        abs_corr = np.abs(corr.values)
+        redundancy = (abs_corr.sum(axis=1) - 1) / max(1, len(names) - 1)
+        rank = {col: i for i, col in enumerate(priority or [])}
+        position = {col: i for i, col in enumerate(names)}
+
+        for _, pair in high_correlation_pairs(corr, corr_threshold).iterrows():
+            a, b = position[pair['feature_1']], position[pair['feature_2']]
+            if not (keep[a] and keep[b]):
+                continue
+            if names[a] in protected and names[b] in protected:
+                continue
+
+            if names[a] in protected:
+                drop = b
+            elif names[b] in protected:
+                drop = a
+            elif priority:
+                # priority에 없는 피처는 가장 낮은 우선순위
+                drop = a if rank.get(names[a], len(rank)) > rank.get(names[b], len(rank)) else b
+            else:
+                drop = a if (redundancy[a], a) > (redundancy[b], b) else b
+            other = b if drop == a else a
+            keep[drop] = False
+            dropped.append({'feature': names[drop], 'reason': 'correlation',
+                            'partner': names[other], 'value': float(pair['corr'])})
+
+    # 3) VIF 기반 제거
+    indices = np.flatnonzero(keep)
+    inverse = _inverse(corr.values[np.ix_(indices, indices)])
+    vif = _vif_from_inverse(inverse)
+    removed_since_refresh = 0
+
+    if vif_threshold is not None:
+        while len(indices) > 1:
+            candidates = np.array([names[idx] not in protected for idx in indices])
+            masked = np.where(candidates, vif, -np.inf)
+            worst = int(np.argmax(masked))
+            if masked[worst] <= vif_threshold:
+                break
+
+            dropped.append({'feature': names[indices[worst]], 'reason': 'vif',
+                            'partner': None, 'value': float(vif[worst])})
+
+            # 역행렬에서 k번째 행/열 제거: P' = P₋ₖ₋ₖ - P₋ₖₖ Pₖ₋ₖ / Pₖₖ
+            rest = np.arange(len(indices)) != worst
+            pivot = inverse[worst, worst]
+            if np.isfinite(pivot) and abs(pivot) < VIF_INF and removed_since_refresh < 20:
+                column = inverse[rest, worst]
+                inverse = inverse[np.ix_(rest, rest)] - np.outer(column, column) / pivot
+                removed_since_refresh += 1
+            else:
+                # 완전 공선성이거나 누적 오차가 커질 수 있으면 다시 계산
+                inverse = _inverse(corr.values[np.ix_(indices[rest], indices[rest])])
+                removed_since_refresh = 0
+            indices = indices[rest]
+            vif = _vif_from_inverse(inverse)
+
+    selected = [names[idx] for idx in indices]
+    # 원래 피처 순서 유지
+    order = {col: i for i, col in enumerate(feature_columns)}
+    selected.sort(key=order.get)
+
+    result = {
+        'selected': selected,
+        'dropped': pd.DataFrame(dropped, columns=['feature', 'reason', 'partner', 'value']),
+        'vif': pd.Series(vif, index=[names[idx] for idx in indices], name='VIF').reindex(selected),
+        'corr': corr,
+    }
+
+    if verbose:
+        counts = result['dropped']['reason'].value_counts().to_dict()
+        print(f"✂️ 피처 정리: {len(feature_columns)}개 → {len(selected)}개 ({time.perf_counter() - started:.1f}초, 상관행렬 {corr_elapsed:.1f}초)")
+        print(f"   분산 0: {counts.get('zero_variance', 0)}개 | 상관 > {corr_threshold}: {counts.get('correlation', 0)}개"
+              f" | VIF > {vif_threshold}: {counts.get('vif', 0)}개")
+        finite = result['vif'][np.isfinite(result['vif'])]
+        if len(finite):
+            print(f"   남은 피처 최대 VIF: {finite.max():.2f}")
+
+    return result
+
+
+def write_training_features(features, path):
+    """training_features.txt 형식으로 저장 (한 줄에 하나)"""
+    with open(path, 'w') as f:
+        for feature in features:
+            f.write(f"{feature}\n")
+    print(f"💾 피처 목록 저장: {path} ({len(features)}개)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="상관관계/VIF 기반 피처 정리 → training_features.txt")
+    parser.add_argument('--data-dir', required=True, help='train_data.csv / training_features.txt 폴더')
+    parser.add_argument('--corr', type=float, default=0.95, help='상관 제거 기준 (|r| 초과)')
+    parser.add_argument('--vif', type=float, default=10.0, help='VIF 제거 기준 (0 이하면 생략)')
+    parser.add_argument('--priority', default=None, help='우선순위 파일 (xgboost_feature_importance.json 또는 한 줄에 하나)')
+    parser.add_argument('--sample-rows', type=int, default=1_000_000)
+    parser.add_argument('--output', default=None, help='저장 경로 (기본: data-dir/training_features.txt)')
+    parser.add_argument('--report', default=None, help='제거 내역 CSV 저장 경로')
+    args = parser.parse_args()
+
+    feature_file = os.path.join(args.data_dir, 'training_features.txt')
+    # 원본 목록은 training_features_full.txt로 보관 → 다시 실행해도 전체 목록 기준으로 정리
+    full_file = os.path.join(args.data_dir, 'training_features_full.txt')
+    if os.path.exists(feature_file) and not os.path.exists(full_file):
+        shutil.copyfile(feature_file, full_file)
+    source_file = full_file if os.path.exists(full_file) else feature_file
+
+    feature_columns = None
+    if os.path.exists(source_file):
+        with open(source_file, 'r') as f:
+            feature_columns = [line.strip() for line in f if line.strip()]
+        print(f"📄 피처 목록: {source_file} ({len(feature_columns)}개)")
+
+    X = pd.read_csv(os.path.join(args.data_dir, 'train_data.csv'), usecols=feature_columns)
+    if feature_columns is None:
+        feature_columns = [col for col in X.select_dtypes(include=[np.number]).columns if col != 'Future_Label']
+    feature_columns = [col for col in feature_columns if col in X.columns and col != 'Future_Label'
+                       and pd.api.types.is_numeric_dtype(X[col])]
+    print(f"📊 데이터: {len(X):,}행 × {len(feature_columns)}피처")
+
+    priority = None
+    if args.priority:
+        if args.priority.endswith('.json'):
+            importance = pd.read_json(args.priority, typ='series')
+            priority = importance.sort_values(ascending=False).index.tolist()
+        else:
+            with open(args.priority, 'r') as f:
+                priority = [line.strip() for line in f if line.strip()]
+
+    result = prune_features(
+        X, feature_columns,
+        corr_threshold=args.corr,
+        vif_threshold=args.vif if args.vif > 0 else None,
+        priority=priority,
+        sample_rows=args.sample_rows,
+    )
+
+    correlated = result['dropped'][result['dropped']['reason'] == 'correlation']
+    if not correlated.empty:
+        print("\n상관 중복 제거 (상위 15개):")
+        for _, row in correlated.head(15).iterrows():
+            print(f"   {row['feature']:30s} ≈ {row['partner']:30s} ({row['value']:+.3f})")
+
+    write_training_features(result['selected'], args.output or feature_file)
+    if args.report:
+        result['dropped'].to_csv(args.report, index=False)
+        print(f"📝 제거 내역 저장: {args.report}")
+
+
+if __name__ == '__main__':
+    main()
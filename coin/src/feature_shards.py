@@ -0,0 +1,222 @@
+import os
+import json
+import time
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+import warnings
+warnings.filterwarnings('ignore')
+
+from walk_forward_cv import to_native_params
+
+
+MANIFEST_FILE = 'manifest.json'
+
+
+def write_feature_shards(df, shard_dir, feature_columns, label_column='Future_Label', rows_per_shard=500_000):
+    """
+    학습 데이터를 float32 .npy 조각(shard)으로 저장
+
+    - 피처/라벨/Date를 조각마다 따로 저장 → 학습 시 한 조각씩만 메모리에 올림
+    - manifest.json에 피처 목록, 조각별 행 수/기간, 전체 클래스 분포 기록
+
+    Parameters:
+    df: 전처리된 학습 데이터 (Date, 라벨, 피처 포함)
+    shard_dir: 저장 폴더
+    feature_columns: 저장할 피처 (숫자 컬럼만 저장)
+    label_column: 라벨 컬럼
+    rows_per_shard: 조각당 행 수
+
+    Returns:
+    dict: manifest
+    """
+    os.makedirs(shard_dir, exist_ok=True)
+    numeric = set(df.select_dtypes(include=[np.number]).columns)
+    features = [col for col in feature_columns if col in numeric and col != label_column]
+
+    if 'Date' in df.columns:
+        df = df.sort_values('Date', kind='mergesort')
+
+    shards = []
+    class_counts = {}
+    for shard_idx, start in enumerate(range(0, len(df), rows_per_shard)):
+        chunk = df.iloc[start:start + rows_per_shard]
+        name = f"shard_{shard_idx:04d}"
+
+        X = chunk[features].to_numpy(dtype=np.float32, copy=True)
+        X[~np.isfinite(X)] = 0
+        y = chunk[label_column].to_numpy(dtype=np.int32)
+        np.save(os.path.join(shard_dir, f"{name}_X.npy"), X)
+        np.save(os.path.join(shard_dir, f"{name}_y.npy"), y)
+
+        info = {'name': name, 'rows': int(len(chunk))}
+        if 'Date' in chunk.columns:
+            dates = pd.to_datetime(chunk['Date'])
+            np.save(os.path.join(shard_dir, f"{name}_date.npy"), dates.values.astype('datetime64[ns]').astype(np.int64))
+            info['date_min'] = str(dates.min())
+            info['date_max'] = str(dates.max())
+        shards.append(info)
+
+        labels, counts = np.unique(y, return_counts=True)
+        for label, count in zip(labels, counts):
+            class_counts[str(int(label))] = class_counts.get(str(int(label)), 0) + int(count)
+
+    manifest = {
+        'features': features,
+        'label_column': label_column,
+        'rows': int(len(df)),
+        'class_counts': class_counts,
+        'shards': shards,
+    }
+    with open(os.path.join(shard_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    print(f"💾 피처 조각 저장: {shard_dir} ({len(shards)}개, {len(df):,}행 × {len(features)}피처)")
+    return manifest
+
+
+def load_manifest(shard_dir):
+    with open(os.path.join(shard_dir, MANIFEST_FILE), 'r') as f:
+        return json.load(f)
+
+
+def class_weight_table(class_counts):
+    """manifest 클래스 분포 → 라벨별 가중치 배열 (total / (n_classes * count))"""
+    labels = sorted(int(label) for label in class_counts)
+    total = sum(class_counts.values())
+    table = np.zeros(max(labels) + 1, dtype=np.float32)
+    for label in labels:
+        table[label] = total / (len(labels) * class_counts[str(label)])
+    return table
+
+
+class ShardIterator(xgb.DataIter):
+    """
+    조각 파일을 하나씩 읽어 XGBoost에 넘기는 데이터 반복자
+
+    - XGBoost가 양자화/외부 메모리 페이지 생성 중 여러 번 처음부터 다시 읽음 (reset → next ...)
+    - 조각은 mmap으로 열어 필요한 열만 float32로 복사
+    """
+
+    def __init__(self, shard_dir, feature_columns=None, class_weights=True, cache_prefix=None):
+        """
+        Parameters:
+        shard_dir: write_feature_shards 저장 폴더
+        feature_columns: 사용할 피처 (None이면 저장된 전체, 순서도 이 목록 기준)
+        class_weights: True면 전체 클래스 분포 기준 균형 가중치 포함
+        cache_prefix: 외부 메모리 페이지 캐시 경로 접두사 (None이면 메모리 내 양자화)
+        """
+        self.shard_dir = shard_dir
+        self.manifest = load_manifest(shard_dir)
+        stored = self.manifest['features']
+        self.feature_columns = list(feature_columns) if feature_columns else stored
+        missing = [col for col in self.feature_columns if col not in stored]
+        if missing:
+            raise ValueError(f"조각에 없는 피처: {missing[:10]}")
+        position = {col: i for i, col in enumerate(stored)}
+        self.columns = np.array([position[col] for col in self.feature_columns])
+        self.all_columns = self.columns.tolist() == list(range(len(stored)))
+        self.weight_table = class_weight_table(self.manifest['class_counts']) if class_weights else None
+
+        self._shards = [shard['name'] for shard in self.manifest['shards']]
+        self._position = 0
+        self.read_sec = 0.0
+        super().__init__(cache_prefix=cache_prefix)
+
+    def reset(self):
+        self._position = 0
+
+    def next(self, input_data):
+        if self._position >= len(self._shards):
+            return 0
+        started = time.perf_counter()
+        name = self._shards[self._position]
+        X = np.load(os.path.join(self.shard_dir, f"{name}_X.npy"), mmap_mode='r')
+        X = np.ascontiguousarray(X if self.all_columns else X[:, self.columns])
+        y = np.load(os.path.join(self.shard_dir, f"{name}_y.npy"))
+        weight = self.weight_table[y] if self.weight_table is not None else None
+        self.read_sec += time.perf_counter() - started
+
+        input_data(data=X, label=y, weight=weight, feature_names=self.feature_columns)
+        self._position += 1
+        return 1
+
+
+def make_shard_matrix(shard_dir, feature_columns=None, max_bin=256, ref=None,
+                      external_memory=True, cache_dir=None, class_weights=True):
+    """
+    조각 폴더 → XGBoost 학습/검증 행렬
+
+    Parameters:
+    shard_dir: 조각 폴더
+    feature_columns: 사용할 피처
+    max_bin: 히스토그램 bin 수
+    ref: 검증 행렬이면 학습 행렬 (같은 bin 경계 사용)
+    external_memory: True면 양자화 페이지를 디스크에 두고 학습 (xgboost 2.x 이상)
+                     False면 조각을 스트리밍으로 읽어 메모리 내 QuantileDMatrix 생성
+    cache_dir: 외부 메모리 페이지 캐시 폴더 (기본: shard_dir/xgb_cache)
+    class_weights: 균형 클래스 가중치 포함 여부
+    """
+    cache_prefix = None
+    if external_memory:
+        cache_dir = cache_dir or os.path.join(shard_dir, 'xgb_cache')
+        os.makedirs(cache_dir, exist_ok=True)
+        cache_prefix = os.path.join(cache_dir, 'cache')
+
+    iterator = ShardIterator(shard_dir, feature_columns, class_weights=class_weights, cache_prefix=cache_prefix)
+    if not external_memory:
+        return xgb.QuantileDMatrix(iterator, max_bin=max_bin, ref=ref)
+    if hasattr(xgb, 'ExtMemQuantileDMatrix'):
+        # xgboost 3.x: 양자화된 페이지를 디스크 캐시에서 읽으며 학습
+        return xgb.ExtMemQuantileDMatrix(iterator, max_bin=max_bin, ref=ref)
+    # xgboost 2.x: 반복자 + cache_prefix로 만든 DMatrix가 외부 메모리 모드 (hist 전용)
+    return xgb.DMatrix(iterator)
+
+
+def train_from_shards(params, train_dir, val_dir=None, feature_columns=None, external_memory=True,
+                      cache_dir=None, verbose_eval=False):
+    """
+    조각 폴더로 학습 (노트북 최종 모델 학습의 외부 메모리 버전)
+
+    Parameters:
+    params: XGBClassifier 형식 파라미터 (n_estimators, early_stopping_rounds 포함 가능)
+    train_dir: 학습 조각 폴더
+    val_dir: 검증 조각 폴더 (없으면 조기 종료 없이 학습)
+
+    Returns:
+    tuple: (booster, 소요 시간 dict)
+    """
+    native, num_boost_round, early_stopping_rounds = to_native_params(params)
+    native['tree_method'] = 'hist'
+    native.pop('gpu_id', None)
+    native.pop('predictor', None)
+    max_bin = int(native.get('max_bin', 256))
+    native['max_bin'] = max_bin
+
+    started = time.perf_counter()
+    dtrain = make_shard_matrix(
+        train_dir, feature_columns, max_bin=max_bin, external_memory=external_memory,
+        cache_dir=os.path.join(cache_dir, 'train') if cache_dir else None,
+    )
+    evals = []
+    if val_dir:
+        dval = make_shard_matrix(
+            val_dir, feature_columns, max_bin=max_bin, ref=dtrain, external_memory=external_memory,
+            cache_dir=os.path.join(cache_dir, 'val') if cache_dir else None, class_weights=False,
+        )
+        evals = [(dval, 'validation')]
+    built = time.perf_counter()
+
+    booster = xgb.train(
+        native, dtrain,
+        num_boost_round=num_boost_round,
+        evals=evals,
+        early_stopping_rounds=early_stopping_rounds if evals else None,
+        verbose_eval=verbose_eval,
+    )
+    finished = time.perf_counter()
+
+    timings = {'build_sec': built - started, 'train_sec': finished - built, 'total_sec': finished - started}
+    print(f"✅ 조각 학습 완료 ({'외부 메모리' if external_memory else '스트리밍 메모리'}):"
+          f" 행렬 {timings['build_sec']:.1f}초 | 학습 {timings['train_sec']:.1f}초")
+    return booster, timings
@@ -0,0 +1,297 @@
+"""
+XGBoost 하이퍼파라미터 병렬 튜닝 (Optuna + 로컬 SQLite)
+
+- 여러 워커 프로세스가 같은 SQLite study를 공유하며 trial을 나눠 실행
+- 폴드마다 중간 점수를 보고해 median / hyperband pruning으로 나쁜 trial을 조기 종료
+- 같은 명령으로 다시 실행하면 저장된 study에 이어서 진행 (중단된 trial은 heartbeat로 정리 후 재시도)
+- trial마다 실행 시간(wall_sec)과 폴드별 점수/학습 시간을 user_attrs에 기록
+
+실행 예:
+    python tune_xgboost.py --data-dir /workspace/AI모델/projects/coin/data/xgboost_B --workers 8 --trials 300
+    python tune_xgboost.py --data-dir .../data/1h/xgboost_B --study xgb_1h --pruner hyperband \\
+        --features ../models/1h/feature_list.json --output ../models/1h/xgboost_best_params.json
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import time
+import numpy as np
+import pandas as pd
+import warnings
+warnings.filterwarnings('ignore')
+
+import optuna
+from optuna.samplers import TPESampler
+from optuna.pruners import MedianPruner, HyperbandPruner, NopPruner
+from optuna.storages import RDBStorage, RetryFailedTrialCallback
+from optuna.study import MaxTrialsCallback
+from optuna.trial import TrialState
+
+from walk_forward_cv import PurgedWalkForwardCV, FoldMatrixCache
+
+
+# 피처 목록 파일이 없을 때 제외할 컬럼 (라벨/메타/원시 가격)
+NON_FEATURE_COLUMNS = [
+    'Future_Label', 'Label', 'Label_Name', 'Optimized_Label', 'Optimized_Label_Name',
+    'Symbol', 'Date', 'Symbol_encoded', 'Open', 'High', 'Low', 'Close', 'Volume',
+]
+
+
+def load_training_data(data_dir, feature_file=None):
+    """
+    train_data.csv + val_data.csv 로드 (학습 노트북의 load_and_prepare_data와 같은 전처리)
+
+    Parameters:
+    data_dir: train_data.csv / val_data.csv / training_features.txt 폴더
+    feature_file: 피처 목록 (.txt 한 줄에 하나, 또는 feature_list.json)
+
+    Returns:
+    tuple: (X, y, dates, feature_columns)
+    """
+    feature_file = feature_file or os.path.join(data_dir, 'training_features.txt')
+    feature_columns = None
+    if os.path.exists(feature_file):
+        if feature_file.endswith('.json'):
+            with open(feature_file, 'r') as f:
+                feature_columns = json.load(f)['feature_list']
+        else:
+            with open(feature_file, 'r') as f:
+                feature_columns = [line.strip() for line in f if line.strip()]
+        print(f"📄 피처 목록: {feature_file} ({len(feature_columns)}개)")
+    else:
+        print("⚠️ 피처 목록 없음 - 라벨/메타 컬럼을 제외한 전체 숫자 컬럼 사용")
+
+    train_val_df = pd.concat([
+        pd.read_csv(os.path.join(data_dir, 'train_data.csv')),
+        pd.read_csv(os.path.join(data_dir, 'val_data.csv')),
+    ], ignore_index=True)
+
+    if feature_columns is None:
+        feature_columns = [
+            col for col in train_val_df.select_dtypes(include=[np.number]).columns
+            if col not in NON_FEATURE_COLUMNS
+        ]
+    feature_columns = [col for col in feature_columns if col in train_val_df.columns and col != 'Future_Label']
+
+    X = train_val_df[feature_columns].fillna(0).replace([np.inf, -np.inf], 0)
+    y = train_val_df['Future_Label']
+    dates = pd.to_datetime(train_val_df['Date'])
+
+    print(f"📊 학습 데이터: {X.shape} | 기간 {dates.min()} ~ {dates.max()}")
+    return X, y, dates, feature_columns
+
+
+def suggest_params(trial, n_jobs=1, use_gpu=False, seed=42):
+    """학습 노트북 objective_function과 같은 탐색 공간"""
+    params = {
+        'objective': 'multi:softprob',
+        'num_class': 3,
+        'eval_metric': 'mlogloss',
+        'max_depth': trial.suggest_int('max_depth', 6, 15),
+        'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.3),
+        'n_estimators': trial.suggest_int('n_estimators', 300, 1000),
+        'subsample': trial.suggest_float('subsample', 0.5, 1.0),
+        'colsample_bytree': trial.suggest_float('colsample_bytree', 0.5, 1.0),
+        'colsample_bylevel': trial.suggest_float('colsample_bylevel', 0.5, 1.0),
+        'colsample_bynode': trial.suggest_float('colsample_bynode', 0.5, 1.0),
+        'min_child_weight': trial.suggest_int('min_child_weight', 1, 15),
+        'gamma': trial.suggest_float('gamma', 0, 8),
+        'reg_alpha': trial.suggest_float('reg_alpha', 0, 3),
+        'reg_lambda': trial.suggest_float('reg_lambda', 0.1, 4),
+        'max_leaves': trial.suggest_int('max_leaves', 50, 500),
+        'max_bin': trial.suggest_int('max_bin', 512, 1024, step=128),
+        'grow_policy': trial.suggest_categorical('grow_policy', ['depthwise', 'lossguide']),
+        'early_stopping_rounds': 100,
+        'tree_method': 'hist',
+        'random_state': seed,
+        'n_jobs': n_jobs,
+        'verbosity': 0,
+    }
+    if use_gpu:
+        params['device'] = 'cuda'
+    return params
+
+
+def make_pruner(name, n_folds):
+    """폴드 번호를 step(자원)으로 쓰는 pruner"""
+    if name == 'median':
+        # 처음 5개 trial은 끝까지, 각 trial의 첫 폴드는 항상 실행
+        return MedianPruner(n_startup_trials=5, n_warmup_steps=1)
+    if name == 'hyperband':
+        return HyperbandPruner(min_resource=1, max_resource=n_folds, reduction_factor=3)
+    return NopPruner()
+
+
+def make_storage(url):
+    """
+    여러 프로세스가 공유하는 RDB storage
+
+    - SQLite 잠금 대기 시간을 늘려 동시 쓰기 충돌 방지
+    - heartbeat가 끊긴 trial(강제 종료 등)은 FAIL 처리 후 한 번 재시도
+    """
+    engine_kwargs = {'connect_args': {'timeout': 60}} if url.startswith('sqlite') else {}
+    return RDBStorage(
+        url,
+        engine_kwargs=engine_kwargs,
+        heartbeat_interval=60,
+        grace_period=180,
+        failed_trial_callback=RetryFailedTrialCallback(max_retry=1),
+    )
+
+
+def make_objective(fold_cache, n_jobs, use_gpu, seed):
+    n_folds = len(fold_cache.splits)
+
+    def objective(trial):
+        started = time.perf_counter()
+        params = suggest_params(trial, n_jobs=n_jobs, use_gpu=use_gpu, seed=seed)
+
+        def on_fold(fold_idx, fold, scores):
+            # 지금까지 폴드 평균을 중간 값으로 보고
+            trial.report(float(np.mean(scores)), step=fold_idx + 1)
+            # 마지막 폴드까지 끝났으면 결과를 버리지 않음
+            if fold_idx + 1 < n_folds and trial.should_prune():
+                trial.set_user_attr('fold_scores', scores)
+                trial.set_user_attr('wall_sec', round(time.perf_counter() - started, 2))
+                raise optuna.TrialPruned(f"{fold_idx + 1}폴드 후 중단 (평균 {np.mean(scores):.4f})")
+
+        result = fold_cache.cross_validate(params, verbose=False, on_fold=on_fold)
+
+        trial.set_user_attr('fold_scores', result['scores'])
+        trial.set_user_attr('fold_fit_sec', [round(fold['fit_sec'], 2) for fold in result['folds']])
+        trial.set_user_attr('wall_sec', round(time.perf_counter() - started, 2))
+        trial.set_user_attr('pid', os.getpid())
+        return result['mean']
+
+    return objective
+
+
+def run_worker(worker_id, args):
+    """워커 1개: 데이터/행렬 캐시를 준비하고 목표 trial 수에 도달할 때까지 최적화"""
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+    X, y, dates, _ = load_training_data(args.data_dir, args.features)
+    cv = PurgedWalkForwardCV(n_splits=args.folds, purge=args.purge)
+    fold_cache = FoldMatrixCache(X, y, dates, cv=cv)
+    del X
+
+    study = optuna.load_study(
+        study_name=args.study,
+        storage=make_storage(args.storage),
+        # 워커마다 시드를 달리하고, 실행 중인 trial은 임시 값으로 간주해 같은 지점 중복 탐색 방지
+        sampler=TPESampler(seed=args.seed + worker_id, constant_liar=True),
+        pruner=make_pruner(args.pruner, args.folds),
+    )
+
+    def print_trial(study, trial):
+        wall = trial.user_attrs.get('wall_sec', 0)
+        if trial.state == TrialState.COMPLETE:
+            print(f"✅ [W{worker_id}] Trial {trial.number}: {trial.value:.4f} ({wall:.1f}초) | 최고 {study.best_value:.4f}")
+        elif trial.state == TrialState.PRUNED:
+            done = len(trial.user_attrs.get('fold_scores', []))
+            print(f"✂️ [W{worker_id}] Trial {trial.number}: {done}/{args.folds}폴드 후 중단 ({wall:.1f}초)")
+
+    study.optimize(
+        make_objective(fold_cache, args.threads, args.gpu, args.seed),
+        callbacks=[
+            MaxTrialsCallback(args.trials, states=(TrialState.COMPLETE, TrialState.PRUNED)),
+            print_trial,
+        ],
+        gc_after_trial=True,
+    )
+
+
+def print_summary(study, top=10):
+    trials = study.get_trials(deepcopy=False)
+    by_state = {}
+    for trial in trials:
+        by_state.setdefault(trial.state.name, []).append(trial)
+
+    print(f"\n{'='*70}")
+    print(f"📊 Study '{study.study_name}': " + ", ".join(f"{state} {len(ts)}" for state, ts in by_state.items()))
+    for state in ('COMPLETE', 'PRUNED'):
+        walls = [t.user_attrs['wall_sec'] for t in by_state.get(state, []) if 'wall_sec' in t.user_attrs]
+        if walls:
+            print(f"   {state} 평균 실행 시간: {np.mean(walls):.1f}초 (합계 {np.sum(walls) / 60:.1f}분)")
+
+    completed = sorted(by_state.get('COMPLETE', []), key=lambda t: t.value, reverse=True)
+    if not completed:
+        print("   완료된 trial 없음")
+        return None
+
+    print(f"\n🏆 Top {min(top, len(completed))} trial:")
+    for rank, trial in enumerate(completed[:top], 1):
+        scores = ', '.join(f"{s:.4f}" for s in trial.user_attrs.get('fold_scores', []))
+        print(f"   {rank:2d}. Trial {trial.number}: {trial.value:.4f} | {trial.user_attrs.get('wall_sec', 0):.1f}초 | [{scores}]")
+
+    best = study.best_trial
+    print(f"\n최적 파라미터 (Trial {best.number}, F1 {best.value:.4f}):")
+    for key, value in best.params.items():
+        print(f"   {key}: {value}")
+    print(f"{'='*70}")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="XGBoost 하이퍼파라미터 병렬 튜닝 (Optuna + SQLite)")
+    parser.add_argument('--data-dir', required=True, help='train_data.csv / val_data.csv 폴더')
+    parser.add_argument('--features', default=None, help='피처 목록 (.txt 또는 feature_list.json)')
+    parser.add_argument('--study', default='xgboost_walk_forward')
+    parser.add_argument('--storage', default='sqlite:///optuna_xgboost.db')
+    parser.add_argument('--trials', type=int, default=200, help='목표 trial 수 (완료 + 중단, 재개 시 이어서 계산)')
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 1) // 4))
+    parser.add_argument('--threads', type=int, default=None, help='워커당 xgboost 스레드 수 (기본: CPU 수 / 워커 수)')
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--purge', type=int, default=5, help='검증 직전 학습에서 제외할 봉 수')
+    parser.add_argument('--pruner', choices=['median', 'hyperband', 'none'], default='median')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--gpu', action='store_true', help="device='cuda' 사용 (워커 수는 1~2 권장)")
+    parser.add_argument('--output', default=None, help='최적 파라미터 저장 경로 (xgboost_best_params.json 형식)')
+    args = parser.parse_args()
+
+    if args.threads is None:
+        args.threads = max(1, (os.cpu_count() or 1) // args.workers)
+
+    # study는 부모 프로세스에서 한 번 생성 (이미 있으면 이어서 진행)
+    study = optuna.create_study(
+        study_name=args.study,
+        storage=make_storage(args.storage),
+        direction='maximize',
+        load_if_exists=True,
+    )
+    finished = len(study.get_trials(deepcopy=False, states=(TrialState.COMPLETE, TrialState.PRUNED)))
+    print(f"🚀 튜닝 시작: study '{args.study}' ({args.storage})")
+    print(f"   기존 trial {finished}개 → 목표 {args.trials}개 | 워커 {args.workers} × 스레드 {args.threads}"
+          f" | {args.folds}폴드 purge {args.purge} | pruner {args.pruner}")
+
+    started = time.perf_counter()
+    if args.workers == 1:
+        run_worker(0, args)
+    else:
+        ctx = mp.get_context('spawn')
+        workers = [ctx.Process(target=run_worker, args=(i, args), daemon=False) for i in range(args.workers)]
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            print("\n⏹️ 중단 요청 - 워커 종료 (같은 명령으로 재실행하면 이어서 진행)")
+            for worker in workers:
+                worker.terminate()
+            for worker in workers:
+                worker.join()
+
+    print(f"\n⏱️ 튜닝 소요 시간: {(time.perf_counter() - started) / 60:.1f}분")
+    best = print_summary(optuna.load_study(study_name=args.study, storage=make_storage(args.storage)))
+
+    if best is not None and args.output:
+        with open(args.output, 'w') as f:
+            json.dump(best.params, f, indent=2)
+        print(f"💾 최적 파라미터 저장: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,372 @@
+import os
+import time
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.metrics import f1_score
+import warnings
+warnings.filterwarnings('ignore')
+
+
+class PurgedWalkForwardCV:
+    """
+    시계열 (Symbol, Date) 데이터용 purge/embargo 교차검증 분할기
+
+    - 행 위치가 아니라 Date(시점) 단위로 폴드를 나눔 → 같은 시점의 모든 심볼은 같은 폴드
+    - walk_forward=True: 검증 구간보다 과거 시점만 학습 (확장 윈도우)
+    - walk_forward=False: 검증 구간 앞/뒤 모두 학습 (purged k-fold)
+    - purge: 검증 시작 직전 시점 수만큼 학습에서 제외 (라벨이 미래 봉을 참조하는 구간)
+    - embargo: 검증 종료 직후 시점 수만큼 학습에서 제외 (walk_forward=False일 때 의미 있음)
+
+    sklearn 분할기와 같은 방식으로 사용:
+        cv.split(X, y, groups=dates)
+    """
+
+    def __init__(self, n_splits=5, purge=1, embargo=0, walk_forward=True, max_train_dates=None):
+        """
+        Parameters:
+        n_splits: 폴드 수
+        purge: 검증 직전 제외할 시점 수 (라벨 계산에 쓰인 미래 봉 수 이상)
+        embargo: 검증 직후 제외할 시점 수
+        walk_forward: True면 과거 시점만 학습
+        max_train_dates: 학습에 쓸 최대 시점 수 (None이면 확장 윈도우, 값이 있으면 고정 윈도우)
+        """
+        self.n_splits = n_splits
+        self.purge = purge
+        self.embargo = embargo
+        self.walk_forward = walk_forward
+        self.max_train_dates = max_train_dates
+
+    def get_n_splits(self, X=None, y=None, groups=None):
+        return self.n_splits
+
+    def _date_codes(self, dates):
+        """시점 → 정렬된 정수 코드 (같은 시점은 같은 코드)"""
+        dates = pd.to_datetime(pd.Series(np.asarray(dates))).values
+        unique_dates, codes = np.unique(dates, return_inverse=True)
+        return unique_dates, codes
+
+    def split(self, X, y=None, groups=None):
+        """
+        Parameters:
+        X: 피처 (행 수만 사용)
+        y: 사용 안 함 (sklearn 호환)
+        groups: 행별 Date (필수)
+
+        Yields:
+        (train_idx, val_idx): 행 위치 배열
+        """
+        if groups is None:
+            raise ValueError("groups에 행별 Date를 전달해야 합니다")
+        if len(groups) != len(X):
+            raise ValueError(f"groups 길이({len(groups)})가 X 행 수({len(X)})와 다릅니다")
+
+        unique_dates, codes = self._date_codes(groups)
+        n_dates = len(unique_dates)
+
+        # walk-forward는 첫 블록을 학습 전용으로 남겨 n_splits + 1 블록으로 분할
+        n_blocks = self.n_splits + 1 if self.walk_forward else self.n_splits
+        if n_dates < n_blocks * (self.purge + 1):
+            raise ValueError(f"시점 수({n_dates})가 폴드/purge 설정에 비해 부족합니다")
+        bounds = np.linspace(0, n_dates, n_blocks + 1).astype(int)
+
+        first_block = 1 if self.walk_forward else 0
+        for block in range(first_block, n_blocks):
+            val_start, val_end = bounds[block], bounds[block + 1]   # [val_start, val_end)
+
+            # 검증 구간 앞: purge만큼 비우고 학습
+            train_end = max(0, val_start - self.purge)
+            train_start = 0
+            if self.max_train_dates:
+                train_start = max(0, train_end - self.max_train_dates)
+            train_mask = (codes >= train_start) & (codes < train_end)
+
+            # 검증 구간 뒤: embargo만큼 비우고 학습 (purged k-fold)
+            if not self.walk_forward:
+                train_mask |= codes >= val_end + self.embargo
+
+            val_mask = (codes >= val_start) & (codes < val_end)
+            train_idx = np.flatnonzero(train_mask)
+            val_idx = np.flatnonzero(val_mask)
+            if len(train_idx) == 0 or len(val_idx) == 0:
+                continue
+            yield train_idx, val_idx
+
+    def describe(self, dates):
+        """폴드별 학습/검증 기간 요약 DataFrame"""
+        unique_dates, codes = self._date_codes(dates)
+        rows = []
+        for fold_num, (train_idx, val_idx) in enumerate(self.split(codes, groups=dates), 1):
+            rows.append({
+                'fold': fold_num,
+                'train_start': unique_dates[codes[train_idx].min()],
+                'train_end': unique_dates[codes[train_idx].max()],
+                'val_start': unique_dates[codes[val_idx].min()],
+                'val_end': unique_dates[codes[val_idx].max()],
+                'train_rows': len(train_idx),
+                'val_rows': len(val_idx),
+            })
+        return pd.DataFrame(rows)
+
+
+def balanced_sample_weights(y):
+    """클래스 가중치 (total / (n_classes * count)) 를 행별 가중치로 변환"""
+    y = np.asarray(y).astype(int)
+    counts = np.bincount(y)
+    present = counts > 0
+    class_weights = np.zeros(len(counts), dtype=np.float64)
+    class_weights[present] = len(y) / (present.sum() * counts[present])
+    return class_weights[y]
+
+
+def _fit_fold(fold_num, X, y, train_idx, val_idx, params, scorer):
+    """
+    폴드 1개 학습/평가 (워커 프로세스에서 실행)
+
+    X, y는 joblib이 메모리맵으로 공유하므로 워커마다 복사되지 않음
+    """
+    import xgboost as xgb
+
+    started = time.perf_counter()
+    X_train, y_train = X[train_idx], y[train_idx]
+    X_val, y_val = X[val_idx], y[val_idx]
+    prepared = time.perf_counter()
+
+    model = xgb.XGBClassifier(**params)
+    model.fit(
+        X_train, y_train,
+        sample_weight=balanced_sample_weights(y_train),
+        eval_set=[(X_val, y_val)],
+        verbose=False
+    )
+    fitted = time.perf_counter()
+
+    score = scorer(y_val, model.predict(X_val))
+    finished = time.perf_counter()
+
+    return {
+        'fold': fold_num,
+        'score': float(score),
+        'best_iteration': getattr(model, 'best_iteration', None),
+        'train_rows': len(train_idx),
+        'val_rows': len(val_idx),
+        'prepare_sec': prepared - started,
+        'fit_sec': fitted - prepared,
+        'predict_sec': finished - fitted,
+        'total_sec': finished - started,
+        'pid': os.getpid(),
+    }
+
+
+def macro_f1(y_true, y_pred):
+    return f1_score(y_true, y_pred, average='macro')
+
+
+def cross_validate(params, X, y, dates, cv=None, n_jobs=-1, scorer=macro_f1, verbose=True):
+    """
+    폴드를 프로세스 병렬로 학습해 CV 점수 계산
+
+    Parameters:
+    params: XGBClassifier 파라미터 (early_stopping_rounds 포함 가능)
+    X: 피처 DataFrame 또는 배열 (float32로 한 번만 변환해 모든 폴드가 공유)
+    y: 라벨
+    dates: 행별 Date (PurgedWalkForwardCV 분할 기준)
+    cv: 분할기 (None이면 PurgedWalkForwardCV())
+    n_jobs: 동시에 학습할 폴드 수 (-1이면 CPU 수와 폴드 수 중 작은 값)
+    scorer: (y_true, y_pred) → 점수
+    verbose: 폴드별 소요 시간 출력
+
+    Returns:
+    dict: {'mean', 'std', 'scores', 'folds', 'elapsed_sec'}
+    """
+    cv = cv or PurgedWalkForwardCV()
+    X = np.ascontiguousarray(X.values if hasattr(X, 'values') else X, dtype=np.float32)
+    y = np.asarray(y).astype(np.int32)
+    splits = list(cv.split(X, y, groups=dates))
+
+    cpu_count = os.cpu_count() or 1
+    if n_jobs is None or n_jobs < 1:
+        n_jobs = cpu_count
+    n_jobs = max(1, min(n_jobs, len(splits)))
+
+    # 폴드 병렬 시 폴드당 스레드를 나눠 CPU 과다 할당 방지
+    fold_params = dict(params)
+    if n_jobs > 1:
+        fold_params['n_jobs'] = max(1, cpu_count // n_jobs)
+
+    started = time.perf_counter()
+    if n_jobs == 1:
+        folds = [_fit_fold(i, X, y, tr, va, fold_params, scorer) for i, (tr, va) in enumerate(splits, 1)]
+    else:
+        # 1MB 이상 배열은 joblib이 임시 메모리맵으로 만들어 워커가 공유
+        folds = Parallel(n_jobs=n_jobs, backend='loky', max_nbytes='1M')(
+            delayed(_fit_fold)(i, X, y, tr, va, fold_params, scorer) for i, (tr, va) in enumerate(splits, 1)
+        )
+    elapsed = time.perf_counter() - started
+
+    slowest = max((fold['total_sec'] for fold in folds), default=0)
+    return _summarize_folds(
+        folds, elapsed, f"동시 {n_jobs}", f"가장 느린 폴드 {slowest:.1f}초", verbose
+    )
+
+
+def _summarize_folds(folds, elapsed, mode, detail, verbose):
+    """폴드 결과 → {'mean', 'std', 'scores', 'folds', 'elapsed_sec'} (verbose면 폴드별 출력)"""
+    scores = [fold['score'] for fold in folds]
+    result = {
+        'mean': float(np.mean(scores)) if scores else float('nan'),
+        'std': float(np.std(scores)) if scores else float('nan'),
+        'scores': scores,
+        'folds': folds,
+        'elapsed_sec': elapsed,
+    }
+
+    if verbose:
+        print(f"  CV {len(folds)}폴드 ({mode}): {elapsed:.1f}초 ({detail})")
+        for fold in folds:
+            print(f"    Fold {fold['fold']}: {fold['score']:.4f} | 학습 {fold['train_rows']:,}행 / 검증 {fold['val_rows']:,}행"
+                  f" | fit {fold['fit_sec']:.1f}초 | 반복 {fold['best_iteration']}")
+
+    return result
+
+
+# sklearn 래퍼 파라미터 → xgb.train 파라미터 이름
+_NATIVE_PARAM_NAMES = {
+    'random_state': 'seed',
+    'n_jobs': 'nthread',
+}
+# xgb.train 인자로 따로 넘기는 항목
+_TRAIN_ARG_NAMES = ('n_estimators', 'early_stopping_rounds')
+
+
+def to_native_params(params):
+    """
+    XGBClassifier 파라미터 dict → (xgb.train params, num_boost_round, early_stopping_rounds)
+    """
+    native = {}
+    for key, value in params.items():
+        if key in _TRAIN_ARG_NAMES or value is None:
+            continue
+        native[_NATIVE_PARAM_NAMES.get(key, key)] = value
+    return native, int(params.get('n_estimators', 100)), params.get('early_stopping_rounds')
+
+
+class FoldMatrixCache:
+    """
+    폴드별 학습/검증 QuantileDMatrix를 만들어 두고 Optuna trial 사이에서 재사용
+
+    - 피처 양자화(히스토그램 bin 경계 계산)는 max_bin마다 달라지므로 (폴드, max_bin) 키로 캐시
+    - 클래스 가중치는 폴드 라벨로 한 번만 계산해 학습 행렬에 포함
+    - 캐시 항목 수는 max_entries로 제한 (오래 안 쓴 항목부터 삭제, 기본: 폴드 수 × max_bin 후보 수)
+    - DMatrix는 프로세스 간 공유가 안 되므로 폴드는 현재 프로세스에서 순차 학습
+      (폴드 내부는 xgboost가 nthread만큼 병렬 처리)
+    """
+
+    def __init__(self, X, y, dates, cv=None, max_entries=None, max_bin_choices=5):
+        """
+        Parameters:
+        X: 피처 DataFrame 또는 배열
+        y: 라벨
+        dates: 행별 Date
+        cv: 분할기 (None이면 PurgedWalkForwardCV())
+        max_entries: 보관할 (폴드, max_bin) 조합 최대 수 (None이면 폴드 수 × max_bin_choices)
+        max_bin_choices: Optuna가 탐색하는 max_bin 후보 수 (512~1024, 128 간격 = 5개)
+        """
+        self.cv = cv or PurgedWalkForwardCV()
+        self.X = np.ascontiguousarray(X.values if hasattr(X, 'values') else X, dtype=np.float32)
+        self.y = np.asarray(y).astype(np.int32)
+        self.splits = list(self.cv.split(self.X, self.y, groups=dates))
+        self.weights = [balanced_sample_weights(self.y[train_idx]) for train_idx, _ in self.splits]
+        self.max_entries = max_entries or len(self.splits) * max_bin_choices
+
+        self._matrices = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.build_sec = 0.0
+
+    def get(self, fold_idx, max_bin=256):
+        """(학습 행렬, 검증 행렬, 검증 라벨) 반환 (없으면 생성 후 캐시)"""
+        key = (fold_idx, int(max_bin))
+        if key in self._matrices:
+            self.hits += 1
+            self._matrices.move_to_end(key)
+            return self._matrices[key]
+
+        import xgboost as xgb
+
+        started = time.perf_counter()
+        train_idx, val_idx = self.splits[fold_idx]
+        dtrain = xgb.QuantileDMatrix(
+            self.X[train_idx], self.y[train_idx], weight=self.weights[fold_idx], max_bin=int(max_bin)
+        )
+        # 검증 행렬은 학습 행렬의 bin 경계를 그대로 사용
+        dval = xgb.QuantileDMatrix(self.X[val_idx], self.y[val_idx], ref=dtrain, max_bin=int(max_bin))
+        entry = (dtrain, dval, self.y[val_idx])
+        self.build_sec += time.perf_counter() - started
+        self.misses += 1
+
+        self._matrices[key] = entry
+        while len(self._matrices) > self.max_entries:
+            self._matrices.popitem(last=False)
+        return entry
+
+    def cross_validate(self, params, scorer=macro_f1, verbose=True, on_fold=None):
+        """
+        캐시된 행렬로 CV 점수 계산 (반환 형식은 cross_validate와 동일)
+
+        Parameters:
+        params: XGBClassifier 파라미터 (max_bin, n_estimators, early_stopping_rounds 포함 가능)
+        on_fold: 폴드마다 호출되는 콜백 (fold_idx, fold 결과 dict, 지금까지 점수 목록)
+                 예외를 던지면 남은 폴드를 건너뜀 (Optuna pruning)
+        """
+        import xgboost as xgb
+
+        native, num_boost_round, early_stopping_rounds = to_native_params(params)
+        max_bin = int(native.get('max_bin', 256))
+        native['max_bin'] = max_bin
+
+        started = time.perf_counter()
+        folds = []
+        for fold_idx, (train_idx, val_idx) in enumerate(self.splits):
+            fold_started = time.perf_counter()
+            dtrain, dval, y_val = self.get(fold_idx, max_bin)
+            prepared = time.perf_counter()
+
+            booster = xgb.train(
+                native, dtrain,
+                num_boost_round=num_boost_round,
+                evals=[(dval, 'validation')],
+                early_stopping_rounds=early_stopping_rounds,
+                verbose_eval=False,
+            )
+            fitted = time.perf_counter()
+
+            best_iteration = getattr(booster, 'best_iteration', None)
+            iteration_range = (0, best_iteration + 1) if best_iteration is not None else (0, 0)
+            proba = booster.predict(dval, iteration_range=iteration_range)
+            val_pred = proba.argmax(axis=1) if proba.ndim == 2 else (proba > 0.5).astype(int)
+            score = scorer(y_val, val_pred)
+            finished = time.perf_counter()
+
+            folds.append({
+                'fold': fold_idx + 1,
+                'score': float(score),
+                'best_iteration': best_iteration,
+                'train_rows': len(train_idx),
+                'val_rows': len(val_idx),
+                'prepare_sec': prepared - fold_started,
+                'fit_sec': fitted - prepared,
+                'predict_sec': finished - fitted,
+                'total_sec': finished - fold_started,
+                'pid': os.getpid(),
+            })
+            if on_fold is not None:
+                on_fold(fold_idx, folds[-1], [fold['score'] for fold in folds])
+        elapsed = time.perf_counter() - started
+
+        prepare = sum(fold['prepare_sec'] for fold in folds)
+        return _summarize_folds(
+            folds, elapsed, f"행렬 캐시, max_bin={max_bin}",
+            f"행렬 준비 {prepare:.1f}초 | 캐시 적중 {self.hits}/{self.hits + self.misses}", verbose
+        )
@@ -525,7 +525,8 @@ def filter_target_symbols(processed_stocks, target_symbols=None):
     return filtered_stocks
 
 # 메인 실행 함수
-def prepare_xgboost_data(processed_stocks, output_dir='./data/xgboost', forecast_horizon=1, target_symbols=None):
+def prepare_xgboost_data(processed_stocks, output_dir='./data/xgboost', forecast_horizon=1, target_symbols=None,
+                         shard_rows=None):
     """
     XGBoost 학습을 위한 완전한 데이터 전처리
     
@@ -540,6 +541,9 @@ def prepare_xgboost_data(processed_stocks, output_dir='./data/xgboost', forecast
     target_symbols : list or None
         선택할 종목 리스트. None이면 전체 사용
         예: ['BTC', 'ETH', 'SOL', 'DOGE'] (-USD는 자동 제거됨)
+    shard_rows : int or None
+        지정 시 train/val/test를 이 행 수 단위 .npy 조각으로도 저장 (output_dir/shards/)
+        → feature_shards.train_from_shards로 외부 메모리 학습
     
     Returns:
     --------
@@ -568,6 +572,15 @@ def prepare_xgboost_data(processed_stocks, output_dir='./data/xgboost', forecast
     val_df.to_csv(os.path.join(output_dir, 'val_data.csv'), index=False)
     test_df.to_csv(os.path.join(output_dir, 'test_data.csv'), index=False)
     
+    # 6. 외부 메모리 학습용 조각 저장
+    if shard_rows:
+        from feature_shards import write_feature_shards
+        for split_name, split_df in [('train', train_df), ('val', val_df), ('test', test_df)]:
+            write_feature_shards(
+                split_df, os.path.join(output_dir, 'shards', split_name),
+                training_features, rows_per_shard=shard_rows
+            )
+    
     return {
         'train': train_df,
         'val': val_df, 